@@ -32,6 +32,7 @@ if sys.platform == "win32" and not mimetypes.inited:
         mimetypes.init()
 import os
 import re
+import threading
 from contextlib import asynccontextmanager, suppress
 from datetime import datetime
 from pathlib import Path
@@ -219,6 +220,45 @@ def _schedule_stock_index_background_refresh(app: FastAPI, reason: str) -> None:
     )
 
 
+async def _migrate_analysis_blobs_in_background() -> None:
+    stop_event = threading.Event()
+    try:
+        from src.storage import DatabaseManager
+
+        await run_in_threadpool(
+            DatabaseManager.get_instance().migrate_analysis_history_blobs,
+            stop_event=stop_event,
+        )
+    except asyncio.CancelledError:
+        # Cancelling the task does not stop the threadpool call; the batch
+        # loop checks the event and exits after its current transaction.
+        stop_event.set()
+        raise
+    except Exception as exc:  # noqa: BLE001 - legacy rows stay readable inline.
+        logger.warning("[analysis-blobs] background migration failed: %s", exc)
+
+
+def _schedule_analysis_blob_migration(app: FastAPI) -> None:
+    task = getattr(app.state, "analysis_blob_migration_task", None)
+    if task is not None and not task.done():
+        return
+
+    app.state.analysis_blob_migration_task = asyncio.create_task(
+        _migrate_analysis_blobs_in_background()
+    )
+
+
+def _flush_llm_usage_telemetry() -> None:
+    try:
+        from src.storage import DatabaseManager
+
+        db = DatabaseManager._instance
+        if db is not None and getattr(db, "_initialized", False):
+            db.flush_llm_usage(timeout=5.0)
+    except Exception as exc:  # noqa: BLE001 - the atexit hook still drains the queue.
+        logger.warning("[LLM usage] telemetry flush on shutdown failed: %s", exc)
+
+
 def _load_runtime_scheduler_args() -> dict:
     raw_value = os.getenv(RUNTIME_SCHEDULER_ARGS_ENV)
     if not raw_value:
@@ -289,6 +329,7 @@ async def app_lifespan(app: FastAPI):
         runtime_scheduler=app.state.runtime_scheduler_service,
     )
     _schedule_stock_index_background_refresh(app, "startup")
+    _schedule_analysis_blob_migration(app)
     # A one-shot automatic strategy batch is backed by an in-process task, so
     # it cannot continue across a process restart.  Persist an honest terminal
     # state instead of leaving the Run Center on an endless "running" label.
@@ -308,11 +349,12 @@ async def app_lifespan(app: FastAPI):
     try:
         yield
     finally:
-        refresh_task = getattr(app.state, "stock_index_refresh_task", None)
-        if refresh_task is not None and not refresh_task.done():
-            refresh_task.cancel()
-            with suppress(asyncio.CancelledError):
-                await refresh_task
+        for task_name in ("stock_index_refresh_task", "analysis_blob_migration_task"):
+            background_task = getattr(app.state, task_name, None)
+            if background_task is not None and not background_task.done():
+                background_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await background_task
         if hasattr(app.state, "system_config_service"):
             delattr(app.state, "system_config_service")
         continuous_runs = getattr(app.state, "strategy_continuous_runs", None)
@@ -323,6 +365,7 @@ async def app_lifespan(app: FastAPI):
         if runtime_scheduler is not None:
             runtime_scheduler.stop()
             delattr(app.state, "runtime_scheduler_service")
+        _flush_llm_usage_telemetry()
 
 
 def create_app(static_dir: Optional[Path] = None) -> FastAPI:
@@ -43,7 +43,11 @@ from src.report_language import (
     localize_trend_prediction,
     normalize_report_language,
 )
-from src.services.history_service import HistoryService, MarkdownReportGenerationError
+from src.services.history_service import (
+    HistoryService,
+    InvalidHistoryCursorError,
+    MarkdownReportGenerationError,
+)
 from src.schemas.decision_action import build_action_fields
 from src.utils.data_processing import (
     normalize_model_used,
@@ -208,10 +212,11 @@ def _extract_guardrail_reason(raw_result: Any) -> Optional[str]:
     response_model=HistoryListResponse,
     responses={
         200: {"description": "历史记录列表"},
+        400: {"description": "cursor 无效", "model": ErrorResponse},
         500: {"description": "服务器错误", "model": ErrorResponse},
     },
     summary="获取历史分析列表",
-    description="分页获取历史分析记录摘要，支持按股票代码和日期范围筛选"
+    description="分页获取历史分析记录摘要，支持按股票代码和日期范围筛选；传入 cursor 时按游标翻页"
 )
 def get_history_list(
     stock_code: Optional[str] = Query(None, description="股票代码筛选"),
@@ -220,6 +225,7 @@ def get_history_list(
     end_date: Optional[str] = Query(None, description="结束日期 (YYYY-MM-DD)"),
     page: int = Query(1, ge=1, description="页码（从 1 开始）"),
     limit: int = Query(20, ge=1, le=100, description="每页数量"),
+    cursor: Optional[str] = Query(None, description="上一页返回的 next_cursor；传入时忽略 page"),
     db_manager: DatabaseManager = Depends(get_database_manager)
 ) -> HistoryListResponse:
     """
@@ -234,6 +240,7 @@ def get_history_list(
         end_date: 结束日期
         page: 页码
         limit: 每页数量
+        cursor: keyset 翻页游标
         db_manager: 数据库管理器依赖
         
     Returns:
@@ -249,7 +256,9 @@ def get_history_list(
             start_date=start_date,
             end_date=end_date,
             page=page,
-            limit=limit
+            limit=limit,
+            # 直接调用（非经 FastAPI 解析）时默认值是 Query 对象而非 None
+            cursor=cursor if isinstance(cursor, str) else None,
         )
         
         # 转换为响应模型
@@ -279,12 +288,18 @@ def get_history_list(
         ]
         
         return HistoryListResponse(
-            total=result.get("total", 0),
+            total=result.get("total") or 0,
             page=page,
             limit=limit,
-            items=items
+            items=items,
+            next_cursor=result.get("next_cursor"),
         )
         
+    except InvalidHistoryCursorError as e:
+        raise HTTPException(
+            status_code=400,
+            detail={"error": "invalid_request", "message": str(e)},
+        )
     except Exception as e:
         logger.error(f"查询历史列表失败: {e}", exc_info=True)
         raise HTTPException(
@@ -461,10 +476,9 @@ def get_stock_bar(
             )
 
             display_stock_code = service._display_stock_code(record.code)
-            analysis_count = db_manager.get_analysis_history_paginated(
+            analysis_count = db_manager.count_analysis_history(
                 code=HistoryService._history_code_filter_candidates(display_stock_code),
-                limit=1,
-            )[1]
+            )
             items.append(
                 StockBarItem(
                     id=record.id,
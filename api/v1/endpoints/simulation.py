@@ -35,6 +35,7 @@ from api.v1.schemas.simulation import (
     StrategyValidationExperimentCreateRequest, StrategyValidationExperimentItem,
     StrategyValidationExperimentListResponse, StrategyValidationVersionStatusItem,
     StrategyValidationComparisonRequest, StrategyValidationComparisonResponse,
+    StrategyValidationSweepRequest, StrategyValidationSweepResponse,
     StrategyDataSourceCreateRequest,
     StrategyKernelExecuteRequest,
     AgentTemplateCreateRequest, AgentTemplateUpdateRequest,
@@ -328,6 +329,16 @@ def definition_compare_validation_experiments(request: StrategyValidationCompari
         raise _strategy_validation_error(exc)
 
 
+@router.post("/definition/validation-sweeps", response_model=StrategyValidationSweepResponse)
+def definition_run_validation_sweep(request: StrategyValidationSweepRequest) -> dict:
+    payload = request.model_dump(mode="json")
+    payload["grid"] = {field: values for field, values in payload["grid"].items() if values is not None}
+    try:
+        return StrategyValidationService().run_sweep(payload)
+    except StrategyValidationError as exc:
+        raise _strategy_validation_error(exc)
+
+
 @router.get("/definition/validation-experiments/{experiment_id}", response_model=StrategyValidationExperimentItem)
 def definition_get_validation_experiment(experiment_id: int) -> dict:
     try:
@@ -69,17 +69,19 @@ class HistoryItem(BaseModel):
 class HistoryListResponse(BaseModel):
     """历史记录列表响应"""
     
-    total: int = Field(..., description="总记录数")
+    total: int = Field(..., description="总记录数（短时缓存的计数，可能略有滞后）")
     page: int = Field(..., description="当前页码")
     limit: int = Field(..., description="每页数量")
     items: List[HistoryItem] = Field(default_factory=list, description="记录列表")
+    next_cursor: Optional[str] = Field(None, description="下一页游标，为空表示没有更多记录")
     
     model_config = ConfigDict(json_schema_extra={
         "example": {
             "total": 100,
             "page": 1,
             "limit": 20,
-            "items": []
+            "items": [],
+            "next_cursor": None
         }
     })
 
@@ -125,6 +125,7 @@ class IntelligenceFetchResponse(BaseModel):
     fetched_count: Optional[int] = None
     saved_count: Optional[int] = None
     retention_deleted: Optional[int] = None
+    not_modified: Optional[bool] = None
     dry_run: Optional[bool] = None
     sample_items: List[IntelligenceSampleItem] = Field(default_factory=list)
     results: Optional[List[dict]] = None
@@ -310,6 +310,38 @@ class StrategyValidationComparisonResponse(BaseModel):
     comparisonBasis: Dict[str, Any]
 
 
+class StrategyValidationSweepGrid(BaseModel):
+    rebalanceFrequency: Optional[List[Literal["daily", "weekly", "monthly"]]] = Field(None, min_length=1, max_length=3)
+    maxPositions: Optional[List[int]] = Field(None, min_length=1, max_length=10)
+    slippageRate: Optional[List[float]] = Field(None, min_length=1, max_length=10)
+    commissionRate: Optional[List[float]] = Field(None, min_length=1, max_length=10)
+
+
+class StrategyValidationSweepRequest(BaseModel):
+    strategyVersionIds: List[int] = Field(..., min_length=1, max_length=10)
+    idempotencyKey: str = Field(..., min_length=8, max_length=96)
+    config: StrategyValidationConfig
+    grid: StrategyValidationSweepGrid = Field(default_factory=StrategyValidationSweepGrid)
+
+
+class StrategyValidationSweepCell(BaseModel):
+    experimentId: int
+    strategyVersionId: int
+    overrides: Dict[str, Any] = Field(default_factory=dict)
+    status: StrategyValidationExperimentStatus
+    inputSnapshotHash: Optional[str] = None
+    metrics: Dict[str, Any] = Field(default_factory=dict)
+    errorMessage: Optional[str] = None
+
+
+class StrategyValidationSweepResponse(BaseModel):
+    sweepKey: str
+    cellCount: int
+    executedCount: int
+    snapshotCount: int
+    cells: List[StrategyValidationSweepCell] = Field(default_factory=list)
+
+
 class StrategyValidationVersionStatusItem(BaseModel):
     strategyVersionId: int
     versionRevision: int
@@ -32,7 +32,7 @@
 提示：优先级数字越小越优先，同优先级按初始化顺序排列
 """
 
-from .base import BaseFetcher, DataFetcherManager
+from .base import BaseFetcher, DataFetcherManager, get_fetcher_manager, reset_fetcher_manager
 from .efinance_fetcher import EfinanceFetcher
 from .tencent_fetcher import TencentFetcher
 from .akshare_fetcher import AkshareFetcher, is_hk_stock_code
@@ -48,6 +48,8 @@ from .us_index_mapping import is_us_index_code, is_us_stock_code, get_us_index_y
 __all__ = [
     'BaseFetcher',
     'DataFetcherManager',
+    'get_fetcher_manager',
+    'reset_fetcher_manager',
     'EfinanceFetcher',
     'TencentFetcher',
     'AkshareFetcher',
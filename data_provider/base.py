@@ -14,23 +14,38 @@
 3. 指数退避重试机制
 """
 
+import contextvars
+import functools
+import inspect
 import logging
 import random
 import time
-from threading import BoundedSemaphore, RLock, Thread
+from concurrent.futures import Future, TimeoutError as FuturesTimeoutError
+from threading import RLock
 from abc import ABC, abstractmethod
-from datetime import datetime, timezone
-from typing import Callable, Optional, List, Tuple, Dict, Any
+from datetime import date, datetime, timedelta, timezone
+from typing import TYPE_CHECKING, Callable, Optional, List, Tuple, Dict, Any
 
 import pandas as pd
 import numpy as np
 from src.data.stock_index_loader import get_index_stock_name
 from src.data.stock_mapping import STOCK_NAME_MAP, is_meaningful_stock_name
 from src.services.market_symbol_utils import is_suffix_market_symbol
+from src.services.concurrency_budget import data_source_slot
 from src.services.run_diagnostics import record_provider_run, record_provider_run_started
 from .fundamental_adapter import AkshareFundamentalAdapter
 from .yfinance_fundamental_adapter import YfinanceFundamentalAdapter
 from .realtime_types import CircuitBreaker
+from .timeout_executor import (
+    CancelToken,
+    cancellation_requested,
+    get_fundamental_block_pool,
+    get_fundamental_executor,
+    run_with_cancel_token,
+)
+
+if TYPE_CHECKING:
+    from .kline_warehouse import KlineCoverage, KlineWarehouse
 
 # 配置日志
 logger = logging.getLogger(__name__)
@@ -39,6 +54,44 @@ logger = logging.getLogger(__name__)
 # === 标准化列名定义 ===
 STANDARD_COLUMNS = ['date', 'open', 'high', 'low', 'close', 'volume', 'amount', 'pct_chg']
 
+# K 线仓库增量追加时与数据源核对的已入库 K 线根数
+WAREHOUSE_OVERLAP_BARS = 5
+
+# 基本面适配器与同一上游的 fetcher 共用数据源并发预算（按 fetcher 名）
+AKSHARE_DATA_SOURCE = "AkshareFetcher"
+YFINANCE_DATA_SOURCE = "YfinanceFetcher"
+
+
+def calculate_daily_indicators(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    计算技术指标
+    
+    计算指标：
+    - MA5, MA10, MA20: 移动平均线
+    - Volume_Ratio: 量比（今日成交量 / 5日平均成交量）
+    """
+    df = df.copy()
+    
+    # 移动平均线
+    df['ma5'] = df['close'].rolling(window=5, min_periods=1).mean()
+    df['ma10'] = df['close'].rolling(window=10, min_periods=1).mean()
+    df['ma20'] = df['close'].rolling(window=20, min_periods=1).mean()
+    
+    # 量比：当日成交量 / 5日平均成交量
+    # 注意：此处的 volume_ratio 是“日线成交量 / 前5日均量(shift 1)”的相对倍数，
+    # 与部分交易软件口径的“分时量比（同一时刻对比）”不同，含义更接近“放量倍数”。
+    # 该行为目前保留（按需求不改逻辑）。
+    avg_volume_5 = df['volume'].rolling(window=5, min_periods=1).mean()
+    df['volume_ratio'] = df['volume'] / avg_volume_5.shift(1)
+    df['volume_ratio'] = df['volume_ratio'].fillna(1.0)
+    
+    # 保留2位小数
+    for col in ['ma5', 'ma10', 'ma20', 'volume_ratio']:
+        if col in df.columns:
+            df[col] = df[col].round(2)
+    
+    return df
+
 
 def unwrap_exception(exc: Exception) -> Exception:
     """
@@ -558,34 +611,8 @@ class BaseFetcher(ABC):
         return df
     
     def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
-        """
-        计算技术指标
-        
-        计算指标：
-        - MA5, MA10, MA20: 移动平均线
-        - Volume_Ratio: 量比（今日成交量 / 5日平均成交量）
-        """
-        df = df.copy()
-        
-        # 移动平均线
-        df['ma5'] = df['close'].rolling(window=5, min_periods=1).mean()
-        df['ma10'] = df['close'].rolling(window=10, min_periods=1).mean()
-        df['ma20'] = df['close'].rolling(window=20, min_periods=1).mean()
-        
-        # 量比：当日成交量 / 5日平均成交量
-        # 注意：此处的 volume_ratio 是“日线成交量 / 前5日均量(shift 1)”的相对倍数，
-        # 与部分交易软件口径的“分时量比（同一时刻对比）”不同，含义更接近“放量倍数”。
-        # 该行为目前保留（按需求不改逻辑）。
-        avg_volume_5 = df['volume'].rolling(window=5, min_periods=1).mean()
-        df['volume_ratio'] = df['volume'] / avg_volume_5.shift(1)
-        df['volume_ratio'] = df['volume_ratio'].fillna(1.0)
-        
-        # 保留2位小数
-        for col in ['ma5', 'ma10', 'ma20', 'volume_ratio']:
-            if col in df.columns:
-                df[col] = df[col].round(2)
-        
-        return df
+        """计算技术指标（见 calculate_daily_indicators）"""
+        return calculate_daily_indicators(df)
     
     @staticmethod
     def random_sleep(min_seconds: float = 1.0, max_seconds: float = 3.0) -> None:
@@ -600,6 +627,61 @@ class BaseFetcher(ABC):
         time.sleep(sleep_time)
 
 
+class _LazyFetcher:
+    """
+    默认数据源的延迟实例化占位
+
+    name/priority 取自类属性，用于排序与路由；首次访问其它属性（即首次有能力
+    路由到该数据源）时才构造真实实例，之后所有访问都转发给该实例。
+
+    实例化之前，能力探测（``hasattr(fetcher, "get_chip_distribution")`` 等）
+    直接按类回答：类上定义的方法返回调用时才构造实例的占位函数，类上没有的
+    公开属性视为不支持，均不会为探测构造实例。
+    """
+
+    def __init__(self, fetcher_cls: type):
+        self._fetcher_cls = fetcher_cls
+        self._fetcher: Optional[BaseFetcher] = None
+        self._lock = RLock()
+        self.name = fetcher_cls.name
+        self.priority = fetcher_cls.priority
+
+    @property
+    def is_instantiated(self) -> bool:
+        return self._fetcher is not None
+
+    def resolve(self) -> BaseFetcher:
+        if self._fetcher is None:
+            with self._lock:
+                if self._fetcher is None:
+                    logger.debug(f"[数据源初始化] 首次路由到 {self.name}，创建实例")
+                    self._fetcher = self._fetcher_cls()
+        return self._fetcher
+
+    def __getattr__(self, attr: str) -> Any:
+        if attr.startswith("__") or attr in ("_fetcher_cls", "_fetcher", "_lock"):
+            raise AttributeError(attr)
+        if self._fetcher is not None:
+            return getattr(self._fetcher, attr)
+        member = getattr(self._fetcher_cls, attr, None)
+        if member is None and not hasattr(self._fetcher_cls, attr):
+            if attr.startswith("_"):
+                # 私有属性可能在 __init__ 中设置，只能从实例上取
+                return getattr(self.resolve(), attr)
+            raise AttributeError(attr)
+        if inspect.isroutine(member):
+            @functools.wraps(member)
+            def _call_resolved(*args: Any, **kwargs: Any) -> Any:
+                return getattr(self.resolve(), attr)(*args, **kwargs)
+
+            return _call_resolved
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self) -> str:
+        state = "ready" if self.is_instantiated else "lazy"
+        return f"<_LazyFetcher {self.name} P{self.priority} {state}>"
+
+
 class DataFetcherManager:
     """
     数据源策略管理器
@@ -663,8 +745,7 @@ class DataFetcherManager:
         self._tickflow_lock = RLock()
         self._fundamental_cache: Dict[str, Dict[str, Any]] = {}
         self._fundamental_cache_lock = RLock()
-        self._fundamental_timeout_worker_limit = 8
-        self._fundamental_timeout_slots = BoundedSemaphore(self._fundamental_timeout_worker_limit)
+        self._fundamental_timeout_executor = get_fundamental_executor()
 
     def _ensure_concurrency_guards(self) -> None:
         """Lazily initialize thread-safety primitives for test scaffolds using __new__."""
@@ -742,9 +823,24 @@ class DataFetcherManager:
             return lock
 
     def _call_fetcher_method(self, fetcher: BaseFetcher, method_name: str, *args, **kwargs):
-        """Serialize shared fetcher state access through manager-owned per-instance locks."""
+        """Serialize shared fetcher state access through manager-owned per-instance locks.
+
+        The call first takes a slot of the fetcher's data-source budget, so
+        each upstream is capped independently of the analysis thread count.
+        """
         method = getattr(fetcher, method_name)
-        with self._get_fetcher_call_lock(fetcher):
+        with data_source_slot(getattr(fetcher, "name", type(fetcher).__name__)):
+            with self._get_fetcher_call_lock(fetcher):
+                return method(*args, **kwargs)
+
+    @staticmethod
+    def _call_adapter_method(data_source: str, method: Callable[..., Any], *args, **kwargs):
+        """Run a fundamental adapter call inside the budget of the upstream it queries.
+
+        Adapters hold no shared per-instance state, so only the data-source
+        budget applies; they share it with the fetcher of the same upstream.
+        """
+        with data_source_slot(data_source):
             return method(*args, **kwargs)
 
     @classmethod
@@ -1166,13 +1262,14 @@ class DataFetcherManager:
         from .yfinance_fetcher import YfinanceFetcher
         from .longbridge_fetcher import LongbridgeFetcher
         config = get_config()
-        # 创建所有数据源实例（优先级在各 Fetcher 的 __init__ 中确定）
-        efinance = EfinanceFetcher()
+        # 优先级由类属性决定的默认数据源延迟到首次路由时再实例化；
+        # Tencent 与可选数据源的优先级在 __init__ 中确定，仍立即创建。
+        efinance = _LazyFetcher(EfinanceFetcher)
         tencent = TencentFetcher()
-        akshare = AkshareFetcher()
-        pytdx = PytdxFetcher()      # 通达信数据源（可配 PYTDX_HOST/PYTDX_PORT）
-        baostock = BaostockFetcher()
-        yfinance = YfinanceFetcher()
+        akshare = _LazyFetcher(AkshareFetcher)
+        pytdx = _LazyFetcher(PytdxFetcher)      # 通达信数据源（可配 PYTDX_HOST/PYTDX_PORT）
+        baostock = _LazyFetcher(BaostockFetcher)
+        yfinance = _LazyFetcher(YfinanceFetcher)
         optional_fetchers: List[BaseFetcher] = []
 
         tushare_token = (getattr(config, "tushare_token", None) or "").strip()
@@ -1252,7 +1349,163 @@ class DataFetcherManager:
         preferred_fetcher: Optional[str] = None,
     ) -> Tuple[pd.DataFrame, str]:
         """
-        获取日线数据（自动切换数据源）
+        获取日线数据（配置 KLINE_WAREHOUSE_DIR 时优先读本地 K 线仓库）
+
+        仓库命中：
+        1. 覆盖区间包含请求区间且不含今天 -> 直接从仓库切片，不访问数据源
+        2. 覆盖区间只缺尾部 -> 从仓库最后几根 K 线起仅向记录的同一数据源拉取尾部，
+           重叠日收盘价不一致（如除权后前复权价格整体变化）时作废该股票并完整重拉
+        3. 未覆盖 -> 走数据源完整拉取，并把已收盘部分写回仓库
+
+        参数、返回值与异常同 _get_daily_data_from_sources。
+        """
+        warehouse = self._get_kline_warehouse()
+        if warehouse is None:
+            return self._get_daily_data_from_sources(stock_code, start_date, end_date, days, preferred_fetcher)
+
+        stock_code = normalize_stock_code(stock_code)
+        end_day = datetime.strptime(end_date, '%Y-%m-%d').date() if end_date else date.today()
+        start_day = (
+            datetime.strptime(start_date, '%Y-%m-%d').date()
+            if start_date
+            else end_day - timedelta(days=days * 2)
+        )
+        market = _market_tag(stock_code)
+        coverage = warehouse.coverage(market, stock_code)
+        if (
+            coverage is not None
+            and coverage.start <= start_day
+            and preferred_fetcher in (None, coverage.source)
+        ):
+            if end_day < date.today() and coverage.end >= end_day:
+                stored = warehouse.frame(market, stock_code, start_day, end_day)
+                if stored is not None and not stored.empty:
+                    logger.info(
+                        f"[K线仓库] {stock_code} 命中: 范围={start_day} ~ {end_day}, rows={len(stored)}"
+                    )
+                    return self._finish_warehouse_frame(stored, stock_code), coverage.source
+            else:
+                merged = self._extend_from_warehouse(warehouse, market, stock_code, coverage, start_day, end_day, days)
+                if merged is not None:
+                    return merged, coverage.source
+
+        df, source = self._get_daily_data_from_sources(
+            stock_code,
+            start_day.isoformat(),
+            end_day.isoformat(),
+            days,
+            preferred_fetcher,
+        )
+        self._write_kline_warehouse(warehouse, market, stock_code, df, source, start_day, end_day)
+        return df, source
+
+    def _get_kline_warehouse(self) -> Optional["KlineWarehouse"]:
+        from src.config import get_config
+
+        root = getattr(get_config(), 'kline_warehouse_dir', None)
+        if not isinstance(root, str) or not root.strip():
+            return None
+        from .kline_warehouse import KlineWarehouse
+
+        return KlineWarehouse.open(root.strip())
+
+    @staticmethod
+    def _finish_warehouse_frame(df: pd.DataFrame, stock_code: str) -> pd.DataFrame:
+        df = df.sort_values('date').reset_index(drop=True)
+        df['code'] = stock_code
+        return calculate_daily_indicators(df[['code'] + STANDARD_COLUMNS])
+
+    def _extend_from_warehouse(
+        self,
+        warehouse: "KlineWarehouse",
+        market: str,
+        stock_code: str,
+        coverage: "KlineCoverage",
+        start_day: date,
+        end_day: date,
+        days: int,
+    ) -> Optional[pd.DataFrame]:
+        """从仓库最后几根 K 线起向同一数据源拉取尾部并与仓库数据拼接；失败返回 None。
+
+        探测起点按仓库中的 K 线而不是自然日回退，停牌或长假超过任何固定天数时
+        重叠区间仍然存在；只有重叠日收盘价不一致才作废该股票。
+        """
+        stored = warehouse.frame(market, stock_code, coverage.start, coverage.end)
+        if stored is None or stored.empty:
+            return None
+        tail_start = stored['date'].iloc[-min(len(stored), WAREHOUSE_OVERLAP_BARS)].date()
+        try:
+            tail, _source = self._get_daily_data_from_sources(
+                stock_code,
+                tail_start.isoformat(),
+                end_day.isoformat(),
+                days,
+                coverage.source,
+            )
+        except DataFetchError as exc:
+            logger.info(f"[K线仓库] {stock_code} 尾部拉取失败，改为完整拉取: {exc}")
+            return None
+        if tail is None or tail.empty:
+            return None
+        tail = tail.assign(date=pd.to_datetime(tail['date']))
+        overlap = stored.merge(tail[['date', 'close']], on='date', suffixes=('', '_fresh'))
+        if overlap.empty:
+            # 数据源没有返回仓库末尾这几天（如源端截断），无法核对复权口径，交给完整拉取覆盖写入
+            logger.info(f"[K线仓库] {stock_code} 尾部与仓库没有重叠交易日，改为完整拉取")
+            return None
+        if not np.allclose(
+            overlap['close'].to_numpy(dtype=float),
+            overlap['close_fresh'].to_numpy(dtype=float),
+            rtol=1e-4,
+            atol=1e-3,
+            equal_nan=True,
+        ):
+            logger.info(f"[K线仓库] {stock_code} 重叠区间价格与仓库不一致（可能复权口径变化），作废后完整拉取")
+            warehouse.invalidate(market, stock_code)
+            return None
+
+        warehouse.write(market, stock_code, tail, source=coverage.source, start=tail_start, end=end_day)
+        fresh = tail[tail['date'] >= pd.Timestamp(start_day)]
+        kept = stored[(stored['date'] >= pd.Timestamp(start_day)) & (stored['date'] < fresh['date'].min())]
+        combined = pd.concat(
+            [kept, fresh.reindex(columns=STANDARD_COLUMNS)],
+            ignore_index=True,
+        )
+        logger.info(
+            f"[K线仓库] {stock_code} 增量追加: 仓库 rows={len(combined) - len(fresh)}, 新增 rows={len(fresh)}"
+        )
+        return self._finish_warehouse_frame(combined, stock_code)
+
+    @staticmethod
+    def _write_kline_warehouse(
+        warehouse: "KlineWarehouse",
+        market: str,
+        stock_code: str,
+        df: pd.DataFrame,
+        source: str,
+        start_day: date,
+        end_day: date,
+    ) -> None:
+        if df is None or df.empty or 'date' not in df.columns:
+            return
+        first_day = pd.to_datetime(df['date']).min().date()
+        # 数据源返回的首行明显晚于请求起点时（上市较晚或源端截断），只记录实际覆盖的区间
+        covered_start = start_day if first_day <= start_day + timedelta(days=10) else first_day
+        try:
+            warehouse.write(market, stock_code, df, source=source, start=covered_start, end=end_day)
+        except OSError as exc:
+            logger.warning(f"[K线仓库] {stock_code} 写入失败: {exc}")
+
+    def _get_daily_data_from_sources(
+        self, 
+        stock_code: str,
+        start_date: Optional[str] = None,
+        end_date: Optional[str] = None,
+        days: int = 30,
+        preferred_fetcher: Optional[str] = None,
+    ) -> Tuple[pd.DataFrame, str]:
+        """
+        从数据源获取日线数据（自动切换数据源）
         
         故障切换策略：
         1. 美股指数/美股股票直接路由到 YfinanceFetcher
@@ -2333,7 +2586,7 @@ class DataFetcherManager:
                     provider=fetcher.name,
                     operation="get_belong_board",
                 )
-                raw_data = fetcher.get_belong_board(stock_code)
+                raw_data = self._call_fetcher_method(fetcher, 'get_belong_board', stock_code)
                 boards = self._normalize_belong_boards(raw_data)
                 if boards:
                     record_provider_run(
@@ -2470,7 +2723,7 @@ class DataFetcherManager:
             tickflow_fetcher = self._get_tickflow_fetcher()
             if tickflow_fetcher is not None:
                 try:
-                    data = tickflow_fetcher.get_main_indices(region=region)
+                    data = self._call_fetcher_method(tickflow_fetcher, 'get_main_indices', region=region)
                     if data:
                         logger.info("[TickFlowFetcher] 获取指数行情成功")
                         return data
@@ -2481,7 +2734,7 @@ class DataFetcherManager:
             if region == "cn" and fetcher.name == "TickFlowFetcher":
                 continue
             try:
-                data = fetcher.get_main_indices(region=region)
+                data = self._call_fetcher_method(fetcher, 'get_main_indices', region=region)
                 if data:
                     logger.info(f"[{fetcher.name}] 获取指数行情成功")
                     return data
@@ -2497,7 +2750,7 @@ class DataFetcherManager:
         if tickflow_fetcher is not None:
             started_at = time.monotonic()
             try:
-                data = tickflow_fetcher.get_market_stats()
+                data = self._call_fetcher_method(tickflow_fetcher, 'get_market_stats')
                 elapsed = time.monotonic() - started_at
                 if data:
                     logger.info(
@@ -2528,7 +2781,7 @@ class DataFetcherManager:
                 continue
             started_at = time.monotonic()
             try:
-                data = fetcher.get_market_stats()
+                data = self._call_fetcher_method(fetcher, 'get_market_stats')
                 elapsed = time.monotonic() - started_at
                 if data:
                     logger.info(
@@ -2567,47 +2820,24 @@ class DataFetcherManager:
         task_name: str,
     ) -> Tuple[Optional[Any], Optional[str], int]:
         """
-        Execute a task in a short-lived thread and enforce a timeout.
+        Execute a task on the shared bounded fundamental executor and enforce a timeout.
+
+        On timeout the task's cancel token is set: queued tasks are dropped and
+        running ones may stop early via ``cancellation_requested()``.
 
         Returns:
             (result, error, duration_ms)
         """
-        start = time.time()
         timeout_value = max(0.0, timeout_seconds)
         if timeout_value <= 0:
             return None, f"{task_name} timeout", 0
-        result_holder: Dict[str, Any] = {}
-        error_holder: Dict[str, Exception] = {}
+        executor = getattr(self, "_fundamental_timeout_executor", None) or get_fundamental_executor()
+        return executor.run(task, timeout_value, task_name)
 
-        if not self._fundamental_timeout_slots.acquire(blocking=False):
-            return None, f"{task_name} timeout worker pool exhausted", int(timeout_value * 1000)
-
-        def runner() -> None:
-            try:
-                result_holder["value"] = task()
-            except Exception as exc:
-                error_holder["value"] = exc
-            finally:
-                try:
-                    self._fundamental_timeout_slots.release()
-                except ValueError:
-                    pass
-
-        worker = Thread(target=runner, daemon=True, name=f"fundamental-{task_name}")
-        try:
-            worker.start()
-        except Exception as exc:
-            try:
-                self._fundamental_timeout_slots.release()
-            except ValueError:
-                pass
-            return None, str(exc), int((time.time() - start) * 1000)
-        worker.join(timeout=timeout_value)
-        if worker.is_alive():
-            return None, f"{task_name} timeout", int(timeout_value * 1000)
-        if "value" in error_holder:
-            return None, str(error_holder["value"]), int((time.time() - start) * 1000)
-        return result_holder.get("value"), None, int((time.time() - start) * 1000)
+    def get_fundamental_executor_metrics(self) -> Dict[str, Any]:
+        """Queued / running / abandoned counts and per-block p50/p95 latency of fundamental tasks."""
+        executor = getattr(self, "_fundamental_timeout_executor", None) or get_fundamental_executor()
+        return executor.metrics()
 
     def _run_with_retry(
         self,
@@ -2628,7 +2858,7 @@ class DataFetcherManager:
         last_error: Optional[str] = None
 
         for _ in range(attempts):
-            if remaining_seconds <= 0:
+            if remaining_seconds <= 0 or cancellation_requested():
                 break
             result, err, cost_ms = self._run_with_timeout(task, remaining_seconds, task_name)
             total_cost_ms += cost_ms
@@ -2924,7 +3154,7 @@ class DataFetcherManager:
             bundle_payload, bundle_err, bundle_ms = {}, "fundamental stage timeout", 0
         else:
             bundle_payload, bundle_err, bundle_ms = self._run_with_retry(
-                lambda: self._yfinance_fundamental_adapter.get_fundamental_bundle(stock_code),
+                lambda: self._call_adapter_method(YFINANCE_DATA_SOURCE, self._yfinance_fundamental_adapter.get_fundamental_bundle, stock_code),
                 bundle_timeout,
                 "fundamental_bundle_yfinance",
             )
@@ -3003,7 +3233,7 @@ class DataFetcherManager:
                 inst_timeout = max(stage_timeout - (time.time() - start_ts), 0.0)
                 if inst_timeout > 0:
                     tw_record, inst_err, _inst_ms = self._run_with_retry(
-                        lambda: fetcher.get_institutional_net(stock_code),
+                        lambda: self._call_fetcher_method(fetcher, 'get_institutional_net', stock_code),
                         inst_timeout,
                         "fundamental_tw_institution",
                     )
@@ -3162,7 +3392,6 @@ class DataFetcherManager:
                     if age <= cache_ttl:
                         return cache_item.get("context", {})
 
-        remaining_seconds = stage_timeout
         result_ctx: Dict[str, Any] = {
             "market": market,
             "valuation": {},
@@ -3179,20 +3408,61 @@ class DataFetcherManager:
 
         start_ts = time.time()
 
-        def _consume_budget(consumed_ms: int) -> None:
-            nonlocal remaining_seconds
-            remaining_seconds = max(0.0, remaining_seconds - consumed_ms / 1000.0)
+        # 各 block 互不依赖，同时启动并共享同一阶段预算：阶段耗时约为最慢 block，
+        # 而不是各 block 之和。上游调用仍经由有界的基本面超时执行器。
+        block_timeout = min(fetch_timeout, stage_timeout)
+        block_pool = get_fundamental_block_pool()
+        block_deadline = time.monotonic() + block_timeout
+        block_tokens: Dict[Future, CancelToken] = {}
+
+        def _submit_block(func: Callable[..., Any], *args: Any, **kwargs: Any) -> Future:
+            token = CancelToken()
+            future = block_pool.submit(
+                contextvars.copy_context().run, run_with_cancel_token, token, func, *args, **kwargs
+            )
+            block_tokens[future] = token
+            return future
 
-        valuation_timeout = min(fetch_timeout, remaining_seconds)
-        if valuation_timeout > 0:
-            quote_payload, valuation_err, valuation_ms = self._run_with_retry(
+        def _collect_block(future: Optional[Future], fallback: Any) -> Any:
+            if future is None:
+                return fallback
+            try:
+                return future.result(timeout=max(0.0, block_deadline - time.monotonic()))
+            except FuturesTimeoutError:
+                # 超过阶段预算：未开始的 block 直接取消，运行中的通过令牌通知其提前退出
+                future.cancel()
+                block_tokens[future].cancel()
+                logger.warning(f"[基本面] {stock_code} block 超时，已放弃")
+                return fallback
+            except Exception as exc:
+                logger.warning(f"[基本面] {stock_code} block 调度失败: {exc}")
+                return fallback
+
+        if block_timeout > 0:
+            valuation_future = _submit_block(
+                self._run_with_retry,
                 lambda: self.get_realtime_quote(stock_code),
-                valuation_timeout,
+                block_timeout,
                 "fundamental_valuation",
             )
-            _consume_budget(valuation_ms)
+            bundle_future = _submit_block(
+                self._run_with_retry,
+                lambda: self._call_adapter_method(AKSHARE_DATA_SOURCE, self._fundamental_adapter.get_fundamental_bundle, stock_code),
+                block_timeout,
+                "fundamental_bundle",
+            )
         else:
-            quote_payload, valuation_err, valuation_ms = None, "fundamental stage timeout", 0
+            valuation_future = bundle_future = None
+        capital_flow_future = dragon_tiger_future = boards_future = None
+        if not is_etf:
+            capital_flow_future = _submit_block(self.get_capital_flow_context, stock_code, budget_seconds=block_timeout)
+            dragon_tiger_future = _submit_block(self.get_dragon_tiger_context, stock_code, budget_seconds=block_timeout)
+            boards_future = _submit_block(self.get_board_context, stock_code, budget_seconds=block_timeout)
+
+        quote_payload, valuation_err, valuation_ms = _collect_block(
+            valuation_future,
+            (None, "fundamental stage timeout", 0),
+        )
 
         valuation_payload = {
             "pe_ratio": getattr(quote_payload, "pe_ratio", None) if quote_payload else None,
@@ -3219,19 +3489,16 @@ class DataFetcherManager:
         )
 
         # growth / earnings / institution (one AkShare call)
-        if remaining_seconds <= 0:
+        if bundle_future is None:
             bundle_status = "failed"
             bundle_payload: Dict[str, Any] = {}
             bundle_errors = ["fundamental stage timeout"]
             bundle_ms = 0
         else:
-            bundle_timeout = min(fetch_timeout, remaining_seconds)
-            bundle_payload, bundle_err_msg, bundle_ms = self._run_with_retry(
-                lambda: self._fundamental_adapter.get_fundamental_bundle(stock_code),
-                bundle_timeout,
-                "fundamental_bundle",
+            bundle_payload, bundle_err_msg, bundle_ms = _collect_block(
+                bundle_future,
+                (None, "fundamental_bundle timeout", 0),
             )
-            _consume_budget(bundle_ms)
             if not isinstance(bundle_payload, dict):
                 bundle_status = "failed"
                 bundle_payload = {}
@@ -3355,26 +3622,20 @@ class DataFetcherManager:
             )
             result_ctx["status"] = "partial"
         else:
-            capital_flow_budget = min(fetch_timeout, remaining_seconds)
-            capital_flow_start = time.time()
-            result_ctx["capital_flow"] = self.get_capital_flow_context(
-                stock_code,
-                budget_seconds=capital_flow_budget,
-            )
-            _consume_budget(int((time.time() - capital_flow_start) * 1000))
-
-            dragon_tiger_budget = min(fetch_timeout, remaining_seconds)
-            dragon_tiger_start = time.time()
-            result_ctx["dragon_tiger"] = self.get_dragon_tiger_context(
-                stock_code,
-                budget_seconds=dragon_tiger_budget,
-            )
-            _consume_budget(int((time.time() - dragon_tiger_start) * 1000))
-
-            result_ctx["boards"] = self.get_board_context(
-                stock_code,
-                budget_seconds=min(fetch_timeout, remaining_seconds),
-            )
+            for block, future in (
+                ("capital_flow", capital_flow_future),
+                ("dragon_tiger", dragon_tiger_future),
+                ("boards", boards_future),
+            ):
+                result_ctx[block] = _collect_block(
+                    future,
+                    self._build_fundamental_block(
+                        "failed",
+                        {},
+                        [{"provider": "fundamental_pipeline", "result": "failed", "duration_ms": 0}],
+                        [f"{block} timeout"],
+                    ),
+                )
 
         block_statuses = {
             "valuation": result_ctx["valuation"].get("status", "not_supported"),
@@ -3443,7 +3704,7 @@ class DataFetcherManager:
                 ["fundamental stage timeout"],
             )
         payload, err, cost_ms = self._run_with_retry(
-            lambda: self._fundamental_adapter.get_capital_flow(stock_code),
+            lambda: self._call_adapter_method(AKSHARE_DATA_SOURCE, self._fundamental_adapter.get_capital_flow, stock_code),
             timeout,
             "capital_flow",
         )
@@ -3507,7 +3768,7 @@ class DataFetcherManager:
                 ["fundamental stage timeout"],
             )
         payload, err, cost_ms = self._run_with_retry(
-            lambda: self._fundamental_adapter.get_dragon_tiger_flag(stock_code),
+            lambda: self._call_adapter_method(AKSHARE_DATA_SOURCE, self._fundamental_adapter.get_dragon_tiger_flag, stock_code),
             timeout,
             "dragon_tiger",
         )
@@ -3607,7 +3868,7 @@ class DataFetcherManager:
 
                 start = time.time()
                 try:
-                    data = fetcher.get_sector_rankings(n)
+                    data = self._call_fetcher_method(fetcher, 'get_sector_rankings', n)
                     duration_ms = int((time.time() - start) * 1000)
                     if data and data[0] is not None and data[1] is not None:
                         source_chain.append(
@@ -3685,7 +3946,7 @@ class DataFetcherManager:
             bottom: List[Dict] = []
             for fetcher in self._get_fetchers_snapshot():
                 try:
-                    data = fetcher.get_concept_rankings(normalized_n)
+                    data = self._call_fetcher_method(fetcher, 'get_concept_rankings', normalized_n)
                     if data and (data[0] or data[1]):
                         top = data[0] or []
                         bottom = data[1] or []
@@ -3719,7 +3980,7 @@ class DataFetcherManager:
         last_error = ""
         for fetcher in self._fetchers:
             try:
-                data = fetcher.get_hot_stocks(n)
+                data = self._call_fetcher_method(fetcher, 'get_hot_stocks', n)
                 if data:
                     logger.info(f"[{fetcher.name}] 获取人气股成功")
                     return data[:n]
@@ -3741,7 +4002,7 @@ class DataFetcherManager:
         last_error = ""
         for fetcher in self._fetchers:
             try:
-                data = fetcher.get_limit_up_pool(date=date, n=n)
+                data = self._call_fetcher_method(fetcher, 'get_limit_up_pool', date=date, n=n)
                 if data:
                     logger.info(f"[{fetcher.name}] 获取涨停池成功")
                     return data[:n]
@@ -3753,3 +4014,60 @@ class DataFetcherManager:
         if last_error:
             logger.warning(f"[涨停池] 所有数据源均失败，最终错误: {last_error}")
         return []
+
+
+# 影响默认数据源组成与优先级的配置项；这些值不变时共享管理器可继续复用
+_FETCHER_MANAGER_CONFIG_FIELDS = (
+    "tushare_token",
+    "tickflow_api_key",
+    "tickflow_kline_adjust",
+    "tickflow_batch_daily_enabled",
+    "tickflow_batch_size",
+    "tickflow_priority",
+    "longbridge_app_key",
+    "longbridge_app_secret",
+    "longbridge_access_token",
+    "longbridge_oauth_client_id",
+    "finnhub_api_key",
+    "alphavantage_api_key",
+    "enable_eastmoney_patch",
+)
+_shared_fetcher_manager: Optional[DataFetcherManager] = None
+_shared_fetcher_manager_key: Optional[Tuple[Any, ...]] = None
+_shared_fetcher_manager_lock = RLock()
+
+
+def _fetcher_manager_key() -> Tuple[Any, ...]:
+    from src.config import get_config
+
+    config = get_config()
+    return (DataFetcherManager,) + tuple(
+        getattr(config, field_name, None) for field_name in _FETCHER_MANAGER_CONFIG_FIELDS
+    )
+
+
+def get_fetcher_manager() -> DataFetcherManager:
+    """
+    返回进程级共享的 DataFetcherManager
+
+    各调用方共享同一组数据源实例的实时行情缓存、熔断状态与连接会话；
+    仅当数据源相关配置变化时才重建。需要并行绕开单实例调用锁的场景
+    （如持仓逐只取价）仍应自行创建管理器。
+    """
+    global _shared_fetcher_manager, _shared_fetcher_manager_key
+    key = _fetcher_manager_key()
+    with _shared_fetcher_manager_lock:
+        if _shared_fetcher_manager is None or _shared_fetcher_manager_key != key:
+            if _shared_fetcher_manager is not None:
+                logger.info("[数据源初始化] 数据源配置已变化，重建共享 DataFetcherManager")
+            _shared_fetcher_manager = DataFetcherManager()
+            _shared_fetcher_manager_key = key
+        return _shared_fetcher_manager
+
+
+def reset_fetcher_manager() -> None:
+    """丢弃共享的 DataFetcherManager，下次调用 get_fetcher_manager 时重建。"""
+    global _shared_fetcher_manager, _shared_fetcher_manager_key
+    with _shared_fetcher_manager_lock:
+        _shared_fetcher_manager = None
+        _shared_fetcher_manager_key = None
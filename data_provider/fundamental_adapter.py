@@ -15,6 +15,8 @@ from typing import Any, Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from .timeout_executor import cancellation_requested
+
 logger = logging.getLogger(__name__)
 
 _DIVIDEND_KEYWORD_MAP: Dict[str, List[str]] = {
@@ -275,6 +277,10 @@ class AkshareFundamentalAdapter:
             return None, None, [f"import_akshare:{type(exc).__name__}"]
 
         for func_name, kwargs in candidates:
+            if cancellation_requested():
+                # 调用方已超时放弃，不再继续请求后续候选接口
+                errors.append("cancelled")
+                break
             fn = getattr(ak, func_name, None)
             if fn is None:
                 continue
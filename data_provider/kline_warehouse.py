@@ -0,0 +1,474 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+本地日线列式仓库
+===================================
+
+把已收盘的日线按 ``market/year`` 分区保存为 NumPy 列文件（``.npy``），读取时
+``mmap`` 映射，按股票集合与日期区间切片时直接返回映射数组的视图。
+
+布局::
+
+    <root>/index.json                  分区索引（段列表、行数、最小/最大日期）与覆盖区间
+    <root>/<market>/<year>/<segment>/  code.npy date.npy source.npy open.npy ... meta.json
+
+- 每个段按 ``(code, date)`` 排序且写入后不可变；增量追加只新增一个小段，
+  同一 ``(code, date)`` 以较新的段为准。追加后只把尾部与新段规模相当的小段合并
+  （分层合并，每行只会被重写对数次），段数仍超过 ``MAX_SEGMENTS`` 时才合并为一个基础段。
+- ``index.json`` 的 ``coverage`` 记录每只股票已从数据源完整拉取过的日期区间及来源，
+  只有落在该区间内、且来源一致的行才会被读出。
+- 只保存早于今天的交易日，盘中未收盘的 K 线不会入库。
+- 写入由进程内锁与 ``flock`` 串行化；读取不加锁，通过不可变段与原子替换的索引保持一致，
+  若读到的段恰好被合并删除，则重新加载索引后重试。
+
+未安装 pyarrow，因此没有使用 Parquet/Arrow IPC；``.npy`` 同样是定长列式、
+可零拷贝内存映射的格式。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - Windows fallback
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+KLINE_FIELDS = ('open', 'high', 'low', 'close', 'volume', 'amount', 'pct_chg')
+INDEX_VERSION = 1
+READ_ATTEMPTS = 3
+
+
+@dataclass(frozen=True)
+class KlineCoverage:
+    """某只股票已完整拉取的日期区间。"""
+
+    start: date
+    end: date
+    source: str
+
+
+@dataclass(frozen=True)
+class KlineSlice:
+    """单只股票的日线切片；单个分区内的切片是内存映射数组的视图。"""
+
+    code: str
+    dates: np.ndarray
+    values: Dict[str, np.ndarray]
+
+    def __len__(self) -> int:
+        return len(self.dates)
+
+    def frame(self) -> pd.DataFrame:
+        df = pd.DataFrame({'date': pd.to_datetime(self.dates)})
+        for field in KLINE_FIELDS:
+            df[field] = np.asarray(self.values[field], dtype=float)
+        df['code'] = self.code
+        return df
+
+
+class KlineWarehouse:
+    """按 market/year 分区的本地日线仓库。"""
+
+    MAX_SEGMENTS = 16
+
+    _instances: Dict[str, "KlineWarehouse"] = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, root: str | Path):
+        self.root = Path(root).resolve()
+        self._lock = threading.RLock()
+        self._segments: Dict[str, Dict[str, np.ndarray]] = {}
+        self._index: Optional[dict] = None
+        self._index_mtime: Optional[int] = None
+
+    @classmethod
+    def open(cls, root: str | Path) -> "KlineWarehouse":
+        """返回同一目录共享的仓库实例（段映射缓存按目录复用）。"""
+        key = str(Path(root).resolve())
+        with cls._instances_lock:
+            instance = cls._instances.get(key)
+            if instance is None:
+                instance = cls._instances[key] = cls(key)
+            return instance
+
+    # ------------------------------------------------------------------
+    # 读取
+    # ------------------------------------------------------------------
+    def coverage(self, market: str, code: str) -> Optional[KlineCoverage]:
+        item = self._load_index()['coverage'].get(market, {}).get(code)
+        if not item:
+            return None
+        return KlineCoverage(date.fromisoformat(item[0]), date.fromisoformat(item[1]), item[2])
+
+    def partitions(self) -> Dict[str, dict]:
+        """分区索引：``{"cn/2024": {"rows", "minDate", "maxDate", "segments"}}``。"""
+        return {key: dict(value) for key, value in self._load_index()['partitions'].items()}
+
+    def read(
+        self,
+        market: str,
+        codes: Iterable[str],
+        start: date,
+        end: date,
+    ) -> Dict[str, KlineSlice]:
+        """按股票集合与日期区间切片，仅返回覆盖区间内、来源一致的行。"""
+        codes = list(dict.fromkeys(codes))
+        for attempt in range(READ_ATTEMPTS):
+            index = self._load_index(force=attempt > 0)
+            try:
+                return self._read_index(index, market, codes, start, end)
+            except FileNotFoundError:
+                # 索引列出的段刚被并发的合并删除：重新加载索引后重试
+                if attempt == READ_ATTEMPTS - 1:
+                    raise
+                logger.debug("K 线仓库段已被合并，重新加载索引: %s", self.root)
+        return {}
+
+    def frame(self, market: str, code: str, start: date, end: date) -> Optional[pd.DataFrame]:
+        sliced = self.read(market, [code], start, end).get(code)
+        return None if sliced is None else sliced.frame()
+
+    def _read_index(
+        self,
+        index: dict,
+        market: str,
+        codes: List[str],
+        start: date,
+        end: date,
+    ) -> Dict[str, KlineSlice]:
+        coverage = index['coverage'].get(market, {})
+        result: Dict[str, KlineSlice] = {}
+        for code in codes:
+            item = coverage.get(code)
+            if not item:
+                continue
+            low = max(start, date.fromisoformat(item[0]))
+            high = min(end, date.fromisoformat(item[1]))
+            if low > high:
+                continue
+            pieces = []
+            for year in range(low.year, high.year + 1):
+                partition = index['partitions'].get(f"{market}/{year}")
+                if partition:
+                    pieces.extend(self._partition_pieces(partition['segments'], code, item[2], low, high))
+            merged = self._merge_pieces(code, pieces)
+            if merged is not None:
+                result[code] = merged
+        return result
+
+    # ------------------------------------------------------------------
+    # 写入
+    # ------------------------------------------------------------------
+    def write(
+        self,
+        market: str,
+        code: str,
+        df: pd.DataFrame,
+        *,
+        source: str,
+        start: date,
+        end: date,
+    ) -> int:
+        """追加一次完整拉取 ``[start, end]`` 的结果并扩展覆盖区间。
+
+        只保存 ``end`` 与昨天中较早者之前的行；覆盖区间与已有区间相连且来源相同时取并集，
+        否则以本次区间替换（旧来源的行不再可读，合并时清理）。
+
+        Returns:
+            写入的行数
+        """
+        end = min(end, date.today() - timedelta(days=1))
+        if df is None or df.empty or start > end or 'date' not in df.columns:
+            return 0
+        dates = pd.to_datetime(df['date']).to_numpy(dtype='datetime64[D]')
+        keep = (dates >= np.datetime64(start)) & (dates <= np.datetime64(end))
+        if not keep.any():
+            return 0
+        rows = pd.DataFrame({'date': dates[keep]})
+        for field in KLINE_FIELDS:
+            rows[field] = pd.to_numeric(df[field], errors='coerce').to_numpy(dtype=float)[keep] if field in df else np.nan
+        rows = rows.drop_duplicates(subset='date', keep='last').sort_values('date')
+
+        with self._write_lock():
+            index = self._load_index(force=True)
+            # 先扩展覆盖区间：合并时按覆盖区间的来源筛选行，新写入的行必须可见
+            self._extend_coverage(index, market, code, start, end, source)
+            for year, part in rows.groupby(rows['date'].dt.year):
+                key = f"{market}/{int(year)}"
+                partition = index['partitions'].setdefault(key, {'segments': [], 'rows': 0, 'minDate': None, 'maxDate': None})
+                segment = self._write_segment(
+                    market,
+                    int(year),
+                    codes=np.full(len(part), code),
+                    dates=part['date'].to_numpy(dtype='datetime64[D]'),
+                    sources=np.zeros(len(part), dtype=np.int16),
+                    source_names=[source],
+                    values={field: part[field].to_numpy(dtype=float) for field in KLINE_FIELDS},
+                )
+                partition['segments'].append(segment)
+                self._merge_tail(index, market, key)
+                if len(partition['segments']) > self.MAX_SEGMENTS:
+                    self._compact_partition(index, market, key)
+            self._save_index(index)
+        return len(rows)
+
+    def invalidate(self, market: str, code: str) -> None:
+        """丢弃某只股票的覆盖区间（例如复权口径变化后），旧行在合并时清理。"""
+        with self._write_lock():
+            index = self._load_index(force=True)
+            if index['coverage'].get(market, {}).pop(code, None) is not None:
+                self._save_index(index)
+
+    def compact(self, market: Optional[str] = None) -> None:
+        """把每个分区的所有段合并为一个基础段。"""
+        with self._write_lock():
+            index = self._load_index(force=True)
+            for key in list(index['partitions']):
+                if market is None or key.split('/', 1)[0] == market:
+                    self._compact_partition(index, key.split('/', 1)[0], key)
+            self._save_index(index)
+
+    # ------------------------------------------------------------------
+    # 内部实现
+    # ------------------------------------------------------------------
+    def _partition_pieces(
+        self,
+        segments: List[str],
+        code: str,
+        source: str,
+        low: date,
+        high: date,
+    ) -> List[Tuple[int, np.ndarray, Dict[str, np.ndarray]]]:
+        pieces = []
+        for order, name in enumerate(segments):
+            segment = self._segment(name)
+            left = int(np.searchsorted(segment['code'], code, side='left'))
+            right = int(np.searchsorted(segment['code'], code, side='right'))
+            if left == right:
+                continue
+            dates = segment['date'][left:right]
+            lo = left + int(np.searchsorted(dates, np.datetime64(low), side='left'))
+            hi = left + int(np.searchsorted(dates, np.datetime64(high), side='right'))
+            if lo == hi:
+                continue
+            source_id = segment['source_names'].index(source) if source in segment['source_names'] else -1
+            if source_id < 0:
+                continue
+            selected = slice(lo, hi)
+            source_ids = segment['source'][selected]
+            if not (source_ids == source_id).all():
+                selected = np.flatnonzero(segment['source'][lo:hi] == source_id) + lo
+                if not len(selected):
+                    continue
+            pieces.append((order, segment['date'][selected], {field: segment[field][selected] for field in KLINE_FIELDS}))
+        return pieces
+
+    @staticmethod
+    def _merge_pieces(code: str, pieces: List[Tuple[int, np.ndarray, Dict[str, np.ndarray]]]) -> Optional[KlineSlice]:
+        if not pieces:
+            return None
+        if len(pieces) == 1:
+            _order, dates, values = pieces[0]
+            return KlineSlice(code=code, dates=dates, values=values)
+        # 多段/跨年：按日期拼接，同一日期保留较新段
+        dates = np.concatenate([piece[1] for piece in pieces])
+        orders = np.concatenate([np.full(len(piece[1]), piece[0]) for piece in pieces])
+        position = np.lexsort((orders, dates))
+        dates = dates[position]
+        last = np.append(dates[1:] != dates[:-1], True)
+        chosen = position[last]
+        values = {
+            field: np.concatenate([piece[2][field] for piece in pieces])[chosen]
+            for field in KLINE_FIELDS
+        }
+        return KlineSlice(code=code, dates=dates[last], values=values)
+
+    def _segment(self, name: str) -> Dict[str, np.ndarray]:
+        segment = self._segments.get(name)
+        if segment is None:
+            directory = self.root / name
+            segment = {
+                column: np.load(directory / f"{column}.npy", mmap_mode='r')
+                for column in ('code', 'date', 'source', *KLINE_FIELDS)
+            }
+            segment['source_names'] = json.loads((directory / 'meta.json').read_text(encoding='utf-8'))['sources']
+            self._segments[name] = segment
+        return segment
+
+    def _write_segment(
+        self,
+        market: str,
+        year: int,
+        *,
+        codes: np.ndarray,
+        dates: np.ndarray,
+        sources: np.ndarray,
+        source_names: List[str],
+        values: Dict[str, np.ndarray],
+    ) -> str:
+        order = np.lexsort((dates, codes))
+        name = f"{market}/{year}/{uuid.uuid4().hex}"
+        staging = self.root / market / str(year) / f".{uuid.uuid4().hex}.tmp"
+        staging.mkdir(parents=True)
+        width = max(1, max((len(str(item)) for item in codes), default=1))
+        np.save(staging / 'code.npy', np.asarray(codes, dtype=f'<U{width}')[order])
+        np.save(staging / 'date.npy', np.asarray(dates, dtype='datetime64[D]')[order])
+        np.save(staging / 'source.npy', np.asarray(sources, dtype=np.int16)[order])
+        for field in KLINE_FIELDS:
+            np.save(staging / f"{field}.npy", np.asarray(values[field], dtype=float)[order])
+        (staging / 'meta.json').write_text(
+            json.dumps({'rows': int(len(order)), 'sources': source_names}, ensure_ascii=False),
+            encoding='utf-8',
+        )
+        staging.rename(self.root / name)
+        return name
+
+    def _merge_tail(self, index: dict, market: str, key: str) -> None:
+        """把尾部与新段规模相当的段合并：较早的段超过尾部行数两倍时停止。"""
+        segments = index['partitions'][key]['segments']
+        first = len(segments) - 1
+        tail_rows = self._segment_rows(segments[first])
+        while first > 0 and self._segment_rows(segments[first - 1]) <= 2 * tail_rows:
+            first -= 1
+            tail_rows += self._segment_rows(segments[first])
+        if first < len(segments) - 1:
+            self._compact_partition(index, market, key, first=first)
+        else:
+            self._refresh_partition_stats(index['partitions'][key])
+
+    def _segment_rows(self, name: str) -> int:
+        return len(self._segment(name)['date'])
+
+    def _compact_partition(self, index: dict, market: str, key: str, first: int = 0) -> None:
+        """把分区中 ``first`` 起的段合并为一个段（默认整个分区），丢弃来源与覆盖区间不符的行。"""
+        partition = index['partitions'][key]
+        coverage = index['coverage'].get(market, {})
+        codes, dates, orders, source_labels = [], [], [], []
+        values: Dict[str, list] = {field: [] for field in KLINE_FIELDS}
+        for order, name in enumerate(partition['segments'][first:]):
+            segment = self._segment(name)
+            labels = np.asarray(segment['source_names'], dtype=object)[np.asarray(segment['source'])]
+            wanted = np.asarray([(coverage.get(code) or [None, None, None])[2] for code in segment['code']], dtype=object)
+            keep = labels == wanted
+            codes.append(np.asarray(segment['code'])[keep])
+            dates.append(np.asarray(segment['date'])[keep])
+            orders.append(np.full(int(keep.sum()), order))
+            source_labels.append(labels[keep])
+            for field in KLINE_FIELDS:
+                values[field].append(np.asarray(segment[field])[keep])
+        all_codes = np.concatenate(codes) if codes else np.array([], dtype='<U1')
+        all_dates = np.concatenate(dates) if dates else np.array([], dtype='datetime64[D]')
+        all_orders = np.concatenate(orders) if orders else np.array([], dtype=int)
+        all_labels = np.concatenate(source_labels) if source_labels else np.array([], dtype=object)
+        position = np.lexsort((all_orders, all_dates, all_codes))
+        sorted_codes, sorted_dates = all_codes[position], all_dates[position]
+        last = np.append((sorted_codes[1:] != sorted_codes[:-1]) | (sorted_dates[1:] != sorted_dates[:-1]), True)
+        chosen = position[last]
+        source_names = sorted({str(label) for label in all_labels[chosen]})
+        source_ids = np.asarray([source_names.index(str(label)) for label in all_labels[chosen]], dtype=np.int16)
+        old_segments = list(partition['segments'][first:])
+        partition['segments'] = partition['segments'][:first]
+        if len(chosen):
+            year = int(key.split('/', 1)[1])
+            partition['segments'].append(self._write_segment(
+                market,
+                year,
+                codes=all_codes[chosen],
+                dates=all_dates[chosen],
+                sources=source_ids,
+                source_names=source_names,
+                values={field: np.concatenate(values[field])[chosen] for field in KLINE_FIELDS},
+            ))
+        self._refresh_partition_stats(partition)
+        for name in old_segments:
+            self._segments.pop(name, None)
+            # 已映射的读者在 POSIX 上仍持有文件，可直接删除目录
+            shutil.rmtree(self.root / name, ignore_errors=True)
+
+    def _refresh_partition_stats(self, partition: dict) -> None:
+        rows, low, high = 0, None, None
+        for name in partition['segments']:
+            segment = self._segment(name)
+            if not len(segment['date']):
+                continue
+            rows += len(segment['date'])
+            first, last = segment['date'].min(), segment['date'].max()
+            low = first if low is None or first < low else low
+            high = last if high is None or last > high else high
+        partition['rows'] = rows
+        partition['minDate'] = None if low is None else str(low)
+        partition['maxDate'] = None if high is None else str(high)
+
+    @staticmethod
+    def _extend_coverage(index: dict, market: str, code: str, start: date, end: date, source: str) -> None:
+        coverage = index['coverage'].setdefault(market, {})
+        item = coverage.get(code)
+        if item and item[2] == source:
+            current_start, current_end = date.fromisoformat(item[0]), date.fromisoformat(item[1])
+            # 区间相连（允许中间是休市日）时取并集
+            if start <= current_end + timedelta(days=7) and end >= current_start - timedelta(days=7):
+                start, end = min(start, current_start), max(end, current_end)
+        coverage[code] = [start.isoformat(), end.isoformat(), source]
+
+    def _load_index(self, force: bool = False) -> dict:
+        path = self.root / 'index.json'
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            mtime = None
+        with self._lock:
+            if force or self._index is None or mtime != self._index_mtime:
+                index = {'version': INDEX_VERSION, 'partitions': {}, 'coverage': {}}
+                if mtime is not None:
+                    try:
+                        loaded = json.loads(path.read_text(encoding='utf-8'))
+                        if loaded.get('version') == INDEX_VERSION:
+                            index = loaded
+                    except (OSError, ValueError):
+                        logger.warning("K 线仓库索引损坏，按空仓库处理: %s", path)
+                self._index, self._index_mtime = index, mtime
+                self._prune_segment_cache(index)
+            return self._index
+
+    def _prune_segment_cache(self, index: dict) -> None:
+        """丢弃其它进程合并后已不在索引中的段映射。"""
+        live = {name for partition in index['partitions'].values() for name in partition['segments']}
+        for name in [name for name in list(self._segments) if name not in live]:
+            self._segments.pop(name, None)
+
+    def _save_index(self, index: dict) -> None:
+        path = self.root / 'index.json'
+        temporary = path.with_name(f".index.{uuid.uuid4().hex}.tmp")
+        temporary.write_text(json.dumps(index, ensure_ascii=False, sort_keys=True), encoding='utf-8')
+        temporary.replace(path)
+        with self._lock:
+            self._index, self._index_mtime = index, path.stat().st_mtime_ns
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        with self._lock:
+            self.root.mkdir(parents=True, exist_ok=True)
+            if fcntl is None:  # pragma: no cover - exercised only on platforms without fcntl
+                yield
+                return
+            with open(self.root / '.lock', 'a+', encoding='utf-8') as handle:
+                fcntl.flock(handle.fileno(), fcntl.LOCK_EX)
+                try:
+                    yield
+                finally:
+                    fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
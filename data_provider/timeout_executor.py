@@ -0,0 +1,207 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+基本面阶段超时执行器
+===================================
+
+进程级常驻、有界的线程池，替代每个任务新建守护线程的做法：
+1. 任务携带协作式取消令牌；超时后令牌被置位，尚未开始的任务直接丢弃，
+   运行中的任务可在上游调用之间通过 ``cancellation_requested()`` 提前退出
+2. 队列有上限，超过时立即返回 "timeout worker pool exhausted"
+3. 统计 queued / running / abandoned 以及每个 block 的 p50/p95 耗时
+"""
+
+import contextvars
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError as FuturesTimeoutError
+from typing import Any, Callable, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LATENCY_SAMPLES_PER_BLOCK = 256
+
+
+class CancelToken:
+    """协作式取消令牌：任务在上游调用之间检查，超时后尽早退出。
+
+    ``parent`` 为外层任务的令牌：外层被放弃时，其下提交的子任务同样视为已取消。
+    """
+
+    __slots__ = ("_event", "_parent")
+
+    def __init__(self, parent: Optional["CancelToken"] = None) -> None:
+        self._event = threading.Event()
+        self._parent = parent
+
+    def cancel(self) -> None:
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self._parent is not None and self._parent.cancelled)
+
+
+_current_cancel_token: contextvars.ContextVar[Optional[CancelToken]] = contextvars.ContextVar(
+    "fundamental_cancel_token",
+    default=None,
+)
+
+
+def cancellation_requested() -> bool:
+    """当前任务的调用方是否已超时放弃（不在超时执行器内时恒为 False）。"""
+    token = _current_cancel_token.get()
+    return token is not None and token.cancelled
+
+
+def run_with_cancel_token(token: CancelToken, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """在绑定 ``token`` 的上下文中执行 func，供自行提交到线程池的编排任务使用。"""
+    reset = _current_cancel_token.set(token)
+    try:
+        return func(*args, **kwargs)
+    finally:
+        _current_cancel_token.reset(reset)
+
+
+def _percentile(samples: Deque[int], ratio: float) -> Optional[int]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(ratio * (len(ordered) - 1)))))
+    return ordered[index]
+
+
+class TimeoutExecutor:
+    """有界常驻线程池，按 task_name（block）统计排队、运行、放弃与耗时。"""
+
+    def __init__(self, max_workers: int = 8, max_queue: int = 64, thread_name_prefix: str = "fundamental"):
+        self._max_workers = max(1, int(max_workers))
+        self._max_queue = max(0, int(max_queue))
+        self._executor = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix=thread_name_prefix)
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._abandoned = 0
+        self._rejected = 0
+        self._latencies: Dict[str, Deque[int]] = {}
+
+    def run(
+        self,
+        task: Callable[[], Any],
+        timeout_seconds: float,
+        task_name: str,
+    ) -> Tuple[Optional[Any], Optional[str], int]:
+        """
+        在常驻线程池中执行任务并等待至多 timeout_seconds。
+
+        Returns:
+            (result, error, duration_ms)
+        """
+        start = time.time()
+        with self._lock:
+            if self._queued + self._running >= self._max_workers + self._max_queue:
+                self._rejected += 1
+                return None, f"{task_name} timeout worker pool exhausted", int(timeout_seconds * 1000)
+            self._queued += 1
+
+        token = CancelToken(parent=_current_cancel_token.get())
+        context = contextvars.copy_context()
+        state = {"started": False}
+
+        def runner() -> Any:
+            with self._lock:
+                if token.cancelled:
+                    self._queued -= 1
+                    return None
+                self._queued -= 1
+                self._running += 1
+                state["started"] = True
+            run_started = time.time()
+            reset = _current_cancel_token.set(token)
+            try:
+                return task()
+            finally:
+                _current_cancel_token.reset(reset)
+                with self._lock:
+                    self._running -= 1
+                    if not token.cancelled:
+                        samples = self._latencies.setdefault(
+                            task_name, deque(maxlen=_LATENCY_SAMPLES_PER_BLOCK)
+                        )
+                        samples.append(int((time.time() - run_started) * 1000))
+
+        try:
+            future: Future = self._executor.submit(context.run, runner)
+        except Exception as exc:
+            with self._lock:
+                self._queued -= 1
+            return None, str(exc), int((time.time() - start) * 1000)
+
+        try:
+            result = future.result(timeout=timeout_seconds)
+        except FuturesTimeoutError:
+            with self._lock:
+                token.cancel()
+                if state["started"]:
+                    self._abandoned += 1
+            return None, f"{task_name} timeout", int(timeout_seconds * 1000)
+        except Exception as exc:
+            return None, str(exc), int((time.time() - start) * 1000)
+        return result, None, int((time.time() - start) * 1000)
+
+    def metrics(self) -> Dict[str, Any]:
+        """返回当前排队/运行/放弃计数与每个 block 的 p50/p95 耗时（毫秒）。"""
+        with self._lock:
+            return {
+                "max_workers": self._max_workers,
+                "max_queue": self._max_queue,
+                "queued": self._queued,
+                "running": self._running,
+                "abandoned": self._abandoned,
+                "rejected": self._rejected,
+                "latency_ms": {
+                    name: {
+                        "count": len(samples),
+                        "p50": _percentile(samples, 0.5),
+                        "p95": _percentile(samples, 0.95),
+                    }
+                    for name, samples in self._latencies.items()
+                },
+            }
+
+
+_fundamental_executor: Optional[TimeoutExecutor] = None
+_fundamental_executor_lock = threading.Lock()
+
+
+def get_fundamental_executor() -> TimeoutExecutor:
+    """进程级共享的基本面超时执行器。"""
+    global _fundamental_executor
+    if _fundamental_executor is None:
+        with _fundamental_executor_lock:
+            if _fundamental_executor is None:
+                _fundamental_executor = TimeoutExecutor()
+    return _fundamental_executor
+
+
+_fundamental_block_pool: Optional[ThreadPoolExecutor] = None
+
+
+def get_fundamental_block_pool() -> ThreadPoolExecutor:
+    """
+    进程级共享的 block 编排线程池。
+
+    get_fundamental_context 用它并行调度各 block；block 内部的上游调用仍提交到
+    get_fundamental_executor()，两者分开以免编排任务占满执行器造成互相等待。
+    """
+    global _fundamental_block_pool
+    if _fundamental_block_pool is None:
+        with _fundamental_executor_lock:
+            if _fundamental_block_pool is None:
+                _fundamental_block_pool = ThreadPoolExecutor(
+                    max_workers=16,
+                    thread_name_prefix="fundamental-block",
+                )
+    return _fundamental_block_pool
@@ -22,8 +22,8 @@ _MARKET_READ_POLICY = ToolPolicy.declared(
 
 def _get_fetcher_manager():
     """Lazy import to avoid circular deps."""
-    from data_provider import DataFetcherManager
-    return DataFetcherManager()
+    from data_provider import get_fetcher_manager
+    return get_fetcher_manager()
 
 
 # ============================================================
@@ -1164,10 +1164,18 @@ class Config:
     sqlite_busy_timeout_ms: int = 5000
     sqlite_write_retry_max: int = 3
     sqlite_write_retry_base_delay: float = 0.1
+    # LLM 用量遥测写入：async 由后台线程批量写入，sync 在调用线程内逐条写入
+    llm_usage_write_mode: str = "async"
+    llm_usage_flush_interval_ms: int = 500
+    llm_usage_batch_size: int = 200
+    llm_usage_queue_max: int = 10000
 
     # 是否保存分析上下文快照（用于历史回溯）
     save_context_snapshot: bool = True
 
+    # 本地日线 K 线仓库目录（按 market/year 分区的列式文件）；为空时不启用
+    kline_warehouse_dir: Optional[str] = None
+
     # === 回测配置 ===
     backtest_enabled: bool = True
     backtest_eval_window_days: int = 10
@@ -1181,6 +1189,8 @@ class Config:
     
     # === 系统配置 ===
     max_workers: int = 3  # 低并发防封禁
+    data_source_max_concurrency: int = 3  # 每个数据源（按 fetcher 名）同时进行的请求数
+    llm_max_concurrency: int = 4  # 每个 LLM 模型通道同时进行的分析调用数
     debug: bool = False
     http_proxy: Optional[str] = None  # HTTP 代理 (例如: http://127.0.0.1:10809)
     https_proxy: Optional[str] = None # HTTPS 代理
@@ -2119,7 +2129,31 @@ class Config:
                 field_name='SQLITE_WRITE_RETRY_BASE_DELAY',
                 minimum=0.0,
             ),
+            llm_usage_write_mode=(
+                'sync'
+                if (os.getenv('LLM_USAGE_WRITE_MODE') or '').strip().lower() == 'sync'
+                else 'async'
+            ),
+            llm_usage_flush_interval_ms=parse_env_int(
+                os.getenv('LLM_USAGE_FLUSH_INTERVAL_MS'),
+                500,
+                field_name='LLM_USAGE_FLUSH_INTERVAL_MS',
+                minimum=1,
+            ),
+            llm_usage_batch_size=parse_env_int(
+                os.getenv('LLM_USAGE_BATCH_SIZE'),
+                200,
+                field_name='LLM_USAGE_BATCH_SIZE',
+                minimum=1,
+            ),
+            llm_usage_queue_max=parse_env_int(
+                os.getenv('LLM_USAGE_QUEUE_MAX'),
+                10000,
+                field_name='LLM_USAGE_QUEUE_MAX',
+                minimum=1,
+            ),
             save_context_snapshot=os.getenv('SAVE_CONTEXT_SNAPSHOT', 'true').lower() == 'true',
+            kline_warehouse_dir=(os.getenv('KLINE_WAREHOUSE_DIR') or '').strip() or None,
             backtest_enabled=os.getenv('BACKTEST_ENABLED', 'true').lower() == 'true',
             backtest_eval_window_days=parse_env_int(os.getenv('BACKTEST_EVAL_WINDOW_DAYS'), 10, field_name='BACKTEST_EVAL_WINDOW_DAYS', minimum=1),
             backtest_min_age_days=parse_env_int(os.getenv('BACKTEST_MIN_AGE_DAYS'), 14, field_name='BACKTEST_MIN_AGE_DAYS', minimum=1),
@@ -2133,6 +2167,19 @@ class Config:
             log_dir=os.getenv('LOG_DIR', './logs'),
             log_level=os.getenv('LOG_LEVEL', 'INFO'),
             max_workers=parse_env_int(os.getenv('MAX_WORKERS'), 3, field_name='MAX_WORKERS', minimum=1),
+            data_source_max_concurrency=parse_env_int(
+                os.getenv('DATA_SOURCE_MAX_CONCURRENCY'),
+                3,
+                field_name='DATA_SOURCE_MAX_CONCURRENCY',
+                minimum=1,
+            ),
+            llm_max_concurrency=parse_env_int(
+                os.getenv('LLM_MAX_CONCURRENCY'),
+                4,
+                field_name='LLM_MAX_CONCURRENCY',
+                minimum=1,
+                maximum=32,
+            ),
             debug=os.getenv('DEBUG', 'false').lower() == 'true',
             config_validate_mode=os.getenv('CONFIG_VALIDATE_MODE', 'warn').lower(),
             http_proxy=os.getenv('HTTP_PROXY'),
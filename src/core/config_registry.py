@@ -76,6 +76,10 @@ WEB_SETTINGS_HIDDEN_FROM_UI = {
     "SQLITE_BUSY_TIMEOUT_MS",
     "SQLITE_WRITE_RETRY_MAX",
     "SQLITE_WRITE_RETRY_BASE_DELAY",
+    "LLM_USAGE_WRITE_MODE",
+    "LLM_USAGE_FLUSH_INTERVAL_MS",
+    "LLM_USAGE_BATCH_SIZE",
+    "LLM_USAGE_QUEUE_MAX",
     "USE_PROXY",
     "PROXY_HOST",
     "PROXY_PORT",
@@ -49,6 +49,7 @@ from src.report_language import (
     normalize_report_language,
 )
 from src.search_service import SearchService
+from src.core.stage_graph import StageGraph
 from src.analysis_context_pack_prompt import format_analysis_context_pack_prompt_section
 from src.analysis_context_pack_overview import render_analysis_context_pack_overview
 from src.market_phase_summary import MARKET_PHASE_SUMMARY_KEY, render_market_phase_summary
@@ -73,6 +74,11 @@ from src.services.analysis_context_builder import (
     PipelineAnalysisArtifacts,
 )
 from src.services.market_structure_service import MarketStructureService
+from src.services.concurrency_budget import (
+    budget_snapshot,
+    llm_slot,
+    resolve_analysis_worker_count,
+)
 from src.services.run_diagnostics import (
     activate_run_diagnostic_context,
     current_diagnostic_snapshot,
@@ -462,190 +468,118 @@ class StockAnalysisPipeline:
             # 获取股票名称（先走轻量名称路径，后续若 realtime_quote 有 name 再覆盖）
             stock_name = self.fetcher_manager.get_stock_name(code, allow_realtime=False)
 
-            # Step 1: 获取实时行情（量比、换手率等）- 使用统一入口，自动故障切换
-            realtime_quote = None
-            try:
-                if self.config.enable_realtime_quote:
-                    realtime_quote = self.fetcher_manager.get_realtime_quote(code, log_final_failure=False)
-                    if realtime_quote:
-                        # 使用实时行情返回的真实股票名称
-                        if realtime_quote.name:
-                            stock_name = realtime_quote.name
-                        # 兼容不同数据源的字段（有些数据源可能没有 volume_ratio）
-                        volume_ratio = getattr(realtime_quote, 'volume_ratio', None)
-                        turnover_rate = getattr(realtime_quote, 'turnover_rate', None)
-                        logger.info(f"{stock_name}({code}) 实时行情: 价格={realtime_quote.price}, "
-                                  f"量比={volume_ratio}, 换手率={turnover_rate}% "
-                                  f"(来源: {realtime_quote.source.value if hasattr(realtime_quote, 'source') else 'unknown'})")
-                    else:
-                        logger.warning(f"{stock_name}({code}) 所有实时行情数据源均不可用，已降级为历史收盘价继续分析")
-                else:
-                    logger.info(f"{stock_name}({code}) 实时行情已禁用，使用历史收盘价继续分析")
-            except Exception as e:
-                logger.warning(f"{stock_name}({code}) 实时行情链路异常，已降级为历史收盘价继续分析: {e}")
-
-            # 如果还是没有名称，使用代码作为名称
-            if not stock_name:
-                stock_name = f'股票{code}'
-
-            # Step 2: 获取筹码分布 - 使用统一入口，带熔断保护
-            chip_data = None
+            # Steps 1-4 只依赖股票代码（趋势、情报依赖实时行情），以 DAG 并发执行，
+            # 每个阶段沿用原有预算与降级逻辑，LLM 前的耗时由 sum(stage) 降为 max(stage)。
+            name_hint = stock_name
+            stages = StageGraph()
             try:
-                chip_data = self.fetcher_manager.get_chip_distribution(code)
-                if chip_data:
-                    logger.info(f"{stock_name}({code}) 筹码分布: 获利比例={chip_data.profit_ratio:.1%}, "
-                              f"90%集中度={chip_data.concentration_90:.2%}")
-                else:
-                    logger.debug(f"{stock_name}({code}) 筹码分布获取失败或已禁用")
-            except Exception as e:
-                logger.warning(f"{stock_name}({code}) 获取筹码分布失败: {e}")
-
-            # If agent mode is explicitly enabled, or specific agent skills are configured, use the Agent analysis pipeline.
-            # NOTE: use config.agent_mode (explicit opt-in) instead of
-            # config.is_agent_available() so that users who only configured an
-            # API Key for the traditional analysis path are not silently
-            # switched to Agent mode (which is slower and more expensive).
-            use_agent = getattr(self.config, 'agent_mode', False)
-            if not use_agent:
-                if self.analysis_skills:
-                    use_agent = True
-                    logger.info(f"{stock_name}({code}) Auto-enabled agent mode due to request skills: {self.analysis_skills}")
-            if not use_agent:
-                # Auto-enable agent mode when specific skills are configured (e.g., scheduled task with strategy)
-                configured_skills = getattr(self.config, 'agent_skills', [])
-                if configured_skills and configured_skills != ['all']:
-                    use_agent = True
-                    logger.info(f"{stock_name}({code}) Auto-enabled agent mode due to configured skills: {configured_skills}")
-
-            self._emit_progress(32, f"{stock_name}：正在聚合基本面与趋势数据")
-
-            # Step 2.5: 基本面能力聚合（统一入口，异常降级）
-            # - 失败时返回 partial/failed，不影响既有技术面/新闻链路
-            # - 关闭开关时仍返回 not_supported 结构
-            fundamental_context = None
-            try:
-                fundamental_context = self.fetcher_manager.get_fundamental_context(
-                    code,
-                    budget_seconds=getattr(
-                        self.config,
-                        'fundamental_stage_timeout_seconds',
-                        FUNDAMENTAL_STAGE_TIMEOUT_SECONDS_DEFAULT,
+                stages.add("realtime_quote", lambda: self._stage_realtime_quote(code, name_hint))
+                stages.add("chip_distribution", lambda: self._stage_chip_distribution(code, name_hint))
+                stages.add("fundamental_context", lambda: self._stage_fundamental_context(code, name_hint))
+                stages.add("historical_bars", lambda: self._stage_historical_bars(code))
+                stages.add(
+                    "trend_analysis",
+                    lambda: self._stage_trend_analysis(
+                        code,
+                        name_hint,
+                        stages.result("historical_bars"),
+                        stages.result("realtime_quote"),
                     ),
+                    after=("historical_bars", "realtime_quote"),
                 )
-            except Exception as e:
-                logger.warning(f"{stock_name}({code}) 基本面聚合失败: {e}")
-                fundamental_context = self.fetcher_manager.build_failed_fundamental_context(code, str(e))
 
-            fundamental_context = self._attach_belong_boards_to_fundamental_context(
-                code,
-                fundamental_context,
-            )
-            market_structure_context = self._build_market_structure_context(
-                code=code,
-                stock_name=stock_name,
-                market=market,
-                fundamental_context=fundamental_context,
-                trade_date=daily_market_target_date,
-                market_phase_summary=market_phase_summary,
-            )
+                # Step 1: 实时行情（量比、换手率等）
+                realtime_quote = stages.result("realtime_quote")
+                stock_name = self._resolve_stage_stock_name(code, stock_name, realtime_quote)
+
+                # If agent mode is explicitly enabled, or specific agent skills are configured, use the Agent analysis pipeline.
+                # NOTE: use config.agent_mode (explicit opt-in) instead of
+                # config.is_agent_available() so that users who only configured an
+                # API Key for the traditional analysis path are not silently
+                # switched to Agent mode (which is slower and more expensive).
+                use_agent = getattr(self.config, 'agent_mode', False)
+                if not use_agent:
+                    if self.analysis_skills:
+                        use_agent = True
+                        logger.info(f"{stock_name}({code}) Auto-enabled agent mode due to request skills: {self.analysis_skills}")
+                if not use_agent:
+                    # Auto-enable agent mode when specific skills are configured (e.g., scheduled task with strategy)
+                    configured_skills = getattr(self.config, 'agent_skills', [])
+                    if configured_skills and configured_skills != ['all']:
+                        use_agent = True
+                        logger.info(f"{stock_name}({code}) Auto-enabled agent mode due to configured skills: {configured_skills}")
+
+                if not use_agent:
+                    # 情报检索本就依赖实时行情，放在 Agent 判定之后提交不损失并发
+                    stages.add(
+                        "news_intel",
+                        lambda news_stock_name=stock_name: self._stage_news_intel(code, news_stock_name, query_id),
+                    )
 
-            # P0: write-only snapshot, fail-open, no read dependency on this table.
-            try:
-                self.db.save_fundamental_snapshot(
-                    query_id=query_id,
-                    code=code,
-                    payload=fundamental_context,
-                    source_chain=fundamental_context.get("source_chain", []),
-                    coverage=fundamental_context.get("coverage", {}),
-                )
-            except Exception as e:
-                logger.debug(f"{stock_name}({code}) 基本面快照写入失败: {e}")
+                # Step 2: 筹码分布
+                chip_data = stages.result("chip_distribution")
 
-            # Step 3: 趋势分析（基于交易理念）— 在 Agent 分支之前执行，供两条路径共用
-            trend_result: Optional[TrendAnalysisResult] = None
-            try:
-                from src.services.history_loader import get_frozen_target_date
-                _mkt = get_market_for_stock(normalize_stock_code(code))
-                frozen = get_frozen_target_date()
-                end_date = frozen if frozen else get_market_now(_mkt).date()
-                start_date = end_date - timedelta(days=89)  # ~60 trading days for MA60
-                historical_bars = self.db.get_data_range(code, start_date, end_date)
-                if historical_bars:
-                    df = pd.DataFrame([bar.to_dict() for bar in historical_bars])
-                    # Issue #234: Augment with realtime for intraday MA calculation
-                    if self.config.enable_realtime_quote and realtime_quote:
-                        df = self._augment_historical_with_realtime(df, realtime_quote, code)
-                    trend_result = self.trend_analyzer.analyze(df, code)
-                    logger.info(f"{stock_name}({code}) 趋势分析: {trend_result.trend_status.value}, "
-                              f"买入信号={trend_result.buy_signal.value}, 评分={trend_result.signal_score}")
-            except Exception as e:
-                logger.warning(f"{stock_name}({code}) 趋势分析失败: {e}", exc_info=True)
+                self._emit_progress(32, f"{stock_name}：正在聚合基本面与趋势数据")
 
-            if use_agent:
-                logger.info(f"{stock_name}({code}) 启用 Agent 模式进行分析")
-                self._emit_progress(58, f"{stock_name}：正在切换 Agent 分析链路")
-                return self._analyze_with_agent(
+                # Step 2.5: 基本面能力聚合（统一入口，异常降级）
+                fundamental_context = stages.result("fundamental_context")
+                fundamental_context = self._attach_belong_boards_to_fundamental_context(
                     code,
-                    report_type,
-                    query_id,
-                    stock_name,
-                    realtime_quote,
-                    chip_data,
                     fundamental_context,
-                    trend_result,
-                    market_phase_context=market_phase_context_dict,
+                )
+                market_structure_context = self._build_market_structure_context(
+                    code=code,
+                    stock_name=stock_name,
+                    market=market,
+                    fundamental_context=fundamental_context,
+                    trade_date=daily_market_target_date,
                     market_phase_summary=market_phase_summary,
-                    daily_market_context=daily_market_context,
-                    portfolio_context=portfolio_context,
-                    market_structure_context=market_structure_context,
                 )
 
-            # Step 4: 多维度情报搜索（最新消息+风险排查+业绩预期）
-            news_context = None
-            persisted_intelligence_context = self._load_persisted_intelligence_context(
-                code=code,
-                stock_name=stock_name,
-                market=market or "cn",
-            )
-            news_result_count: Optional[int] = None
-            self._emit_progress(46, f"{stock_name}：正在检索新闻与舆情")
-            if self.search_service is not None and self.search_service.is_available:
-                logger.info(f"{stock_name}({code}) 开始多维度情报搜索...")
+                # P0: write-only snapshot, fail-open, no read dependency on this table.
+                try:
+                    self.db.save_fundamental_snapshot(
+                        query_id=query_id,
+                        code=code,
+                        payload=fundamental_context,
+                        source_chain=fundamental_context.get("source_chain", []),
+                        coverage=fundamental_context.get("coverage", {}),
+                    )
+                except Exception as e:
+                    logger.debug(f"{stock_name}({code}) 基本面快照写入失败: {e}")
 
-                # 使用多维度搜索（最多5次搜索）
-                intel_results = self.search_service.search_comprehensive_intel(
-                    stock_code=code,
-                    stock_name=stock_name,
-                    max_searches=5
-                )
+                # Step 3: 趋势分析（基于交易理念）— 在 Agent 分支之前完成，供两条路径共用
+                trend_result: Optional[TrendAnalysisResult] = stages.result("trend_analysis")
 
-                # 格式化情报报告
-                if intel_results:
-                    news_context = self.search_service.format_intel_report(intel_results, stock_name)
-                    total_results = sum(
-                        len(r.results) for r in intel_results.values() if r.success
+                if use_agent:
+                    logger.info(f"{stock_name}({code}) 启用 Agent 模式进行分析")
+                    self._emit_progress(58, f"{stock_name}：正在切换 Agent 分析链路")
+                    return self._analyze_with_agent(
+                        code,
+                        report_type,
+                        query_id,
+                        stock_name,
+                        realtime_quote,
+                        chip_data,
+                        fundamental_context,
+                        trend_result,
+                        market_phase_context=market_phase_context_dict,
+                        market_phase_summary=market_phase_summary,
+                        daily_market_context=daily_market_context,
+                        portfolio_context=portfolio_context,
+                        market_structure_context=market_structure_context,
                     )
-                    news_result_count = total_results
-                    logger.info(f"{stock_name}({code}) 情报搜索完成: 共 {total_results} 条结果")
-                    logger.debug(f"{stock_name}({code}) 情报搜索结果:\n{news_context}")
 
-                    # 保存新闻情报到数据库（用于后续复盘与查询）
-                    try:
-                        query_context = self._build_query_context(query_id=query_id)
-                        for dim_name, response in intel_results.items():
-                            if response and response.success and response.results:
-                                self.db.save_news_intel(
-                                    code=code,
-                                    name=stock_name,
-                                    dimension=dim_name,
-                                    query=response.query,
-                                    response=response,
-                                    query_context=query_context
-                                )
-                    except Exception as e:
-                        logger.warning(f"{stock_name}({code}) 保存新闻情报失败: {e}")
-            else:
-                logger.info(f"{stock_name}({code}) 搜索服务不可用，跳过情报搜索")
+                # Step 4: 多维度情报搜索（最新消息+风险排查+业绩预期）
+                persisted_intelligence_context = self._load_persisted_intelligence_context(
+                    code=code,
+                    stock_name=stock_name,
+                    market=market or "cn",
+                )
+                self._emit_progress(46, f"{stock_name}：正在检索新闻与舆情")
+                news_context, news_result_count = stages.result("news_intel")
+            finally:
+                stages.close()
 
             # Step 4.5: Social sentiment intelligence (US stocks only)
             if self.social_sentiment_service is not None and self.social_sentiment_service.is_available and is_us_stock_code(code):
@@ -751,13 +685,14 @@ class StockAnalysisPipeline:
                     model=getattr(self.config, "litellm_model", None),
                     call_type="analysis",
                 )
-                result = self.analyzer.analyze(
-                    enhanced_context,
-                    news_context=news_context,
-                    progress_callback=self._emit_progress,
-                    stream_progress_callback=_on_llm_stream,
-                    analysis_context_pack_summary=analysis_context_pack_summary,
-                )
+                with llm_slot(getattr(self.config, "litellm_model", None)):
+                    result = self.analyzer.analyze(
+                        enhanced_context,
+                        news_context=news_context,
+                        progress_callback=self._emit_progress,
+                        stream_progress_callback=_on_llm_stream,
+                        analysis_context_pack_summary=analysis_context_pack_summary,
+                    )
                 llm_duration_ms = int((time.monotonic() - llm_started_at) * 1000)
                 record_llm_run(
                     success=bool(result and getattr(result, "success", True)),
@@ -894,6 +829,156 @@ class StockAnalysisPipeline:
             logger.exception(f"{stock_name}({code}) 详细错误信息:")
             return None
     
+    @staticmethod
+    def _resolve_stage_stock_name(code: str, stock_name: Optional[str], realtime_quote: Any) -> str:
+        """Prefer the realtime quote's name, falling back to the code."""
+        if realtime_quote and getattr(realtime_quote, "name", None):
+            return realtime_quote.name
+        return stock_name or f'股票{code}'
+
+    def _stage_realtime_quote(self, code: str, stock_name: str) -> Any:
+        """Step 1: 获取实时行情（量比、换手率等）- 使用统一入口，自动故障切换"""
+        realtime_quote = None
+        try:
+            if self.config.enable_realtime_quote:
+                realtime_quote = self.fetcher_manager.get_realtime_quote(code, log_final_failure=False)
+                if realtime_quote:
+                    # 使用实时行情返回的真实股票名称
+                    if realtime_quote.name:
+                        stock_name = realtime_quote.name
+                    # 兼容不同数据源的字段（有些数据源可能没有 volume_ratio）
+                    volume_ratio = getattr(realtime_quote, 'volume_ratio', None)
+                    turnover_rate = getattr(realtime_quote, 'turnover_rate', None)
+                    logger.info(f"{stock_name}({code}) 实时行情: 价格={realtime_quote.price}, "
+                              f"量比={volume_ratio}, 换手率={turnover_rate}% "
+                              f"(来源: {realtime_quote.source.value if hasattr(realtime_quote, 'source') else 'unknown'})")
+                else:
+                    logger.warning(f"{stock_name}({code}) 所有实时行情数据源均不可用，已降级为历史收盘价继续分析")
+            else:
+                logger.info(f"{stock_name}({code}) 实时行情已禁用，使用历史收盘价继续分析")
+        except Exception as e:
+            logger.warning(f"{stock_name}({code}) 实时行情链路异常，已降级为历史收盘价继续分析: {e}")
+        return realtime_quote
+
+    def _stage_chip_distribution(self, code: str, stock_name: str) -> Optional[ChipDistribution]:
+        """Step 2: 获取筹码分布 - 使用统一入口，带熔断保护"""
+        chip_data = None
+        try:
+            chip_data = self.fetcher_manager.get_chip_distribution(code)
+            if chip_data:
+                logger.info(f"{stock_name}({code}) 筹码分布: 获利比例={chip_data.profit_ratio:.1%}, "
+                          f"90%集中度={chip_data.concentration_90:.2%}")
+            else:
+                logger.debug(f"{stock_name}({code}) 筹码分布获取失败或已禁用")
+        except Exception as e:
+            logger.warning(f"{stock_name}({code}) 获取筹码分布失败: {e}")
+        return chip_data
+
+    def _stage_fundamental_context(self, code: str, stock_name: str) -> Dict[str, Any]:
+        """
+        Step 2.5: 基本面能力聚合（统一入口，异常降级）
+        - 失败时返回 partial/failed，不影响既有技术面/新闻链路
+        - 关闭开关时仍返回 not_supported 结构
+        """
+        try:
+            return self.fetcher_manager.get_fundamental_context(
+                code,
+                budget_seconds=getattr(
+                    self.config,
+                    'fundamental_stage_timeout_seconds',
+                    FUNDAMENTAL_STAGE_TIMEOUT_SECONDS_DEFAULT,
+                ),
+            )
+        except Exception as e:
+            logger.warning(f"{stock_name}({code}) 基本面聚合失败: {e}")
+            return self.fetcher_manager.build_failed_fundamental_context(code, str(e))
+
+    def _stage_historical_bars(self, code: str) -> List[Any]:
+        """Step 3 输入：读取约 60 个交易日的日线，供 MA60 使用。"""
+        try:
+            from src.services.history_loader import get_frozen_target_date
+            _mkt = get_market_for_stock(normalize_stock_code(code))
+            frozen = get_frozen_target_date()
+            end_date = frozen if frozen else get_market_now(_mkt).date()
+            start_date = end_date - timedelta(days=89)  # ~60 trading days for MA60
+            return self.db.get_data_range(code, start_date, end_date) or []
+        except Exception as e:
+            logger.warning(f"{code} 读取趋势分析日线失败: {e}", exc_info=True)
+            return []
+
+    def _stage_trend_analysis(
+        self,
+        code: str,
+        stock_name: str,
+        historical_bars: List[Any],
+        realtime_quote: Any,
+    ) -> Optional[TrendAnalysisResult]:
+        """Step 3: 趋势分析（基于交易理念）"""
+        stock_name = self._resolve_stage_stock_name(code, stock_name, realtime_quote)
+        try:
+            if not historical_bars:
+                return None
+            df = pd.DataFrame([bar.to_dict() for bar in historical_bars])
+            # Issue #234: Augment with realtime for intraday MA calculation
+            if self.config.enable_realtime_quote and realtime_quote:
+                df = self._augment_historical_with_realtime(df, realtime_quote, code)
+            trend_result = self.trend_analyzer.analyze(df, code)
+            logger.info(f"{stock_name}({code}) 趋势分析: {trend_result.trend_status.value}, "
+                      f"买入信号={trend_result.buy_signal.value}, 评分={trend_result.signal_score}")
+            return trend_result
+        except Exception as e:
+            logger.warning(f"{stock_name}({code}) 趋势分析失败: {e}", exc_info=True)
+            return None
+
+    def _stage_news_intel(
+        self,
+        code: str,
+        stock_name: str,
+        query_id: str,
+    ) -> Tuple[Optional[str], Optional[int]]:
+        """Step 4: 多维度情报搜索，返回 (news_context, news_result_count)。"""
+        news_context = None
+        news_result_count: Optional[int] = None
+        if self.search_service is None or not self.search_service.is_available:
+            logger.info(f"{stock_name}({code}) 搜索服务不可用，跳过情报搜索")
+            return news_context, news_result_count
+
+        logger.info(f"{stock_name}({code}) 开始多维度情报搜索...")
+
+        # 使用多维度搜索（最多5次搜索）
+        intel_results = self.search_service.search_comprehensive_intel(
+            stock_code=code,
+            stock_name=stock_name,
+            max_searches=5
+        )
+
+        # 格式化情报报告
+        if intel_results:
+            news_context = self.search_service.format_intel_report(intel_results, stock_name)
+            total_results = sum(
+                len(r.results) for r in intel_results.values() if r.success
+            )
+            news_result_count = total_results
+            logger.info(f"{stock_name}({code}) 情报搜索完成: 共 {total_results} 条结果")
+            logger.debug(f"{stock_name}({code}) 情报搜索结果:\n{news_context}")
+
+            # 保存新闻情报到数据库（用于后续复盘与查询）
+            try:
+                query_context = self._build_query_context(query_id=query_id)
+                for dim_name, response in intel_results.items():
+                    if response and response.success and response.results:
+                        self.db.save_news_intel(
+                            code=code,
+                            name=stock_name,
+                            dimension=dim_name,
+                            query=response.query,
+                            response=response,
+                            query_context=query_context
+                        )
+            except Exception as e:
+                logger.warning(f"{stock_name}({code}) 保存新闻情报失败: {e}")
+        return news_context, news_result_count
+
     def _enhance_context(
         self,
         context: Dict[str, Any],
@@ -1437,7 +1522,11 @@ class StockAnalysisPipeline:
                     model=getattr(self.config, "agent_litellm_model", None),
                     call_type="agent_analysis",
                 )
-                agent_result = executor.run(message, context=initial_context)
+                with llm_slot(
+                    getattr(self.config, "agent_litellm_model", None)
+                    or getattr(self.config, "litellm_model", None)
+                ):
+                    agent_result = executor.run(message, context=initial_context)
             except Exception as exc:
                 record_llm_run(
                     success=False,
@@ -3200,8 +3289,11 @@ class StockAnalysisPipeline:
         results: List[AnalysisResult] = []
         
         # 使用线程池并发处理
-        # 注意：max_workers 设置较低（默认3）以避免触发反爬
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+        # 注意：反爬限速由每个数据源的并发预算保证（DATA_SOURCE_MAX_CONCURRENCY），
+        # LLM 由每个模型通道的预算保证（LLM_MAX_CONCURRENCY）；线程数只需覆盖两者之和。
+        with ThreadPoolExecutor(
+            max_workers=resolve_analysis_worker_count(self.max_workers, self.config)
+        ) as executor:
             # 提交任务
             future_to_code = {
                 executor.submit(
@@ -3239,7 +3331,7 @@ class StockAnalysisPipeline:
                     if idx < len(stock_codes) - 1 and analysis_delay > 0:
                         # 注意：此 sleep 发生在“主线程收集 future 的循环”中，
                         # 并不会阻止线程池中的任务同时发起网络请求。
-                        # 因此它对降低并发请求峰值的效果有限；真正的峰值主要由 max_workers 决定。
+                        # 因此它对降低并发请求峰值的效果有限；真正的峰值主要由各数据源并发预算决定。
                         # 该行为目前保留（按需求不改逻辑）。
                         logger.debug(f"等待 {analysis_delay} 秒后继续下一只股票...")
                         time.sleep(analysis_delay)
@@ -3270,6 +3362,18 @@ class StockAnalysisPipeline:
         
         logger.info("===== 分析完成 =====")
         logger.info(f"成功: {success_count}, 失败: {fail_count}, 耗时: {elapsed_time:.2f} 秒")
+        for budget in budget_snapshot():
+            if budget["max_queue_depth"] > 1:
+                logger.info(
+                    "[budget] %s:%s limit=%s acquired=%s total_wait=%sms max_wait=%sms max_queue=%s",
+                    budget["budget"],
+                    budget["key"],
+                    budget["limit"],
+                    budget["acquired"],
+                    budget["total_wait_ms"],
+                    budget["max_wait_ms"],
+                    budget["max_queue_depth"],
+                )
         
         # 保存报告到本地文件（无论是否推送通知都保存）
         if results and not dry_run:
@@ -0,0 +1,102 @@
+# -*- coding: utf-8 -*-
+"""Small dependency graph for the independent I/O stages of one analysis."""
+
+import contextvars
+import logging
+import threading
+import time
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from src.services.run_diagnostics import record_stage_run
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _Stage:
+    name: str
+    func: Callable[[], Any]
+    after: Tuple[str, ...]
+    context: contextvars.Context
+    future: Future = field(default_factory=Future)
+    scheduled: bool = False
+
+
+class StageGraph:
+    """Run stages as soon as the stages they depend on have finished.
+
+    Each stage is a zero-argument callable; dependents read their inputs with
+    ``result(name)`` once they run. Stages execute in the caller's
+    ``contextvars`` context (so provider diagnostics land in the active run)
+    and every stage's start offset and duration are recorded as a
+    ``stage_run``. A stage that raises stores the exception; ``result``
+    re-raises it, and its dependents still run so they can degrade.
+    """
+
+    def __init__(self, *, max_workers: int = 6, executor: Optional[Executor] = None):
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=max_workers,
+            thread_name_prefix="analysis_stage",
+        )
+        self._stages: Dict[str, _Stage] = {}
+        self._lock = threading.Lock()
+        self._started_at = time.monotonic()
+
+    def add(self, name: str, func: Callable[[], Any], *, after: Tuple[str, ...] = ()) -> None:
+        """Register ``func`` and start it immediately if its dependencies are done."""
+        missing = [dependency for dependency in after if dependency not in self._stages]
+        if missing:
+            raise ValueError(f"stage {name} depends on unknown stages: {missing}")
+        with self._lock:
+            self._stages[name] = _Stage(name, func, tuple(after), contextvars.copy_context())
+        for dependency in after:
+            self._stages[dependency].future.add_done_callback(lambda _future: self._schedule_ready())
+        self._schedule_ready()
+
+    def result(self, name: str, timeout: Optional[float] = None) -> Any:
+        return self._stages[name].future.result(timeout=timeout)
+
+    def close(self) -> None:
+        """Release the owned worker threads without waiting for stragglers."""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False)
+
+    def _schedule_ready(self) -> None:
+        ready = []
+        with self._lock:
+            for stage in self._stages.values():
+                if stage.scheduled:
+                    continue
+                if all(self._stages[dependency].future.done() for dependency in stage.after):
+                    stage.scheduled = True
+                    ready.append(stage)
+        for stage in ready:
+            try:
+                self._executor.submit(stage.context.run, self._run, stage)
+            except RuntimeError as exc:  # executor already shut down
+                stage.future.set_exception(exc)
+
+    def _run(self, stage: _Stage) -> None:
+        started_at = time.monotonic()
+        error: Optional[BaseException] = None
+        try:
+            value = stage.func()
+        except BaseException as exc:  # re-raised from result()
+            error = exc
+        duration_ms = int((time.monotonic() - started_at) * 1000)
+        record_stage_run(
+            stage=stage.name,
+            success=error is None,
+            offset_ms=int((started_at - self._started_at) * 1000),
+            duration_ms=duration_ms,
+            depends_on=list(stage.after),
+            error_message=error,
+        )
+        logger.debug("[stage] %s finished in %sms (success=%s)", stage.name, duration_ms, error is None)
+        if error is None:
+            stage.future.set_result(value)
+        else:
+            stage.future.set_exception(error)
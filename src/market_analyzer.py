@@ -33,7 +33,7 @@ from src.llm.generation_backend import GenerationError
 from src.schemas.market_light import MARKET_LIGHT_REGIONS, MarketLightSnapshot
 from src.services.run_diagnostics import record_llm_run, record_llm_run_started
 from src.services.intelligence_service import IntelligenceService
-from data_provider.base import DataFetcherManager
+from data_provider.base import get_fetcher_manager
 
 logger = logging.getLogger(__name__)
 
@@ -146,7 +146,7 @@ class MarketAnalyzer:
         self.config = config or get_config()
         self.search_service = search_service
         self.analyzer = analyzer
-        self.data_manager = DataFetcherManager()
+        self.data_manager = get_fetcher_manager()
         self.region = region if region in ("cn", "us", "hk", "jp", "kr") else "cn"
         self.profile: MarketProfile = get_profile(self.region)
         self.strategy = get_market_strategy_blueprint(self.region)
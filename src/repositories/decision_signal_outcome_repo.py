@@ -134,6 +134,62 @@ class DecisionSignalOutcomeRepository:
             session.refresh(existing)
             return existing, False
 
+    def upsert_outcomes(
+        self,
+        fields_list: List[Dict[str, Any]],
+    ) -> List[Tuple[DecisionSignalOutcomeRecord, bool]]:
+        """Upsert many outcome rows in one transaction; results follow the input order."""
+        if not fields_list:
+            return []
+        now = utc_naive_now()
+        signal_ids = sorted({int(fields["signal_id"]) for fields in fields_list})
+        engine_versions = sorted({fields["engine_version"] for fields in fields_list})
+        with self.db.get_session() as session:
+            existing_rows = session.execute(
+                select(DecisionSignalOutcomeRecord)
+                .where(
+                    DecisionSignalOutcomeRecord.signal_id.in_(signal_ids),
+                    DecisionSignalOutcomeRecord.engine_version.in_(engine_versions),
+                )
+            ).scalars().all()
+            rows_by_key = {
+                (int(row.signal_id), row.horizon, row.engine_version): row
+                for row in existing_rows
+            }
+            keys: List[Tuple[int, str, str]] = []
+            created_keys = set()
+            for fields in fields_list:
+                key = (int(fields["signal_id"]), fields["horizon"], fields["engine_version"])
+                keys.append(key)
+                existing = rows_by_key.get(key)
+                if existing is None:
+                    row = DecisionSignalOutcomeRecord(**fields)
+                    session.add(row)
+                    rows_by_key[key] = row
+                    created_keys.add(key)
+                    continue
+                for name, value in fields.items():
+                    if name in {"id", "created_at"}:
+                        continue
+                    setattr(existing, name, value)
+                if key not in created_keys:
+                    existing.updated_at = now
+            session.commit()
+
+            # One reload query instead of a refresh per row; identity map returns the same objects.
+            refreshed = session.execute(
+                select(DecisionSignalOutcomeRecord)
+                .where(
+                    DecisionSignalOutcomeRecord.signal_id.in_(signal_ids),
+                    DecisionSignalOutcomeRecord.engine_version.in_(engine_versions),
+                )
+            ).scalars().all()
+            refreshed_by_key = {
+                (int(row.signal_id), row.horizon, row.engine_version): row
+                for row in refreshed
+            }
+            return [(refreshed_by_key[key], key in created_keys) for key in keys]
+
     def list_outcomes(
         self,
         *,
@@ -4,13 +4,16 @@
 from __future__ import annotations
 
 from datetime import datetime, timedelta
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
-from sqlalchemy import and_, delete, desc, func, or_, select
+from sqlalchemy import and_, delete, desc, func, or_, select, update
 from sqlalchemy.exc import IntegrityError
 
 from src.storage import DatabaseManager, IntelligenceItem, IntelligenceSource, INTELLIGENCE_ITEM_NULL_SCOPE_VALUE
 
+_URL_LOOKUP_CHUNK_SIZE = 500
+_REFRESHED_CONTENT_FIELDS = ("summary", "source", "published_at", "raw_payload")
+
 
 class IntelligenceRepository:
     """DB access layer for configurable intelligence sources and items."""
@@ -91,6 +94,7 @@ class IntelligenceRepository:
         status: str,
         error: Optional[str] = None,
         fetched_at: Optional[datetime] = None,
+        http_validators: Optional[Tuple[Optional[str], Optional[str]]] = None,
     ) -> None:
         with self.db.get_session() as session:
             row = session.execute(
@@ -102,9 +106,73 @@ class IntelligenceRepository:
             row.last_error = error
             if fetched_at is not None:
                 row.last_fetched_at = fetched_at
+            if http_validators is not None:
+                row.http_etag, row.http_last_modified = http_validators
             row.updated_at = datetime.now()
             session.commit()
 
+    def refresh_known_items(
+        self,
+        *,
+        source_id: int,
+        source_type: str,
+        scope_type: str,
+        scope_value: Optional[str],
+        market: str,
+        items: Iterable[Dict[str, Any]],
+        fetched_at: datetime,
+    ) -> Set[str]:
+        """Refresh items this source already stored and return their URLs.
+
+        Unchanged rows only get ``fetched_at`` bumped in one bulk UPDATE; rows
+        whose summary, source, published_at or raw_payload changed are
+        rewritten with the same keep-existing-when-empty rules as
+        ``upsert_items``.
+        """
+        incoming = {fields["url"]: fields for fields in items if fields.get("url")}
+        pending = sorted(incoming)
+        if not pending:
+            return set()
+        conditions = [
+            IntelligenceItem.source_id == source_id,
+            IntelligenceItem.source_type == (source_type or "rss"),
+            IntelligenceItem.scope_type == (scope_type or "market"),
+            IntelligenceItem.market == (market or "cn"),
+            IntelligenceItem.scope_value == self._normalize_scope_value(scope_value),
+        ]
+        content_columns = [getattr(IntelligenceItem, name) for name in _REFRESHED_CONTENT_FIELDS]
+        known: Set[str] = set()
+        with self.db.get_session() as session:
+            for start in range(0, len(pending), _URL_LOOKUP_CHUNK_SIZE):
+                chunk = pending[start:start + _URL_LOOKUP_CHUNK_SIZE]
+                rows = session.execute(
+                    select(IntelligenceItem.id, IntelligenceItem.url, *content_columns)
+                    .where(and_(*conditions, IntelligenceItem.url.in_(chunk)))
+                ).all()
+                unchanged_ids: List[int] = []
+                changed: List[Dict[str, Any]] = []
+                for row in rows:
+                    known.add(row.url)
+                    fields = incoming[row.url]
+                    content = {
+                        name: fields.get(name) or getattr(row, name)
+                        for name in _REFRESHED_CONTENT_FIELDS
+                    }
+                    if all(content[name] == getattr(row, name) for name in _REFRESHED_CONTENT_FIELDS):
+                        unchanged_ids.append(row.id)
+                    else:
+                        changed.append({"id": row.id, "fetched_at": fetched_at, **content})
+                if unchanged_ids:
+                    session.execute(
+                        update(IntelligenceItem)
+                        .where(IntelligenceItem.id.in_(unchanged_ids))
+                        .values(fetched_at=fetched_at)
+                    )
+                if changed:
+                    session.execute(update(IntelligenceItem), changed)
+            session.commit()
+        return known
+
     def upsert_items(self, items: Iterable[Dict[str, Any]]) -> int:
         saved = 0
         with self.db.get_session() as session:
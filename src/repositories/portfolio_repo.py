@@ -6,6 +6,7 @@ Provides DB access helpers for portfolio account/events/snapshot tables.
 
 from __future__ import annotations
 
+import json
 import logging
 from contextlib import contextmanager
 from datetime import date, datetime
@@ -23,12 +24,15 @@ from src.storage import (
     PortfolioFxRate,
     PortfolioPosition,
     PortfolioPositionLot,
+    PortfolioReplayCheckpoint,
     PortfolioTrade,
     StockDaily,
 )
 
 logger = logging.getLogger(__name__)
 
+REPLAY_CHECKPOINTS_KEPT_PER_METHOD = 3
+
 
 class DuplicateTradeUidError(Exception):
     """Raised when trade_uid conflicts with existing record in one account."""
@@ -464,9 +468,9 @@ class PortfolioRepository:
     # ------------------------------------------------------------------
     # Event reads
     # ------------------------------------------------------------------
-    def list_trades(self, account_id: int, as_of: date) -> List[PortfolioTrade]:
+    def list_trades(self, account_id: int, as_of: date, *, after: Optional[date] = None) -> List[PortfolioTrade]:
         with self.db.get_session() as session:
-            return self.list_trades_in_session(session=session, account_id=account_id, as_of=as_of)
+            return self.list_trades_in_session(session=session, account_id=account_id, as_of=as_of, after=after)
 
     def list_trades_in_session(
         self,
@@ -474,22 +478,24 @@ class PortfolioRepository:
         session: Any,
         account_id: int,
         as_of: date,
+        after: Optional[date] = None,
     ) -> List[PortfolioTrade]:
+        conditions = [
+            PortfolioTrade.account_id == account_id,
+            PortfolioTrade.trade_date <= as_of,
+        ]
+        if after is not None:
+            conditions.append(PortfolioTrade.trade_date > after)
         rows = session.execute(
             select(PortfolioTrade)
-            .where(
-                and_(
-                    PortfolioTrade.account_id == account_id,
-                    PortfolioTrade.trade_date <= as_of,
-                )
-            )
+            .where(and_(*conditions))
             .order_by(PortfolioTrade.trade_date.asc(), PortfolioTrade.id.asc())
         ).scalars().all()
         return list(rows)
 
-    def list_cash_ledger(self, account_id: int, as_of: date) -> List[PortfolioCashLedger]:
+    def list_cash_ledger(self, account_id: int, as_of: date, *, after: Optional[date] = None) -> List[PortfolioCashLedger]:
         with self.db.get_session() as session:
-            return self.list_cash_ledger_in_session(session=session, account_id=account_id, as_of=as_of)
+            return self.list_cash_ledger_in_session(session=session, account_id=account_id, as_of=as_of, after=after)
 
     def list_cash_ledger_in_session(
         self,
@@ -497,22 +503,24 @@ class PortfolioRepository:
         session: Any,
         account_id: int,
         as_of: date,
+        after: Optional[date] = None,
     ) -> List[PortfolioCashLedger]:
+        conditions = [
+            PortfolioCashLedger.account_id == account_id,
+            PortfolioCashLedger.event_date <= as_of,
+        ]
+        if after is not None:
+            conditions.append(PortfolioCashLedger.event_date > after)
         rows = session.execute(
             select(PortfolioCashLedger)
-            .where(
-                and_(
-                    PortfolioCashLedger.account_id == account_id,
-                    PortfolioCashLedger.event_date <= as_of,
-                )
-            )
+            .where(and_(*conditions))
             .order_by(PortfolioCashLedger.event_date.asc(), PortfolioCashLedger.id.asc())
         ).scalars().all()
         return list(rows)
 
-    def list_corporate_actions(self, account_id: int, as_of: date) -> List[PortfolioCorporateAction]:
+    def list_corporate_actions(self, account_id: int, as_of: date, *, after: Optional[date] = None) -> List[PortfolioCorporateAction]:
         with self.db.get_session() as session:
-            return self.list_corporate_actions_in_session(session=session, account_id=account_id, as_of=as_of)
+            return self.list_corporate_actions_in_session(session=session, account_id=account_id, as_of=as_of, after=after)
 
     def list_corporate_actions_in_session(
         self,
@@ -520,15 +528,17 @@ class PortfolioRepository:
         session: Any,
         account_id: int,
         as_of: date,
+        after: Optional[date] = None,
     ) -> List[PortfolioCorporateAction]:
+        conditions = [
+            PortfolioCorporateAction.account_id == account_id,
+            PortfolioCorporateAction.effective_date <= as_of,
+        ]
+        if after is not None:
+            conditions.append(PortfolioCorporateAction.effective_date > after)
         rows = session.execute(
             select(PortfolioCorporateAction)
-            .where(
-                and_(
-                    PortfolioCorporateAction.account_id == account_id,
-                    PortfolioCorporateAction.effective_date <= as_of,
-                )
-            )
+            .where(and_(*conditions))
             .order_by(PortfolioCorporateAction.effective_date.asc(), PortfolioCorporateAction.id.asc())
         ).scalars().all()
         return list(rows)
@@ -764,6 +774,13 @@ class PortfolioRepository:
                 existing.source = source
                 existing.is_stale = is_stale
                 existing.updated_at = datetime.now()
+            # Replay converts realized PnL/fees at event-date rates, so a rate on or before
+            # a checkpoint date can change state that checkpoint already folded in.
+            session.execute(
+                delete(PortfolioReplayCheckpoint).where(
+                    PortfolioReplayCheckpoint.checkpoint_date >= rate_date
+                )
+            )
             session.commit()
 
     def get_latest_fx_rate(
@@ -860,6 +877,139 @@ class PortfolioRepository:
                     identities.append(identity)
             return identities
 
+    # ------------------------------------------------------------------
+    # Replay checkpoints
+    # ------------------------------------------------------------------
+    def get_latest_replay_checkpoint(
+        self,
+        *,
+        account_id: int,
+        cost_method: str,
+        as_of: date,
+    ) -> Optional[PortfolioReplayCheckpoint]:
+        """Return the newest checkpoint on or before ``as_of`` whose event fingerprint still matches."""
+        with self.db.get_session() as session:
+            row = session.execute(
+                select(PortfolioReplayCheckpoint)
+                .where(
+                    and_(
+                        PortfolioReplayCheckpoint.account_id == account_id,
+                        PortfolioReplayCheckpoint.cost_method == cost_method,
+                        PortfolioReplayCheckpoint.checkpoint_date <= as_of,
+                    )
+                )
+                .order_by(desc(PortfolioReplayCheckpoint.checkpoint_date))
+                .limit(1)
+            ).scalar_one_or_none()
+            if row is None:
+                return None
+            current = self._replay_event_fingerprint_in_session(
+                session=session,
+                account_id=account_id,
+                through=row.checkpoint_date,
+            )
+            if json.loads(row.event_fingerprint or "{}") != current:
+                logger.info(
+                    "Discard stale portfolio replay checkpoint: account_id=%s method=%s date=%s",
+                    account_id,
+                    cost_method,
+                    row.checkpoint_date,
+                )
+                session.delete(row)
+                session.commit()
+                return None
+            session.expunge(row)
+            return row
+
+    def save_replay_checkpoint(
+        self,
+        *,
+        account_id: int,
+        cost_method: str,
+        checkpoint_date: date,
+        base_currency: str,
+        event_fingerprint: Dict[str, List[int]],
+        state: str,
+    ) -> bool:
+        """Persist one checkpoint unless the ledger changed since it was replayed.
+
+        The fingerprint is re-read inside the ledger write lock, so an event
+        written concurrently at or before ``checkpoint_date`` skips the save.
+        """
+        with self.portfolio_write_session() as session:
+            current = self._replay_event_fingerprint_in_session(
+                session=session,
+                account_id=account_id,
+                through=checkpoint_date,
+            )
+            if current != event_fingerprint:
+                return False
+            existing = session.execute(
+                select(PortfolioReplayCheckpoint).where(
+                    and_(
+                        PortfolioReplayCheckpoint.account_id == account_id,
+                        PortfolioReplayCheckpoint.cost_method == cost_method,
+                        PortfolioReplayCheckpoint.checkpoint_date == checkpoint_date,
+                    )
+                ).limit(1)
+            ).scalar_one_or_none()
+            fingerprint_text = json.dumps(event_fingerprint, sort_keys=True)
+            if existing is None:
+                session.add(
+                    PortfolioReplayCheckpoint(
+                        account_id=account_id,
+                        cost_method=cost_method,
+                        checkpoint_date=checkpoint_date,
+                        base_currency=base_currency,
+                        event_fingerprint=fingerprint_text,
+                        state=state,
+                    )
+                )
+            else:
+                existing.base_currency = base_currency
+                existing.event_fingerprint = fingerprint_text
+                existing.state = state
+            session.flush()
+
+            stale_ids = session.execute(
+                select(PortfolioReplayCheckpoint.id)
+                .where(
+                    and_(
+                        PortfolioReplayCheckpoint.account_id == account_id,
+                        PortfolioReplayCheckpoint.cost_method == cost_method,
+                    )
+                )
+                .order_by(desc(PortfolioReplayCheckpoint.checkpoint_date))
+                .offset(REPLAY_CHECKPOINTS_KEPT_PER_METHOD)
+            ).scalars().all()
+            if stale_ids:
+                session.execute(
+                    delete(PortfolioReplayCheckpoint).where(PortfolioReplayCheckpoint.id.in_(stale_ids))
+                )
+            return True
+
+    @staticmethod
+    def _replay_event_fingerprint_in_session(
+        *,
+        session: Any,
+        account_id: int,
+        through: date,
+    ) -> Dict[str, List[int]]:
+        """Return ``{event_type: [count, max_id]}`` for events dated on or before ``through``."""
+        fingerprint: Dict[str, List[int]] = {}
+        for event_type, model, date_column in (
+            ("cash", PortfolioCashLedger, PortfolioCashLedger.event_date),
+            ("corp", PortfolioCorporateAction, PortfolioCorporateAction.effective_date),
+            ("trade", PortfolioTrade, PortfolioTrade.trade_date),
+        ):
+            count, max_id = session.execute(
+                select(func.count(model.id), func.max(model.id)).where(
+                    and_(model.account_id == account_id, date_column <= through)
+                )
+            ).one()
+            fingerprint[event_type] = [int(count or 0), int(max_id or 0)]
+        return fingerprint
+
     # ------------------------------------------------------------------
     # Snapshot / position cache
     # ------------------------------------------------------------------
@@ -940,6 +1090,14 @@ class PortfolioRepository:
                 )
             )
         )
+        session.execute(
+            delete(PortfolioReplayCheckpoint).where(
+                and_(
+                    PortfolioReplayCheckpoint.account_id == account_id,
+                    PortfolioReplayCheckpoint.checkpoint_date >= from_date,
+                )
+            )
+        )
 
     @staticmethod
     def _is_sqlite_locked_error(exc: OperationalError) -> bool:
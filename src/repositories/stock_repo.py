@@ -11,7 +11,7 @@
 
 import logging
 from datetime import date
-from typing import Optional, List, Dict, Any
+from typing import Iterable, Optional, List, Dict, Any
 
 import pandas as pd
 from sqlalchemy import and_, desc, select
@@ -169,3 +169,38 @@ class StockRepository:
                 .limit(eval_window_days)
             ).scalars().all()
             return list(rows)
+
+    def get_bars_for_anchor_window(
+        self,
+        *,
+        code: str,
+        anchor_dates: Iterable[date],
+        eval_window_days: int,
+    ) -> List[StockDaily]:
+        """Return bars from the earliest anchor through eval_window_days bars after the latest anchor.
+
+        The slice covers every anchor bar plus the forward window of each anchor, so
+        callers can evaluate many (anchor, horizon) pairs of one stock in memory.
+        """
+        anchors = sorted(set(anchor_dates))
+        if not anchors:
+            return []
+        with self.db.get_session() as session:
+            rows = session.execute(
+                select(StockDaily)
+                .where(
+                    and_(
+                        StockDaily.code == code,
+                        StockDaily.date >= anchors[0],
+                        StockDaily.date <= anchors[-1],
+                    )
+                )
+                .order_by(StockDaily.date)
+            ).scalars().all()
+            forward_rows = session.execute(
+                select(StockDaily)
+                .where(and_(StockDaily.code == code, StockDaily.date > anchors[-1]))
+                .order_by(StockDaily.date)
+                .limit(max(0, int(eval_window_days)))
+            ).scalars().all()
+            return list(rows) + list(forward_rows)
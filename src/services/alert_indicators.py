@@ -3,11 +3,14 @@
 
 from __future__ import annotations
 
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
 from datetime import datetime, time
 from math import isfinite
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
 
@@ -22,6 +25,17 @@ TECHNICAL_ALERT_TYPES = frozenset({
 ABOVE_BELOW_DIRECTIONS = frozenset({"above", "below"})
 CROSS_DIRECTIONS = frozenset({"bullish_cross", "bearish_cross"})
 MAX_REQUESTED_DAYS = 365
+INDICATOR_CACHE_MAX_ENTRIES = 4096
+NORMALIZED_FRAME_CACHE_SIZE = 64
+
+# Parameters that change the computed series; direction/threshold only change the comparison.
+_INDICATOR_SERIES_PARAMS: Dict[str, Tuple[str, ...]] = {
+    "ma_price_cross": ("window",),
+    "rsi_threshold": ("period",),
+    "macd_cross": ("fast_period", "slow_period", "signal_period"),
+    "kdj_cross": ("period", "k_period", "d_period"),
+    "cci_threshold": ("period",),
+}
 
 
 @dataclass
@@ -41,6 +55,104 @@ class IndicatorEvaluation:
     data_timestamp: Optional[datetime] = None
 
 
+@dataclass
+class _IndicatorEntry:
+    dates: np.ndarray
+    inputs: Dict[str, np.ndarray]
+    values: np.ndarray
+    state: Dict[str, float]
+
+    def matches(self, dates: np.ndarray, inputs: Dict[str, np.ndarray]) -> bool:
+        return np.array_equal(self.dates, dates) and all(
+            np.array_equal(self.inputs[name], values) for name, values in inputs.items()
+        )
+
+
+class IndicatorCache:
+    """Indicator series shared by technical alert rules across evaluations.
+
+    Entries are keyed by (symbol, indicator, series params, last bar date), so
+    rules that only differ in direction or threshold read one series. A frame
+    that equals a cached frame plus one new closed bar is extended by a single
+    step instead of being recomputed. Bar dates and inputs are compared before
+    reuse, so revised history always falls back to a full computation. A
+    sliding window that drops its oldest bar is recomputed too: recursive
+    indicators (RSI, MACD, KDJ) are seeded at the first bar of the frame, and
+    carrying state from bars outside it would make cached results depend on
+    process uptime instead of the bars being evaluated.
+    """
+
+    def __init__(self, max_entries: int = INDICATOR_CACHE_MAX_ENTRIES) -> None:
+        self.max_entries = max(1, int(max_entries))
+        self.stats = {"hits": 0, "extended": 0, "computed": 0}
+        self._entries: "OrderedDict[tuple, _IndicatorEntry]" = OrderedDict()
+        self._normalized: "OrderedDict[tuple, Tuple[Any, pd.DataFrame]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalized_frame(
+        self,
+        df: Any,
+        *,
+        required_columns: tuple[str, ...],
+        now: Optional[datetime] = None,
+    ) -> pd.DataFrame:
+        """Return ``normalize_ohlcv`` for ``df``, reusing the result for the same frame object."""
+        current = now or datetime.now()
+        key = (id(df), required_columns, current.date(), current.time() >= time(16, 0))
+        with self._lock:
+            cached = self._normalized.get(key)
+            if cached is not None and cached[0] is df:
+                return cached[1]
+        normalized = normalize_ohlcv(df, required_columns=required_columns, now=current)
+        with self._lock:
+            # Keep a reference to the source frame so its id() cannot be reused while cached.
+            self._normalized[key] = (df, normalized)
+            while len(self._normalized) > NORMALIZED_FRAME_CACHE_SIZE:
+                self._normalized.popitem(last=False)
+        return normalized
+
+    def series(self, stock_code: str, alert_type: str, params: Dict[str, Any], df: pd.DataFrame) -> np.ndarray:
+        """Return the indicator series of ``alert_type`` for a normalized frame."""
+        param_key = _series_param_key(alert_type, params)
+        try:
+            dates = df["date"].to_numpy(dtype="datetime64[ns]")
+        except (TypeError, ValueError):
+            return _compute_indicator_series(alert_type, param_key, df)[0]
+        inputs = {name: df[name].to_numpy(dtype=float) for name in _series_input_columns(alert_type)}
+        base_key = (stock_code, alert_type, param_key)
+        key = base_key + (dates[-1],)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.matches(dates, inputs):
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return entry.values
+            previous_key = base_key + (dates[-2],) if len(dates) >= 2 else None
+            previous = self._entries.get(previous_key) if previous_key is not None else None
+
+        if previous is not None and previous.matches(
+            dates[:-1],
+            {name: values[:-1] for name, values in inputs.items()},
+        ):
+            value, state = _extend_indicator_series(alert_type, param_key, inputs, previous)
+            values = np.append(previous.values, value)
+            outcome = "extended"
+        else:
+            values, state = _compute_indicator_series(alert_type, param_key, df)
+            outcome = "computed"
+
+        with self._lock:
+            if previous_key is not None and outcome == "extended":
+                self._entries.pop(previous_key, None)
+            self._entries[key] = _IndicatorEntry(dates=dates, inputs=inputs, values=values, state=state)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self.stats[outcome] += 1
+        return values
+
+
 def normalize_indicator_parameters(alert_type: str, parameters: Dict[str, Any]) -> Dict[str, Any]:
     if not isinstance(parameters, dict):
         raise ValueError("parameters must be an object")
@@ -122,13 +234,15 @@ def evaluate_indicator_alert(
     df: Any,
     *,
     now: Optional[datetime] = None,
+    indicator_cache: Optional[IndicatorCache] = None,
 ) -> IndicatorEvaluation:
-    columns = ("close",)
-    if alert_type in {"kdj_cross", "cci_threshold"}:
-        columns = ("high", "low", "close")
+    columns = _series_input_columns(alert_type)
 
     try:
-        normalized = normalize_ohlcv(df, required_columns=columns, now=now)
+        if indicator_cache is not None:
+            normalized = indicator_cache.normalized_frame(df, required_columns=columns, now=now)
+        else:
+            normalized = normalize_ohlcv(df, required_columns=columns, now=now)
     except ValueError as exc:
         return IndicatorEvaluation(
             status="degraded",
@@ -162,17 +276,22 @@ def evaluate_indicator_alert(
             data_timestamp=_latest_timestamp(normalized),
         )
 
+    if alert_type not in _INDICATOR_SERIES_PARAMS:
+        raise ValueError(f"unsupported technical alert_type: {alert_type}")
+    if indicator_cache is not None:
+        values = indicator_cache.series(stock_code, alert_type, params, normalized)
+    else:
+        values, _state = _compute_indicator_series(alert_type, _series_param_key(alert_type, params), normalized)
+
     if alert_type == "ma_price_cross":
-        return _evaluate_ma(stock_code, params, normalized)
+        return _evaluate_ma(stock_code, params, normalized, values)
     if alert_type == "rsi_threshold":
-        return _evaluate_rsi(stock_code, params, normalized)
+        return _evaluate_rsi(stock_code, params, normalized, values)
     if alert_type == "macd_cross":
-        return _evaluate_macd(stock_code, params, normalized)
+        return _evaluate_macd(stock_code, params, normalized, values)
     if alert_type == "kdj_cross":
-        return _evaluate_kdj(stock_code, params, normalized)
-    if alert_type == "cci_threshold":
-        return _evaluate_cci(stock_code, params, normalized)
-    raise ValueError(f"unsupported technical alert_type: {alert_type}")
+        return _evaluate_kdj(stock_code, params, normalized, values)
+    return _evaluate_cci(stock_code, params, normalized, values)
 
 
 def normalize_ohlcv(
@@ -210,13 +329,12 @@ def normalize_ohlcv(
     return output
 
 
-def _evaluate_ma(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) -> IndicatorEvaluation:
+def _evaluate_ma(stock_code: str, params: Dict[str, Any], df: pd.DataFrame, ma: np.ndarray) -> IndicatorEvaluation:
     window = int(params["window"])
     direction = str(params["direction"])
-    series = df["close"].rolling(window=window).mean()
     latest = _latest_timestamp(df)
     prev_close, curr_close = float(df["close"].iloc[-2]), float(df["close"].iloc[-1])
-    prev_ma, curr_ma = float(series.iloc[-2]), float(series.iloc[-1])
+    prev_ma, curr_ma = float(ma[-2]), float(ma[-1])
     if not all(isfinite(value) for value in (prev_ma, curr_ma)):
         return _indicator_unavailable("MA", latest)
 
@@ -237,13 +355,12 @@ def _evaluate_ma(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) -> I
     )
 
 
-def _evaluate_rsi(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) -> IndicatorEvaluation:
+def _evaluate_rsi(stock_code: str, params: Dict[str, Any], df: pd.DataFrame, rsi: np.ndarray) -> IndicatorEvaluation:
     period = int(params["period"])
     threshold = float(params["threshold"])
     direction = str(params["direction"])
-    rsi = _calculate_rsi(df["close"], period)
     latest = _latest_timestamp(df)
-    prev_value, curr_value = float(rsi.iloc[-2]), float(rsi.iloc[-1])
+    prev_value, curr_value = float(rsi[-2]), float(rsi[-1])
     if not all(isfinite(value) for value in (prev_value, curr_value)):
         return _indicator_unavailable("RSI", latest, threshold=threshold)
 
@@ -262,18 +379,10 @@ def _evaluate_rsi(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) ->
     )
 
 
-def _evaluate_macd(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) -> IndicatorEvaluation:
-    fast_period = int(params["fast_period"])
-    slow_period = int(params["slow_period"])
-    signal_period = int(params["signal_period"])
+def _evaluate_macd(stock_code: str, params: Dict[str, Any], df: pd.DataFrame, delta: np.ndarray) -> IndicatorEvaluation:
     direction = str(params["direction"])
-    ema_fast = df["close"].ewm(span=fast_period, adjust=False).mean()
-    ema_slow = df["close"].ewm(span=slow_period, adjust=False).mean()
-    dif = ema_fast - ema_slow
-    dea = dif.ewm(span=signal_period, adjust=False).mean()
-    delta = dif - dea
     latest = _latest_timestamp(df)
-    prev_delta, curr_delta = float(delta.iloc[-2]), float(delta.iloc[-1])
+    prev_delta, curr_delta = float(delta[-2]), float(delta[-1])
     if not all(isfinite(value) for value in (prev_delta, curr_delta)):
         return _indicator_unavailable("MACD", latest, threshold=0.0)
 
@@ -292,20 +401,10 @@ def _evaluate_macd(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) ->
     )
 
 
-def _evaluate_kdj(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) -> IndicatorEvaluation:
-    period = int(params["period"])
-    k_period = int(params["k_period"])
-    d_period = int(params["d_period"])
+def _evaluate_kdj(stock_code: str, params: Dict[str, Any], df: pd.DataFrame, delta: np.ndarray) -> IndicatorEvaluation:
     direction = str(params["direction"])
-    lowest_low = df["low"].rolling(window=period).min()
-    highest_high = df["high"].rolling(window=period).max()
-    denominator = highest_high - lowest_low
-    rsv = ((df["close"] - lowest_low) / denominator.mask(denominator == 0) * 100).fillna(50)
-    k_value = rsv.ewm(alpha=1 / k_period, adjust=False).mean()
-    d_value = k_value.ewm(alpha=1 / d_period, adjust=False).mean()
-    delta = k_value - d_value
     latest = _latest_timestamp(df)
-    prev_delta, curr_delta = float(delta.iloc[-2]), float(delta.iloc[-1])
+    prev_delta, curr_delta = float(delta[-2]), float(delta[-1])
     if not all(isfinite(value) for value in (prev_delta, curr_delta)):
         return _indicator_unavailable("KDJ", latest, threshold=0.0)
 
@@ -324,19 +423,12 @@ def _evaluate_kdj(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) ->
     )
 
 
-def _evaluate_cci(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) -> IndicatorEvaluation:
+def _evaluate_cci(stock_code: str, params: Dict[str, Any], df: pd.DataFrame, cci: np.ndarray) -> IndicatorEvaluation:
     period = int(params["period"])
     threshold = float(params["threshold"])
     direction = str(params["direction"])
-    typical_price = (df["high"] + df["low"] + df["close"]) / 3
-    tp_ma = typical_price.rolling(window=period).mean()
-    mean_deviation = typical_price.rolling(window=period).apply(
-        lambda values: float(abs(values - values.mean()).mean()),
-        raw=False,
-    )
-    cci = (typical_price - tp_ma) / (0.015 * mean_deviation.mask(mean_deviation == 0))
     latest = _latest_timestamp(df)
-    prev_value, curr_value = float(cci.iloc[-2]), float(cci.iloc[-1])
+    prev_value, curr_value = float(cci[-2]), float(cci[-1])
     if not all(isfinite(value) for value in (prev_value, curr_value)):
         return _indicator_unavailable("CCI", latest, threshold=threshold)
 
@@ -355,6 +447,144 @@ def _evaluate_cci(stock_code: str, params: Dict[str, Any], df: pd.DataFrame) ->
     )
 
 
+def _series_input_columns(alert_type: str) -> tuple[str, ...]:
+    if alert_type in {"kdj_cross", "cci_threshold"}:
+        return ("high", "low", "close")
+    return ("close",)
+
+
+def _series_param_key(alert_type: str, params: Dict[str, Any]) -> Tuple[int, ...]:
+    return tuple(int(params[name]) for name in _INDICATOR_SERIES_PARAMS[alert_type])
+
+
+def _compute_indicator_series(
+    alert_type: str,
+    param_key: Tuple[int, ...],
+    df: pd.DataFrame,
+) -> Tuple[np.ndarray, Dict[str, float]]:
+    """Compute a full indicator series plus the recursive state at its last bar."""
+    close = df["close"]
+    if alert_type == "ma_price_cross":
+        (window,) = param_key
+        return close.rolling(window=window).mean().to_numpy(dtype=float), {}
+    if alert_type == "rsi_threshold":
+        (period,) = param_key
+        avg_gain, avg_loss = _wilder_averages(close, period)
+        rsi = _rsi_from_averages(avg_gain, avg_loss)
+        return rsi.to_numpy(dtype=float), {
+            "avg_gain": float(avg_gain.iloc[-1]),
+            "avg_loss": float(avg_loss.iloc[-1]),
+        }
+    if alert_type == "macd_cross":
+        fast_period, slow_period, signal_period = param_key
+        ema_fast = close.ewm(span=fast_period, adjust=False).mean()
+        ema_slow = close.ewm(span=slow_period, adjust=False).mean()
+        dif = ema_fast - ema_slow
+        dea = dif.ewm(span=signal_period, adjust=False).mean()
+        return (dif - dea).to_numpy(dtype=float), {
+            "ema_fast": float(ema_fast.iloc[-1]),
+            "ema_slow": float(ema_slow.iloc[-1]),
+            "dea": float(dea.iloc[-1]),
+        }
+    if alert_type == "kdj_cross":
+        period, k_period, d_period = param_key
+        lowest_low = df["low"].rolling(window=period).min()
+        highest_high = df["high"].rolling(window=period).max()
+        denominator = highest_high - lowest_low
+        rsv = ((close - lowest_low) / denominator.mask(denominator == 0) * 100).fillna(50)
+        k_value = rsv.ewm(alpha=1 / k_period, adjust=False).mean()
+        d_value = k_value.ewm(alpha=1 / d_period, adjust=False).mean()
+        return (k_value - d_value).to_numpy(dtype=float), {
+            "k": float(k_value.iloc[-1]),
+            "d": float(d_value.iloc[-1]),
+        }
+    if alert_type == "cci_threshold":
+        (period,) = param_key
+        typical_price = ((df["high"] + df["low"] + close) / 3).to_numpy(dtype=float)
+        cci = np.full(len(typical_price), np.nan)
+        if len(typical_price) >= period:
+            windows = np.lib.stride_tricks.sliding_window_view(typical_price, period)
+            tp_ma = windows.mean(axis=1)
+            mean_deviation = np.abs(windows - tp_ma[:, None]).mean(axis=1)
+            with np.errstate(divide="ignore", invalid="ignore"):
+                cci[period - 1:] = np.where(
+                    mean_deviation == 0,
+                    np.nan,
+                    (typical_price[period - 1:] - tp_ma) / (0.015 * mean_deviation),
+                )
+        return cci, {}
+    raise ValueError(f"unsupported technical alert_type: {alert_type}")
+
+
+def _extend_indicator_series(
+    alert_type: str,
+    param_key: Tuple[int, ...],
+    inputs: Dict[str, np.ndarray],
+    previous: _IndicatorEntry,
+) -> Tuple[float, Dict[str, float]]:
+    """Compute the indicator value of the newest bar from the cached state."""
+    close = inputs["close"]
+    state = previous.state
+    if alert_type == "ma_price_cross":
+        (window,) = param_key
+        return float(np.mean(close[-window:])), {}
+    if alert_type == "rsi_threshold":
+        (period,) = param_key
+        change = float(close[-1] - close[-2])
+        alpha = _ewm_alpha(alpha=1 / period)
+        avg_gain = _ewm_step(state["avg_gain"], change if change > 0 else 0.0, alpha)
+        avg_loss = _ewm_step(state["avg_loss"], -change if change < 0 else 0.0, alpha)
+        return _rsi_value(avg_gain, avg_loss), {"avg_gain": avg_gain, "avg_loss": avg_loss}
+    if alert_type == "macd_cross":
+        fast_period, slow_period, signal_period = param_key
+        price = float(close[-1])
+        ema_fast = _ewm_step(state["ema_fast"], price, _ewm_alpha(span=fast_period))
+        ema_slow = _ewm_step(state["ema_slow"], price, _ewm_alpha(span=slow_period))
+        dif = ema_fast - ema_slow
+        dea = _ewm_step(state["dea"], dif, _ewm_alpha(span=signal_period))
+        return dif - dea, {"ema_fast": ema_fast, "ema_slow": ema_slow, "dea": dea}
+    if alert_type == "kdj_cross":
+        period, k_period, d_period = param_key
+        lowest_low = float(np.min(inputs["low"][-period:]))
+        highest_high = float(np.max(inputs["high"][-period:]))
+        denominator = highest_high - lowest_low
+        rsv = (float(close[-1]) - lowest_low) / denominator * 100 if denominator != 0 else 50.0
+        k_value = _ewm_step(state["k"], rsv, _ewm_alpha(alpha=1 / k_period))
+        d_value = _ewm_step(state["d"], k_value, _ewm_alpha(alpha=1 / d_period))
+        return k_value - d_value, {"k": k_value, "d": d_value}
+    if alert_type == "cci_threshold":
+        (period,) = param_key
+        window = (inputs["high"][-period:] + inputs["low"][-period:] + close[-period:]) / 3
+        tp_ma = float(window.mean())
+        mean_deviation = float(np.abs(window - tp_ma).mean())
+        if mean_deviation == 0:
+            return float("nan"), {}
+        return (float(window[-1]) - tp_ma) / (0.015 * mean_deviation), {}
+    raise ValueError(f"unsupported technical alert_type: {alert_type}")
+
+
+def _ewm_alpha(*, span: Optional[int] = None, alpha: Optional[float] = None) -> float:
+    # pandas converts span/alpha to a center of mass first; follow the same path so
+    # one-step extensions reproduce the full ewm(adjust=False) recursion.
+    com = (span - 1) / 2.0 if span is not None else (1.0 - float(alpha)) / float(alpha)
+    return 1.0 / (1.0 + com)
+
+
+def _ewm_step(previous: float, value: float, alpha: float) -> float:
+    if previous != previous:
+        return value
+    if previous == value:
+        return previous
+    old_weight = 1.0 - alpha
+    return (old_weight * previous + alpha * value) / (old_weight + alpha)
+
+
+def _rsi_value(avg_gain: float, avg_loss: float) -> float:
+    if avg_loss == 0:
+        return 100.0 if avg_gain > 0 else 50.0
+    return 100 - (100 / (1 + avg_gain / avg_loss))
+
+
 def _ensure_required_bars_fetchable(alert_type: str, params: Dict[str, Any]) -> Dict[str, Any]:
     required_bars = compute_required_bars(alert_type, params)
     if required_bars > MAX_REQUESTED_DAYS:
@@ -409,12 +639,20 @@ def _float_in_range(
 
 
 def _calculate_rsi(close: pd.Series, period: int) -> pd.Series:
+    return _rsi_from_averages(*_wilder_averages(close, period))
+
+
+def _wilder_averages(close: pd.Series, period: int) -> Tuple[pd.Series, pd.Series]:
     delta = close.diff()
     gain = delta.where(delta > 0, 0)
     loss = -delta.where(delta < 0, 0)
     # 使用 Wilder's EMA / SMMA 口径，不使用 rolling SMA。
     avg_gain = gain.ewm(alpha=1 / period, adjust=False).mean()
     avg_loss = loss.ewm(alpha=1 / period, adjust=False).mean()
+    return avg_gain, avg_loss
+
+
+def _rsi_from_averages(avg_gain: pd.Series, avg_loss: pd.Series) -> pd.Series:
     rs = avg_gain / avg_loss
     return (100 - (100 / (1 + rs))).fillna(50)
 
@@ -7,7 +7,7 @@ import asyncio
 import json
 import logging
 import re
-from datetime import date, datetime
+from datetime import date, datetime, timedelta
 from typing import Any, Dict, List, Optional
 
 from src.agent.events import (
@@ -21,6 +21,7 @@ from src.agent.events import (
 from src.repositories.alert_repo import AlertRepository
 from src.services.alert_indicators import (
     TECHNICAL_ALERT_TYPES,
+    IndicatorCache,
     TechnicalIndicatorAlert,
     compute_requested_days,
     evaluate_indicator_alert,
@@ -78,6 +79,10 @@ SUPPORTED_ALERT_TYPES = SYMBOL_ALERT_TYPES | PORTFOLIO_ALERT_TYPES | MARKET_ALER
 SUPPORTED_TARGET_SCOPES = frozenset({"single_symbol", "watchlist", "portfolio_holdings", "portfolio_account", "market"})
 SUPPORTED_SEVERITIES = frozenset({"info", "warning", "critical"})
 NULLABLE_RULE_UPDATE_FIELDS = frozenset({"cooldown_policy", "notification_policy"})
+VOLUME_ALERT_DAILY_DAYS = 20
+# Tagged keys in the per-cycle evaluation cache (plain (stock_code, days) keys hold daily data).
+REALTIME_QUOTE_CACHE_TAG = "realtime_quote"
+DAILY_DAYS_HINT_CACHE_TAG = "daily_days"
 
 logger = logging.getLogger(__name__)
 
@@ -106,6 +111,8 @@ class AlertService:
     def __init__(self, db_manager: Optional[DatabaseManager] = None):
         self.db = db_manager or DatabaseManager.get_instance()
         self.repo = AlertRepository(self.db)
+        # Long-lived across worker cycles so unchanged bars reuse (or extend) indicator series.
+        self.indicator_cache = IndicatorCache()
 
     def create_rule(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         fields = self._normalize_rule_payload(payload)
@@ -210,11 +217,11 @@ class AlertService:
         daily_cache: Optional[Dict[Any, Any]] = None,
     ) -> Dict[str, Any]:
         if isinstance(rule, PriceAlert):
-            return await self._evaluate_price(rule, monitor)
+            return await self._evaluate_price(rule, monitor, daily_cache=daily_cache)
         if isinstance(rule, PriceChangeAlert):
-            return await self._evaluate_price_change(rule, monitor)
+            return await self._evaluate_price_change(rule, monitor, daily_cache=daily_cache)
         if isinstance(rule, VolumeAlert):
-            return await self._evaluate_volume(rule)
+            return await self._evaluate_volume(rule, daily_cache=daily_cache)
         if isinstance(rule, TechnicalIndicatorAlert):
             return await self._evaluate_technical_indicator(rule, daily_cache=daily_cache)
         if isinstance(rule, PortfolioRiskAlert):
@@ -308,10 +315,88 @@ class AlertService:
         }
         return response
 
-    async def _evaluate_price(self, rule: PriceAlert, monitor: EventMonitor) -> Dict[str, Any]:
+    @staticmethod
+    def _daily_days_for_rule(rule) -> Optional[int]:
+        """Return how many days of daily history ``rule`` requests, or None if it needs none."""
+        if isinstance(rule, VolumeAlert):
+            return VOLUME_ALERT_DAILY_DAYS
+        if isinstance(rule, TechnicalIndicatorAlert):
+            return compute_requested_days(rule.alert_type, rule.indicator_params)
+        return None
+
+    async def _get_realtime_quote(
+        self,
+        stock_code: str,
+        monitor: EventMonitor,
+        daily_cache: Optional[Dict[Any, Any]] = None,
+    ) -> Any:
+        if daily_cache is None:
+            return await monitor._get_realtime_quote(stock_code)
+        cache_key = (REALTIME_QUOTE_CACHE_TAG, stock_code)
+        if cache_key not in daily_cache:
+            daily_cache[cache_key] = await monitor._get_realtime_quote(stock_code)
+        return daily_cache[cache_key]
+
+    async def _get_daily_data(
+        self,
+        stock_code: str,
+        days: int,
+        daily_cache: Optional[Dict[Any, Any]] = None,
+    ) -> Any:
+        """Fetch daily history once per symbol and cycle.
+
+        When the cache carries a wider ``daily_days`` hint for the symbol, the
+        widest window is fetched once and narrower requests are trimmed from it.
+        """
+
+        def _fetch_daily_data(fetch_days: int):
+            from data_provider import get_fetcher_manager
+
+            return get_fetcher_manager().get_daily_data(stock_code, days=fetch_days)
+
+        if daily_cache is None:
+            return await asyncio.to_thread(_fetch_daily_data, days)
+        cache_key = (stock_code, days)
+        if cache_key in daily_cache:
+            return daily_cache[cache_key]
+
+        fetch_days = max(days, int(daily_cache.get((DAILY_DAYS_HINT_CACHE_TAG, stock_code)) or days))
+        wide_key = (stock_code, fetch_days)
+        if wide_key not in daily_cache:
+            daily_cache[wide_key] = await asyncio.to_thread(_fetch_daily_data, fetch_days)
+        result = daily_cache[wide_key]
+        if fetch_days != days:
+            result = self._trim_daily_result(result, days)
+            daily_cache[cache_key] = result
+        return result
+
+    @staticmethod
+    def _trim_daily_result(result: Any, days: int) -> Any:
+        """Trim a wider daily frame to the ``days * 2`` calendar window get_daily_data would request."""
+        if not isinstance(result, tuple) or len(result) != 2:
+            return result
+        df, source = result
+        if df is None or getattr(df, "empty", True) or "date" not in df:
+            return result
+        import pandas as pd
+
+        dates = pd.to_datetime(df["date"], errors="coerce")
+        latest = dates.max()
+        if pd.isna(latest):
+            return result
+        window_start = latest - timedelta(days=days * 2)
+        return df.loc[dates >= window_start], source
+
+    async def _evaluate_price(
+        self,
+        rule: PriceAlert,
+        monitor: EventMonitor,
+        *,
+        daily_cache: Optional[Dict[Any, Any]] = None,
+    ) -> Dict[str, Any]:
         threshold = float(rule.price)
         try:
-            quote = await monitor._get_realtime_quote(rule.stock_code)
+            quote = await self._get_realtime_quote(rule.stock_code, monitor, daily_cache)
         except Exception as exc:
             return self._evaluation_error(
                 rule,
@@ -372,10 +457,16 @@ class AlertService:
             data_timestamp=self._extract_quote_datetime(quote),
         )
 
-    async def _evaluate_price_change(self, rule: PriceChangeAlert, monitor: EventMonitor) -> Dict[str, Any]:
+    async def _evaluate_price_change(
+        self,
+        rule: PriceChangeAlert,
+        monitor: EventMonitor,
+        *,
+        daily_cache: Optional[Dict[Any, Any]] = None,
+    ) -> Dict[str, Any]:
         threshold = abs(float(rule.change_pct))
         try:
-            quote = await monitor._get_realtime_quote(rule.stock_code)
+            quote = await self._get_realtime_quote(rule.stock_code, monitor, daily_cache)
         except Exception as exc:
             return self._evaluation_error(
                 rule,
@@ -434,14 +525,14 @@ class AlertService:
             data_timestamp=self._extract_quote_datetime(quote),
         )
 
-    async def _evaluate_volume(self, rule: VolumeAlert) -> Dict[str, Any]:
-        def _fetch_daily_data():
-            from data_provider import DataFetcherManager
-
-            return DataFetcherManager().get_daily_data(rule.stock_code, days=20)
-
+    async def _evaluate_volume(
+        self,
+        rule: VolumeAlert,
+        *,
+        daily_cache: Optional[Dict[Any, Any]] = None,
+    ) -> Dict[str, Any]:
         try:
-            result = await asyncio.to_thread(_fetch_daily_data)
+            result = await self._get_daily_data(rule.stock_code, VOLUME_ALERT_DAILY_DAYS, daily_cache)
         except Exception as exc:
             return self._evaluation_error(rule, exc, data_source="daily_data")
         if result is None:
@@ -528,20 +619,9 @@ class AlertService:
         daily_cache: Optional[Dict[tuple[str, int], Any]] = None,
     ) -> Dict[str, Any]:
         requested_days = compute_requested_days(rule.alert_type, rule.indicator_params)
-        cache_key = (rule.stock_code, requested_days)
-
-        def _fetch_daily_data():
-            from data_provider import DataFetcherManager
-
-            return DataFetcherManager().get_daily_data(rule.stock_code, days=requested_days)
 
         try:
-            if daily_cache is not None and cache_key in daily_cache:
-                result = daily_cache[cache_key]
-            else:
-                result = await asyncio.to_thread(_fetch_daily_data)
-                if daily_cache is not None:
-                    daily_cache[cache_key] = result
+            result = await self._get_daily_data(rule.stock_code, requested_days, daily_cache)
         except Exception as exc:
             return self._evaluation_error(rule, exc, data_source="daily_data")
 
@@ -573,7 +653,13 @@ class AlertService:
             )
 
         try:
-            evaluation = evaluate_indicator_alert(rule.alert_type, rule.stock_code, rule.indicator_params, df)
+            evaluation = evaluate_indicator_alert(
+                rule.alert_type,
+                rule.stock_code,
+                rule.indicator_params,
+                df,
+                indicator_cache=self.indicator_cache,
+            )
         except ValueError as exc:
             return self._not_triggered(
                 rule,
@@ -31,7 +31,7 @@ from src.market_phase_summary import (
     format_public_phase_pack_excerpt,
     render_market_phase_summary,
 )
-from src.services.alert_service import AlertService
+from src.services.alert_service import DAILY_DAYS_HINT_CACHE_TAG, AlertService
 from src.services.decision_signal_service import DecisionSignalService
 from src.services.decision_signal_summary import (
     format_decision_signal_excerpt,
@@ -48,6 +48,8 @@ if TYPE_CHECKING:
 ALERT_WORKER_FINGERPRINT_TTL_SECONDS = 24 * 60 * 60
 DEFAULT_DB_ALERT_COOLDOWN_SECONDS = 24 * 60 * 60
 ALERT_WORKER_RULE_LIMIT = 1000
+ALERT_WORKER_EVALUATION_CONCURRENCY = 8
+ALERT_WORKER_QUOTE_PREFETCH_MIN_SYMBOLS = 5
 WRITABLE_TRIGGER_STATUSES = frozenset({"triggered", "skipped", "degraded", "failed"})
 
 
@@ -140,26 +142,10 @@ class AlertWorker:
             logger.info("[AlertWorker] No active alert rules loaded")
             return stats
 
-        monitor = EventMonitor()
-        daily_cache: Dict[Any, Any] = {}
         self._analysis_visibility_cache = {}
-        for runtime_rule in runtime_rules:
+        results = self._evaluate_cycle(runtime_rules)
+        for runtime_rule, result in zip(runtime_rules, results):
             stats["evaluated"] += 1
-            try:
-                result = asyncio.run(self.service._evaluate_rule(runtime_rule.rule, monitor, daily_cache=daily_cache))
-            except Exception as exc:
-                result = {
-                    "rule_id": self.service._runtime_rule_id(runtime_rule.rule),
-                    "record_status": "failed",
-                    "triggered": False,
-                    "observed_value": None,
-                    "threshold": self.service._threshold_for_rule(runtime_rule.rule),
-                    "data_source": self.service._data_source_for_rule(runtime_rule.rule),
-                    "data_timestamp": None,
-                    "reason": self.service._sanitize_text(str(exc) or "Alert evaluation failed"),
-                    "message": self.service._sanitize_text(str(exc) or "Alert evaluation failed"),
-                }
-
             record_status = result.get("record_status")
             if record_status == "triggered":
                 self._attach_decision_signal_summary_safely(runtime_rule, result)
@@ -200,6 +186,95 @@ class AlertWorker:
 
         return stats
 
+    def _evaluate_cycle(self, runtime_rules: List[RuntimeAlertRule]) -> List[Dict[str, Any]]:
+        """Evaluate every rule of one cycle on a single event loop.
+
+        Results keep the order of ``runtime_rules``; trigger writes and
+        notifications stay sequential in ``run_once``.
+        """
+        started_at = time.monotonic()
+        try:
+            results = asyncio.run(self._evaluate_rules(runtime_rules))
+        except Exception as exc:
+            logger.warning("[AlertWorker] Alert evaluation cycle failed: %s", exc)
+            return [self._evaluation_failure(runtime_rule.rule, exc) for runtime_rule in runtime_rules]
+        logger.info(
+            "[AlertWorker] Evaluated %d alert rules in %.2fs",
+            len(runtime_rules),
+            time.monotonic() - started_at,
+        )
+        return results
+
+    async def _evaluate_rules(self, runtime_rules: List[RuntimeAlertRule]) -> List[Dict[str, Any]]:
+        """Evaluate rules grouped by stock code with bounded concurrency.
+
+        Rules on the same symbol run back to back inside one group so a single
+        realtime quote and a single (widest) daily-history fetch serve all of
+        them through the shared cycle cache; groups run concurrently.
+        """
+        monitor = EventMonitor()
+        daily_cache: Dict[Any, Any] = {}
+        groups: Dict[Any, List[int]] = {}
+        quote_symbols: List[str] = []
+        for index, runtime_rule in enumerate(runtime_rules):
+            rule = runtime_rule.rule
+            stock_code = getattr(rule, "stock_code", None)
+            groups.setdefault(stock_code or ("rule", index), []).append(index)
+            if not stock_code:
+                continue
+            if isinstance(rule, (PriceAlert, PriceChangeAlert)) and stock_code not in quote_symbols:
+                quote_symbols.append(stock_code)
+            days = self.service._daily_days_for_rule(rule)
+            if days is not None:
+                hint_key = (DAILY_DAYS_HINT_CACHE_TAG, stock_code)
+                daily_cache[hint_key] = max(days, daily_cache.get(hint_key, 0))
+
+        if len(quote_symbols) >= ALERT_WORKER_QUOTE_PREFETCH_MIN_SYMBOLS:
+            await self._prefetch_realtime_quotes(quote_symbols)
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(runtime_rules)
+        semaphore = asyncio.Semaphore(ALERT_WORKER_EVALUATION_CONCURRENCY)
+
+        async def _evaluate_group(indexes: List[int]) -> None:
+            async with semaphore:
+                for index in indexes:
+                    rule = runtime_rules[index].rule
+                    try:
+                        results[index] = await self.service._evaluate_rule(rule, monitor, daily_cache=daily_cache)
+                    except Exception as exc:
+                        results[index] = self._evaluation_failure(rule, exc)
+
+        await asyncio.gather(*(_evaluate_group(indexes) for indexes in groups.values()))
+        return [result or {} for result in results]
+
+    @staticmethod
+    async def _prefetch_realtime_quotes(stock_codes: List[str]) -> None:
+        def _prefetch() -> int:
+            from data_provider import get_fetcher_manager
+
+            return get_fetcher_manager().prefetch_realtime_quotes(stock_codes)
+
+        try:
+            prefetched = await asyncio.to_thread(_prefetch)
+        except Exception as exc:
+            logger.warning("[AlertWorker] Realtime quote prefetch failed: %s", exc)
+            return
+        logger.debug("[AlertWorker] Prefetched realtime quotes for %s symbols", prefetched)
+
+    def _evaluation_failure(self, rule: Any, exc: Exception) -> Dict[str, Any]:
+        message = self.service._sanitize_text(str(exc) or "Alert evaluation failed")
+        return {
+            "rule_id": self.service._runtime_rule_id(rule),
+            "record_status": "failed",
+            "triggered": False,
+            "observed_value": None,
+            "threshold": self.service._threshold_for_rule(rule),
+            "data_source": self.service._data_source_for_rule(rule),
+            "data_timestamp": None,
+            "reason": message,
+            "message": message,
+        }
+
     def _load_runtime_rules(self, config: Any) -> List[RuntimeAlertRule]:
         runtime_rules: List[RuntimeAlertRule] = []
         seen_keys = set()
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""Named concurrency budgets shared by analysis runs.
+
+Analysis threads no longer share one cap: each data source (keyed by fetcher
+name) and each LLM model channel gets its own limit, so a long watchlist can
+keep the LLM busy while every upstream still sees at most its own budget.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from src.services.run_diagnostics import record_budget_wait
+
+logger = logging.getLogger(__name__)
+
+DATA_SOURCE_BUDGET = "data_source"
+LLM_BUDGET = "llm"
+
+DEFAULT_DATA_SOURCE_MAX_CONCURRENCY = 3
+DEFAULT_LLM_MAX_CONCURRENCY = 4
+MAX_LLM_MAX_CONCURRENCY = 32
+
+
+@dataclass
+class _BudgetState:
+    limit: int
+    active: int = 0
+    waiting: int = 0
+    acquired: int = 0
+    total_wait_ms: int = 0
+    max_wait_ms: int = 0
+    max_queue_depth: int = 0
+
+    def to_dict(self, kind: str, key: str) -> Dict[str, Any]:
+        return {
+            "budget": kind,
+            "key": key,
+            "limit": self.limit,
+            "active": self.active,
+            "waiting": self.waiting,
+            "acquired": self.acquired,
+            "total_wait_ms": self.total_wait_ms,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
+class ConcurrencyBudgets:
+    """Per-(kind, key) counting slots with queue-depth and wait accounting.
+
+    Limits are passed on every acquire so runtime config changes apply to the
+    next caller without rebuilding the registry.
+    """
+
+    def __init__(self) -> None:
+        self._condition = threading.Condition()
+        self._states: Dict[Tuple[str, str], _BudgetState] = {}
+
+    @contextmanager
+    def slot(self, kind: str, key: str, limit: int) -> Iterator[None]:
+        normalized_limit = max(1, int(limit or 1))
+        # Keys must stay sortable for snapshot(); model names can arrive as
+        # arbitrary objects from callers and provider configs.
+        budget_key = (kind, str(key) if key else "unknown")
+        started_at = time.monotonic()
+        with self._condition:
+            state = self._states.get(budget_key)
+            if state is None:
+                state = _BudgetState(limit=normalized_limit)
+                self._states[budget_key] = state
+            state.limit = normalized_limit
+            state.waiting += 1
+            queue_depth = state.waiting
+            state.max_queue_depth = max(state.max_queue_depth, queue_depth)
+            try:
+                self._condition.wait_for(lambda: state.active < state.limit)
+            finally:
+                state.waiting -= 1
+            state.active += 1
+            wait_ms = int((time.monotonic() - started_at) * 1000)
+            state.acquired += 1
+            state.total_wait_ms += wait_ms
+            state.max_wait_ms = max(state.max_wait_ms, wait_ms)
+        if wait_ms > 0:
+            logger.debug("[budget] %s:%s waited %sms (queue depth %s)", kind, budget_key[1], wait_ms, queue_depth)
+        record_budget_wait(budget=kind, key=budget_key[1], wait_ms=wait_ms, queue_depth=queue_depth)
+        try:
+            yield
+        finally:
+            with self._condition:
+                state.active -= 1
+                self._condition.notify_all()
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        with self._condition:
+            return [state.to_dict(kind, key) for (kind, key), state in sorted(self._states.items())]
+
+
+_BUDGETS = ConcurrencyBudgets()
+
+
+def _positive_int(value: Any, default: int) -> int:
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
+def _runtime_config(config: Optional[Any]) -> Any:
+    if config is not None:
+        return config
+    from src.config import get_config
+
+    return get_config()
+
+
+def resolve_data_source_limit(config: Optional[Any] = None) -> int:
+    """Return the per-data-source concurrency limit."""
+    return _positive_int(
+        getattr(_runtime_config(config), "data_source_max_concurrency", None),
+        DEFAULT_DATA_SOURCE_MAX_CONCURRENCY,
+    )
+
+
+def resolve_llm_limit(config: Optional[Any] = None) -> int:
+    """Return the per-model-channel LLM concurrency limit."""
+    limit = _positive_int(
+        getattr(_runtime_config(config), "llm_max_concurrency", None),
+        DEFAULT_LLM_MAX_CONCURRENCY,
+    )
+    return min(limit, MAX_LLM_MAX_CONCURRENCY)
+
+
+def resolve_analysis_worker_count(io_workers: int, config: Optional[Any] = None) -> int:
+    """Size a per-stock analysis pool.
+
+    ``io_workers`` (``MAX_WORKERS``) stocks may be in their data stages while
+    another ``LLM_MAX_CONCURRENCY`` wait on or hold LLM slots; upstream and
+    model limits are enforced by the budgets, not by the pool size.
+    """
+    return max(1, int(io_workers or 1)) + resolve_llm_limit(config)
+
+
+@contextmanager
+def data_source_slot(provider: str, config: Optional[Any] = None) -> Iterator[None]:
+    """Hold one concurrency slot of ``provider`` (a fetcher name)."""
+    with _BUDGETS.slot(DATA_SOURCE_BUDGET, provider, resolve_data_source_limit(config)):
+        yield
+
+
+@contextmanager
+def llm_slot(model: Optional[str], config: Optional[Any] = None) -> Iterator[None]:
+    """Hold one concurrency slot of the LLM channel serving ``model``."""
+    with _BUDGETS.slot(LLM_BUDGET, model or "default", resolve_llm_limit(config)):
+        yield
+
+
+def budget_snapshot() -> List[Dict[str, Any]]:
+    """Return process-wide queue depth and wait totals for every budget."""
+    return _BUDGETS.snapshot()
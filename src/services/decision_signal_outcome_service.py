@@ -3,6 +3,7 @@
 
 from __future__ import annotations
 
+from bisect import bisect_right
 from collections import Counter, defaultdict
 from datetime import date, datetime
 import json
@@ -78,6 +79,22 @@ PROFILE_CALIBRATION_BREAKDOWN_DIMENSIONS = (
 )
 
 
+class _DailyBarWindow:
+    """In-memory daily bars of one stock, answering anchor and forward-window lookups."""
+
+    def __init__(self, bars: Iterable[Any]):
+        self._bars = sorted(bars, key=lambda bar: bar.date)
+        self._dates = [bar.date for bar in self._bars]
+        self._by_date = {bar.date: bar for bar in self._bars}
+
+    def on_date(self, target_date: date) -> Optional[Any]:
+        return self._by_date.get(target_date)
+
+    def forward(self, analysis_date: date, eval_window_days: int) -> List[Any]:
+        start = bisect_right(self._dates, analysis_date)
+        return self._bars[start:start + max(0, int(eval_window_days))]
+
+
 class DecisionSignalOutcomeService:
     """Business logic for signal outcomes, stats, and feedback."""
 
@@ -147,25 +164,42 @@ class DecisionSignalOutcomeService:
         updated_count = 0
         skipped_count = 0
 
+        existing_by_key: Dict[Tuple[int, str], DecisionSignalOutcomeRecord] = {
+            (int(row.signal_id), row.horizon): row
+            for row in self.repo.list_outcomes_for_signals(
+                signal_ids=[int(signal.id) for signal in signals],
+                engine_version=DECISION_SIGNAL_OUTCOME_ENGINE_VERSION,
+            )
+        }
+        # Slots keep the signal x horizon order of items while evaluations are batched.
+        item_slots: List[Any] = []
+        pending: List[Tuple[DecisionSignalRecord, str]] = []
         for signal in signals:
             for horizon in self._horizons_for_signal(signal, horizons_norm):
-                existing = self.repo.get_outcome(
-                    signal_id=signal.id,
-                    horizon=horizon,
-                    engine_version=DECISION_SIGNAL_OUTCOME_ENGINE_VERSION,
-                )
+                existing = existing_by_key.get((int(signal.id), horizon))
                 if existing is not None and not force and not self._should_recompute_outcome(existing):
                     skipped_count += 1
-                    items.append(self._serialize_outcome(existing))
+                    item_slots.append(existing)
                     continue
+                item_slots.append(None)
+                pending.append((signal, horizon))
 
-                fields = self._evaluate_signal_horizon(signal, horizon)
-                row, created = self.repo.upsert_outcome(fields)
-                if created:
-                    created_count += 1
-                else:
-                    updated_count += 1
-                items.append(self._serialize_outcome(row))
+        bar_windows = self._load_bar_windows(pending)
+        fields_list = [
+            self._evaluate_signal_horizon(signal, horizon, bars=bar_windows.get(signal.stock_code))
+            for signal, horizon in pending
+        ]
+        upserted = iter(self.repo.upsert_outcomes(fields_list))
+        for slot in item_slots:
+            if slot is not None:
+                items.append(self._serialize_outcome(slot))
+                continue
+            row, created = next(upserted)
+            if created:
+                created_count += 1
+            else:
+                updated_count += 1
+            items.append(self._serialize_outcome(row))
 
         return {
             "items": items,
@@ -397,7 +431,41 @@ class DecisionSignalOutcomeService:
         row = self.repo.upsert_feedback(fields)
         return self._serialize_feedback(row)
 
-    def _evaluate_signal_horizon(self, signal: DecisionSignalRecord, horizon: str) -> Dict[str, Any]:
+    def _load_bar_windows(
+        self,
+        pending: List[Tuple[DecisionSignalRecord, str]],
+    ) -> Dict[str, "_DailyBarWindow"]:
+        """Load each stock's bars once, covering every anchor and the longest horizon."""
+        anchors_by_code: Dict[str, set] = defaultdict(set)
+        window_days_by_code: Dict[str, int] = defaultdict(int)
+        for signal, horizon in pending:
+            eval_days = SUPPORTED_OUTCOME_HORIZONS.get(horizon)
+            if self._direction_for_action(signal.action) is None or eval_days is None:
+                continue
+            anchor_date = self._anchor_date(signal)
+            if anchor_date is None:
+                continue
+            anchors_by_code[signal.stock_code].add(anchor_date)
+            window_days_by_code[signal.stock_code] = max(window_days_by_code[signal.stock_code], eval_days)
+
+        return {
+            code: _DailyBarWindow(
+                self.stock_repo.get_bars_for_anchor_window(
+                    code=code,
+                    anchor_dates=anchors,
+                    eval_window_days=window_days_by_code[code],
+                )
+            )
+            for code, anchors in anchors_by_code.items()
+        }
+
+    def _evaluate_signal_horizon(
+        self,
+        signal: DecisionSignalRecord,
+        horizon: str,
+        *,
+        bars: Optional["_DailyBarWindow"] = None,
+    ) -> Dict[str, Any]:
         base = self._snapshot_fields(signal, horizon)
         direction = self._direction_for_action(signal.action)
         if direction is None:
@@ -411,7 +479,10 @@ class DecisionSignalOutcomeService:
         if anchor_date is None:
             return self._unable_fields(base, reason="missing_anchor_date", direction_expected=direction)
 
-        start_bar = self.stock_repo.get_daily_on_date(code=signal.stock_code, target_date=anchor_date)
+        if bars is not None:
+            start_bar = bars.on_date(anchor_date)
+        else:
+            start_bar = self.stock_repo.get_daily_on_date(code=signal.stock_code, target_date=anchor_date)
         start_price = getattr(start_bar, "close", None)
         if start_price is None:
             return self._unable_fields(
@@ -431,11 +502,14 @@ class DecisionSignalOutcomeService:
                 start_price=start_price,
             )
 
-        forward_bars = self.stock_repo.get_forward_bars(
-            code=signal.stock_code,
-            analysis_date=anchor_date,
-            eval_window_days=eval_days,
-        )
+        if bars is not None:
+            forward_bars = bars.forward(anchor_date, eval_days)
+        else:
+            forward_bars = self.stock_repo.get_forward_bars(
+                code=signal.stock_code,
+                analysis_date=anchor_date,
+                eval_window_days=eval_days,
+            )
         evaluation = BacktestEngine.evaluate_decision_signal(
             direction_expected=direction,
             anchor_date=anchor_date,
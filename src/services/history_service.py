@@ -10,6 +10,8 @@ Responsibilities:
 3. Generate detailed reports in Markdown format
 """
 from __future__ import annotations
+import base64
+import binascii
 import json
 import logging
 from datetime import date, datetime, timedelta
@@ -72,6 +74,10 @@ class MarkdownReportGenerationError(Exception):
         super().__init__(self.message)
 
 
+class InvalidHistoryCursorError(ValueError):
+    """Raised when a history list cursor cannot be decoded."""
+
+
 class HistoryService:
     """
     History Query Service
@@ -171,6 +177,24 @@ class HistoryService:
 
         return candidates
     
+    @staticmethod
+    def _encode_history_cursor(created_at: Optional[datetime], record_id: int) -> Optional[str]:
+        """Encode the (created_at, id) keyset position of a list row as an opaque token."""
+        if created_at is None:
+            return None
+        raw = f"{created_at.isoformat()}|{int(record_id)}"
+        return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+    @staticmethod
+    def _decode_history_cursor(cursor: str) -> Tuple[datetime, int]:
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            raw = base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8")
+            created_at_text, record_id = raw.rsplit("|", 1)
+            return datetime.fromisoformat(created_at_text), int(record_id)
+        except (binascii.Error, UnicodeError, ValueError) as exc:
+            raise InvalidHistoryCursorError(f"无效的 cursor: {cursor}") from exc
+
     def get_history_list(
         self,
         stock_code: Optional[str] = None,
@@ -178,22 +202,32 @@ class HistoryService:
         start_date: Optional[str] = None,
         end_date: Optional[str] = None,
         page: int = 1,
-        limit: int = 20
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        include_total: bool = True,
     ) -> Dict[str, Any]:
         """
         Get history analysis list.
+
+        Rows come from the lightweight summary projection, so report blobs are
+        never loaded. Passing ``cursor`` (the previous page's ``next_cursor``)
+        switches to keyset pagination on ``(created_at, id)`` and ignores
+        ``page``; the total is a short-lived cached count.
         
         Args:
             stock_code: Stock code filter
             report_type: Report type filter
             start_date: Start date (YYYY-MM-DD)
             end_date: End date (YYYY-MM-DD)
-            page: Page number
+            page: Page number (used only without cursor)
             limit: Items per page
+            cursor: Keyset cursor returned as ``next_cursor`` by the previous page
+            include_total: Whether to compute the (cached) total count
             
         Returns:
-            Dictionary containing total count and items
+            Dictionary containing total count, items and next_cursor
         """
+        before = self._decode_history_cursor(cursor) if cursor else None
         try:
             if stock_code:
                 stock_code = self._history_code_filter_candidates(stock_code)
@@ -213,28 +247,39 @@ class HistoryService:
                     end_dt = datetime.strptime(end_date, "%Y-%m-%d").date()
                 except ValueError:
                     logger.warning(f"无效的 end_date 格式: {end_date}")
-            
-            # Calculate offset
-            offset = (page - 1) * limit
-            
-            # Use new paginated query method
-            records, total = self.db.get_analysis_history_paginated(
+
+            offset = 0 if before is not None else (page - 1) * limit
+
+            # Fetch one extra row to know whether another page exists
+            records = self.db.get_analysis_history_summaries(
                 code=stock_code,
                 report_type=report_type,
                 start_date=start_dt,
                 end_date=end_dt,
+                before=before,
                 offset=offset,
-                limit=limit
+                limit=limit + 1,
             )
-            
-            # Convert to response format
-            items = []
-            for record in records:
-                items.append(self._record_to_list_item_dict(record))
-            
+            has_more = len(records) > limit
+            records = records[:limit]
+
+            total = None
+            if include_total:
+                total = self.db.count_analysis_history(
+                    code=stock_code,
+                    report_type=report_type,
+                    start_date=start_dt,
+                    end_date=end_dt,
+                )
+
+            next_cursor = None
+            if has_more and records:
+                next_cursor = self._encode_history_cursor(records[-1].created_at, records[-1].id)
+
             return {
                 "total": total,
-                "items": items,
+                "items": [self._record_to_list_item_dict(record) for record in records],
+                "next_cursor": next_cursor,
             }
             
         except Exception as e:
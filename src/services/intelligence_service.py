@@ -10,7 +10,8 @@ import logging
 import re
 import socket
 import threading
-from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from email.utils import parsedate_to_datetime
 from typing import Any, Callable, Dict, List, Optional
@@ -34,8 +35,13 @@ _MAX_FEED_BYTES = 2 * 1024 * 1024
 _MAX_FEED_REDIRECTS = 5
 _UPSTREAM_FETCH_FAILURE_MESSAGE = "fetch failed: upstream request failed"
 _REDIRECT_STATUS_CODES = {301, 302, 303, 307, 308}
+_NOT_MODIFIED_STATUS_CODE = 304
 _DISABLE_REQUEST_PROXIES = {"http": None, "https": None}
 _DNS_GUARD_LOCK = threading.Lock()
+_DNS_GUARD_TARGET = threading.local()
+_DNS_GUARD_STATE: Dict[str, Any] = {"users": 0, "original": None}
+_FETCH_MAX_WORKERS = 16
+_FETCH_PER_HOST_CONCURRENCY = 2
 _AUTO_FETCH_MIN_INTERVAL_SECONDS = 60 * 60
 _BUILTIN_SOURCE_TEMPLATES = [
     {
@@ -119,6 +125,16 @@ class FeedEntry:
     raw_payload: Dict[str, Any]
 
 
+@dataclass(frozen=True)
+class _FeedFetch:
+    """One download: parsed entries, or ``not_modified`` plus the validators to store."""
+
+    entries: List[FeedEntry] = field(default_factory=list)
+    not_modified: bool = False
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
 class IntelligenceService:
     """Fetch, validate, persist and query configurable intelligence sources."""
 
@@ -260,55 +276,126 @@ class IntelligenceService:
             raise IntelligenceServiceError(f"Intelligence source not found: {source_id}")
         if not source.enabled:
             raise IntelligenceServiceError(f"Intelligence source is disabled: {source_id}")
-        now = datetime.now()
         try:
-            entries = self._fetch_feed_entries(self._source_to_fields(source), limit=self.config.news_intel_max_items_per_source)
-            item_fields = [self._entry_to_item_fields(entry, source, now) for entry in entries]
-            saved = 0 if dry_run else self.repo.upsert_items(item_fields)
-            deleted = 0 if dry_run else self.repo.apply_retention(self.config.news_intel_retention_days)
-            if not dry_run:
-                self.repo.update_source_status(source.id, status="success", error=None, fetched_at=now)
-            return {
-                "ok": True,
-                "source_id": source.id,
-                "fetched_count": len(entries),
-                "saved_count": saved,
-                "retention_deleted": deleted,
-                "dry_run": dry_run,
-                "sample_items": [self._feed_entry_to_dict(entry) for entry in entries[:5]],
-            }
+            fetch = self._download_source(source, conditional=not dry_run)
+            return self._store_source_fetch(source, fetch, now=datetime.now(), dry_run=dry_run)
         except Exception as exc:
-            error = self._sanitize_error(exc)
-            if not dry_run:
-                self.repo.update_source_status(source.id, status="failed", error=error)
-            logger.warning("Intelligence source fetch failed id=%s name=%s: %s", source.id, source.name, error)
+            self._record_source_failure(source, exc, dry_run=dry_run)
             raise
 
     def fetch_enabled_sources(self) -> Dict[str, Any]:
-        rows, total = self.repo.list_sources(enabled=True, page=1, page_size=100)
-        results = []
+        sources = []
         page = 1
-        source_count = 0
-        while True:
-            for row in rows:
-                source_count += 1
-                try:
-                    results.append(self.fetch_source(row.id))
-                except Exception as exc:
-                    results.append({"ok": False, "source_id": row.id, "error": self._sanitize_error(exc)})
-            if source_count >= total:
+        rows, total = self.repo.list_sources(enabled=True, page=page, page_size=100)
+        while rows:
+            sources.extend(rows)
+            if len(sources) >= total:
                 break
             page += 1
             rows, _ = self.repo.list_sources(enabled=True, page=page, page_size=100)
-            if not rows:
-                break
+
+        # Downloads run concurrently (bounded per host); results are persisted
+        # here, on the calling thread, so SQLite sees a single writer.  Hosts are
+        # submitted round-robin so workers waiting on one busy host do not
+        # starve the others.
+        by_host: Dict[str, List[IntelligenceSource]] = {}
+        for row in sources:
+            by_host.setdefault(self._source_host(row), []).append(row)
+        host_slots = {host: threading.Semaphore(_FETCH_PER_HOST_CONCURRENCY) for host in by_host}
+        submit_order = [
+            host_rows[index]
+            for index in range(max((len(host_rows) for host_rows in by_host.values()), default=0))
+            for host_rows in by_host.values()
+            if index < len(host_rows)
+        ]
+
+        def download(row: IntelligenceSource) -> _FeedFetch:
+            with host_slots[self._source_host(row)]:
+                return self._download_source(row, conditional=True)
+
+        results = []
+        now = datetime.now()
+        with ThreadPoolExecutor(max_workers=max(1, min(_FETCH_MAX_WORKERS, len(sources))), thread_name_prefix="intel-fetch") as pool:
+            submitted = {id(row): pool.submit(download, row) for row in submit_order}
+            futures = [(row, submitted[id(row)]) for row in sources]
+            for row, future in futures:
+                try:
+                    results.append(self._store_source_fetch(row, future.result(), now=now, apply_retention=False))
+                except Exception as exc:
+                    self._record_source_failure(row, exc)
+                    results.append({"ok": False, "source_id": row.id, "error": self._sanitize_error(exc)})
+        retention_deleted = self.repo.apply_retention(self.config.news_intel_retention_days) if sources else 0
         return {
             "ok": True,
-            "source_count": source_count,
+            "source_count": len(sources),
             "results": results,
             "saved_count": sum(int(item.get("saved_count") or 0) for item in results),
+            "retention_deleted": retention_deleted,
+        }
+
+    def _download_source(self, source: IntelligenceSource, *, conditional: bool) -> _FeedFetch:
+        return self._fetch_feed(
+            self._source_to_fields(source),
+            limit=self.config.news_intel_max_items_per_source,
+            etag=source.http_etag if conditional else None,
+            last_modified=source.http_last_modified if conditional else None,
+        )
+
+    def _store_source_fetch(
+        self,
+        source: IntelligenceSource,
+        fetch: _FeedFetch,
+        *,
+        now: datetime,
+        dry_run: bool = False,
+        apply_retention: bool = True,
+    ) -> Dict[str, Any]:
+        entries = list({entry.url: entry for entry in fetch.entries}.values())
+        saved = 0
+        deleted = 0
+        if not dry_run:
+            item_fields = [self._entry_to_item_fields(entry, source, now) for entry in entries]
+            known_urls = self.repo.refresh_known_items(
+                source_id=source.id,
+                source_type=source.source_type,
+                scope_type=source.scope_type,
+                scope_value=source.scope_value,
+                market=source.market,
+                items=item_fields,
+                fetched_at=now,
+            )
+            new_items = [fields for fields in item_fields if fields["url"] not in known_urls]
+            if new_items:
+                saved = self.repo.upsert_items(new_items)
+            if apply_retention:
+                deleted = self.repo.apply_retention(self.config.news_intel_retention_days)
+            self.repo.update_source_status(
+                source.id,
+                status="success",
+                error=None,
+                fetched_at=now,
+                http_validators=(fetch.etag, fetch.last_modified),
+            )
+        return {
+            "ok": True,
+            "source_id": source.id,
+            "fetched_count": len(fetch.entries),
+            "saved_count": saved,
+            "retention_deleted": deleted,
+            "not_modified": fetch.not_modified,
+            "dry_run": dry_run,
+            "sample_items": [self._feed_entry_to_dict(entry) for entry in fetch.entries[:5]],
         }
 
+    def _record_source_failure(self, source: IntelligenceSource, exc: Exception, *, dry_run: bool = False) -> None:
+        error = self._sanitize_error(exc)
+        if not dry_run:
+            self.repo.update_source_status(source.id, status="failed", error=error)
+        logger.warning("Intelligence source fetch failed id=%s name=%s: %s", source.id, source.name, error)
+
+    def _source_host(self, source: IntelligenceSource) -> str:
+        return self._normalize_hostname(urlparse(source.url or "").hostname)
+
     def refresh_auto_sources(self, *, force: bool = False) -> Dict[str, Any]:
         """Fail-open runtime refresh for opt-in local intelligence evidence."""
         if not getattr(self.config, "news_intel_auto_fetch_enabled", False):
@@ -445,11 +532,21 @@ class IntelligenceService:
         )
 
     def _fetch_feed_entries(self, fields: Dict[str, Any], *, limit: int) -> List[FeedEntry]:
+        return self._fetch_feed(fields, limit=limit).entries
+
+    def _fetch_feed(
+        self,
+        fields: Dict[str, Any],
+        *,
+        limit: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> _FeedFetch:
         if fields["source_type"] == "newsnow":
-            return self._fetch_newsnow_entries(fields, limit=limit)
+            return self._fetch_newsnow_entries(fields, limit=limit, etag=etag, last_modified=last_modified)
 
         timeout = max(1, min(float(self.config.news_intel_fetch_timeout_sec), 30.0))
-        headers = {"User-Agent": "daily-stock-analysis-intel/1.0"}
+        headers = {"User-Agent": "daily-stock-analysis-intel/1.0", **self._conditional_headers(etag, last_modified)}
         self._validate_url(fields["url"])
         request_url = fields["url"]
         response = None
@@ -463,6 +560,8 @@ class IntelligenceService:
                     stream=True,
                 )
                 status_code = int(getattr(response, "status_code", 200))
+                if status_code == _NOT_MODIFIED_STATUS_CODE:
+                    return self._not_modified_fetch(response, etag, last_modified)
                 if status_code in _REDIRECT_STATUS_CODES:
                     location = getattr(response, "headers", {}).get("Location")
                     if not location:
@@ -493,7 +592,10 @@ class IntelligenceService:
                 content = response.content[: _MAX_FEED_BYTES + 1]
                 if len(content) > _MAX_FEED_BYTES:
                     raise IntelligenceServiceError("feed response is too large")
-            return self._parse_feed(content, source_name=fields["name"], limit=limit)
+            return _FeedFetch(
+                entries=self._parse_feed(content, source_name=fields["name"], limit=limit),
+                **self._response_validators(response),
+            )
         except IntelligenceServiceError:
             raise
         except Exception as exc:
@@ -502,7 +604,14 @@ class IntelligenceService:
             if response is not None:
                 response.close()
 
-    def _fetch_newsnow_entries(self, fields: Dict[str, Any], *, limit: int) -> List[FeedEntry]:
+    def _fetch_newsnow_entries(
+        self,
+        fields: Dict[str, Any],
+        *,
+        limit: int,
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None,
+    ) -> _FeedFetch:
         timeout = max(1, min(float(self.config.news_intel_fetch_timeout_sec), 30.0))
         headers = {
             "User-Agent": (
@@ -510,6 +619,7 @@ class IntelligenceService:
                 "(KHTML, like Gecko) Chrome/126.0.0.0 Safari/537.36 daily-stock-analysis-intel/1.0"
             ),
             "Accept": "application/json",
+            **self._conditional_headers(etag, last_modified),
         }
         self._validate_url(fields["url"])
         response = None
@@ -522,6 +632,8 @@ class IntelligenceService:
                 stream=True,
             )
             status_code = int(getattr(response, "status_code", 200))
+            if status_code == _NOT_MODIFIED_STATUS_CODE:
+                return self._not_modified_fetch(response, etag, last_modified)
             if status_code in _REDIRECT_STATUS_CODES:
                 raise IntelligenceServiceError("NewsNow API redirects are not followed")
             response.raise_for_status()
@@ -532,7 +644,10 @@ class IntelligenceService:
                 payload = json.loads(content.decode("utf-8"))
             except (UnicodeDecodeError, json.JSONDecodeError) as exc:
                 raise IntelligenceServiceError(f"invalid NewsNow JSON response: {exc}") from exc
-            return self._parse_newsnow_payload(payload, source_name=fields["name"], limit=limit)
+            return _FeedFetch(
+                entries=self._parse_newsnow_payload(payload, source_name=fields["name"], limit=limit),
+                **self._response_validators(response),
+            )
         except IntelligenceServiceError:
             raise
         except Exception as exc:
@@ -541,6 +656,33 @@ class IntelligenceService:
             if response is not None:
                 response.close()
 
+    @staticmethod
+    def _conditional_headers(etag: Optional[str], last_modified: Optional[str]) -> Dict[str, str]:
+        headers = {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        return headers
+
+    @staticmethod
+    def _response_validators(response: Any) -> Dict[str, Optional[str]]:
+        headers = getattr(response, "headers", None) or {}
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        return {
+            "etag": etag.strip()[:256] or None if isinstance(etag, str) else None,
+            "last_modified": last_modified.strip()[:64] or None if isinstance(last_modified, str) else None,
+        }
+
+    def _not_modified_fetch(self, response: Any, etag: Optional[str], last_modified: Optional[str]) -> _FeedFetch:
+        validators = self._response_validators(response)
+        return _FeedFetch(
+            not_modified=True,
+            etag=validators["etag"] or etag,
+            last_modified=validators["last_modified"] or last_modified,
+        )
+
     def _read_limited_response(self, response: requests.Response) -> bytes:
         if hasattr(response, "iter_content") and callable(response.iter_content):
             chunks = []
@@ -561,23 +703,20 @@ class IntelligenceService:
     def _get_with_validated_dns(self, raw_url: str, **kwargs: Any) -> requests.Response:
         parsed = urlparse(raw_url)
         target_hostname = self._normalize_hostname(parsed.hostname)
-        original_getaddrinfo = socket.getaddrinfo
-
-        def guarded_getaddrinfo(host: Any, port: Any, *args: Any, **inner_kwargs: Any) -> Any:
-            addrinfos = original_getaddrinfo(host, port, *args, **inner_kwargs)
-            if self._normalize_hostname(host) == target_hostname:
-                self._validate_addrinfos(addrinfos)
-            return addrinfos
-
-        with _DNS_GUARD_LOCK:
-            socket.getaddrinfo = guarded_getaddrinfo
-            try:
-                request_kwargs = dict(kwargs)
-                request_kwargs.setdefault("proxies", _DISABLE_REQUEST_PROXIES)
-                getter = self._request_get or requests.get
-                return getter(raw_url, **request_kwargs)
-            finally:
-                socket.getaddrinfo = original_getaddrinfo
+        # One process-wide getaddrinfo wrapper stays installed while any fetch
+        # runs; each thread validates only its own target host, so concurrent
+        # fetches no longer serialize on the guard.
+        _acquire_dns_guard()
+        previous_target = getattr(_DNS_GUARD_TARGET, "hostname", None)
+        _DNS_GUARD_TARGET.hostname = target_hostname
+        try:
+            request_kwargs = dict(kwargs)
+            request_kwargs.setdefault("proxies", _DISABLE_REQUEST_PROXIES)
+            getter = self._request_get or requests.get
+            return getter(raw_url, **request_kwargs)
+        finally:
+            _DNS_GUARD_TARGET.hostname = previous_target
+            _release_dns_guard()
 
     @staticmethod
     def _normalize_hostname(hostname: Any) -> str:
@@ -832,3 +971,27 @@ class IntelligenceService:
     @staticmethod
     def _iso(value: Optional[datetime]) -> Optional[str]:
         return value.isoformat() if value else None
+
+
+def _guarded_getaddrinfo(host: Any, port: Any, *args: Any, **kwargs: Any) -> Any:
+    addrinfos = _DNS_GUARD_STATE["original"](host, port, *args, **kwargs)
+    target_hostname = getattr(_DNS_GUARD_TARGET, "hostname", None)
+    if target_hostname and IntelligenceService._normalize_hostname(host) == target_hostname:
+        IntelligenceService._validate_addrinfos(addrinfos)
+    return addrinfos
+
+
+def _acquire_dns_guard() -> None:
+    with _DNS_GUARD_LOCK:
+        if _DNS_GUARD_STATE["users"] == 0:
+            _DNS_GUARD_STATE["original"] = socket.getaddrinfo
+            socket.getaddrinfo = _guarded_getaddrinfo
+        _DNS_GUARD_STATE["users"] += 1
+
+
+def _release_dns_guard() -> None:
+    with _DNS_GUARD_LOCK:
+        _DNS_GUARD_STATE["users"] -= 1
+        if _DNS_GUARD_STATE["users"] == 0:
+            socket.getaddrinfo = _DNS_GUARD_STATE["original"]
+            _DNS_GUARD_STATE["original"] = None
@@ -16,7 +16,7 @@ from datetime import date
 import time
 from typing import Any, Callable, Dict, Hashable, List, Optional, Set, Tuple
 
-from data_provider import DataFetcherManager
+from data_provider import DataFetcherManager, get_fetcher_manager
 
 from src.schemas.market_structure import (
     MarketStructureDataQuality,
@@ -55,7 +55,7 @@ class MarketHotspotService:
         failure_cache_ttl_seconds: Optional[float] = None,
         success_cache_ttl_seconds: Optional[float] = None,
     ) -> None:
-        self.fetcher_manager = fetcher_manager or DataFetcherManager()
+        self.fetcher_manager = fetcher_manager or get_fetcher_manager()
         self._ranking_fetch_timeout_seconds = ranking_fetch_timeout_seconds
         self._failure_cache_ttl_seconds = self._coerce_cache_ttl(
             DEFAULT_RANKING_CACHE_FAILURE_TTL_SECONDS
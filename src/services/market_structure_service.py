@@ -7,7 +7,7 @@ import logging
 from datetime import date
 from typing import Any, Dict, List, Optional
 
-from data_provider import DataFetcherManager
+from data_provider import DataFetcherManager, get_fetcher_manager
 
 from src.schemas.market_structure import (
     MARKET_STRUCTURE_SCHEMA_VERSION,
@@ -43,7 +43,7 @@ class MarketStructureService:
         fetcher_manager: Optional[DataFetcherManager] = None,
         hotspot_service: Optional[MarketHotspotService] = None,
     ) -> None:
-        self.fetcher_manager = fetcher_manager or DataFetcherManager()
+        self.fetcher_manager = fetcher_manager or get_fetcher_manager()
         self.hotspot_service = hotspot_service or MarketHotspotService(
             fetcher_manager=self.fetcher_manager,
         )
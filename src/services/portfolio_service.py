@@ -7,7 +7,7 @@ import json
 import logging
 from collections import defaultdict
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, timedelta
 from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
@@ -96,6 +96,61 @@ class _AvgState:
     total_cost: float = 0.0
 
 
+@dataclass
+class _ReplayState:
+    """Event-replay accumulators; persisted as replay checkpoints."""
+
+    cash_balances: Dict[str, float] = field(default_factory=lambda: defaultdict(float))
+    fees_total_base: float = 0.0
+    taxes_total_base: float = 0.0
+    realized_pnl_base: float = 0.0
+    fx_stale: bool = False
+    fifo_lots: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = field(
+        default_factory=lambda: defaultdict(list)
+    )
+    avg_state: Dict[Tuple[str, str, str], _AvgState] = field(default_factory=lambda: defaultdict(_AvgState))
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "cash_balances": dict(self.cash_balances),
+                "fees_total_base": self.fees_total_base,
+                "taxes_total_base": self.taxes_total_base,
+                "realized_pnl_base": self.realized_pnl_base,
+                "fx_stale": self.fx_stale,
+                "fifo_lots": [
+                    [list(key), [{**lot, "open_date": lot["open_date"].isoformat()} for lot in lots]]
+                    for key, lots in self.fifo_lots.items()
+                    if lots
+                ],
+                "avg_state": [
+                    [list(key), [state.quantity, state.total_cost]]
+                    for key, state in self.avg_state.items()
+                ],
+            },
+            ensure_ascii=False,
+        )
+
+    @classmethod
+    def from_json(cls, raw: str) -> "_ReplayState":
+        data = json.loads(raw)
+        state = cls(
+            fees_total_base=float(data["fees_total_base"]),
+            taxes_total_base=float(data["taxes_total_base"]),
+            realized_pnl_base=float(data["realized_pnl_base"]),
+            fx_stale=bool(data["fx_stale"]),
+        )
+        for currency, amount in data["cash_balances"].items():
+            state.cash_balances[currency] = float(amount)
+        for key, lots in data["fifo_lots"]:
+            state.fifo_lots[tuple(key)] = [
+                {**lot, "open_date": date.fromisoformat(lot["open_date"])} for lot in lots
+            ]
+        for key, (quantity, total_cost) in data["avg_state"]:
+            state.avg_state[tuple(key)] = _AvgState(quantity=float(quantity), total_cost=float(total_cost))
+        return state
+
+
 @dataclass(frozen=True)
 class _ResolvedPositionPrice:
     price: float
@@ -782,9 +837,26 @@ class PortfolioService:
         cost_method: str,
         include_realtime: bool,
     ) -> Dict[str, Any]:
-        trades = self.repo.list_trades(account.id, as_of=as_of_date)
-        cash_ledger = self.repo.list_cash_ledger(account.id, as_of=as_of_date)
-        corporate_actions = self.repo.list_corporate_actions(account.id, as_of=as_of_date)
+        # Resume from the newest valid checkpoint and replay only later events.
+        checkpoint = self.repo.get_latest_replay_checkpoint(
+            account_id=account.id,
+            cost_method=cost_method,
+            as_of=as_of_date,
+        )
+        if checkpoint is not None and checkpoint.base_currency != account.base_currency:
+            checkpoint = None
+        if checkpoint is not None:
+            state = _ReplayState.from_json(checkpoint.state)
+            replay_after: Optional[date] = checkpoint.checkpoint_date
+            fingerprint = json.loads(checkpoint.event_fingerprint)
+        else:
+            state = _ReplayState()
+            replay_after = None
+            fingerprint = {"cash": [0, 0], "corp": [0, 0], "trade": [0, 0]}
+
+        trades = self.repo.list_trades(account.id, as_of=as_of_date, after=replay_after)
+        cash_ledger = self.repo.list_cash_ledger(account.id, as_of=as_of_date, after=replay_after)
+        corporate_actions = self.repo.list_corporate_actions(account.id, as_of=as_of_date, after=replay_after)
 
         events = []
         for row in cash_ledger:
@@ -798,141 +870,44 @@ class PortfolioService:
         event_priority = {"cash": 0, "corp": 1, "trade": 2}
         events.sort(key=lambda item: (item[1], event_priority[item[0]], item[2]))
 
-        cash_balances: Dict[str, float] = defaultdict(float)
-        fees_total_base = 0.0
-        taxes_total_base = 0.0
-        realized_pnl_base = 0.0
-        fx_stale = False
-
-        fifo_lots: Dict[Tuple[str, str, str], List[Dict[str, Any]]] = defaultdict(list)
-        avg_state: Dict[Tuple[str, str, str], _AvgState] = defaultdict(_AvgState)
-
-        for event_type, event_date, _, event in events:
-            if event_type == "cash":
-                currency = self._normalize_currency(event.currency)
-                amount = float(event.amount or 0.0)
-                if event.direction == "in":
-                    cash_balances[currency] += amount
-                elif event.direction == "out":
-                    cash_balances[currency] -= amount
-                else:
-                    raise ValueError(f"Unsupported cash direction: {event.direction}")
-                continue
-
-            if event_type == "trade":
-                key = (
-                    self._normalize_symbol_for_position(event.symbol),
-                    self._normalize_market(event.market),
-                    self._normalize_currency(event.currency),
-                )
-                qty = float(event.quantity or 0.0)
-                price = float(event.price or 0.0)
-                fee = float(event.fee or 0.0)
-                tax = float(event.tax or 0.0)
-                if qty <= 0 or price <= 0:
-                    raise ValueError(f"Invalid trade quantity or price for {event.symbol}")
-
-                gross = qty * price
-                side = (event.side or "").lower().strip()
-                if side == "buy":
-                    cash_balances[key[2]] -= (gross + fee + tax)
-                    if cost_method == "fifo":
-                        unit_cost = (gross + fee + tax) / qty
-                        fifo_lots[key].append(
-                            {
-                                "symbol": key[0],
-                                "market": key[1],
-                                "currency": key[2],
-                                "open_date": event_date,
-                                "remaining_quantity": qty,
-                                "unit_cost": unit_cost,
-                                "source_trade_id": event.id,
-                            }
-                        )
-                    else:
-                        state = avg_state[key]
-                        state.quantity += qty
-                        state.total_cost += (gross + fee + tax)
-                elif side == "sell":
-                    cash_balances[key[2]] += (gross - fee - tax)
-                    proceeds_net = gross - fee - tax
-                    if cost_method == "fifo":
-                        cost_basis = self._consume_fifo_lots(
-                            fifo_lots[key],
-                            qty,
-                            key[0],
-                            event_date,
-                        )
-                    else:
-                        cost_basis = self._consume_avg_position(
-                            avg_state[key],
-                            qty,
-                            key[0],
-                            event_date,
-                        )
-                    realized_local = proceeds_net - cost_basis
-                    realized_base, stale_realized, _ = self._convert_amount(
-                        amount=realized_local,
-                        from_currency=key[2],
-                        to_currency=account.base_currency,
-                        as_of_date=event_date,
-                    )
-                    realized_pnl_base += realized_base
-                    fx_stale = fx_stale or stale_realized
-                else:
-                    raise ValueError(f"Unsupported trade side: {event.side}")
-
-                fee_base, stale_fee, _ = self._convert_amount(
-                    amount=fee,
-                    from_currency=key[2],
-                    to_currency=account.base_currency,
-                    as_of_date=event_date,
-                )
-                tax_base, stale_tax, _ = self._convert_amount(
-                    amount=tax,
-                    from_currency=key[2],
-                    to_currency=account.base_currency,
-                    as_of_date=event_date,
-                )
-                fees_total_base += fee_base
-                taxes_total_base += tax_base
-                fx_stale = fx_stale or stale_fee or stale_tax
-                continue
+        # Checkpoint everything before as_of: same-day events are the ones most likely
+        # to still be edited, and any back-dated write invalidates later checkpoints.
+        checkpoint_date = as_of_date - timedelta(days=1)
+        pending_checkpoint: Optional[str] = None
+        checkpoint_event_count = 0
+        for event_type, event_date, event_id, event in events:
+            if event_date > checkpoint_date and checkpoint_event_count and pending_checkpoint is None:
+                pending_checkpoint = state.to_json()
+            self._apply_replay_event(
+                state=state,
+                account=account,
+                cost_method=cost_method,
+                event_type=event_type,
+                event_date=event_date,
+                event=event,
+            )
+            if event_date <= checkpoint_date:
+                checkpoint_event_count += 1
+                count, max_id = fingerprint[event_type]
+                fingerprint[event_type] = [count + 1, max(max_id, int(event_id))]
+        if checkpoint_event_count and pending_checkpoint is None:
+            pending_checkpoint = state.to_json()
+        if pending_checkpoint is not None:
+            self._save_replay_checkpoint(
+                account=account,
+                cost_method=cost_method,
+                checkpoint_date=checkpoint_date,
+                fingerprint=fingerprint,
+                state=pending_checkpoint,
+            )
 
-            if event_type == "corp":
-                key = (
-                    self._normalize_symbol_for_position(event.symbol),
-                    self._normalize_market(event.market),
-                    self._normalize_currency(event.currency),
-                )
-                action_type = (event.action_type or "").strip().lower()
-                if action_type == "cash_dividend":
-                    per_share = float(event.cash_dividend_per_share or 0.0)
-                    if per_share <= 0:
-                        continue
-                    qty_held = self._held_quantity(
-                        key=key,
-                        cost_method=cost_method,
-                        fifo_lots=fifo_lots,
-                        avg_state=avg_state,
-                    )
-                    if qty_held > EPS:
-                        cash_balances[key[2]] += qty_held * per_share
-                elif action_type == "split_adjustment":
-                    split_ratio = float(event.split_ratio or 0.0)
-                    if split_ratio <= 0:
-                        raise ValueError(f"Invalid split_ratio for {event.symbol}")
-                    if abs(split_ratio - 1.0) <= EPS:
-                        continue
-                    if cost_method == "fifo":
-                        for lot in fifo_lots[key]:
-                            lot["remaining_quantity"] *= split_ratio
-                            lot["unit_cost"] /= split_ratio
-                    else:
-                        state = avg_state[key]
-                        state.quantity *= split_ratio
-                else:
-                    raise ValueError(f"Unsupported corporate action type: {event.action_type}")
+        cash_balances = state.cash_balances
+        fees_total_base = state.fees_total_base
+        taxes_total_base = state.taxes_total_base
+        realized_pnl_base = state.realized_pnl_base
+        fx_stale = state.fx_stale
+        fifo_lots = state.fifo_lots
+        avg_state = state.avg_state
 
         position_rows, lot_rows, market_value_base, total_cost_base, stale_pos = self._build_positions(
             account=account,
@@ -1004,6 +979,164 @@ class PortfolioService:
             "fx_stale": fx_stale,
         }
 
+    def _apply_replay_event(
+        self,
+        *,
+        state: _ReplayState,
+        account: Any,
+        cost_method: str,
+        event_type: str,
+        event_date: date,
+        event: Any,
+    ) -> None:
+        if event_type == "cash":
+            currency = self._normalize_currency(event.currency)
+            amount = float(event.amount or 0.0)
+            if event.direction == "in":
+                state.cash_balances[currency] += amount
+            elif event.direction == "out":
+                state.cash_balances[currency] -= amount
+            else:
+                raise ValueError(f"Unsupported cash direction: {event.direction}")
+            return
+
+        if event_type == "trade":
+            key = (
+                self._normalize_symbol_for_position(event.symbol),
+                self._normalize_market(event.market),
+                self._normalize_currency(event.currency),
+            )
+            qty = float(event.quantity or 0.0)
+            price = float(event.price or 0.0)
+            fee = float(event.fee or 0.0)
+            tax = float(event.tax or 0.0)
+            if qty <= 0 or price <= 0:
+                raise ValueError(f"Invalid trade quantity or price for {event.symbol}")
+
+            gross = qty * price
+            side = (event.side or "").lower().strip()
+            if side == "buy":
+                state.cash_balances[key[2]] -= (gross + fee + tax)
+                if cost_method == "fifo":
+                    unit_cost = (gross + fee + tax) / qty
+                    state.fifo_lots[key].append(
+                        {
+                            "symbol": key[0],
+                            "market": key[1],
+                            "currency": key[2],
+                            "open_date": event_date,
+                            "remaining_quantity": qty,
+                            "unit_cost": unit_cost,
+                            "source_trade_id": event.id,
+                        }
+                    )
+                else:
+                    position = state.avg_state[key]
+                    position.quantity += qty
+                    position.total_cost += (gross + fee + tax)
+            elif side == "sell":
+                state.cash_balances[key[2]] += (gross - fee - tax)
+                proceeds_net = gross - fee - tax
+                if cost_method == "fifo":
+                    cost_basis = self._consume_fifo_lots(
+                        state.fifo_lots[key],
+                        qty,
+                        key[0],
+                        event_date,
+                    )
+                else:
+                    cost_basis = self._consume_avg_position(
+                        state.avg_state[key],
+                        qty,
+                        key[0],
+                        event_date,
+                    )
+                realized_local = proceeds_net - cost_basis
+                realized_base, stale_realized, _ = self._convert_amount(
+                    amount=realized_local,
+                    from_currency=key[2],
+                    to_currency=account.base_currency,
+                    as_of_date=event_date,
+                )
+                state.realized_pnl_base += realized_base
+                state.fx_stale = state.fx_stale or stale_realized
+            else:
+                raise ValueError(f"Unsupported trade side: {event.side}")
+
+            fee_base, stale_fee, _ = self._convert_amount(
+                amount=fee,
+                from_currency=key[2],
+                to_currency=account.base_currency,
+                as_of_date=event_date,
+            )
+            tax_base, stale_tax, _ = self._convert_amount(
+                amount=tax,
+                from_currency=key[2],
+                to_currency=account.base_currency,
+                as_of_date=event_date,
+            )
+            state.fees_total_base += fee_base
+            state.taxes_total_base += tax_base
+            state.fx_stale = state.fx_stale or stale_fee or stale_tax
+            return
+
+        if event_type == "corp":
+            key = (
+                self._normalize_symbol_for_position(event.symbol),
+                self._normalize_market(event.market),
+                self._normalize_currency(event.currency),
+            )
+            action_type = (event.action_type or "").strip().lower()
+            if action_type == "cash_dividend":
+                per_share = float(event.cash_dividend_per_share or 0.0)
+                if per_share <= 0:
+                    return
+                qty_held = self._held_quantity(
+                    key=key,
+                    cost_method=cost_method,
+                    fifo_lots=state.fifo_lots,
+                    avg_state=state.avg_state,
+                )
+                if qty_held > EPS:
+                    state.cash_balances[key[2]] += qty_held * per_share
+            elif action_type == "split_adjustment":
+                split_ratio = float(event.split_ratio or 0.0)
+                if split_ratio <= 0:
+                    raise ValueError(f"Invalid split_ratio for {event.symbol}")
+                if abs(split_ratio - 1.0) <= EPS:
+                    return
+                if cost_method == "fifo":
+                    for lot in state.fifo_lots[key]:
+                        lot["remaining_quantity"] *= split_ratio
+                        lot["unit_cost"] /= split_ratio
+                else:
+                    position = state.avg_state[key]
+                    position.quantity *= split_ratio
+            else:
+                raise ValueError(f"Unsupported corporate action type: {event.action_type}")
+
+    def _save_replay_checkpoint(
+        self,
+        *,
+        account: Any,
+        cost_method: str,
+        checkpoint_date: date,
+        fingerprint: Dict[str, List[int]],
+        state: str,
+    ) -> None:
+        try:
+            self.repo.save_replay_checkpoint(
+                account_id=account.id,
+                cost_method=cost_method,
+                checkpoint_date=checkpoint_date,
+                base_currency=account.base_currency,
+                event_fingerprint=fingerprint,
+                state=state,
+            )
+        except Exception as exc:
+            # Checkpoints are an optimization; snapshot reads must not fail on them.
+            logger.warning("Portfolio replay checkpoint save skipped for account_id=%s: %s", account.id, exc)
+
     def _build_positions(
         self,
         *,
@@ -10,6 +10,7 @@ from __future__ import annotations
 
 import logging
 import re
+import threading
 import uuid
 from collections.abc import Mapping
 from contextvars import ContextVar, Token
@@ -259,6 +260,55 @@ class HistoryRun:
         return {key: value for key, value in payload.items() if value is not None}
 
 
+@dataclass
+class StageRun:
+    """Timing of one analysis pipeline stage in a trace."""
+
+    trace_id: str
+    stage: str
+    success: bool
+    offset_ms: int
+    duration_ms: int
+    depends_on: List[str] = field(default_factory=list)
+    error_message_sanitized: Optional[str] = None
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    def to_dict(self) -> Dict[str, Any]:
+        payload = {
+            "trace_id": self.trace_id,
+            "stage": self.stage,
+            "success": self.success,
+            "offset_ms": self.offset_ms,
+            "duration_ms": self.duration_ms,
+            "depends_on": list(self.depends_on),
+            "error_message_sanitized": self.error_message_sanitized,
+            "created_at": self.created_at,
+        }
+        return {key: value for key, value in payload.items() if value is not None}
+
+
+@dataclass
+class BudgetWait:
+    """Aggregated concurrency-budget waits of one trace for one budget key."""
+
+    budget: str
+    key: str
+    acquired: int = 0
+    total_wait_ms: int = 0
+    max_wait_ms: int = 0
+    max_queue_depth: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "budget": self.budget,
+            "key": self.key,
+            "acquired": self.acquired,
+            "total_wait_ms": self.total_wait_ms,
+            "max_wait_ms": self.max_wait_ms,
+            "max_queue_depth": self.max_queue_depth,
+        }
+
+
 @dataclass
 class RunDiagnosticComponent:
     """User-facing status for one diagnostic component."""
@@ -327,6 +377,8 @@ class RunDiagnosticContext:
     llm_runs: List[LLMRun] = field(default_factory=list)
     notification_runs: List[NotificationRun] = field(default_factory=list)
     history_runs: List[HistoryRun] = field(default_factory=list)
+    stage_runs: List[StageRun] = field(default_factory=list)
+    budget_waits: Dict[str, BudgetWait] = field(default_factory=dict)
     event_sink: Optional[Callable[[Dict[str, Any]], None]] = None
     flow_event_index: int = 0
     provider_attempt_index_by_type: Dict[str, int] = field(default_factory=dict)
@@ -334,8 +386,14 @@ class RunDiagnosticContext:
     llm_attempt_index_by_type: Dict[str, int] = field(default_factory=dict)
     llm_pending_attempt_index_by_key: Dict[str, List[int]] = field(default_factory=dict)
     llm_pending_attempt_index_by_call_type: Dict[str, List[int]] = field(default_factory=dict)
+    # Pipeline stages run concurrently and record into the same context.
+    _lock: threading.RLock = field(default_factory=threading.RLock, repr=False, compare=False)
 
     def record_provider_run(self, provider_run: ProviderRun) -> None:
+        with self._lock:
+            self._record_provider_run(provider_run)
+
+    def _record_provider_run(self, provider_run: ProviderRun) -> None:
         self.provider_runs.append(provider_run)
         data_type_key = _safe_event_key(provider_run.data_type) or "provider"
         pending_key = _provider_pending_key(
@@ -362,6 +420,10 @@ class RunDiagnosticContext:
         provider: str,
         operation: str,
     ) -> None:
+        with self._lock:
+            self._record_provider_run_started(data_type=data_type, provider=provider, operation=operation)
+
+    def _record_provider_run_started(self, *, data_type: str, provider: str, operation: str) -> None:
         data_type_key = _safe_event_key(data_type) or "provider"
         attempt_index = self.provider_attempt_index_by_type.get(data_type_key, 0) + 1
         self.provider_attempt_index_by_type[data_type_key] = attempt_index
@@ -380,6 +442,10 @@ class RunDiagnosticContext:
         )
 
     def record_llm_run(self, llm_run: LLMRun) -> None:
+        with self._lock:
+            self._record_llm_run(llm_run)
+
+    def _record_llm_run(self, llm_run: LLMRun) -> None:
         self.llm_runs.append(llm_run)
         call_type_key = _safe_event_key(llm_run.call_type) or "analysis"
         pending_key = _llm_pending_key(llm_run.call_type, llm_run.provider, llm_run.model)
@@ -432,6 +498,10 @@ class RunDiagnosticContext:
         provider: Optional[str] = None,
         model: Optional[str] = None,
     ) -> None:
+        with self._lock:
+            self._record_llm_run_started(call_type=call_type, provider=provider, model=model)
+
+    def _record_llm_run_started(self, *, call_type: str, provider: Optional[str], model: Optional[str]) -> None:
         call_type_key = _safe_event_key(call_type) or "analysis"
         attempt_index = self.llm_attempt_index_by_type.get(call_type_key, 0) + 1
         self.llm_attempt_index_by_type[call_type_key] = attempt_index
@@ -453,12 +523,29 @@ class RunDiagnosticContext:
         )
 
     def record_notification_run(self, notification_run: NotificationRun) -> None:
-        self.notification_runs.append(notification_run)
-        self._emit_flow_event(_notification_flow_event(self, notification_run, len(self.notification_runs)))
+        with self._lock:
+            self.notification_runs.append(notification_run)
+            self._emit_flow_event(_notification_flow_event(self, notification_run, len(self.notification_runs)))
 
     def record_history_run(self, history_run: HistoryRun) -> None:
-        self.history_runs.append(history_run)
-        self._emit_flow_event(_history_flow_event(self, history_run, len(self.history_runs)))
+        with self._lock:
+            self.history_runs.append(history_run)
+            self._emit_flow_event(_history_flow_event(self, history_run, len(self.history_runs)))
+
+    def record_stage_run(self, stage_run: StageRun) -> None:
+        with self._lock:
+            self.stage_runs.append(stage_run)
+
+    def record_budget_wait(self, *, budget: str, key: str, wait_ms: int, queue_depth: int) -> None:
+        with self._lock:
+            entry = self.budget_waits.get(f"{budget}:{key}")
+            if entry is None:
+                entry = BudgetWait(budget=budget, key=key)
+                self.budget_waits[f"{budget}:{key}"] = entry
+            entry.acquired += 1
+            entry.total_wait_ms += wait_ms
+            entry.max_wait_ms = max(entry.max_wait_ms, wait_ms)
+            entry.max_queue_depth = max(entry.max_queue_depth, queue_depth)
 
     def _emit_flow_event(self, event: Dict[str, Any]) -> None:
         if self.event_sink is None:
@@ -473,6 +560,10 @@ class RunDiagnosticContext:
             logger.warning("run-flow event sink failed: %s", exc)
 
     def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return self._snapshot()
+
+    def _snapshot(self) -> Dict[str, Any]:
         return {
             "trace_id": self.trace_id,
             "task_id": self.task_id,
@@ -484,6 +575,8 @@ class RunDiagnosticContext:
             "llm_runs": [run.to_dict() for run in self.llm_runs],
             "notification_runs": [run.to_dict() for run in self.notification_runs],
             "history_runs": [run.to_dict() for run in self.history_runs],
+            "stage_runs": [run.to_dict() for run in self.stage_runs],
+            "budget_waits": [entry.to_dict() for entry in self.budget_waits.values()],
         }
 
 
@@ -1039,6 +1132,48 @@ def record_history_run(
         logger.warning("history diagnostic record failed: %s", exc)
 
 
+def record_stage_run(
+    *,
+    stage: str,
+    success: bool,
+    offset_ms: int,
+    duration_ms: int,
+    depends_on: Optional[List[str]] = None,
+    error_message: Optional[Any] = None,
+) -> None:
+    """Append a pipeline stage timing to the active context without affecting callers."""
+    context = get_current_diagnostic_context()
+    if context is None:
+        return
+
+    try:
+        context.record_stage_run(
+            StageRun(
+                trace_id=context.trace_id,
+                stage=stage,
+                success=success,
+                offset_ms=offset_ms,
+                duration_ms=duration_ms,
+                depends_on=list(depends_on or []),
+                error_message_sanitized=sanitize_diagnostic_text(error_message),
+            )
+        )
+    except Exception as exc:  # pragma: no cover - defensive fail-open guard
+        logger.warning("stage diagnostic record failed: %s", exc)
+
+
+def record_budget_wait(*, budget: str, key: str, wait_ms: int, queue_depth: int) -> None:
+    """Add one concurrency-budget acquisition to the active context without affecting callers."""
+    context = get_current_diagnostic_context()
+    if context is None:
+        return
+
+    try:
+        context.record_budget_wait(budget=budget, key=key, wait_ms=wait_ms, queue_depth=queue_depth)
+    except Exception as exc:  # pragma: no cover - defensive fail-open guard
+        logger.warning("budget diagnostic record failed: %s", exc)
+
+
 _SUMMARY_STATUS_LABELS = {
     "normal": "正常",
     "degraded": "部分降级",
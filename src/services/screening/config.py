@@ -229,6 +229,7 @@ class Config:
     daily_fetch_max_workers: int = 1
     daily_history_cache_dir: Path | None = None
     daily_history_cache_ttl_hours: int = 24
+    daily_history_cache_bundle: bool = False
 
     # Independent risk layer.
     risk_enabled: bool = True
@@ -373,6 +374,10 @@ class Config:
                     )
                 ),
             ),
+            daily_history_cache_bundle=_parse_bool_env(
+                "SCREENING_DAILY_HISTORY_CACHE_BUNDLE",
+                _parse_bool_env("DAILY_HISTORY_CACHE_BUNDLE", False),
+            ),
             risk_enabled=_parse_bool_env("RISK_ENABLED", True),
             risk_max_penalty=_parse_float_env("RISK_MAX_PENALTY", 12.0),
             risk_veto_high=_parse_bool_env("RISK_VETO_HIGH", False),
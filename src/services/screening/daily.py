@@ -9,17 +9,22 @@ from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 import hashlib
 import json
+import logging
 import os
 from pathlib import Path
 import threading
 import time
-from typing import Callable
+from typing import Callable, Mapping
+import uuid
 
+import numpy as np
 import pandas as pd
 import requests
 
 from src.services.screening.source_guard import call_with_timeout, parse_source_timeout_seconds
 
+logger = logging.getLogger(__name__)
+
 _DAILY_FEATURE_DEFAULTS = {
     "daily_data_points": pd.NA,
     "change_60d": pd.NA,
@@ -47,8 +52,31 @@ _DAILY_FEATURE_DEFAULTS = {
     "daily_source": "",
 }
 _DAILY_ENRICH_MAX_WORKERS = 1
-_DAILY_HISTORY_CACHE_VERSION = 1
+_DAILY_HISTORY_RENAME_MAP = {
+    "日期": "date",
+    "收盘": "close",
+    "开盘": "open",
+    "最高": "high",
+    "最低": "low",
+    "成交量": "volume",
+    "成交额": "amount",
+}
+_DAILY_PANEL_COLUMNS = ["date", "open", "high", "low", "close", "volume"]
+_DAILY_HISTORY_CACHE_VERSION = 2
 _DAILY_HISTORY_CACHE_TTL_SECONDS = 24 * 60 * 60
+_DAILY_HISTORY_METADATA_KEYS = (
+    "daily_source",
+    "daily_requested_source",
+    "daily_source_order",
+    "daily_source_order_notes",
+    "source_errors",
+    "daily_source_health",
+)
+_DAILY_HISTORY_TOKEN_KEY = "__token__"
+_DAILY_HISTORY_BUNDLE_DIRNAME = "_bundle"
+_DAILY_HISTORY_BUNDLE_ALIGN = 64
+_DAILY_HISTORY_BUNDLES: dict[str, tuple[int, dict[str, object], np.memmap]] = {}
+_DAILY_HISTORY_BUNDLE_LOCK = threading.Lock()
 _SOURCE_HEALTH_FAILURE_THRESHOLD = 3
 _SOURCE_HEALTH_COOLDOWN_SECONDS = 5 * 60
 _DAILY_CALL_TIMEOUT_SECONDS = 20.0
@@ -70,13 +98,16 @@ def enrich_daily_features(
     cache_ttl_seconds: float | None = None,
     max_workers: int | None = None,
     history_fetcher: Callable[..., pd.DataFrame] | None = None,
+    cache_bundle: bool = False,
 ) -> pd.DataFrame:
     """Attach daily technical features to the first ``max_rows`` candidates.
 
     This intentionally runs after broad snapshot filtering; it is not a full
     market historical-data pass. ``history_fetcher`` is a request-scoped
     override; callers can reuse host data capabilities without replacing this
-    module's process-global ``fetch_daily_history`` function.
+    module's process-global ``fetch_daily_history`` function. With
+    ``cache_bundle`` the day's cache entries are packed into one mapped bundle
+    after the pass, so the next run reads a single file.
     """
     if df.empty or max_rows <= 0:
         return df.copy()
@@ -98,7 +129,7 @@ def enrich_daily_features(
         code = raw_code.zfill(6) if raw_code.isdigit() else raw_code
         fetch_requests.append((idx, code))
 
-    def fetch_one(request: tuple[object, str]) -> tuple[object, dict[str, object], str | None, dict[str, object]]:
+    def fetch_one(request: tuple[object, str]) -> tuple[object, str, pd.DataFrame | None, str | None]:
         idx, code = request
         try:
             hist = fetch_history(
@@ -109,20 +140,9 @@ def enrich_daily_features(
                 cache_dir=cache_dir,
                 cache_ttl_seconds=cache_ttl_seconds,
             )
-            features = compute_daily_features(hist)
-            features["daily_source"] = str(hist.attrs.get("daily_source", ""))
-            metadata = {
-                "daily_source": features["daily_source"],
-                "daily_quality_flags": features.get("daily_quality_flags", ""),
-                "daily_source_order_notes": list(hist.attrs.get("daily_source_order_notes", []) or []),
-                "daily_source_health": dict(hist.attrs.get("daily_source_health", {}) or {}),
-            }
-            return idx, features, None, metadata
+            return idx, code, hist, None
         except Exception as exc:
-            features = dict(_DAILY_FEATURE_DEFAULTS)
-            features["daily_quality_score"] = 0.0
-            features["daily_quality_flags"] = "fetch_failed"
-            return idx, features, f"{code}: {exc}", {"daily_quality_flags": "fetch_failed"}
+            return idx, code, None, f"{code}: {exc}"
 
     if len(fetch_requests) <= 1:
         fetched_rows = [fetch_one(request) for request in fetch_requests]
@@ -130,25 +150,41 @@ def enrich_daily_features(
         worker_limit = min(_normalize_max_workers(max_workers), len(fetch_requests))
         with ThreadPoolExecutor(max_workers=worker_limit) as executor:
             fetched_rows = list(executor.map(fetch_one, fetch_requests))
-
-    for idx, features, error, metadata in fetched_rows:
-        for flag in str(metadata.get("daily_quality_flags") or "").split(";"):
-            if flag:
-                daily_quality_flag_counts[flag] = daily_quality_flag_counts.get(flag, 0) + 1
-        if error:
+    if cache_bundle and cache_dir is not None and fetch_requests:
+        try:
+            write_daily_history_bundle(cache_dir, ttl_seconds=cache_ttl_seconds)
+        except Exception as exc:  # noqa: BLE001 - per-symbol cache files remain usable.
+            logger.warning("Failed to write daily history bundle in %s: %s", cache_dir, exc)
+
+    # Feature stage: one vectorized pass over every fetched history.
+    histories = {code: hist for _idx, code, hist, _error in fetched_rows if hist is not None}
+    panel, feature_errors = stack_daily_histories(histories)
+    feature_rows = compute_daily_features_batch(panel)
+
+    for idx, code, hist, error in fetched_rows:
+        if error is None and code in feature_errors:
+            error = f"{code}: {feature_errors[code]}"
+        if error is not None:
+            features = dict(_DAILY_FEATURE_DEFAULTS)
+            features["daily_quality_score"] = 0.0
+            features["daily_quality_flags"] = "fetch_failed"
+            daily_quality_flag_counts["fetch_failed"] = daily_quality_flag_counts.get("fetch_failed", 0) + 1
             daily_errors.append(error)
         else:
+            features = dict(feature_rows[code])
+            features["daily_source"] = str(hist.attrs.get("daily_source", ""))
+            for flag in str(features.get("daily_quality_flags") or "").split(";"):
+                if flag:
+                    daily_quality_flag_counts[flag] = daily_quality_flag_counts.get(flag, 0) + 1
             success_count += 1
-            source_name = str(metadata.get("daily_source") or "unknown")
+            source_name = features["daily_source"] or "unknown"
             daily_source_counts[source_name] = daily_source_counts.get(source_name, 0) + 1
-            order_notes = metadata.get("daily_source_order_notes", [])
-            if not isinstance(order_notes, list):
-                order_notes = []
+            order_notes = list(hist.attrs.get("daily_source_order_notes", []) or [])
             for note in order_notes:
                 note_text = str(note)
                 if note_text and note_text not in daily_source_order_notes:
                     daily_source_order_notes.append(note_text)
-            source_health = metadata.get("daily_source_health")
+            source_health = hist.attrs.get("daily_source_health", {}) or {}
             if isinstance(source_health, dict):
                 daily_source_health.update(source_health)
         for key, value in features.items():
@@ -446,7 +482,11 @@ def _daily_history_cache_path(
     digest = hashlib.sha256(key.encode("utf-8")).hexdigest()[:16]
     safe_source = "".join(ch if ch.isalnum() else "-" for ch in source).strip("-") or "source"
     safe_code = "".join(ch if ch.isalnum() else "-" for ch in code).strip("-") or "code"
-    return Path(cache_dir) / f"{safe_code}_{safe_source}_{int(lookback_days)}_{digest}.json"
+    return Path(cache_dir) / f"{safe_code}_{safe_source}_{int(lookback_days)}_{digest}.npz"
+
+
+def _daily_history_meta_path(path: Path) -> Path:
+    return path.with_name(f"{path.stem}.meta.json")
 
 
 def _read_daily_history_cache(
@@ -455,6 +495,7 @@ def _read_daily_history_cache(
     ttl_seconds: float | None,
     allow_stale: bool = False,
 ) -> pd.DataFrame | None:
+    """Read one cached frame from today's bundle or its ``.npz`` + sidecar pair."""
     try:
         stat = path.stat()
     except FileNotFoundError:
@@ -466,20 +507,17 @@ def _read_daily_history_cache(
         return None
 
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        if payload.get("version") != _DAILY_HISTORY_CACHE_VERSION:
-            return None
-        frame = payload.get("frame")
-        if not isinstance(frame, dict):
-            return None
-        columns = frame.get("columns")
-        data = frame.get("data")
-        if not isinstance(columns, list) or not isinstance(data, list):
-            return None
-        df = pd.DataFrame(data, columns=columns)
-        metadata = payload.get("metadata")
+        bundled = _read_bundled_daily_history(path, stat.st_mtime_ns)
+        if bundled is not None:
+            meta, arrays = bundled
+        else:
+            meta, arrays = _load_daily_history_entry(path)
+            if meta is None:
+                return None
+        df = decode_frame_columns(meta["columns"], arrays)
+        metadata = meta.get("metadata")
         if isinstance(metadata, dict):
-            for key in ("daily_source", "daily_requested_source", "daily_source_order", "daily_source_order_notes", "source_errors", "daily_source_health"):
+            for key in _DAILY_HISTORY_METADATA_KEYS:
                 if key in metadata:
                     df.attrs[key] = metadata[key]
         if is_stale:
@@ -497,9 +535,14 @@ def _write_daily_history_cache(
     source: str,
     lookback_days: int,
 ) -> None:
+    tmp_path = path.with_name(f".{path.stem}.{time.time_ns()}.tmp.npz")
+    meta_path = _daily_history_meta_path(path)
+    tmp_meta_path = meta_path.with_name(f".{meta_path.name}.{time.time_ns()}.tmp")
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
-        payload = {
+        arrays, columns = encode_frame_columns(df)
+        token = uuid.uuid4().hex
+        meta = {
             "version": _DAILY_HISTORY_CACHE_VERSION,
             "key": {
                 "code": code,
@@ -515,13 +558,226 @@ def _write_daily_history_cache(
                 "daily_source_health": df.attrs.get("daily_source_health", {}),
             },
             "created_at": datetime.now().isoformat(),
-            "frame": json.loads(df.to_json(orient="split", date_format="iso", force_ascii=False)),
+            "token": token,
+            "rows": int(len(df)),
+            "columns": columns,
         }
-        tmp_path = path.with_name(f".{path.name}.{time.time_ns()}.tmp")
-        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        with open(tmp_path, "wb") as handle:
+            np.savez(handle, **{_DAILY_HISTORY_TOKEN_KEY: np.array(token)}, **arrays)
+        tmp_meta_path.write_text(json.dumps(meta, ensure_ascii=False, default=str), encoding="utf-8")
+        # The token ties the pair together; a reader racing this swap sees a miss.
+        tmp_meta_path.replace(meta_path)
         tmp_path.replace(path)
     except Exception:
         return
+    finally:
+        tmp_path.unlink(missing_ok=True)
+        tmp_meta_path.unlink(missing_ok=True)
+
+
+def write_daily_history_bundle(
+    cache_dir: str | Path,
+    *,
+    ttl_seconds: float | None = None,
+) -> int:
+    """Pack today's fresh per-symbol cache entries into one memory-mappable file.
+
+    The bundle is ``_bundle/daily-history-<YYYYMMDD>.json`` (index) plus the
+    raw column bytes it points at. Readers map it once per process and serve
+    every entry whose ``.npz`` mtime still matches the bundled copy, so a
+    screening run opens one file instead of one archive per candidate. The
+    bundle is only rewritten when the set of fresh entries changed. Returns
+    the number of bundled entries.
+    """
+    directory = Path(cache_dir)
+    ttl = _DAILY_HISTORY_CACHE_TTL_SECONDS if ttl_seconds is None else float(ttl_seconds)
+    now = time.time()
+    candidates: dict[str, tuple[Path, int]] = {}
+    for path in directory.glob("*.npz"):
+        if path.name.startswith("."):
+            continue
+        try:
+            stat = path.stat()
+        except OSError:
+            continue
+        if ttl > 0 and now - stat.st_mtime <= ttl:
+            candidates[path.name] = (path, stat.st_mtime_ns)
+    bundle = _open_daily_history_bundle(directory)
+    if bundle is not None:
+        bundled = {name: entry.get("mtime_ns") for name, entry in bundle[0]["entries"].items()}
+        if bundled == {name: mtime_ns for name, (_path, mtime_ns) in candidates.items()}:
+            return len(bundled)
+    if not candidates:
+        return 0
+
+    bundle_dir = directory / _DAILY_HISTORY_BUNDLE_DIRNAME
+    bundle_dir.mkdir(parents=True, exist_ok=True)
+    day_key = datetime.now().strftime("%Y%m%d")
+    data_path = bundle_dir / f"daily-history-{day_key}.{uuid.uuid4().hex}.bin"
+    entries: dict[str, object] = {}
+    offset = 0
+    with open(data_path, "wb") as handle:
+        for name, (path, mtime_ns) in sorted(candidates.items()):
+            try:
+                meta, arrays = _load_daily_history_entry(path)
+            except Exception:
+                continue
+            if meta is None:
+                continue
+            layout: dict[str, dict[str, object]] = {}
+            for key, values in arrays.items():
+                values = np.ascontiguousarray(values)
+                padding = -offset % _DAILY_HISTORY_BUNDLE_ALIGN
+                handle.write(b"\0" * padding)
+                offset += padding
+                layout[key] = {"offset": offset, "dtype": values.dtype.str, "shape": list(values.shape)}
+                handle.write(values.tobytes())
+                offset += values.nbytes
+            entries[name] = {"mtime_ns": mtime_ns, "meta": meta, "arrays": layout}
+        # Keep the file non-empty so it can always be mapped.
+        handle.write(b"\0" * _DAILY_HISTORY_BUNDLE_ALIGN)
+
+    index_path = bundle_dir / f"daily-history-{day_key}.json"
+    tmp_index_path = index_path.with_name(f".{index_path.name}.{time.time_ns()}.tmp")
+    tmp_index_path.write_text(
+        json.dumps(
+            {
+                "version": _DAILY_HISTORY_CACHE_VERSION,
+                "day": day_key,
+                "data": data_path.name,
+                "entries": entries,
+            },
+            ensure_ascii=False,
+            default=str,
+        ),
+        encoding="utf-8",
+    )
+    tmp_index_path.replace(index_path)
+    for stale in bundle_dir.iterdir():
+        # Processes that still map an older data file keep their view (POSIX).
+        if stale not in (index_path, data_path) and stale.name.startswith("daily-history-"):
+            stale.unlink(missing_ok=True)
+    return len(entries)
+
+
+def _load_daily_history_entry(path: Path) -> tuple[dict[str, object] | None, dict[str, np.ndarray]]:
+    meta = json.loads(_daily_history_meta_path(path).read_text(encoding="utf-8"))
+    if not isinstance(meta, dict) or meta.get("version") != _DAILY_HISTORY_CACHE_VERSION:
+        return None, {}
+    if not isinstance(meta.get("columns"), list):
+        return None, {}
+    with np.load(path, allow_pickle=False) as archive:
+        if str(archive[_DAILY_HISTORY_TOKEN_KEY]) != meta.get("token"):
+            return None, {}
+        arrays = {key: archive[key] for key in archive.files if key != _DAILY_HISTORY_TOKEN_KEY}
+    return meta, arrays
+
+
+def _read_bundled_daily_history(
+    path: Path,
+    mtime_ns: int,
+) -> tuple[dict[str, object], dict[str, np.ndarray]] | None:
+    bundle = _open_daily_history_bundle(path.parent)
+    if bundle is None:
+        return None
+    index, buffer = bundle
+    entry = index["entries"].get(path.name)
+    if not isinstance(entry, dict) or entry.get("mtime_ns") != mtime_ns:
+        return None
+    arrays = {}
+    for key, spec in entry["arrays"].items():
+        shape = tuple(int(size) for size in spec["shape"])
+        arrays[key] = np.frombuffer(
+            buffer,
+            dtype=np.dtype(spec["dtype"]),
+            count=int(np.prod(shape, dtype=np.int64)),
+            offset=int(spec["offset"]),
+        ).reshape(shape)
+    return entry["meta"], arrays
+
+
+def _open_daily_history_bundle(directory: Path) -> tuple[dict[str, object], np.memmap] | None:
+    index_path = (
+        directory
+        / _DAILY_HISTORY_BUNDLE_DIRNAME
+        / f"daily-history-{datetime.now().strftime('%Y%m%d')}.json"
+    )
+    try:
+        mtime_ns = index_path.stat().st_mtime_ns
+    except OSError:
+        return None
+    key = str(index_path)
+    with _DAILY_HISTORY_BUNDLE_LOCK:
+        cached = _DAILY_HISTORY_BUNDLES.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        try:
+            index = json.loads(index_path.read_text(encoding="utf-8"))
+            if index.get("version") != _DAILY_HISTORY_CACHE_VERSION or not isinstance(index.get("entries"), dict):
+                return None
+            buffer = np.memmap(index_path.parent / str(index["data"]), dtype=np.uint8, mode="r")
+        except Exception:
+            return None
+        for other in [item for item in _DAILY_HISTORY_BUNDLES if Path(item).parent == index_path.parent]:
+            del _DAILY_HISTORY_BUNDLES[other]
+        _DAILY_HISTORY_BUNDLES[key] = (mtime_ns, index, buffer)
+        return index, buffer
+
+
+def encode_frame_columns(df: pd.DataFrame) -> tuple[dict[str, np.ndarray], list[dict[str, object]]]:
+    """Split a frame into plain NumPy columns; text columns carry an NA mask.
+
+    Shared by the daily-history cache and the market snapshot cache.
+    """
+    arrays: dict[str, np.ndarray] = {}
+    columns: list[dict[str, object]] = []
+    for position, name in enumerate(df.columns):
+        series = df.iloc[:, position]
+        key = f"c{position}"
+        kind = "values"
+        if pd.api.types.is_bool_dtype(series.dtype) and not series.isna().any():
+            values = series.to_numpy(dtype=bool)
+        elif pd.api.types.is_numeric_dtype(series.dtype) and not pd.api.types.is_bool_dtype(series.dtype):
+            if pd.api.types.is_extension_array_dtype(series.dtype):
+                values = series.to_numpy(dtype=float, na_value=np.nan)
+            else:
+                values = series.to_numpy()
+        elif pd.api.types.is_datetime64_dtype(series.dtype):
+            values = series.to_numpy(dtype="datetime64[ns]")
+        else:
+            mask = series.isna().to_numpy(dtype=bool)
+            values = np.asarray(["" if missing else str(value) for value, missing in zip(series.tolist(), mask)], dtype=str)
+            if mask.any():
+                arrays[f"{key}_na"] = mask
+            kind = "text"
+        arrays[key] = values
+        columns.append({"name": name if isinstance(name, (str, int, float)) else str(name), "key": key, "kind": kind})
+    return arrays, columns
+
+
+def decode_frame_columns(
+    columns: list[dict[str, object]],
+    arrays: dict[str, np.ndarray],
+    *,
+    copy: bool = True,
+) -> pd.DataFrame:
+    """Rebuild a frame from ``encode_frame_columns`` output.
+
+    With ``copy=False`` numeric, boolean and datetime columns wrap ``arrays``
+    directly (for a read-only memory map the frame is read-only too); text
+    columns are always materialized as object arrays.
+    """
+    data: dict[object, object] = {}
+    for column in columns:
+        key = str(column["key"])
+        values = arrays[key]
+        if column.get("kind") == "text":
+            values = values.astype(object)
+            mask = arrays.get(f"{key}_na")
+            if mask is not None:
+                values[np.asarray(mask, dtype=bool)] = None
+        data[column["name"]] = values
+    return pd.DataFrame(data, columns=[column["name"] for column in columns], copy=copy)
 
 
 def _fetch_daily_akshare(code: str, *, lookback_days: int) -> pd.DataFrame:
@@ -854,282 +1110,345 @@ def _is_baostock_network_outage(error_code: object, error_msg: object) -> bool:
 
 def compute_daily_features(hist: pd.DataFrame) -> dict[str, object]:
     """Compute compact trend/reversal features from a daily K-line DataFrame."""
-    df = _normalize_daily_history(hist)
-    if df.empty:
-        raise RuntimeError("daily history is empty after normalization")
-
-    close = pd.to_numeric(df["close"], errors="coerce").dropna()
-    if close.empty:
-        raise RuntimeError("daily history has no valid close price")
-
-    ma5 = close.rolling(5).mean()
-    ma20 = close.rolling(20).mean()
-    ma60 = close.rolling(60).mean()
-    last_close = float(close.iloc[-1])
-    last_ma5 = _last_float(ma5)
-    last_ma20 = _last_float(ma20)
-    last_ma60 = _last_float(ma60)
-    shape = _compute_shape_features(df, last_close=last_close, last_ma20=last_ma20)
-    quality = _compute_daily_quality(hist, df)
-
-    lookback_idx = max(0, len(close) - 61)
-    base_close = float(close.iloc[lookback_idx])
-    change_60d = (last_close / base_close - 1.0) * 100 if base_close > 0 else None
-
-    macd_status = _compute_macd_status(close)
-    rsi_value = _compute_rsi(close)
-    rsi_status = _classify_rsi(rsi_value)
-    ma_bullish = _is_true(last_ma5 is not None and last_ma20 is not None and last_ma60 is not None
-                          and last_ma5 >= last_ma20 >= last_ma60)
-    price_above_ma20 = _is_true(last_ma20 is not None and last_close >= last_ma20)
-    signal_score = _compute_signal_score(
-        change_60d=change_60d,
-        ma_bullish=ma_bullish,
-        price_above_ma20=price_above_ma20,
-        macd_status=macd_status,
-        rsi_status=rsi_status,
-    )
-
-    return {
-        "daily_data_points": int(len(close)),
-        "change_60d": None if change_60d is None else round(float(change_60d), 4),
-        "ma5": last_ma5,
-        "ma20": last_ma20,
-        "ma60": last_ma60,
-        "ma_bullish": ma_bullish,
-        "price_above_ma20": price_above_ma20,
-        "macd_status": macd_status,
-        "rsi_status": rsi_status,
-        "rsi14": None if rsi_value is None else round(float(rsi_value), 4),
-        "signal_score": round(float(signal_score), 4),
-        **shape,
-        **quality,
-    }
-
-
-def _normalize_daily_history(hist: pd.DataFrame) -> pd.DataFrame:
-    rename_map = {
-        "日期": "date",
-        "收盘": "close",
-        "开盘": "open",
-        "最高": "high",
-        "最低": "low",
-        "成交量": "volume",
-        "成交额": "amount",
-    }
-    df = hist.rename(columns=rename_map).copy()
-    if "date" in df.columns:
-        df = df.sort_values("date")
-    if "close" not in df.columns:
-        raise RuntimeError("daily history has no close column")
+    panel, errors = stack_daily_histories({"": hist})
+    if errors:
+        raise RuntimeError(errors[""])
+    return compute_daily_features_batch(panel)[""]
+
+
+def stack_daily_histories(
+    histories: Mapping[str, pd.DataFrame],
+) -> tuple[pd.DataFrame, dict[str, str]]:
+    """Normalize per-code daily histories into one long ``(code, date)`` panel.
+
+    Rows of each code keep date order, closes are numeric and non-null, and
+    missing open/high/low prices fall back to the close. The source frames'
+    stale/fallback attrs are kept in ``panel.attrs["daily_history_attrs"]`` for
+    the quality score. Returns the panel and ``{code: reason}`` for histories
+    that cannot be used.
+    """
+    errors: dict[str, str] = {}
+    frames: list[pd.DataFrame] = []
+    history_attrs: dict[str, dict[str, object]] = {}
+    for code, hist in histories.items():
+        df = hist.rename(columns=_DAILY_HISTORY_RENAME_MAP)
+        if "close" not in df.columns:
+            errors[code] = "daily history has no close column"
+            continue
+        if "date" in df.columns:
+            # ``sort_values("date")`` order: unparseable dates go last.
+            date_key = pd.to_datetime(df["date"], errors="coerce").to_numpy(dtype="datetime64[ns]").view(np.int64)
+            date_key = np.where(date_key == np.iinfo(np.int64).min, np.iinfo(np.int64).max, date_key)
+        else:
+            date_key = np.zeros(len(df), dtype=np.int64)
+        frames.append(df.reindex(columns=_DAILY_PANEL_COLUMNS).assign(code=code, _date_key=date_key))
+        history_attrs[code] = {
+            "has_volume": "volume" in df.columns,
+            "daily_stale": bool(hist.attrs.get("daily_stale")),
+            "source_errors": len(list(hist.attrs.get("source_errors", []) or [])),
+        }
+    if not frames:
+        panel = pd.DataFrame(columns=["code", *_DAILY_PANEL_COLUMNS])
+        panel.attrs["daily_history_attrs"] = {}
+        return panel, errors
+
+    panel = pd.concat(frames, ignore_index=True)
+    codes, _unique = pd.factorize(panel["code"], sort=False)
+    order = np.lexsort((np.arange(len(panel)), panel["_date_key"].to_numpy(), codes))
+    panel = panel.iloc[order].drop(columns="_date_key").reset_index(drop=True)
     for col in ("open", "high", "low", "close", "volume"):
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce")
-    df = df.dropna(subset=["close"]).copy()
+        panel[col] = pd.to_numeric(panel[col], errors="coerce").astype(float)
+    panel = panel[panel["close"].notna()].reset_index(drop=True)
     for col in ("open", "high", "low"):
-        if col not in df.columns:
-            df[col] = df["close"]
-        else:
-            df[col] = df[col].fillna(df["close"])
-    return df
-
-
-def _compute_daily_quality(raw: pd.DataFrame, normalized: pd.DataFrame) -> dict[str, object]:
-    """Score daily-history quality and expose compact audit flags."""
-    score = 100.0
-    flags: list[str] = []
-    points = len(normalized)
-    if points < 30:
-        score -= 35
-        flags.append("short_history_lt30")
-    elif points < 60:
-        score -= 15
-        flags.append("short_history_lt60")
-
-    for col in ("open", "high", "low", "close"):
-        if col not in normalized.columns:
-            score -= 20
-            flags.append(f"missing_{col}")
-            continue
-        missing_ratio = float(pd.to_numeric(normalized[col], errors="coerce").isna().mean())
-        if missing_ratio > 0:
-            score -= min(missing_ratio * 40, 20)
-            flags.append(f"incomplete_{col}")
+        panel[col] = panel[col].fillna(panel["close"])
+    present = set(panel["code"].unique())
+    for code in history_attrs:
+        if code not in present:
+            errors[code] = "daily history is empty after normalization"
+    panel = panel[["code", *_DAILY_PANEL_COLUMNS]]
+    panel.attrs["daily_history_attrs"] = {code: item for code, item in history_attrs.items() if code in present}
+    return panel, errors
+
+
+def compute_daily_features_batch(panel: pd.DataFrame) -> dict[str, dict[str, object]]:
+    """Compute ``compute_daily_features`` for every code of a long panel at once.
+
+    ``panel`` is the output of ``stack_daily_histories``: rows grouped by
+    ``code`` in date order. Each code is laid out as a right-aligned row of a
+    ``(codes, days)`` matrix, so "last N bars" windows are plain column slices
+    and every rolling, EMA and shape feature is a single NumPy expression over
+    all candidates. Returns ``{code: features}`` in first-appearance order.
+    """
+    if panel.empty:
+        return {}
+    code_index, codes = pd.factorize(panel["code"], sort=False)
+    order = np.argsort(code_index, kind="stable")
+    code_index = code_index[order]
+    counts = np.bincount(code_index, minlength=len(codes))
+    width = int(counts.max())
+    rank = np.arange(len(order)) - np.repeat(np.cumsum(counts) - counts, counts)
+    columns = width - counts[code_index] + rank
+
+    def matrix(name: str) -> np.ndarray:
+        values = np.full((len(codes), width), np.nan)
+        values[code_index, columns] = panel[name].to_numpy(dtype=float)[order]
+        return values
+
+    open_, high, low, close, volume = (matrix(name) for name in ("open", "high", "low", "close", "volume"))
+    valid = ~np.isnan(close)
+    last_close = close[:, -1]
+    ma5, ma20, ma60 = (
+        _round_array(np.where(counts >= window, close[:, -window:].mean(axis=1) if width >= window else np.nan, np.nan))
+        for window in (5, 20, 60)
+    )
+    base_close = close[np.arange(len(codes)), width - np.minimum(counts, 61)]
+    change_60d = _ratio_pct(last_close, base_close)
+    macd_status = _macd_status_batch(close, counts)
+    rsi14 = _rsi_batch(close, counts)
+    shape = _shape_features_batch(open_, high, low, close, volume, counts, last_close=last_close, ma20=ma20)
+    quality = _daily_quality_batch(
+        open_,
+        high,
+        low,
+        close,
+        volume,
+        valid,
+        counts,
+        [panel.attrs.get("daily_history_attrs", {}).get(code, {}) for code in codes],
+    )
 
-    if "volume" not in normalized.columns:
-        score -= 12
-        flags.append("missing_volume")
-    else:
-        volume = pd.to_numeric(normalized["volume"], errors="coerce")
-        missing_volume_ratio = float(volume.isna().mean())
-        if missing_volume_ratio > 0:
-            score -= min(missing_volume_ratio * 20, 10)
-            flags.append("incomplete_volume")
-        if (volume.dropna() < 0).any():
-            score -= 20
-            flags.append("negative_volume")
-
-    if {"open", "high", "low", "close"}.issubset(normalized.columns):
-        open_ = pd.to_numeric(normalized["open"], errors="coerce")
-        high = pd.to_numeric(normalized["high"], errors="coerce")
-        low = pd.to_numeric(normalized["low"], errors="coerce")
-        close = pd.to_numeric(normalized["close"], errors="coerce")
-        invalid_ohlc = (high < low) | (high < open_) | (high < close) | (low > open_) | (low > close)
-        if invalid_ohlc.fillna(False).any():
-            score -= 30
-            flags.append("invalid_ohlc")
-        if ((open_ <= 0) | (high <= 0) | (low <= 0) | (close <= 0)).fillna(False).any():
-            score -= 35
-            flags.append("non_positive_price")
+    features: dict[str, dict[str, object]] = {}
+    for position, code in enumerate(codes):
+        last_ma5, last_ma20, last_ma60 = (_optional_float(item[position]) for item in (ma5, ma20, ma60))
+        change = _optional_float(change_60d[position])
+        ma_bullish = bool(
+            last_ma5 is not None and last_ma20 is not None and last_ma60 is not None
+            and last_ma5 >= last_ma20 >= last_ma60
+        )
+        price_above_ma20 = bool(last_ma20 is not None and float(last_close[position]) >= last_ma20)
+        rsi_value = _optional_float(rsi14[position])
+        rsi_status = _classify_rsi(rsi_value)
+        signal_score = _compute_signal_score(
+            change_60d=change,
+            ma_bullish=ma_bullish,
+            price_above_ma20=price_above_ma20,
+            macd_status=str(macd_status[position]),
+            rsi_status=rsi_status,
+        )
+        features[code] = {
+            "daily_data_points": int(counts[position]),
+            "change_60d": _round_or_none(change),
+            "ma5": last_ma5,
+            "ma20": last_ma20,
+            "ma60": last_ma60,
+            "ma_bullish": ma_bullish,
+            "price_above_ma20": price_above_ma20,
+            "macd_status": str(macd_status[position]),
+            "rsi_status": rsi_status,
+            "rsi14": _round_or_none(rsi_value),
+            "signal_score": round(float(signal_score), 4),
+            **{key: values[position] for key, values in shape.items()},
+            **{key: values[position] for key, values in quality.items()},
+        }
+    return features
 
-    if bool(raw.attrs.get("daily_stale")):
-        score -= 25
-        flags.append("stale_cache")
 
-    source_errors = list(raw.attrs.get("source_errors", []) or [])
-    if source_errors:
-        score -= min(len(source_errors) * 5, 20)
-        flags.append("fallback_errors")
+def _shape_features_batch(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    counts: np.ndarray,
+    *,
+    last_close: np.ndarray,
+    ma20: np.ndarray,
+) -> dict[str, list[object]]:
+    previous = slice(-21, -1)
+    prev_high_20d = np.fmax.reduce(high[:, previous], axis=1) if high.shape[1] > 1 else np.full(len(counts), np.nan)
+    recent_high = np.fmax.reduce(high[:, -20:], axis=1)
+    recent_low = np.fmin.reduce(low[:, -20:], axis=1)
+    range_20d_pct = np.where(recent_low > 0, (recent_high / np.where(recent_low > 0, recent_low, 1.0) - 1.0) * 100, np.nan)
+    breakout_20d_pct = _ratio_pct(last_close, prev_high_20d)
+
+    previous_volume = volume[:, previous]
+    previous_volume_count = (~np.isnan(previous_volume)).sum(axis=1)
+    previous_volume_mean = np.nansum(previous_volume, axis=1) / np.maximum(previous_volume_count, 1)
+    usable_volume = (counts >= 2) & (previous_volume_count > 0) & (previous_volume_mean > 0)
+    volume_ratio_20d = np.where(usable_volume, volume[:, -1] / np.where(usable_volume, previous_volume_mean, 1.0), np.nan)
+    body_pct = _ratio_pct(last_close, open_[:, -1])
+    pullback_to_ma20_pct = _ratio_pct(last_close, ma20)
+
+    recent_close = close[:, -20:]
+    returns = recent_close[:, 1:] / recent_close[:, :-1] - 1.0
+    return_count = (~np.isnan(returns)).sum(axis=1)
+    return_mean = np.nansum(returns, axis=1) / np.maximum(return_count, 1)
+    return_var = np.nansum((returns - return_mean[:, None]) ** 2, axis=1) / np.maximum(return_count - 1, 1)
+    volatility_20d_pct = np.where(return_count >= 2, np.sqrt(return_var) * (252 ** 0.5) * 100, np.nan)
+    running_high = np.fmax.accumulate(recent_close, axis=1)
+    max_drawdown_20d_pct = np.minimum(np.fmin.reduce(recent_close / running_high - 1.0, axis=1) * 100, 0.0)
+
+    previous_close = np.concatenate([np.full((len(counts), 1), np.nan), close[:, :-1]], axis=1)
+    true_range = np.fmax(np.fmax(high - low, np.abs(high - previous_close)), np.abs(low - previous_close))
+    true_range_tail = true_range[:, -20:]
+    true_range_count = (~np.isnan(true_range_tail)).sum(axis=1)
+    atr = np.where(true_range_count > 0, np.nansum(true_range_tail, axis=1) / np.maximum(true_range_count, 1), np.nan)
+    atr_20_pct = np.where(last_close > 0, atr / np.where(last_close > 0, last_close, 1.0) * 100, np.nan)
 
     return {
-        "daily_quality_score": round(max(score, 0.0), 4),
-        "daily_quality_flags": ";".join(flags),
+        "prev_high_20d": _round_list(prev_high_20d),
+        "range_20d_pct": _round_list(range_20d_pct),
+        "breakout_20d_pct": _round_list(breakout_20d_pct),
+        "volume_ratio_20d": _round_list(volume_ratio_20d),
+        "body_pct": _round_list(body_pct),
+        "pullback_to_ma20_pct": _round_list(pullback_to_ma20_pct),
+        "consolidation_days_20d": _consolidation_days_batch(high[:, previous], low[:, previous], counts),
+        "volatility_20d_pct": _round_list(volatility_20d_pct),
+        "max_drawdown_20d_pct": _round_list(max_drawdown_20d_pct),
+        "atr_20_pct": _round_list(atr_20_pct),
     }
 
 
-def _compute_shape_features(
-    df: pd.DataFrame,
+def _consolidation_days_batch(
+    high: np.ndarray,
+    low: np.ndarray,
+    counts: np.ndarray,
     *,
-    last_close: float,
-    last_ma20: float | None,
-) -> dict[str, object]:
-    previous = df.iloc[:-1].tail(20)
-    recent = df.tail(20)
-    last = df.iloc[-1]
-
-    prev_high_20d = _series_max(previous["high"]) if "high" in previous.columns else None
-    range_20d_pct = _range_pct(recent)
-    breakout_20d_pct = (
-        (last_close / prev_high_20d - 1.0) * 100
-        if prev_high_20d is not None and prev_high_20d > 0
-        else None
+    max_range_pct: float = 12.0,
+) -> list[int | None]:
+    """Longest trailing window (2-20 bars before the last) whose high/low range stays within ``max_range_pct``."""
+    previous_counts = np.minimum(counts - 1, 20)
+    if high.shape[1] == 0:
+        return [None] * len(counts)
+    window_high = np.fmax.accumulate(high[:, ::-1], axis=1)
+    window_low = np.fmin.accumulate(low[:, ::-1], axis=1)
+    days = np.arange(1, high.shape[1] + 1)
+    safe_low = np.where(window_low > 0, window_low, 1.0)
+    within = (
+        (days >= 2)
+        & (days <= previous_counts[:, None])
+        & (window_low > 0)
+        & ((window_high / safe_low - 1.0) * 100 <= max_range_pct)
     )
-    volume_ratio_20d = _volume_ratio_20d(df)
-    body_pct = _body_pct(last)
-    pullback_to_ma20_pct = (
-        (last_close / last_ma20 - 1.0) * 100
-        if last_ma20 is not None and last_ma20 > 0
-        else None
+    longest = np.where(within.any(axis=1), high.shape[1] - np.argmax(within[:, ::-1], axis=1), 0)
+    return [None if previous_counts[position] <= 0 else int(longest[position]) for position in range(len(counts))]
+
+
+def _macd_status_batch(close: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    diff = _ewm_rows(close, span=12) - _ewm_rows(close, span=26)
+    dea = _ewm_rows(diff, span=9)
+    last_diff, last_dea = diff[:, -1], dea[:, -1]
+    status = np.where(
+        (last_diff > last_dea) & (last_diff > 0),
+        "bullish",
+        np.where((last_diff < last_dea) & (last_diff < 0), "bearish", "neutral"),
     )
-    volatility_20d_pct = _volatility_20d_pct(recent["close"])
-    max_drawdown_20d_pct = _max_drawdown_pct(recent["close"])
-    atr_20_pct = _atr_20_pct(df)
-
-    return {
-        "prev_high_20d": _round_or_none(prev_high_20d),
-        "range_20d_pct": _round_or_none(range_20d_pct),
-        "breakout_20d_pct": _round_or_none(breakout_20d_pct),
-        "volume_ratio_20d": _round_or_none(volume_ratio_20d),
-        "body_pct": _round_or_none(body_pct),
-        "pullback_to_ma20_pct": _round_or_none(pullback_to_ma20_pct),
-        "consolidation_days_20d": _consolidation_days(previous),
-        "volatility_20d_pct": _round_or_none(volatility_20d_pct),
-        "max_drawdown_20d_pct": _round_or_none(max_drawdown_20d_pct),
-        "atr_20_pct": _round_or_none(atr_20_pct),
-    }
-
-
-def _series_max(series: pd.Series) -> float | None:
-    values = pd.to_numeric(series, errors="coerce").dropna()
-    if values.empty:
-        return None
-    return float(values.max())
-
-
-def _range_pct(df: pd.DataFrame) -> float | None:
-    if "high" not in df.columns or "low" not in df.columns:
-        return None
-    high = pd.to_numeric(df["high"], errors="coerce").dropna()
-    low = pd.to_numeric(df["low"], errors="coerce").dropna()
-    if high.empty or low.empty:
-        return None
-    low_min = float(low.min())
-    if low_min <= 0:
-        return None
-    return (float(high.max()) / low_min - 1.0) * 100
+    return np.where(counts >= 35, status, "neutral")
+
+
+def _ewm_rows(values: np.ndarray, *, span: int) -> np.ndarray:
+    """Row-wise ``ewm(span, adjust=False).mean()`` that starts at each row's first value."""
+    alpha = 2.0 / (span + 1.0)
+    result = np.full_like(values, np.nan)
+    state = np.full(values.shape[0], np.nan)
+    for column in range(values.shape[1]):
+        current = values[:, column]
+        state = np.where(
+            np.isnan(state),
+            current,
+            np.where(np.isnan(current), state, (1.0 - alpha) * state + alpha * current),
+        )
+        result[:, column] = state
+    return result
 
 
-def _volume_ratio_20d(df: pd.DataFrame) -> float | None:
-    if "volume" not in df.columns:
-        return None
-    volume = pd.to_numeric(df["volume"], errors="coerce")
-    if len(volume) < 2 or pd.isna(volume.iloc[-1]):
-        return None
-    previous = volume.iloc[:-1].tail(20).dropna()
-    if previous.empty:
-        return None
-    base = float(previous.mean())
-    if base <= 0:
-        return None
-    return float(volume.iloc[-1]) / base
+def _rsi_batch(close: np.ndarray, counts: np.ndarray, period: int = 14) -> np.ndarray:
+    if close.shape[1] <= period:
+        return np.full(len(counts), np.nan)
+    delta = close[:, -period:] - close[:, -period - 1:-1]
+    gain = np.clip(delta, 0, None).mean(axis=1)
+    loss = (-np.clip(delta, None, 0)).mean(axis=1)
+    rsi = 100 - 100 / (1 + gain / np.where(loss > 0, loss, np.nan))
+    return np.where(counts > period, rsi, np.nan)
+
+
+def _daily_quality_batch(
+    open_: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    close: np.ndarray,
+    volume: np.ndarray,
+    valid: np.ndarray,
+    counts: np.ndarray,
+    history_attrs: list[dict[str, object]],
+) -> dict[str, list[object]]:
+    """Score daily-history quality and expose compact audit flags.
+
+    OHLC gaps cannot survive ``stack_daily_histories`` (closes are required
+    and open/high/low are filled from them), so only volume gaps are scored.
+    """
+    missing_volume_ratio = (np.isnan(volume) & valid).sum(axis=1) / np.maximum(counts, 1)
+    negative_volume = (volume < 0).any(axis=1)
+    invalid_ohlc = ((high < low) | (high < open_) | (high < close) | (low > open_) | (low > close)).any(axis=1)
+    non_positive_price = ((open_ <= 0) | (high <= 0) | (low <= 0) | (close <= 0)).any(axis=1)
+
+    scores: list[object] = []
+    flag_texts: list[object] = []
+    for position, attrs in enumerate(history_attrs):
+        score = 100.0
+        flags: list[str] = []
+        points = int(counts[position])
+        if points < 30:
+            score -= 35
+            flags.append("short_history_lt30")
+        elif points < 60:
+            score -= 15
+            flags.append("short_history_lt60")
+        if not attrs.get("has_volume", True):
+            score -= 12
+            flags.append("missing_volume")
+        else:
+            if missing_volume_ratio[position] > 0:
+                score -= min(float(missing_volume_ratio[position]) * 20, 10)
+                flags.append("incomplete_volume")
+            if negative_volume[position]:
+                score -= 20
+                flags.append("negative_volume")
+        if invalid_ohlc[position]:
+            score -= 30
+            flags.append("invalid_ohlc")
+        if non_positive_price[position]:
+            score -= 35
+            flags.append("non_positive_price")
+        if attrs.get("daily_stale"):
+            score -= 25
+            flags.append("stale_cache")
+        source_errors = int(attrs.get("source_errors") or 0)
+        if source_errors:
+            score -= min(source_errors * 5, 20)
+            flags.append("fallback_errors")
+        scores.append(round(max(score, 0.0), 4))
+        flag_texts.append(";".join(flags))
+    return {"daily_quality_score": scores, "daily_quality_flags": flag_texts}
 
 
-def _volatility_20d_pct(close: pd.Series) -> float | None:
-    values = pd.to_numeric(close, errors="coerce").dropna()
-    returns = values.pct_change().dropna()
-    if len(returns) < 2:
-        return None
-    return float(returns.std()) * (252 ** 0.5) * 100
+def _ratio_pct(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    usable = denominator > 0
+    return np.where(usable, (numerator / np.where(usable, denominator, 1.0) - 1.0) * 100, np.nan)
 
 
-def _max_drawdown_pct(close: pd.Series) -> float | None:
-    values = pd.to_numeric(close, errors="coerce").dropna()
-    if values.empty:
-        return None
-    running_high = values.cummax()
-    drawdowns = values / running_high - 1.0
-    return min(float(drawdowns.min()) * 100, 0.0)
+def _round_array(values: np.ndarray) -> np.ndarray:
+    return np.array([np.nan if pd.isna(value) else round(float(value), 4) for value in values], dtype=float)
 
 
-def _atr_20_pct(df: pd.DataFrame) -> float | None:
-    if not {"high", "low", "close"}.issubset(df.columns):
-        return None
-    high = pd.to_numeric(df["high"], errors="coerce")
-    low = pd.to_numeric(df["low"], errors="coerce")
-    close = pd.to_numeric(df["close"], errors="coerce")
-    previous_close = close.shift(1)
-    true_range = pd.concat([
-        high - low,
-        (high - previous_close).abs(),
-        (low - previous_close).abs(),
-    ], axis=1).max(axis=1)
-    atr = true_range.tail(20).dropna().mean()
-    valid_close = close.dropna()
-    if valid_close.empty:
-        return None
-    last_close = float(valid_close.iloc[-1])
-    if pd.isna(atr) or last_close <= 0:
-        return None
-    return float(atr) / last_close * 100
+def _round_list(values: np.ndarray) -> list[float | None]:
+    return [_round_or_none(value) for value in values]
 
 
-def _consolidation_days(previous: pd.DataFrame, *, max_range_pct: float = 12.0) -> int | None:
-    if previous.empty or "high" not in previous.columns or "low" not in previous.columns:
-        return None
-    for days in range(min(len(previous), 20), 1, -1):
-        window = previous.tail(days)
-        range_pct = _range_pct(window)
-        if range_pct is not None and range_pct <= max_range_pct:
-            return int(days)
-    return 0
-
-
-def _body_pct(row: pd.Series) -> float | None:
-    open_price = row.get("open")
-    close_price = row.get("close")
-    if pd.isna(open_price) or pd.isna(close_price) or float(open_price) <= 0:
+def _optional_float(value: object) -> float | None:
+    if value is None or pd.isna(value):
         return None
-    return (float(close_price) / float(open_price) - 1.0) * 100
+    return float(value)
 
 
 def _round_or_none(value: float | None) -> float | None:
@@ -1138,36 +1457,6 @@ def _round_or_none(value: float | None) -> float | None:
     return round(float(value), 4)
 
 
-def _compute_macd_status(close: pd.Series) -> str:
-    if len(close) < 35:
-        return "neutral"
-    ema12 = close.ewm(span=12, adjust=False).mean()
-    ema26 = close.ewm(span=26, adjust=False).mean()
-    diff = ema12 - ema26
-    dea = diff.ewm(span=9, adjust=False).mean()
-    last_diff = float(diff.iloc[-1])
-    last_dea = float(dea.iloc[-1])
-    if last_diff > last_dea and last_diff > 0:
-        return "bullish"
-    if last_diff < last_dea and last_diff < 0:
-        return "bearish"
-    return "neutral"
-
-
-def _compute_rsi(close: pd.Series, period: int = 14) -> float | None:
-    if len(close) <= period:
-        return None
-    delta = close.diff()
-    gain = delta.clip(lower=0).rolling(period).mean()
-    loss = (-delta.clip(upper=0)).rolling(period).mean()
-    rs = gain / loss.replace(0, pd.NA)
-    rsi = 100 - (100 / (1 + rs))
-    value = rsi.iloc[-1]
-    if pd.isna(value):
-        return None
-    return float(value)
-
-
 def _classify_rsi(value: float | None) -> str:
     if value is None:
         return "neutral"
@@ -1207,14 +1496,3 @@ def _compute_signal_score(
     elif rsi_status == "overbought":
         score -= 6
     return max(0.0, min(score, 100.0))
-
-
-def _last_float(series: pd.Series) -> float | None:
-    value = series.iloc[-1]
-    if pd.isna(value):
-        return None
-    return round(float(value), 4)
-
-
-def _is_true(value: bool) -> bool:
-    return bool(value)
@@ -13,19 +13,28 @@ import os
 import random
 import threading
 import time
+import uuid
 from datetime import date, datetime, timezone, timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import requests
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
+from src.services.screening.daily import decode_frame_columns, encode_frame_columns
 from src.services.screening.source_guard import call_with_timeout, parse_source_timeout_seconds
 
 logger = logging.getLogger(__name__)
 
-_SNAPSHOT_CACHE_VERSION = 1
+_SNAPSHOT_CACHE_VERSION = 2
+_LEGACY_SNAPSHOT_CACHE_VERSION = 1
+_SNAPSHOT_DATA_ALIGN = 64
+# Process-wide decoded last-good frames keyed by cache path; an entry is valid
+# while the index file's mtime_ns still matches.
+_SNAPSHOT_FRAMES: dict[str, tuple[int, dict[str, object], pd.DataFrame]] = {}
+_SNAPSHOT_FRAME_LOCK = threading.Lock()
 _DEFAULT_TUSHARE_HTTP_URL = "http://api.waditu.com"
 _EM_REQUEST_MIN_INTERVAL_SECONDS = 1.0
 _EM_REQUEST_JITTER_SECONDS = 0.3
@@ -249,11 +258,37 @@ def _write_last_good_snapshot(
     *,
     source_priority: list[str] | None = None,
 ) -> None:
+    """Persist ``df`` as a small JSON index plus a memory-mappable column file.
+
+    The index at ``path_like`` carries the metadata and the byte layout of
+    ``<stem>.<uuid>.bin`` written next to it; replacing the index switches
+    readers to the new data file atomically. The written frame also becomes
+    the process-wide hot copy, so the next read skips the disk entirely.
+    Without copy-on-write the hot copy is detached from ``df`` so later
+    in-place edits by the caller cannot leak into the cache.
+    """
     if path_like is None:
         return
     path = Path(path_like)
+    data_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.bin")
+    tmp_path = path.with_name(f".{path.name}.{time.time_ns()}.tmp")
+    committed = False
     try:
         path.parent.mkdir(parents=True, exist_ok=True)
+        arrays, columns = encode_frame_columns(df)
+        layout: dict[str, dict[str, object]] = {}
+        offset = 0
+        with open(data_path, "wb") as handle:
+            for key, values in arrays.items():
+                values = np.ascontiguousarray(values)
+                padding = -offset % _SNAPSHOT_DATA_ALIGN
+                handle.write(b"\0" * padding)
+                offset += padding
+                layout[key] = {"offset": offset, "dtype": values.dtype.str, "shape": list(values.shape)}
+                handle.write(values.tobytes())
+                offset += values.nbytes
+            # Keep the file non-empty so it can always be mapped.
+            handle.write(b"\0" * _SNAPSHOT_DATA_ALIGN)
         payload = {
             "version": _SNAPSHOT_CACHE_VERSION,
             "created_at": datetime.now(timezone.utc).isoformat(),
@@ -265,17 +300,98 @@ def _write_last_good_snapshot(
                     if str(source).strip()
                 ],
                 "row_count": int(len(df)),
-                "columns": list(df.columns),
+                "columns": [str(column) for column in df.columns],
             },
-            "frame": json.loads(
-                df.to_json(orient="split", date_format="iso", force_ascii=False)
-            ),
+            "data": data_path.name,
+            "columns": columns,
+            "arrays": layout,
         }
-        tmp_path = path.with_name(f".{path.name}.{time.time_ns()}.tmp")
-        tmp_path.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+        tmp_path.write_text(json.dumps(payload, ensure_ascii=False, default=str), encoding="utf-8")
         tmp_path.replace(path)
+        committed = True
+        hot = df.copy(deep=not _copy_on_write_enabled())
+        hot.attrs = {}
+        with _SNAPSHOT_FRAME_LOCK:
+            _SNAPSHOT_FRAMES[str(path)] = (path.stat().st_mtime_ns, payload, hot)
+        for stale in path.parent.glob(f"{path.stem}.*.bin"):
+            # Processes that still map an older data file keep their view (POSIX).
+            if stale != data_path:
+                stale.unlink(missing_ok=True)
     except Exception as exc:  # noqa: BLE001 - live snapshot should remain usable.
+        if not committed:
+            data_path.unlink(missing_ok=True)
         logger.warning("Failed to write last-good snapshot cache %s: %s", path, exc)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def _load_last_good_snapshot(path: Path, mtime_ns: int) -> tuple[dict[str, object], pd.DataFrame]:
+    """Return (index payload, decoded frame), decoding at most once per file version."""
+    key = str(path)
+    with _SNAPSHOT_FRAME_LOCK:
+        cached = _SNAPSHOT_FRAMES.get(key)
+        if cached is not None and cached[0] == mtime_ns:
+            return cached[1], cached[2]
+        payload = json.loads(path.read_text(encoding="utf-8"))
+        if not isinstance(payload, dict):
+            raise ValueError("malformed cache index")
+        version = payload.get("version")
+        if version == _SNAPSHOT_CACHE_VERSION:
+            frame = _decode_snapshot_columns(path, payload)
+        elif version == _LEGACY_SNAPSHOT_CACHE_VERSION:
+            frame = _decode_legacy_snapshot_frame(payload)
+        else:
+            raise ValueError("unsupported cache version")
+        _SNAPSHOT_FRAMES[key] = (mtime_ns, payload, frame)
+        return payload, frame
+
+
+def _decode_snapshot_columns(path: Path, payload: dict[str, object]) -> pd.DataFrame:
+    columns = payload.get("columns")
+    layout = payload.get("arrays")
+    if not isinstance(columns, list) or not isinstance(layout, dict):
+        raise ValueError("malformed cached frame")
+    buffer = np.memmap(path.with_name(str(payload.get("data"))), dtype=np.uint8, mode="r")
+    arrays: dict[str, np.ndarray] = {}
+    for key, spec in layout.items():
+        shape = tuple(int(size) for size in spec["shape"])
+        arrays[key] = np.frombuffer(
+            buffer,
+            dtype=np.dtype(spec["dtype"]),
+            count=int(np.prod(shape, dtype=np.int64)),
+            offset=int(spec["offset"]),
+        ).reshape(shape)
+    # Numeric columns stay read-only views over the map; readers go through _share_frame.
+    return decode_frame_columns(columns, arrays, copy=False)
+
+
+def _copy_on_write_enabled() -> bool:
+    if int(pd.__version__.split(".", 1)[0]) >= 3:
+        return True
+    return pd.options.mode.copy_on_write is True
+
+
+def _share_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    """Hand out the shared decoded frame safely.
+
+    Under copy-on-write (pandas >= 3, or the option enabled on pandas 2) a
+    shallow copy is enough: callers share the columns and get their own attrs.
+    Otherwise in-place edits would write through to the shared (possibly
+    memory-mapped) arrays, so each caller gets a deep copy.
+    """
+    return frame.copy(deep=not _copy_on_write_enabled())
+
+
+def _decode_legacy_snapshot_frame(payload: dict[str, object]) -> pd.DataFrame:
+    """Read a version-1 cache whose frame is inline ``orient="split"`` JSON."""
+    frame = payload.get("frame")
+    if not isinstance(frame, dict):
+        raise ValueError("missing cached frame")
+    columns = frame.get("columns")
+    data = frame.get("data")
+    if not isinstance(columns, list) or not isinstance(data, list):
+        raise ValueError("malformed cached frame")
+    return pd.DataFrame(data, columns=columns)
 
 
 def _read_last_good_snapshot(
@@ -296,9 +412,7 @@ def _read_last_good_snapshot(
         return None
 
     try:
-        payload = json.loads(path.read_text(encoding="utf-8"))
-        if payload.get("version") != _SNAPSHOT_CACHE_VERSION:
-            raise ValueError("unsupported cache version")
+        payload, frame = _load_last_good_snapshot(path, stat.st_mtime_ns)
         metadata = payload.get("metadata")
         if not isinstance(metadata, dict):
             raise ValueError("missing cache metadata")
@@ -332,13 +446,6 @@ def _read_last_good_snapshot(
                     f"{cached_snapshot_source or '<missing>'} does not match requested primary "
                     f"{requested_priority[0] if requested_priority else '<missing>'}"
                 )
-        frame = payload.get("frame")
-        if not isinstance(frame, dict):
-            raise ValueError("missing cached frame")
-        columns = frame.get("columns")
-        data = frame.get("data")
-        if not isinstance(columns, list) or not isinstance(data, list):
-            raise ValueError("malformed cached frame")
         stale_age_hours = _cache_stale_age_hours(
             stat.st_mtime,
             created_at=str(payload.get("created_at", "")),
@@ -347,7 +454,7 @@ def _read_last_good_snapshot(
             raise ValueError(
                 f"cache stale_age_hours={stale_age_hours:.4g} exceeds max_age_hours={max_age_hours:.4g}"
             )
-        cached = pd.DataFrame(data, columns=columns)
+        cached = _share_frame(frame)
         if cached.empty:
             raise ValueError("cached snapshot is empty")
         missing = _missing_required_columns(cached, required_columns)
@@ -77,8 +77,6 @@ DSA_SCREENING_HOTSPOT_CONNECTIVITY_ERROR_MARKERS = (
     "protocolerror",
     "incompleteread",
 )
-_DSA_FETCHER_MANAGER_LOCK = threading.RLock()
-_DSA_FETCHER_MANAGER: Any = None
 _FUNDAMENTAL_BLOCKS = ("valuation", "growth", "earnings", "institution", "capital_flow", "boards")
 _SCREENING_LITELLM_COMPLETION_ROUTES: ContextVar[Optional[Tuple[Dict[str, Any], ...]]] = ContextVar(
     "screening_litellm_completion_routes",
@@ -3305,14 +3303,9 @@ def _env_text(value: Any) -> str:
 
 
 def _get_dsa_fetcher_manager() -> Any:
-    global _DSA_FETCHER_MANAGER
-    if _DSA_FETCHER_MANAGER is None:
-        with _DSA_FETCHER_MANAGER_LOCK:
-            if _DSA_FETCHER_MANAGER is None:
-                from data_provider import DataFetcherManager
-
-                _DSA_FETCHER_MANAGER = DataFetcherManager()
-    return _DSA_FETCHER_MANAGER
+    from data_provider import get_fetcher_manager
+
+    return get_fetcher_manager()
 
 
 def _fetch_dsa_hotspot_rankings(source: str, limit: int) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
@@ -9,6 +9,7 @@ from __future__ import annotations
 
 import json
 import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from typing import Any, Callable, Optional
 
 from sqlalchemy import select
@@ -24,82 +25,158 @@ from src.storage import (
     persist_llm_usage,
 )
 from src.llm.usage import should_persist_usage_telemetry
+from src.services.concurrency_budget import resolve_llm_limit
 
 
 class StrategyGraphRunError(ValueError):
     pass
 
 
+class _AgentFailure(Exception):
+    def __init__(self, agent: SimulationAgentInstanceRecord, error: BaseException, started: float):
+        super().__init__(str(error))
+        self.agent = agent
+        self.error = error
+        self.started = started
+
+
 class StrategyGraphRuntimeService:
     """Execute one already-created run against its immutable published graph."""
 
-    def __init__(self, db_manager: Optional[DatabaseManager] = None, adapter_factory: Optional[Callable[[], LLMToolAdapter]] = None):
+    def __init__(
+        self,
+        db_manager: Optional[DatabaseManager] = None,
+        adapter_factory: Optional[Callable[[], LLMToolAdapter]] = None,
+        max_parallel_agents: Optional[int] = None,
+    ):
         self.db = db_manager or DatabaseManager.get_instance()
         self._adapter_factory = adapter_factory or LLMToolAdapter
+        # Per-run fan-out of ready agents; defaults to the LLM channel budget (LLM_MAX_CONCURRENCY).
+        self._max_parallel_agents = max(1, int(max_parallel_agents or resolve_llm_limit()))
 
     def execute(self, run_id: int) -> dict[str, Any]:
         snapshot = self._start(run_id)
-        input_snapshot = snapshot["input"]
         outputs: dict[int, Any] = {}
         agent_runs: list[dict[str, Any]] = snapshot["agentRuns"]
-        adapter: Optional[LLMToolAdapter] = None
-        active_event: Optional[dict[str, Any]] = None
+        events = {agent.id: agent_runs[index] for index, agent in enumerate(snapshot["agents"])}
+        running: dict[Future, SimulationAgentInstanceRecord] = {}
+        adapter: list[LLMToolAdapter] = []
+        pool = ThreadPoolExecutor(max_workers=self._max_parallel_agents, thread_name_prefix="strategy-graph")
 
         try:
-            for index, agent in enumerate(snapshot["agents"]):
-                if self._is_cancelled(run_id):
+            for phase in self._execution_phases(snapshot["agents"], snapshot["connections"]):
+                if not self._run_phase(run_id, snapshot, phase, outputs, events, running, adapter, pool):
                     return {"id": run_id, "status": "cancelled"}
-                started = time.monotonic()
-                active_event = agent_runs[index]
-                active_event["status"] = "running"
-                active_event["output"] = {"message": "正在执行此 Agent。"}
-                self._checkpoint(run_id, agent_runs, active_event.get("agentId"))
-                upstream = self._upstream_payload(agent.id, snapshot["connections"], outputs)
-                if agent.agent_type == "INPUT":
-                    output: Any = {"input": input_snapshot, "upstream": upstream}
-                    active_event.update(self._agent_event(agent, "completed", output, started))
-                    outputs[agent.id] = output
-                    self._checkpoint(run_id, agent_runs)
-                    active_event = None
-                    continue
-
-                adapter = adapter or self._adapter_factory()
-                response = adapter.call_text([
-                    {"role": "system", "content": self._system_message(agent)},
-                    {"role": "user", "content": self._user_message(input_snapshot, upstream)},
-                ], max_tokens=1200, timeout=max(1, int(agent.timeout_seconds or 30)))
-                content = str(getattr(response, "content", "") or "")
-                provider = str(getattr(response, "provider", "") or "")
-                if provider == "error":
-                    raise StrategyGraphRunError(content or "LLM runtime is not configured")
-                usage = getattr(response, "usage", None)
-                model = str(getattr(response, "model", "") or provider or "unknown")
-                if should_persist_usage_telemetry(usage):
-                    persist_llm_usage(
-                        usage,
-                        model,
-                        call_type="strategy_run",
-                        stock_code=str(input_snapshot.get("stock_code") or "") or None,
-                        strategy_id=snapshot["strategyId"],
-                        strategy_version_id=snapshot["strategyVersionId"],
-                        strategy_run_id=run_id,
-                        usage_scope="research_run",
-                    )
-                output = {"content": content, "provider": provider, "model": getattr(response, "model", None)}
-                outputs[agent.id] = output
-                active_event.update(self._agent_event(agent, "completed", output, started))
-                self._checkpoint(run_id, agent_runs)
-                active_event = None
             return self._finish(run_id, "completed", {"agentRuns": agent_runs, "finalOutput": self._final_output(snapshot["agents"], outputs)}, None)
+        except _AgentFailure as failure:
+            for agent in running.values():
+                events[agent.id].update(self._agent_event(agent, "cancelled", {"message": "并行 Agent 失败，已中止此 Agent。"}, time.monotonic()))
+            events[failure.agent.id].update(self._agent_event(failure.agent, "failed", {"message": str(failure.error)[:2000]}, failure.started))
+            self._checkpoint(run_id, agent_runs)
+            return self._finish(run_id, "failed", {"agentRuns": agent_runs}, str(failure.error)[:2000])
         except Exception as exc:
-            if active_event is not None:
-                failed_agent = next((item for item in snapshot["agents"] if str(item.id) == str(active_event.get("agentId"))), snapshot["agents"][-1])
-                active_event.update(self._agent_event(failed_agent, "failed", {"message": str(exc)[:2000]}, time.monotonic()))
-                self._checkpoint(run_id, agent_runs)
-            elif snapshot["agents"]:
+            if snapshot["agents"]:
                 failed_agent = next((item for item in snapshot["agents"] if item.id not in outputs), snapshot["agents"][-1])
                 agent_runs.append(self._agent_event(failed_agent, "failed", {"message": str(exc)[:2000]}, time.monotonic()))
             return self._finish(run_id, "failed", {"agentRuns": agent_runs}, str(exc)[:2000])
+        finally:
+            # In-flight calls of a failed or cancelled run finish in the background; their outputs are dropped.
+            pool.shutdown(wait=False, cancel_futures=True)
+
+    def _run_phase(
+        self,
+        run_id: int,
+        snapshot: dict[str, Any],
+        phase: list[tuple[SimulationAgentInstanceRecord, set[int]]],
+        outputs: dict[int, Any],
+        events: dict[int, dict[str, Any]],
+        running: dict[Future, SimulationAgentInstanceRecord],
+        adapter: list[LLMToolAdapter],
+        pool: ThreadPoolExecutor,
+    ) -> bool:
+        """Run every agent of one phase as soon as its upstream agents completed.
+
+        Status events and checkpoints are written only from this (the calling)
+        thread; worker threads just perform the model call.  Returns False when
+        the run was cancelled.
+        """
+        pending = list(phase)
+        started_at: dict[int, float] = {}
+        while pending or running:
+            if self._is_cancelled(run_id):
+                return False
+            ready = [item for item in pending if item[1] <= outputs.keys()]
+            for agent, dependencies in ready[:max(0, self._max_parallel_agents - len(running))]:
+                pending.remove((agent, dependencies))
+                started = started_at[agent.id] = time.monotonic()
+                event = events[agent.id]
+                event["status"] = "running"
+                event["output"] = {"message": "正在执行此 Agent。"}
+                self._checkpoint(run_id, snapshot["agentRuns"], event.get("agentId"))
+                upstream = self._upstream_payload(agent.id, snapshot["connections"], outputs)
+                if agent.agent_type == "INPUT":
+                    output: Any = {"input": snapshot["input"], "upstream": upstream}
+                    event.update(self._agent_event(agent, "completed", output, started))
+                    outputs[agent.id] = output
+                    self._checkpoint(run_id, snapshot["agentRuns"])
+                    continue
+                if not adapter:
+                    try:
+                        adapter.append(self._adapter_factory())
+                    except Exception as exc:
+                        raise _AgentFailure(agent, exc, started) from exc
+                running[pool.submit(self._call_agent, adapter[0], run_id, snapshot, agent, upstream)] = agent
+            if not running:
+                if pending and not any(item[1] <= outputs.keys() for item in pending):
+                    raise StrategyGraphRunError("Agent 依赖无法满足，运行已中止。")
+                continue
+            done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+            failure: Optional[_AgentFailure] = None
+            for future in sorted(done, key=lambda item: running[item].id):
+                agent = running.pop(future)
+                try:
+                    output = future.result()
+                except Exception as exc:
+                    failure = failure or _AgentFailure(agent, exc, started_at[agent.id])
+                    continue
+                outputs[agent.id] = output
+                events[agent.id].update(self._agent_event(agent, "completed", output, started_at[agent.id]))
+                self._checkpoint(run_id, snapshot["agentRuns"])
+            if failure is not None:
+                raise failure
+        return True
+
+    def _call_agent(
+        self,
+        adapter: LLMToolAdapter,
+        run_id: int,
+        snapshot: dict[str, Any],
+        agent: SimulationAgentInstanceRecord,
+        upstream: list[dict[str, Any]],
+    ) -> dict[str, Any]:
+        input_snapshot = snapshot["input"]
+        response = adapter.call_text([
+            {"role": "system", "content": self._system_message(agent)},
+            {"role": "user", "content": self._user_message(input_snapshot, upstream)},
+        ], max_tokens=1200, timeout=max(1, int(agent.timeout_seconds or 30)))
+        content = str(getattr(response, "content", "") or "")
+        provider = str(getattr(response, "provider", "") or "")
+        if provider == "error":
+            raise StrategyGraphRunError(content or "LLM runtime is not configured")
+        usage = getattr(response, "usage", None)
+        model = str(getattr(response, "model", "") or provider or "unknown")
+        if should_persist_usage_telemetry(usage):
+            persist_llm_usage(
+                usage,
+                model,
+                call_type="strategy_run",
+                stock_code=str(input_snapshot.get("stock_code") or "") or None,
+                strategy_id=snapshot["strategyId"],
+                strategy_version_id=snapshot["strategyVersionId"],
+                strategy_run_id=run_id,
+                usage_scope="research_run",
+            )
+        return {"content": content, "provider": provider, "model": getattr(response, "model", None)}
 
     def _start(self, run_id: int) -> dict[str, Any]:
         with self.db.session_scope() as session:
@@ -198,6 +275,38 @@ class StrategyGraphRuntimeService:
         primary = ordered if len(ordered) == len(primary_agents) else sorted(primary_agents, key=lambda item: item.id)
         return primary + sorted(reflection_agents, key=lambda item: item.id)
 
+    @classmethod
+    def _execution_phases(
+        cls,
+        agents: list[SimulationAgentInstanceRecord],
+        connections: list[SimulationAgentConnectionRecord],
+    ) -> list[list[tuple[SimulationAgentInstanceRecord, set[int]]]]:
+        """Split ``_ordered_agents`` output into the DAG phase and the reflection phase.
+
+        Each agent carries the ids it must wait for.  DAG agents depend only on
+        their DATA_FLOW parents so independent branches run concurrently;
+        reflections (and legacy graphs with cycles) keep their sequential order.
+        """
+        primary = [agent for agent in agents if agent.agent_type != "REFLECTION"]
+        reflections = [agent for agent in agents if agent.agent_type == "REFLECTION"]
+        primary_ids = {agent.id for agent in primary}
+        parents: dict[int, set[int]] = {agent.id: set() for agent in primary}
+        for edge in connections:
+            if edge.connection_type == "POST_RUN_CONTEXT" or edge.source_agent_id not in primary_ids or edge.target_agent_id not in primary_ids:
+                continue
+            parents[edge.target_agent_id].add(edge.source_agent_id)
+        position = {agent.id: index for index, agent in enumerate(primary)}
+        if any(position[parent] > position[agent_id] for agent_id, ids in parents.items() for parent in ids):
+            # Legacy cyclic data fell back to id order in _ordered_agents; run it one by one.
+            dag_phase = cls._sequential_phase(primary)
+        else:
+            dag_phase = [(agent, parents[agent.id]) for agent in primary]
+        return [phase for phase in (dag_phase, cls._sequential_phase(reflections)) if phase]
+
+    @staticmethod
+    def _sequential_phase(agents: list[SimulationAgentInstanceRecord]) -> list[tuple[SimulationAgentInstanceRecord, set[int]]]:
+        return [(agent, {agents[index - 1].id} if index else set()) for index, agent in enumerate(agents)]
+
     @staticmethod
     def _upstream_payload(agent_id: int, connections: list[SimulationAgentConnectionRecord], outputs: dict[int, Any]) -> list[dict[str, Any]]:
         return [{"connectionType": edge.connection_type, "fieldMapping": StrategyGraphRuntimeService._load(edge.field_mapping_json), "output": outputs[edge.source_agent_id]}
@@ -218,7 +327,7 @@ class StrategyGraphRuntimeService:
     @staticmethod
     def _final_output(agents: list[SimulationAgentInstanceRecord], outputs: dict[int, Any]) -> Any:
         decision = next((agent for agent in reversed(agents) if agent.agent_type == "DECISION" and agent.id in outputs), None)
-        return outputs.get(decision.id) if decision else next(reversed(outputs.values()), None)
+        return outputs.get(decision.id) if decision else next((outputs[agent.id] for agent in reversed(agents) if agent.id in outputs), None)
 
     @staticmethod
     def _load(value: str | None) -> dict[str, Any]:
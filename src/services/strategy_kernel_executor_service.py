@@ -2,13 +2,12 @@
 
 from __future__ import annotations
 
+import functools
 import importlib
 import json
 import os
 import resource
-import subprocess
 import sys
-import tempfile
 import uuid
 import zipfile
 from datetime import datetime, timezone
@@ -19,6 +18,12 @@ from jsonschema import ValidationError, validate as validate_json_schema
 from sqlalchemy import desc, select
 
 from src.services.strategy_definition_service import StrategyDefinitionError, StrategyDefinitionService
+from src.services.strategy_kernel_worker_pool import (
+    StrategyKernelWorkerError,
+    StrategyKernelWorkerPool,
+    get_strategy_kernel_worker_pool,
+)
+from src.services.strategy_package_cache import StrategyPackageCache
 from src.storage import StockDaily
 
 
@@ -225,44 +230,28 @@ class StrategyKernelExecutorService:
         return function(context)
 
     def _execute_uploaded(self, package: dict[str, Any], context: dict[str, Any]) -> dict[str, Any]:
-        archive_path = self._archive_path(str(package.get("sha256") or ""))
+        digest = str(package.get("sha256") or "")
+        archive_path = self._archive_path(digest)
         if not archive_path.exists():
             raise StrategyKernelExecutionError("STRATEGY_KERNEL_ARCHIVE_MISSING", "策略内核归档不存在。", 409)
-        with tempfile.TemporaryDirectory(prefix="strategy-kernel-") as temporary:
-            target = Path(temporary).resolve()
-            with zipfile.ZipFile(archive_path) as archive:
-                self._safe_extract(archive, target)
-            package_dir = self._package_root(target)
-            command = [str(Path(sys.executable).resolve()), "-I", str(Path(__file__).with_name("strategy_kernel_worker.py")), str(package_dir)]
-            try:
-                completed = subprocess.run(
-                    command,
-                    input=json.dumps(context, ensure_ascii=False, allow_nan=False),
-                    text=True,
-                    capture_output=True,
-                    timeout=self.TIMEOUT_SECONDS,
-                    env={"PATH": os.environ.get("PATH", "")},
-                    cwd=package_dir,
-                    preexec_fn=self._limits if os.name == "posix" else None,
-                    check=False,
-                )
-            except subprocess.TimeoutExpired as exc:
-                raise StrategyKernelExecutionError("STRATEGY_KERNEL_TIMEOUT", "策略函数执行超时。", 408) from exc
-            if completed.returncode != 0:
-                diagnostic = (completed.stderr or completed.stdout or "").strip().splitlines()
-                message = diagnostic[-1][:500] if diagnostic else f"策略函数执行失败（退出码 {completed.returncode}）。"
-                raise StrategyKernelExecutionError("STRATEGY_KERNEL_EXECUTION_FAILED", message, 422)
-            if len(completed.stdout.encode("utf-8")) > self.OUTPUT_LIMIT_BYTES:
-                raise StrategyKernelExecutionError("STRATEGY_KERNEL_OUTPUT_TOO_LARGE", "策略函数输出超过 2 MB。", 422)
-            try:
-                return json.loads(completed.stdout)
-            except json.JSONDecodeError as exc:
-                raise StrategyKernelExecutionError("STRATEGY_KERNEL_OUTPUT_INVALID", "策略函数没有返回有效 JSON。", 422) from exc
+        pool = get_strategy_kernel_worker_pool(
+            timeout_seconds=self.TIMEOUT_SECONDS,
+            output_limit_bytes=self.OUTPUT_LIMIT_BYTES,
+            preexec=functools.partial(self._limits, self.TIMEOUT_SECONDS * StrategyKernelWorkerPool.MAX_CALLS_PER_WORKER),
+        )
+        cache = StrategyPackageCache(archive_path.parent / "extracted")
+        try:
+            return pool.run(digest, lambda: cache.materialize(digest, archive_path, self._extract_package), context)
+        except StrategyKernelWorkerError as exc:
+            raise StrategyKernelExecutionError(exc.code, exc.message, 408 if exc.code == "STRATEGY_KERNEL_TIMEOUT" else 422) from exc
 
-    def _limits(self) -> None:
+    @classmethod
+    def _limits(cls, cpu_seconds: int | None = None) -> None:
+        # Pooled workers get a lifetime CPU ceiling and narrow the soft limit
+        # to TIMEOUT_SECONDS before every call themselves.
         limits = [
-            (resource.RLIMIT_CPU, self.TIMEOUT_SECONDS),
-            (resource.RLIMIT_FSIZE, self.OUTPUT_LIMIT_BYTES),
+            (resource.RLIMIT_CPU, cpu_seconds or cls.TIMEOUT_SECONDS),
+            (resource.RLIMIT_FSIZE, cls.OUTPUT_LIMIT_BYTES),
             (resource.RLIMIT_NOFILE, 32),
         ]
         if hasattr(resource, "RLIMIT_NPROC"):
@@ -272,7 +261,7 @@ class StrategyKernelExecutorService:
         # static source policy and remaining rlimits still apply on macOS;
         # Linux additionally keeps the address-space ceiling.
         if sys.platform != "darwin":
-            limits.append((resource.RLIMIT_AS, self.MEMORY_LIMIT_BYTES))
+            limits.append((resource.RLIMIT_AS, cls.MEMORY_LIMIT_BYTES))
         for limit, requested in limits:
             try:
                 _soft, hard = resource.getrlimit(limit)
@@ -292,6 +281,11 @@ class StrategyKernelExecutorService:
                 raise StrategyKernelExecutionError("STRATEGY_PACKAGE_PATH_INVALID", "策略包包含不安全路径。", 422)
         archive.extractall(target)
 
+    @classmethod
+    def _extract_package(cls, archive: zipfile.ZipFile, target: Path) -> Path:
+        cls._safe_extract(archive, target)
+        return cls._package_root(target)
+
     @staticmethod
     def _package_root(target: Path) -> Path:
         if (target / "strategy.py").exists():
@@ -1,24 +1,32 @@
-"""Minimal JSON stdin/stdout worker for an uploaded strategy function.
+"""Minimal pipe worker for an uploaded strategy function.
 
 The parent process performs archive, AST, dependency and schema validation
 before starting this worker.  This module intentionally imports no project
 code so ``python -I`` cannot give uploaded code access to application secrets.
+
+The worker keeps ``strategy.py`` loaded and answers many calls over a
+length-prefixed pipe protocol: every frame is a 4-byte big-endian length
+followed by UTF-8 JSON.  Requests are ``{"context": ...}``; replies are
+``{"result": ...}`` or ``{"error": "<Type>: <message>"}``.  A ``{"ready": true}``
+frame is written once the module has been imported.
 """
 
 from __future__ import annotations
 
 import importlib.util
+import io
 import json
+import resource
+import struct
 import sys
+from contextlib import redirect_stdout
 from pathlib import Path
 
+FRAME_HEADER = struct.Struct(">I")
 
-def main() -> int:
-    if len(sys.argv) != 2:
-        raise RuntimeError("strategy worker requires a package directory")
-    package_dir = Path(sys.argv[1]).resolve()
+
+def load_entrypoint(package_dir: Path):
     module_path = package_dir / "strategy.py"
-    context = json.load(sys.stdin)
     spec = importlib.util.spec_from_file_location("uploaded_strategy", module_path)
     if spec is None or spec.loader is None:
         raise RuntimeError("cannot load strategy.py")
@@ -27,10 +35,68 @@ def main() -> int:
     entrypoint = getattr(module, "run", None)
     if not callable(entrypoint):
         raise RuntimeError("strategy.py does not expose run(context)")
+    return entrypoint
+
+
+def call(entrypoint, context) -> str:
     result = entrypoint(context)
     if not isinstance(result, dict):
         raise TypeError("run(context) must return a JSON object")
-    sys.stdout.write(json.dumps(result, ensure_ascii=False, allow_nan=False))
+    return json.dumps(result, ensure_ascii=False, allow_nan=False)
+
+
+def _read_frame(stream) -> bytes | None:
+    header = stream.read(FRAME_HEADER.size)
+    if len(header) < FRAME_HEADER.size:
+        return None
+    (length,) = FRAME_HEADER.unpack(header)
+    body = stream.read(length)
+    if len(body) < length:
+        return None
+    return body
+
+
+def _write_frame(stream, body: bytes) -> None:
+    stream.write(FRAME_HEADER.pack(len(body)) + body)
+    stream.flush()
+
+
+def _refresh_cpu_budget(seconds: int) -> None:
+    """Give the next call ``seconds`` of CPU on top of what is already spent.
+
+    The hard RLIMIT_CPU set by the parent still caps the worker's lifetime.
+    """
+    _soft, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    if seconds <= 0 or hard == resource.RLIM_INFINITY:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    spent = int(usage.ru_utime + usage.ru_stime) + 1
+    try:
+        resource.setrlimit(resource.RLIMIT_CPU, (min(spent + seconds, hard), hard))
+    except (OSError, ValueError):
+        pass
+
+
+def main() -> int:
+    if len(sys.argv) != 3:
+        raise RuntimeError("strategy worker requires a package directory and a per-call CPU budget")
+    package_dir = Path(sys.argv[1]).resolve()
+    call_cpu_seconds = int(sys.argv[2])
+    requests = sys.stdin.buffer
+    replies = sys.stdout.buffer
+    # Anything uploaded code prints must not corrupt the reply frames.
+    sys.stdout = sys.stderr
+    entrypoint = load_entrypoint(package_dir)
+    _write_frame(replies, b'{"ready":true}')
+    while (frame := _read_frame(requests)) is not None:
+        _refresh_cpu_budget(call_cpu_seconds)
+        try:
+            context = json.loads(frame.decode("utf-8"))["context"]
+            with redirect_stdout(io.StringIO()):
+                reply = '{"result":' + call(entrypoint, context) + "}"
+        except Exception as exc:  # The parent converts this single safe line.
+            reply = json.dumps({"error": f"{type(exc).__name__}: {exc}"[:500]}, ensure_ascii=False)
+        _write_frame(replies, reply.encode("utf-8"))
     return 0
 
 
@@ -0,0 +1,355 @@
+"""Warm, sandboxed worker processes for uploaded strategy kernels.
+
+Each uploaded package (keyed by its archive sha256) is served by ``strategy_kernel_worker.py`` processes that keep
+``strategy.py`` imported between calls.  Workers run under ``python -I`` with
+an empty environment and the executor's rlimits; a call that times out,
+crashes or exceeds the output limit kills its worker.  Idle
+workers are evicted after ``IDLE_SECONDS`` by a background reaper and every
+worker is recycled after ``MAX_CALLS_PER_WORKER`` calls so long-lived state and
+CPU budget stay bounded.  Packages are resolved, which re-verifies the
+extracted files, under a per-digest lock before every worker spawn, so a
+tampered package directory is never imported and one cold package never blocks
+checkouts of the others.
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import selectors
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+WORKER_SCRIPT = Path(__file__).with_name("strategy_kernel_worker.py")
+
+
+class StrategyKernelWorkerError(RuntimeError):
+    """A pooled call failed; ``code`` maps onto the executor's error codes."""
+
+    def __init__(self, code: str, message: str):
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+@dataclass
+class _Worker:
+    process: subprocess.Popen
+    stderr: Any
+    calls: int = 0
+    idle_since: float = field(default_factory=time.monotonic)
+
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    def diagnostic(self) -> str:
+        try:
+            self.stderr.seek(0)
+            lines = self.stderr.read().decode("utf-8", "replace").strip().splitlines()
+        except (OSError, ValueError):
+            lines = []
+        return lines[-1][:500] if lines else ""
+
+    def close(self) -> None:
+        if self.alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout, self.stderr):
+            try:
+                stream.close()
+            except (OSError, ValueError):
+                pass
+
+
+@dataclass
+class _Package:
+    package_dir: Optional[Path] = None
+    idle: list[_Worker] = field(default_factory=list)
+    busy: int = 0
+    last_used: float = field(default_factory=time.monotonic)
+    resolve_lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class StrategyKernelWorkerPool:
+    """Check out a warm worker for one package sha256, call it, check it back in."""
+
+    IDLE_SECONDS = 300
+    REAP_INTERVAL_SECONDS = 30
+    MAX_CALLS_PER_WORKER = 200
+    MAX_IDLE_WORKERS_PER_PACKAGE = 2
+    MAX_PACKAGES = 16
+
+    def __init__(
+        self,
+        *,
+        timeout_seconds: int,
+        output_limit_bytes: int,
+        preexec: Optional[Callable[[], None]] = None,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.output_limit_bytes = output_limit_bytes
+        self.preexec = preexec
+        self._packages: dict[str, _Package] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+        self._reaper_stop = threading.Event()
+
+    def run(
+        self,
+        digest: str,
+        resolve: Callable[[], Path],
+        context: dict[str, Any],
+    ) -> dict[str, Any]:
+        """Call ``run(context)`` in a warm worker for ``digest``.
+
+        ``resolve`` returns the verified package root; it is called before
+        every worker spawn, while warm workers are reused without it.
+        """
+        request = json.dumps({"context": context}, ensure_ascii=False, allow_nan=False).encode("utf-8")
+        package, worker = self._checkout(digest, resolve)
+        try:
+            try:
+                reply = self._call(worker, request)
+            except BrokenPipeError:
+                # An idle worker can die between calls (rlimit, external kill);
+                # the request was never read, so retry once on a fresh process.
+                worker.close()
+                worker = self._spawn_verified(package, resolve)
+                reply = self._call(worker, request)
+        except BaseException:
+            worker.close()
+            self._checkin(digest, package, None)
+            raise
+        self._checkin(digest, package, worker)
+        if "error" in reply:
+            raise StrategyKernelWorkerError("STRATEGY_KERNEL_EXECUTION_FAILED", str(reply["error"])[:500])
+        return reply.get("result")
+
+    def shutdown(self) -> None:
+        with self._lock:
+            packages, self._packages = list(self._packages.values()), {}
+            reaper, self._reaper = self._reaper, None
+            self._reaper_stop.set()
+        if reaper is not None and reaper is not threading.current_thread():
+            reaper.join(timeout=5)
+        for package in packages:
+            self._discard(package)
+
+    def evict_idle(self) -> None:
+        """Close workers and packages idle for ``IDLE_SECONDS``; run periodically by the reaper."""
+        with self._lock:
+            evicted = self._evict_locked(time.monotonic())
+        for item in evicted:
+            self._discard(item)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "packages": len(self._packages),
+                "idleWorkers": sum(len(item.idle) for item in self._packages.values()),
+                "busyWorkers": sum(item.busy for item in self._packages.values()),
+            }
+
+    def _checkout(self, digest: str, resolve: Callable[[], Path]) -> tuple[_Package, _Worker]:
+        with self._lock:
+            evicted = self._evict_locked(time.monotonic())
+            package = self._packages.get(digest)
+            if package is None:
+                package = self._packages[digest] = _Package()
+            # Counting the checkout as busy keeps the package resident while it resolves.
+            package.busy += 1
+            package.last_used = time.monotonic()
+        for item in evicted:
+            self._discard(item)
+        worker = None
+        evicted = []
+        with self._lock:
+            while package.idle and worker is None:
+                candidate = package.idle.pop()
+                if candidate.alive():
+                    worker = candidate
+                else:
+                    evicted.append(candidate)
+        for item in evicted:
+            self._discard(item)
+        if worker is None:
+            try:
+                worker = self._spawn_verified(package, resolve)
+            except BaseException:
+                self._checkin(digest, package, None)
+                raise
+        return package, worker
+
+    def _checkin(self, digest: str, package: _Package, worker: Optional[_Worker]) -> None:
+        retire = worker
+        with self._lock:
+            package.busy -= 1
+            package.last_used = time.monotonic()
+            if (
+                worker is not None
+                and worker.alive()
+                and worker.calls < self.MAX_CALLS_PER_WORKER
+                and len(package.idle) < self.MAX_IDLE_WORKERS_PER_PACKAGE
+                and self._packages.get(digest) is package
+            ):
+                worker.idle_since = time.monotonic()
+                package.idle.append(worker)
+                retire = None
+                self._ensure_reaper_locked()
+            elif package.package_dir is None and package.busy == 0 and self._packages.get(digest) is package:
+                # The package never resolved; do not keep an empty entry around.
+                del self._packages[digest]
+            orphaned = self._packages.get(digest) is not package and package.busy == 0
+        if retire is not None:
+            retire.close()
+        if orphaned:
+            self._discard(package)
+
+    def _ensure_reaper_locked(self) -> None:
+        if self._reaper is not None and self._reaper.is_alive():
+            return
+        self._reaper_stop = threading.Event()
+        self._reaper = threading.Thread(
+            target=self._reap,
+            args=(self._reaper_stop,),
+            name="strategy-kernel-reaper",
+            daemon=True,
+        )
+        self._reaper.start()
+
+    def _reap(self, stop: threading.Event) -> None:
+        while not stop.wait(self.REAP_INTERVAL_SECONDS):
+            self.evict_idle()
+
+    def _evict_locked(self, now: float) -> list[Any]:
+        evicted: list[Any] = []
+        for package in self._packages.values():
+            keep = [worker for worker in package.idle if now - worker.idle_since < self.IDLE_SECONDS]
+            evicted.extend(worker for worker in package.idle if worker not in keep)
+            package.idle = keep
+        unused = sorted(
+            (item for item in self._packages.items() if item[1].busy == 0 and not item[1].idle),
+            key=lambda item: item[1].last_used,
+        )
+        overflow = max(0, len(self._packages) - self.MAX_PACKAGES)
+        for digest, package in unused:
+            if overflow or now - package.last_used >= self.IDLE_SECONDS:
+                del self._packages[digest]
+                evicted.append(package)
+                overflow = max(0, overflow - 1)
+        return evicted
+
+    @staticmethod
+    def _discard(item: Any) -> None:
+        if isinstance(item, _Worker):
+            item.close()
+            return
+        for worker in item.idle:
+            worker.close()
+        item.idle = []
+
+    def _spawn_verified(self, package: _Package, resolve: Callable[[], Path]) -> _Worker:
+        # Resolving may extract an archive; only callers of this digest wait for it.
+        # The lock is held through the spawn so a concurrent rebuild cannot swap the
+        # directory between verification and the worker's import.
+        with package.resolve_lock:
+            package.package_dir = resolve()
+            return self._spawn(package.package_dir)
+
+    def _spawn(self, package_dir: Path) -> _Worker:
+        stderr = tempfile.TemporaryFile()
+        command = [
+            str(Path(sys.executable).resolve()),
+            "-I",
+            str(WORKER_SCRIPT),
+            str(package_dir),
+            str(self.timeout_seconds),
+        ]
+        process = subprocess.Popen(
+            command,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            bufsize=0,
+            env={"PATH": os.environ.get("PATH", "")},
+            cwd=package_dir,
+            preexec_fn=self.preexec,
+        )
+        worker = _Worker(process=process, stderr=stderr)
+        try:
+            self._read_reply(worker, time.monotonic() + self.timeout_seconds)
+        except BaseException:
+            worker.close()
+            raise
+        return worker
+
+    def _call(self, worker: _Worker, request: bytes) -> dict[str, Any]:
+        deadline = time.monotonic() + self.timeout_seconds
+        worker.calls += 1
+        frame = memoryview(len(request).to_bytes(4, "big") + request)
+        while frame:
+            frame = frame[worker.process.stdin.write(frame):]
+        return self._read_reply(worker, deadline)
+
+    def _read_reply(self, worker: _Worker, deadline: float) -> dict[str, Any]:
+        header = self._read_exact(worker, 4, deadline)
+        length = int.from_bytes(header, "big")
+        if length > self.output_limit_bytes:
+            raise StrategyKernelWorkerError(
+                "STRATEGY_KERNEL_OUTPUT_TOO_LARGE",
+                f"策略函数输出超过 {self.output_limit_bytes // (1024 * 1024)} MB。",
+            )
+        body = self._read_exact(worker, length, deadline)
+        try:
+            reply = json.loads(body.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
+            raise StrategyKernelWorkerError("STRATEGY_KERNEL_OUTPUT_INVALID", "策略函数没有返回有效 JSON。") from exc
+        if not isinstance(reply, dict):
+            raise StrategyKernelWorkerError("STRATEGY_KERNEL_OUTPUT_INVALID", "策略函数没有返回有效 JSON。")
+        return reply
+
+    @staticmethod
+    def _read_exact(worker: _Worker, size: int, deadline: float) -> bytes:
+        stream = worker.process.stdout
+        chunks = bytearray()
+        with selectors.DefaultSelector() as selector:
+            selector.register(stream, selectors.EVENT_READ)
+            while len(chunks) < size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0 or not selector.select(remaining):
+                    raise StrategyKernelWorkerError("STRATEGY_KERNEL_TIMEOUT", "策略函数执行超时。")
+                chunk = os.read(stream.fileno(), size - len(chunks))
+                if not chunk:
+                    try:
+                        returncode = worker.process.wait(timeout=1)
+                    except subprocess.TimeoutExpired:
+                        returncode = None
+                    message = worker.diagnostic() or f"策略函数执行失败（退出码 {returncode}）。"
+                    raise StrategyKernelWorkerError("STRATEGY_KERNEL_EXECUTION_FAILED", message)
+                chunks.extend(chunk)
+        return bytes(chunks)
+
+
+_pool_singleton: Optional[StrategyKernelWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_strategy_kernel_worker_pool(**kwargs: Any) -> StrategyKernelWorkerPool:
+    """Return the process-wide pool, creating it with ``kwargs`` on first use."""
+    global _pool_singleton
+    if _pool_singleton is None:
+        with _pool_lock:
+            if _pool_singleton is None:
+                _pool_singleton = StrategyKernelWorkerPool(**kwargs)
+                atexit.register(_pool_singleton.shutdown)
+    return _pool_singleton
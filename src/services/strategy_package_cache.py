@@ -0,0 +1,185 @@
+"""Content-addressed cache of extracted strategy package archives.
+
+Uploaded archives are immutable and stored as ``<sha256>.zip``, so their
+extraction can be shared by every execution instead of being unpacked into a
+fresh temporary directory per call.  Each entry lives in ``<root>/<sha256>``:
+it is populated in a private temporary directory and renamed into place, so
+readers never observe a partial tree.  A ``.manifest.json`` records the sha256
+of every extracted file plus a hash over that listing.  Files and directories
+are made read-only so kernels cannot leave state behind in their shared working
+directory, and an entry is re-hashed against its manifest every time it is
+materialized (the worker pool does so before spawning each worker) and rebuilt
+when it does not match, including when files were added.  Manifest mtimes
+track last use and the least recently used entries are evicted once the cache
+exceeds ``max_bytes``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import shutil
+import stat
+import tempfile
+import uuid
+import zipfile
+from pathlib import Path
+from typing import Any, Callable
+
+from src.services.strategy_definition_service import StrategyDefinitionError
+
+MANIFEST_NAME = ".manifest.json"
+
+_READ_ONLY_FILE = stat.S_IRUSR | stat.S_IRGRP | stat.S_IROTH
+_READ_ONLY_DIRECTORY = _READ_ONLY_FILE | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH
+
+
+class StrategyPackageCache:
+    """Materialize ``<sha256>.zip`` archives as read-only package directories."""
+
+    MAX_BYTES = 512 * 1024 * 1024
+
+    def __init__(self, root: Path, max_bytes: int | None = None):
+        self.root = Path(root).resolve()
+        self.max_bytes = self.MAX_BYTES if max_bytes is None else max_bytes
+
+    def materialize(self, digest: str, archive_path: Path, extract: Callable[[zipfile.ZipFile, Path], Path]) -> Path:
+        """Return the verified package root for ``digest``, extracting the archive if needed.
+
+        The entry is re-hashed against its manifest on every call.  ``extract`` unpacks an archive into an empty directory and returns the
+        package root inside it.
+        """
+        entry = self.root / digest
+        manifest = self._verified_manifest(digest, entry)
+        if manifest is None:
+            manifest = self._populate(digest, archive_path, entry, extract)
+            self._evict(keep=digest)
+        else:
+            self._touch(entry)
+        return entry / manifest["packageRoot"]
+
+    def entries(self) -> list[dict[str, Any]]:
+        """Cached entries, least recently used first."""
+        if not self.root.is_dir():
+            return []
+        result = []
+        for entry in self.root.iterdir():
+            manifest = None if entry.name.startswith(".") else self._read_manifest(entry)
+            if manifest is None:
+                continue
+            result.append({
+                "digest": entry.name,
+                "bytes": int(manifest.get("bytes") or 0),
+                "lastUsed": (entry / MANIFEST_NAME).stat().st_mtime_ns,
+            })
+        return sorted(result, key=lambda item: item["lastUsed"])
+
+    def _verified_manifest(self, digest: str, entry: Path) -> dict[str, Any] | None:
+        manifest = self._read_manifest(entry)
+        if manifest is None or manifest.get("archiveSha256") != digest:
+            self._remove(entry)
+            return None
+        files = self._hash_files(entry)
+        if manifest.get("manifestSha256") != self._manifest_hash(files) or files != manifest.get("files"):
+            self._remove(entry)
+            return None
+        return manifest
+
+    def _populate(self, digest: str, archive_path: Path, entry: Path, extract: Callable[[zipfile.ZipFile, Path], Path]) -> dict[str, Any]:
+        if self._hash_file(archive_path) != digest:
+            raise StrategyDefinitionError("STRATEGY_KERNEL_ARCHIVE_INVALID", "策略内核归档与登记的 SHA-256 不一致。", 409)
+        self.root.mkdir(parents=True, exist_ok=True)
+        staging = Path(tempfile.mkdtemp(prefix=f".{digest[:16]}-", dir=self.root))
+        try:
+            with zipfile.ZipFile(archive_path) as archive:
+                package_root = extract(archive, staging)
+            files = self._hash_files(staging)
+            manifest = {
+                "archiveSha256": digest,
+                "packageRoot": package_root.relative_to(staging).as_posix(),
+                "files": files,
+                "bytes": sum(path.stat().st_size for path in staging.rglob("*") if path.is_file()),
+                "manifestSha256": self._manifest_hash(files),
+            }
+            (staging / MANIFEST_NAME).write_text(json.dumps(manifest, sort_keys=True), encoding="utf-8")
+            # Deepest first, so each directory is still writable while its children change mode.
+            for directory, _dirs, names in os.walk(staging, topdown=False):
+                for name in names:
+                    os.chmod(os.path.join(directory, name), _READ_ONLY_FILE)
+                os.chmod(directory, _READ_ONLY_DIRECTORY)
+            try:
+                staging.rename(entry)
+            except OSError:
+                # Another process finished first; its entry is equivalent.
+                existing = self._verified_manifest(digest, entry)
+                if existing is None:
+                    raise
+                manifest = existing
+        finally:
+            if staging.exists():
+                self._remove(staging)
+        return manifest
+
+    def _evict(self, keep: str) -> None:
+        entries = self.entries()
+        total = sum(item["bytes"] for item in entries)
+        for item in entries:
+            if total <= self.max_bytes:
+                break
+            if item["digest"] == keep:
+                continue
+            self._remove(self.root / item["digest"])
+            total -= item["bytes"]
+
+    @staticmethod
+    def _touch(entry: Path) -> None:
+        try:
+            os.utime(entry / MANIFEST_NAME)
+        except OSError:
+            pass
+
+    @staticmethod
+    def _read_manifest(entry: Path) -> dict[str, Any] | None:
+        try:
+            manifest = json.loads((entry / MANIFEST_NAME).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        return manifest if isinstance(manifest, dict) and isinstance(manifest.get("packageRoot"), str) else None
+
+    @classmethod
+    def _hash_files(cls, directory: Path) -> dict[str, str]:
+        return {
+            path.relative_to(directory).as_posix(): cls._hash_file(path)
+            for path in sorted(directory.rglob("*"))
+            if path.is_file() and path.name != MANIFEST_NAME
+        }
+
+    @staticmethod
+    def _hash_file(path: Path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as handle:
+            for chunk in iter(lambda: handle.read(1024 * 1024), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _manifest_hash(files: dict[str, str]) -> str:
+        return hashlib.sha256(json.dumps(files, sort_keys=True, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        if not path.exists():
+            return
+        # Rename first so concurrent readers never see a half-deleted entry.
+        doomed = path.with_name(f".evicted-{uuid.uuid4().hex}")
+        try:
+            path.rename(doomed)
+        except OSError:
+            return
+        for directory, _dirs, _names in os.walk(doomed):
+            try:
+                os.chmod(directory, stat.S_IRWXU)
+            except OSError:
+                pass
+        shutil.rmtree(doomed, ignore_errors=True)
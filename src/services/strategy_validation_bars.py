@@ -0,0 +1,464 @@
+"""Columnar daily-bar panel consumed by StrategyVersion validation replays.
+
+A validation experiment freezes every OHLCV row it reads.  Keeping those rows
+as one dict per bar made loading, hashing and replaying a multi-year universe
+dominated by Python object churn, so the panel stores them as dense
+``date index x symbol`` NumPy arrays instead.  Missing bars are NaN holes in
+the value arrays and ``False`` in :attr:`ValidationBarPanel.present`.
+
+The panel is loss-free with respect to the frozen snapshot:
+:meth:`ValidationBarPanel.iter_records` yields exactly the per-bar dicts the
+service hashed and persisted before, in the same ``(code, date)`` order, so
+snapshot hashes of existing experiments remain valid.
+"""
+
+from __future__ import annotations
+
+import math
+import statistics
+from dataclasses import dataclass
+from datetime import date, datetime
+from multiprocessing import shared_memory
+from typing import Any, Callable, Iterable, Iterator, Optional, Sequence
+
+import numpy as np
+
+
+PRICE_FIELDS = ("open", "high", "low", "close", "volume", "amount")
+# Column order of the row tuples accepted by ``ValidationBarPanel.from_rows``.
+ROW_FIELDS = ("code", "date", *PRICE_FIELDS, "dataSource", "sourceCreatedAt", "sourceUpdatedAt", "adjustmentMode")
+
+
+@dataclass(frozen=True)
+class ValidationBarPanel:
+    """Dense OHLCV panel with per-row provenance ids.
+
+    ``values[field][i, j]`` is the bar of ``codes[j]`` on ``dates[i]``.
+    ``provenance_ids[i, j]`` indexes :attr:`provenance`, the interned
+    ``(dataSource, adjustmentMode)`` pairs, and is ``-1`` where no row exists.
+    """
+
+    codes: tuple[str, ...]
+    dates: np.ndarray
+    values: dict[str, np.ndarray]
+    present: np.ndarray
+    provenance_ids: np.ndarray
+    provenance: tuple[tuple[Optional[str], Optional[str]], ...]
+    created_at: np.ndarray
+    updated_at: np.ndarray
+
+    @classmethod
+    def empty(cls) -> "ValidationBarPanel":
+        return cls.from_rows([])
+
+    @classmethod
+    def from_rows(
+        cls,
+        rows: Iterable[Sequence[Any]],
+        *,
+        adjustment_mode: Optional[Callable[[Optional[str]], Optional[str]]] = None,
+    ) -> "ValidationBarPanel":
+        """Build a panel from ``ROW_FIELDS``-ordered tuples sorted by code and date.
+
+        When ``adjustment_mode`` is given, rows may omit the trailing
+        adjustment column and it is derived once per distinct data source.
+        """
+        columns = list(zip(*rows))
+        if not columns:
+            shape = (0, 0)
+            return cls(
+                codes=(),
+                dates=np.empty(0, dtype="datetime64[D]"),
+                values={field: np.empty(shape, dtype=np.float64) for field in PRICE_FIELDS},
+                present=np.zeros(shape, dtype=bool),
+                provenance_ids=np.full(shape, -1, dtype=np.int32),
+                provenance=(),
+                created_at=np.empty(shape, dtype="datetime64[us]"),
+                updated_at=np.empty(shape, dtype="datetime64[us]"),
+            )
+
+        code_index: dict[str, int] = {}
+        code_positions = np.fromiter(
+            (code_index.setdefault(code, len(code_index)) for code in columns[0]),
+            dtype=np.int64,
+            count=len(columns[0]),
+        )
+        dates, date_positions = np.unique(np.array(columns[1], dtype="datetime64[D]"), return_inverse=True)
+        shape = (dates.shape[0], len(code_index))
+        present = np.zeros(shape, dtype=bool)
+        present[date_positions, code_positions] = True
+        if int(present.sum()) != len(columns[0]):
+            raise ValueError("validation bars must contain at most one row per code and date")
+
+        values = {}
+        for offset, field in enumerate(PRICE_FIELDS, start=2):
+            dense = np.full(shape, np.nan, dtype=np.float64)
+            dense[date_positions, code_positions] = np.array(columns[offset], dtype=np.float64)
+            values[field] = dense
+
+        sources = columns[8]
+        if adjustment_mode is not None:
+            modes_by_source = {source: adjustment_mode(source) for source in set(sources)}
+            modes: Sequence[Optional[str]] = [modes_by_source[source] for source in sources]
+        else:
+            modes = columns[11]
+        provenance_index: dict[tuple[Optional[str], Optional[str]], int] = {}
+        provenance_ids = np.full(shape, -1, dtype=np.int32)
+        provenance_ids[date_positions, code_positions] = np.fromiter(
+            (provenance_index.setdefault(pair, len(provenance_index)) for pair in zip(sources, modes)),
+            dtype=np.int32,
+            count=len(sources),
+        )
+
+        timestamps = []
+        for offset in (9, 10):
+            dense = np.full(shape, np.datetime64("NaT"), dtype="datetime64[us]")
+            dense[date_positions, code_positions] = np.array(columns[offset], dtype="datetime64[us]")
+            timestamps.append(dense)
+
+        return cls(
+            codes=tuple(code_index),
+            dates=dates,
+            values=values,
+            present=present,
+            provenance_ids=provenance_ids,
+            provenance=tuple(provenance_index),
+            created_at=timestamps[0],
+            updated_at=timestamps[1],
+        )
+
+    def __len__(self) -> int:
+        return int(self.present.sum())
+
+    @property
+    def tradable(self) -> np.ndarray:
+        """Rows the replay can trade: open and close are both known."""
+        return self.present & ~np.isnan(self.values["open"]) & ~np.isnan(self.values["close"])
+
+    def take(self, codes: Iterable[str]) -> "ValidationBarPanel":
+        """Return a panel restricted to ``codes`` (kept in panel order)."""
+        wanted = set(codes)
+        columns = [index for index, code in enumerate(self.codes) if code in wanted]
+        present = self.present[:, columns]
+        rows = present.any(axis=1)
+        select = np.ix_(rows, columns)
+        return ValidationBarPanel(
+            codes=tuple(self.codes[index] for index in columns),
+            dates=self.dates[rows],
+            values={field: array[select] for field, array in self.values.items()},
+            present=present[rows],
+            provenance_ids=self.provenance_ids[select],
+            provenance=self.provenance,
+            created_at=self.created_at[select],
+            updated_at=self.updated_at[select],
+        )
+
+    def sources(self) -> list[str]:
+        used = np.unique(self.provenance_ids[self.present])
+        return sorted({str(self.provenance[index][0]) for index in used if self.provenance[index][0]})
+
+    def adjustment_modes(self) -> list[str]:
+        used = np.unique(self.provenance_ids[self.present])
+        return sorted({str(self.provenance[index][1]) for index in used if self.provenance[index][1]})
+
+    def source_time_range(self) -> tuple[Optional[datetime], Optional[datetime]]:
+        times = np.concatenate([self.created_at[self.present], self.updated_at[self.present]])
+        times = times[~np.isnat(times)]
+        if not times.size:
+            return None, None
+        return times.min().item(), times.max().item()
+
+    def iter_records(self) -> Iterator[dict[str, Any]]:
+        """Yield the frozen per-bar dicts in ``(code, date)`` order."""
+        dates = self.dates.tolist()
+        for column, code in enumerate(self.codes):
+            rows = np.flatnonzero(self.present[:, column])
+            fields = {field: self.values[field][rows, column].tolist() for field in PRICE_FIELDS}
+            provenance = self.provenance_ids[rows, column].tolist()
+            created = self.created_at[rows, column].tolist()
+            updated = self.updated_at[rows, column].tolist()
+            for position, row in enumerate(rows.tolist()):
+                source, mode = self.provenance[provenance[position]]
+                record = {"code": code, "date": dates[row]}
+                for field in PRICE_FIELDS:
+                    value = fields[field][position]
+                    record[field] = None if value != value else value
+                record["dataSource"] = source
+                record["sourceCreatedAt"] = created[position]
+                record["sourceUpdatedAt"] = updated[position]
+                record["adjustmentMode"] = mode
+                yield record
+
+    def share(self) -> tuple[list[shared_memory.SharedMemory], dict[str, Any]]:
+        """Copy the panel arrays into shared memory for worker processes.
+
+        Returns the owning segments (the caller must ``close`` and ``unlink``
+        them) and a picklable spec for :meth:`attach`.
+        """
+        segments: list[shared_memory.SharedMemory] = []
+        arrays: dict[str, tuple[str, tuple[int, ...], str]] = {}
+        named = {
+            "dates": self.dates,
+            "present": self.present,
+            "provenance_ids": self.provenance_ids,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at,
+            **{f"values.{field}": array for field, array in self.values.items()},
+        }
+        try:
+            for name, array in named.items():
+                segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                segments.append(segment)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)[...] = array
+                arrays[name] = (segment.name, array.shape, array.dtype.str)
+        except BaseException:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+            raise
+        return segments, {"codes": self.codes, "provenance": self.provenance, "arrays": arrays}
+
+    @classmethod
+    def attach(cls, spec: dict[str, Any]) -> tuple["ValidationBarPanel", list[shared_memory.SharedMemory]]:
+        """Map a panel exported by :meth:`share` without copying its arrays.
+
+        The returned segments must stay referenced while the panel is in use.
+        """
+        segments = []
+        arrays = {}
+        for name, (segment_name, shape, dtype) in spec["arrays"].items():
+            segment = shared_memory.SharedMemory(name=segment_name)
+            segments.append(segment)
+            array = np.ndarray(shape, dtype=np.dtype(dtype), buffer=segment.buf)
+            array.flags.writeable = False
+            arrays[name] = array
+        panel = cls(
+            codes=tuple(spec["codes"]),
+            dates=arrays["dates"],
+            values={field: arrays[f"values.{field}"] for field in PRICE_FIELDS},
+            present=arrays["present"],
+            provenance_ids=arrays["provenance_ids"],
+            provenance=tuple(tuple(item) for item in spec["provenance"]),
+            created_at=arrays["created_at"],
+            updated_at=arrays["updated_at"],
+        )
+        return panel, segments
+
+
+# Unit roundoff of float64.  The helpers below evaluate window sums in
+# double-double arithmetic with a rigorous error bound, keep the rows whose
+# correctly rounded result the bound decides, and hand the rest (ties, heavy
+# cancellation, subnormals) to ``math.fsum``/``statistics.pstdev``.
+_UNIT_ROUNDOFF = 2.0 ** -53
+_SPLITTER = 2.0 ** 27 + 1
+# Below this magnitude products may underflow and lose exactness.
+_TINY = 2.0 ** -400
+# Rows per block, so the temporaries of the error-free transforms stay in cache.
+_BLOCK_ROWS = 8192
+
+
+def _two_sum(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``a + b`` as a rounded sum and its exact rounding error (Knuth)."""
+    total = a + b
+    shifted = total - a
+    return total, (a - (total - shifted)) + (b - shifted)
+
+
+def _two_product(a: np.ndarray, b: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """``a * b`` as a rounded product and its exact rounding error (Dekker)."""
+    product = a * b
+    scaled_a, scaled_b = _SPLITTER * a, _SPLITTER * b
+    a_high = scaled_a - (scaled_a - a)
+    b_high = scaled_b - (scaled_b - b)
+    a_low, b_low = a - a_high, b - b_high
+    return product, ((a_high * b_high - product) + a_high * b_low + a_low * b_high) + a_low * b_low
+
+
+def _rounds_to(result: np.ndarray, tail: np.ndarray, bound: np.ndarray) -> np.ndarray:
+    """Where every value within ``bound`` of ``result + tail`` rounds to ``result``."""
+    magnitude = np.abs(result)
+    away = np.where(result < 0, -tail, tail)
+    half_up = (np.nextafter(magnitude, np.inf) - magnitude) / 2
+    half_down = (magnitude - np.nextafter(magnitude, 0)) / 2
+    return (away + bound < half_up) & (bound - away < half_down) & (magnitude > _TINY)
+
+
+def _fsum_rows(values: np.ndarray) -> np.ndarray:
+    """``math.fsum`` of every row of a finite 2-D array."""
+    result = np.empty(values.shape[0])
+    for start in range(0, values.shape[0], _BLOCK_ROWS):
+        block = values[start:start + _BLOCK_ROWS]
+        columns = np.ascontiguousarray(block.T)
+        total = columns[0].copy()
+        errors = np.zeros_like(total)
+        residue = np.zeros_like(total)
+        residue_magnitude = np.zeros_like(total)
+        for column in columns[1:]:
+            total, error = _two_sum(total, column)
+            errors, lost = _two_sum(errors, error)
+            residue += lost
+            residue_magnitude += np.abs(lost)
+        # The exact sum is total + errors + (exact residue).  Without a residue
+        # the float addition below is the correctly rounded sum, ties included.
+        rounded, tail = _two_sum(total, errors)
+        tail += residue
+        bound = (columns.shape[0] + 2) * 2 * _UNIT_ROUNDOFF * residue_magnitude + _UNIT_ROUNDOFF * np.abs(tail)
+        undecided = np.flatnonzero(~((residue_magnitude == 0) | _rounds_to(rounded, tail, bound)))
+        if undecided.size:
+            rounded[undecided] = [math.fsum(row) for row in block[undecided].tolist()]
+        result[start:start + _BLOCK_ROWS] = rounded
+    return result
+
+
+def _pstdev_rows(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """``statistics.pstdev`` of the ``valid`` entries of every row; 0.0 below two."""
+    result = np.empty(values.shape[0])
+    for start in range(0, values.shape[0], _BLOCK_ROWS):
+        block, mask = values[start:start + _BLOCK_ROWS], valid[start:start + _BLOCK_ROWS]
+        deviations = _pstdev_block(np.ascontiguousarray(block.T), np.ascontiguousarray(mask.T))
+        count = mask.sum(axis=1)
+        for row in np.flatnonzero(np.isnan(deviations) & (count >= 2)).tolist():
+            deviations[row] = statistics.pstdev(block[row][mask[row]].tolist())
+        result[start:start + _BLOCK_ROWS] = np.where(count >= 2, deviations, 0.0)
+    return result
+
+
+def _pstdev_block(columns: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Correctly rounded population deviation of each column; NaN where undecided."""
+    u = _UNIT_ROUNDOFF
+    width = columns.shape[0]
+    n = np.maximum(valid.sum(axis=0), 1).astype(np.float64)
+    # Any centre works: sum((x - c)**2) - sum(x - c)**2 / n is exact.
+    centre = np.where(valid, columns, 0.0).sum(axis=0) / n
+    high, low = _two_sum(columns, -centre)
+    high, low = np.where(valid, high, 0.0), np.where(valid, low, 0.0)
+
+    # Q = sum((high + low)**2): exact squares of ``high``, the cross term to
+    # one rounding and the ``low**2`` term dropped.
+    squares, square_errors = _two_product(high, high)
+    q_high = squares[0].copy()
+    q_small = np.zeros_like(q_high)
+    for column in squares[1:]:
+        q_high, error = _two_sum(q_high, column)
+        q_small += error
+    q_small += square_errors.sum(axis=0) + (2 * high * low).sum(axis=0)
+    q_high, q_low = _two_sum(q_high, q_small)
+    q_bound = (3 * width * (width + 4) + 8) * u * u * 1.01 * q_high
+
+    # D = sum(high + low), so the sum of squared deviations is Q - D**2 / n.
+    deviation = high.sum(axis=0) + low.sum(axis=0)
+    deviation_bound = (2 * width + 2) * 2 * u * (np.abs(high).sum(axis=0) + np.abs(low).sum(axis=0))
+    correction = deviation * deviation / n
+    correction_bound = (2 * np.abs(deviation) + deviation_bound) * deviation_bound / n + 4 * u * correction
+
+    ss_high, ss_low = _two_sum(q_high, -correction)
+    ss_low += q_low
+    ss_bound = q_bound + correction_bound + 4 * u * u * q_high
+
+    # One Newton step from the float square root gives sqrt(ss / n) to about
+    # u**2; the variance bound dominates the remaining error.
+    with np.errstate(divide="ignore", invalid="ignore"):
+        root = np.sqrt(np.maximum(ss_high, 0.0) / n)
+        root_square, root_square_error = _two_product(root, root)
+        scaled, scaled_error = _two_product(root_square, n)
+        residual, residual_error = _two_sum(ss_high, -scaled)
+        residual_tail = ((residual_error + ss_low) - scaled_error) - n * root_square_error
+        step = np.where(root > 0, (residual + residual_tail) / (2 * n * root), 0.0)
+        result, tail = _two_sum(root, step)
+        bound = root * (ss_bound / ss_high + 32 * u * u)
+        decided = (ss_high > 4 * ss_bound) & _rounds_to(result, tail, bound)
+    decided |= (ss_high == 0) & (ss_low == 0) & (ss_bound == 0)
+    decided &= ~((high != 0) & (np.abs(high) < _TINY)).any(axis=0)
+    return np.where(decided, np.where(ss_high > 0, result, 0.0), np.nan)
+
+
+# Longest look-back of any replay signal: 20 prior closes plus the signal bar.
+FEATURE_WINDOW = 21
+FEATURE_FIELDS = (
+    "close", "previousClose", "priorHigh20", "mom5", "mom20", "volatility19",
+    "ma20", "avgVolume20", "volumeRatio", "liquidity", "priorsPositive",
+)
+
+
+@dataclass(frozen=True)
+class ValidationFeatures:
+    """Rolling signal features of every symbol as of every panel date.
+
+    Features are computed once per experiment over each symbol's own tradable
+    bars (holes are skipped, not filled) and then aligned to the panel's date
+    index, so ``values[name][i, j]`` is what the replay knew about ``codes[j]``
+    at the close of ``dates[i]``.  Entries are NaN while a symbol has fewer
+    than :data:`FEATURE_WINDOW` tradable bars.  As in the former per-symbol
+    replay, only bars with both open and close count as history.
+
+    Window means and the return volatility are correctly rounded, exactly as
+    ``statistics.fmean`` and ``statistics.pstdev`` return them: a rounding
+    difference in the last ulp is enough to flip ``close >= ma20`` on a flat
+    series and change the picks.
+    """
+
+    codes: tuple[str, ...]
+    dates: np.ndarray
+    values: dict[str, np.ndarray]
+
+    @classmethod
+    def from_panel(cls, panel: ValidationBarPanel) -> "ValidationFeatures":
+        shape = panel.present.shape
+        tradable = panel.tradable
+        # Stack every symbol's tradable bars code-major so one sliding window
+        # pass serves the whole universe; windows that straddle two symbols
+        # are discarded through ``ready`` below.
+        order = tradable.T
+        closes = panel.values["close"].T[order]
+        volumes = np.nan_to_num(panel.values["volume"].T[order], nan=0.0)
+        amounts = panel.values["amount"].T[order]
+        per_code = order.sum(axis=1)
+        offsets = (np.cumsum(per_code) - per_code).astype(np.int64)
+        position = np.arange(closes.shape[0]) - np.repeat(offsets, per_code)
+        ready = position >= FEATURE_WINDOW - 1
+
+        stacked = {name: np.full(closes.shape, np.nan) for name in FEATURE_FIELDS}
+        if ready.any():
+            ends = np.flatnonzero(ready)
+            window = np.lib.stride_tricks.sliding_window_view(closes, FEATURE_WINDOW)[ends - (FEATURE_WINDOW - 1)]
+            volume_window = np.lib.stride_tricks.sliding_window_view(volumes, FEATURE_WINDOW)[ends - (FEATURE_WINDOW - 1)]
+            current, prior5, prior20 = window[:, -1], window[:, -6], window[:, 0]
+            with np.errstate(divide="ignore", invalid="ignore"):
+                previous, following = window[:, 1:-1], window[:, 2:]
+                returns_valid = previous > 0
+                returns = np.where(returns_valid, following / previous - 1, 0.0)
+                avg_volume = _fsum_rows(volume_window[:, :-1]) / (FEATURE_WINDOW - 1)
+                amount = amounts[ends]
+                computed = {
+                    "close": current,
+                    "previousClose": window[:, -2],
+                    "priorHigh20": window[:, :-1].max(axis=1),
+                    "mom5": current / prior5 - 1,
+                    "mom20": current / prior20 - 1,
+                    "volatility19": _pstdev_rows(returns, returns_valid),
+                    "ma20": _fsum_rows(window[:, 1:]) / (FEATURE_WINDOW - 1),
+                    "avgVolume20": avg_volume,
+                    "volumeRatio": np.where(avg_volume > 0, volume_window[:, -1] / avg_volume, 1.0),
+                    "liquidity": np.log10(np.maximum(np.where(np.isfinite(amount) & (amount != 0), amount, 1.0), 1.0)) / 10,
+                    "priorsPositive": ((prior5 > 0) & (prior20 > 0)).astype(np.float64),
+                }
+            for name, value in computed.items():
+                stacked[name][ends] = value
+
+        # Align to the date index: the latest tradable bar on or before each date.
+        seen = np.cumsum(tradable, axis=0)
+        gather = offsets[None, :] + seen - 1
+        known = seen > 0
+        values = {}
+        for name, column in stacked.items():
+            dense = np.full(shape, np.nan)
+            dense[known] = column[gather[known]]
+            values[name] = dense
+        return cls(panel.codes, panel.dates, values)
+
+    def at(self, target: date) -> dict[str, np.ndarray]:
+        """Cross-section of every feature as of the close of ``target``."""
+        row = int(np.searchsorted(self.dates, np.datetime64(target, "D"), side="right")) - 1
+        if row < 0:
+            return {name: np.full(len(self.codes), np.nan) for name in self.values}
+        return {name: array[row] for name, array in self.values.items()}
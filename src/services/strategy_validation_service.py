@@ -9,16 +9,22 @@ does not call an LLM, a broker, or the legacy analysis-record BacktestService.
 from __future__ import annotations
 
 import hashlib
+import itertools
 import json
 import math
+import multiprocessing
+import os
 import re
 import statistics
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from datetime import date, datetime, timedelta
 from typing import Any, Optional
 
-from sqlalchemy import desc, func, select
+import numpy as np
+from sqlalchemy import desc, func, insert, select
 
+from src.services.strategy_validation_bars import ValidationBarPanel, ValidationFeatures
 from src.storage import (
     DatabaseManager,
     SimulationStrategyRecord,
@@ -83,6 +89,11 @@ KLINE_FETCHER_BY_CONNECTION = {
 }
 
 
+SWEEP_GRID_FIELDS = ("rebalanceFrequency", "maxPositions", "slippageRate", "commissionRate")
+MAX_SWEEP_CELLS = 64
+MAX_SWEEP_WORKERS = 8
+
+
 class StrategyValidationError(ValueError):
     def __init__(self, code: str, message: str, status_code: int = 400):
         super().__init__(message)
@@ -111,6 +122,30 @@ class StrategyValidationService:
         config = self._normalize_config(payload.get("config") or {})
 
         # The full definition is frozen before any market data is selected.
+        version_snapshot = self._validation_version_snapshot(version_id)
+        self._apply_universe(version_snapshot, config)
+        request_hash = self._hash({"versionId": version_id, "revision": version_snapshot["revision"], "config": config})
+        with self.db.get_session() as session:
+            existing = self._existing_experiment(session, version_id, idempotency_key, request_hash)
+            if existing:
+                return self._detail(session, existing)
+
+        self._refresh_incomplete_history(config, version_snapshot)
+        with self.db.session_scope() as session:
+            version = self._unchanged_version(session, version_id, version_snapshot)
+            existing = self._existing_experiment(session, version_id, idempotency_key, request_hash)
+            if existing:
+                return self._detail(session, existing)
+
+            bars = self._load_source_bars(session, version_snapshot, config)
+            coverage = self._coverage_report(config, bars)
+            self._require_complete_coverage(coverage)
+            experiment = self._persist_experiment(
+                session, version, idempotency_key, request_hash, config, version_snapshot, bars, self._bars_hash(bars)
+            )
+            return self._detail(session, experiment, bar_count=len(bars))
+
+    def _validation_version_snapshot(self, version_id: int) -> dict[str, Any]:
         from src.services.strategy_definition_service import StrategyDefinitionService
 
         with self.db.get_session() as session:
@@ -133,6 +168,9 @@ class StrategyValidationService:
                 "策略内核不能直接回测；请先在策略中心创建运行配置，再对完整策略版本发起回测。",
                 409,
             )
+        return version_snapshot
+
+    def _apply_universe(self, version_snapshot: dict[str, Any], config: dict[str, Any]) -> None:
         symbols, resolved_universe_mode = self._resolve_universe(version_snapshot, config)
         config["symbols"] = self._canonical_symbols(symbols, config["market"])
         config["resolvedUniverseMode"] = resolved_universe_mode
@@ -142,64 +180,54 @@ class StrategyValidationService:
                 f"显式股票池包含 {len(config['symbols'])} 个标的，超过当前最大候选池 {config['maxUniverseSize']}。",
                 422,
             )
-        request_hash = self._hash({"versionId": version_id, "revision": version_snapshot["revision"], "config": config})
-        with self.db.get_session() as session:
-            existing = session.execute(select(SimulationStrategyValidationExperimentRecord).where(
-                SimulationStrategyValidationExperimentRecord.strategy_version_id == version_id,
-                SimulationStrategyValidationExperimentRecord.idempotency_key == idempotency_key,
-            )).scalar_one_or_none()
-            if existing:
-                if existing.request_hash != request_hash:
-                    raise StrategyValidationError("IDEMPOTENCY_CONFLICT", "相同幂等键对应了不同的验证配置。", 409)
-                return self._detail(session, existing)
 
-        self._refresh_incomplete_history(config, version_snapshot)
-        with self.db.session_scope() as session:
-            version = session.get(SimulationStrategyVersionRecord, version_id)
-            strategy = session.get(SimulationStrategyRecord, version.strategy_id)
-            if version.revision != version_snapshot["revision"]:
-                raise StrategyValidationError(
-                    "VALIDATION_VERSION_CHANGED",
-                    "策略定义在准备历史行情期间发生了变化，请重新创建实验。",
-                    409,
-                )
-            existing = session.execute(select(SimulationStrategyValidationExperimentRecord).where(
-                SimulationStrategyValidationExperimentRecord.strategy_version_id == version_id,
-                SimulationStrategyValidationExperimentRecord.idempotency_key == idempotency_key,
-            )).scalar_one_or_none()
-            if existing:
-                if existing.request_hash != request_hash:
-                    raise StrategyValidationError("IDEMPOTENCY_CONFLICT", "相同幂等键对应了不同的验证配置。", 409)
-                return self._detail(session, existing)
+    @staticmethod
+    def _existing_experiment(session, version_id: int, idempotency_key: str, request_hash: str):
+        existing = session.execute(select(SimulationStrategyValidationExperimentRecord).where(
+            SimulationStrategyValidationExperimentRecord.strategy_version_id == version_id,
+            SimulationStrategyValidationExperimentRecord.idempotency_key == idempotency_key,
+        )).scalar_one_or_none()
+        if existing and existing.request_hash != request_hash:
+            raise StrategyValidationError("IDEMPOTENCY_CONFLICT", "相同幂等键对应了不同的验证配置。", 409)
+        return existing
 
-            bars = self._load_source_bars(session, version_snapshot, config)
-            coverage = self._coverage_report(config, bars)
-            self._require_complete_coverage(coverage)
-            snapshot_hash = self._bars_hash(bars)
-            experiment = SimulationStrategyValidationExperimentRecord(
-                strategy_version_id=version.id,
-                strategy_version_revision=version.revision,
-                status="queued",
-                engine_version=ENGINE_VERSION,
-                idempotency_key=idempotency_key,
-                request_hash=request_hash,
-                input_snapshot_hash=snapshot_hash,
-                config_json=self._dump(config),
-                version_snapshot_json=self._dump(version_snapshot),
+    @staticmethod
+    def _unchanged_version(session, version_id: int, version_snapshot: dict[str, Any]) -> SimulationStrategyVersionRecord:
+        version = session.get(SimulationStrategyVersionRecord, version_id)
+        if version.revision != version_snapshot["revision"]:
+            raise StrategyValidationError(
+                "VALIDATION_VERSION_CHANGED",
+                "策略定义在准备历史行情期间发生了变化，请重新创建实验。",
+                409,
             )
-            session.add(experiment)
-            session.flush()
-            session.add_all([
-                SimulationStrategyValidationBarRecord(
-                    experiment_id=experiment.id,
-                    code=item["code"], date=item["date"], open=item.get("open"), high=item.get("high"),
-                    low=item.get("low"), close=item.get("close"), volume=item.get("volume"),
-                    amount=item.get("amount"), data_source=item.get("dataSource"),
-                    source_created_at=item.get("sourceCreatedAt"), source_updated_at=item.get("sourceUpdatedAt"),
-                    adjustment_mode=item.get("adjustmentMode"),
-                ) for item in bars
-            ])
-            return self._detail(session, experiment, bar_count=len(bars))
+        return version
+
+    def _persist_experiment(
+        self,
+        session,
+        version: SimulationStrategyVersionRecord,
+        idempotency_key: str,
+        request_hash: str,
+        config: dict[str, Any],
+        version_snapshot: dict[str, Any],
+        bars: ValidationBarPanel,
+        snapshot_hash: str,
+    ) -> SimulationStrategyValidationExperimentRecord:
+        experiment = SimulationStrategyValidationExperimentRecord(
+            strategy_version_id=version.id,
+            strategy_version_revision=version.revision,
+            status="queued",
+            engine_version=ENGINE_VERSION,
+            idempotency_key=idempotency_key,
+            request_hash=request_hash,
+            input_snapshot_hash=snapshot_hash,
+            config_json=self._dump(config),
+            version_snapshot_json=self._dump(version_snapshot),
+        )
+        session.add(experiment)
+        session.flush()
+        self._freeze_bars(session, experiment.id, bars)
+        return experiment
 
     def execute_experiment(self, experiment_id: int) -> dict[str, Any]:
         with self.db.session_scope() as session:
@@ -218,12 +246,10 @@ class StrategyValidationService:
                 experiment = session.get(SimulationStrategyValidationExperimentRecord, experiment_id)
                 config = self._load(experiment.config_json)
                 version = self._load(experiment.version_snapshot_json)
-                rows = session.execute(select(SimulationStrategyValidationBarRecord).where(
-                    SimulationStrategyValidationBarRecord.experiment_id == experiment_id
-                ).order_by(SimulationStrategyValidationBarRecord.code, SimulationStrategyValidationBarRecord.date)).scalars().all()
-                bars = [self._bar_dict(row) for row in rows]
+                bars = self._frozen_bars(session, experiment_id)
                 self._require_snapshot_integrity(experiment, bars)
-            result = self._run(config, version, bars)
+                snapshot_hash = experiment.input_snapshot_hash
+            result = self._run(config, version, bars, snapshot_hash)
             with self.db.session_scope() as session:
                 experiment = session.get(SimulationStrategyValidationExperimentRecord, experiment_id)
                 experiment.status = "completed"
@@ -238,6 +264,179 @@ class StrategyValidationService:
             self._fail(experiment_id, message)
             raise StrategyValidationError("VALIDATION_EXECUTION_FAILED", message, 422) from exc
 
+    def run_sweep(self, payload: dict[str, Any], *, max_workers: Optional[int] = None) -> dict[str, Any]:
+        """Create and execute one experiment per StrategyVersion x parameter-grid cell.
+
+        Bars are loaded and hashed once per distinct market snapshot and then
+        replayed by a process pool reading the panel from shared memory.  Each
+        cell is persisted as an ordinary experiment, so cells of different
+        versions with the same overrides can be compared afterwards.
+        """
+        raw_ids = payload.get("strategyVersionIds")
+        if not isinstance(raw_ids, list) or not raw_ids:
+            raise StrategyValidationError("STRATEGY_VERSION_REQUIRED", "参数扫描至少需要一个策略版本。")
+        version_ids = list(dict.fromkeys(
+            self._positive_int(item, "STRATEGY_VERSION_REQUIRED", "必须选择策略版本。") for item in raw_ids
+        ))
+        sweep_key = str(payload.get("idempotencyKey") or "").strip()
+        if len(sweep_key) < 8 or len(sweep_key) > 96:
+            raise StrategyValidationError("IDEMPOTENCY_KEY_INVALID", "参数扫描幂等键长度必须为 8–96 个字符。")
+        base = dict(payload.get("config") or {})
+        grid = payload.get("grid") if isinstance(payload.get("grid"), dict) else {}
+        unknown = sorted(set(grid) - set(SWEEP_GRID_FIELDS))
+        if unknown:
+            raise StrategyValidationError("VALIDATION_SWEEP_GRID_INVALID", f"参数扫描不支持这些字段：{'、'.join(unknown)}。", 422)
+        axes = []
+        for field in SWEEP_GRID_FIELDS:
+            if field not in grid:
+                continue
+            values = grid[field]
+            if not isinstance(values, list) or not values:
+                raise StrategyValidationError("VALIDATION_SWEEP_GRID_INVALID", f"参数扫描字段 {field} 必须是非空列表。", 422)
+            axes.append((field, list(dict.fromkeys(values))))
+        combinations = [dict(zip([field for field, _ in axes], values)) for values in itertools.product(*[values for _, values in axes])]
+        if len(version_ids) * len(combinations) > MAX_SWEEP_CELLS:
+            raise StrategyValidationError(
+                "VALIDATION_SWEEP_TOO_LARGE",
+                f"参数扫描共 {len(version_ids) * len(combinations)} 个组合，超过上限 {MAX_SWEEP_CELLS}。",
+                422,
+            )
+
+        cells: list[dict[str, Any]] = []
+        panels: dict[str, tuple[ValidationBarPanel, str]] = {}
+        for version_id in version_ids:
+            version_snapshot = self._validation_version_snapshot(version_id)
+            version_cells = []
+            for overrides in combinations:
+                config = self._normalize_config({**base, **overrides})
+                self._apply_universe(version_snapshot, config)
+                version_cells.append({
+                    "strategyVersionId": version_id,
+                    "overrides": overrides,
+                    "config": config,
+                    "version": version_snapshot,
+                    "idempotencyKey": f"{sweep_key}:{self._hash({'versionId': version_id, 'overrides': overrides})[:24]}",
+                    "requestHash": self._hash({"versionId": version_id, "revision": version_snapshot["revision"], "config": config}),
+                    # Grid fields never change which bars are read.
+                    "panelKey": self._hash({
+                        "kline": self._kline_connection(version_snapshot),
+                        **{field: config[field] for field in ("market", "symbols", "startDate", "endDate", "maxUniverseSize")},
+                    }),
+                })
+            self._refresh_incomplete_history(version_cells[0]["config"], version_snapshot)
+            with self.db.session_scope() as session:
+                version = self._unchanged_version(session, version_id, version_snapshot)
+                for cell in version_cells:
+                    existing = self._existing_experiment(session, version_id, cell["idempotencyKey"], cell["requestHash"])
+                    if existing is None:
+                        if cell["panelKey"] not in panels:
+                            bars = self._load_source_bars(session, version_snapshot, cell["config"])
+                            self._require_complete_coverage(self._coverage_report(cell["config"], bars))
+                            panels[cell["panelKey"]] = (bars, self._bars_hash(bars))
+                        bars, snapshot_hash = panels[cell["panelKey"]]
+                        existing = self._persist_experiment(
+                            session, version, cell["idempotencyKey"], cell["requestHash"],
+                            cell["config"], version_snapshot, bars, snapshot_hash,
+                        )
+                    elif existing.status in {"queued", "failed"}:
+                        # Retried cells replay their own frozen snapshot, as execute_experiment
+                        # does, even when fresh bars for the same market were loaded above.
+                        bars = self._frozen_bars(session, existing.id)
+                        self._require_snapshot_integrity(existing, bars)
+                        cell["panelKey"] = f"experiment:{existing.id}"
+                        panels[cell["panelKey"]] = (bars, existing.input_snapshot_hash)
+                    cell["experimentId"] = existing.id
+                    cell["pending"] = existing.status in {"queued", "failed"}
+            cells.extend(version_cells)
+
+        pending = [cell for cell in cells if cell["pending"]]
+        with self.db.session_scope() as session:
+            for cell in pending:
+                experiment = session.get(SimulationStrategyValidationExperimentRecord, cell["experimentId"])
+                experiment.status = "running"
+                experiment.started_at = utc_naive_now()
+                experiment.completed_at = None
+                experiment.error_message = None
+        try:
+            outcomes = self._execute_sweep_cells(pending, panels, max_workers)
+        except Exception as exc:
+            # A broken pool or shared-memory failure must not strand cells in
+            # "running": later sweeps only retry queued or failed cells.
+            message = str(exc)[:2000] or "参数扫描执行失败。"
+            for cell in pending:
+                self._fail(cell["experimentId"], message)
+            raise StrategyValidationError(
+                "VALIDATION_SWEEP_EXECUTION_FAILED",
+                f"参数扫描执行失败，未完成的组合已标记为失败，可重试：{message}",
+                503,
+            ) from exc
+
+        with self.db.session_scope() as session:
+            for cell, (status, value) in zip(pending, outcomes):
+                experiment = session.get(SimulationStrategyValidationExperimentRecord, cell["experimentId"])
+                experiment.status = status
+                experiment.completed_at = utc_naive_now()
+                if status == "completed":
+                    experiment.result_json = self._dump(value)
+                else:
+                    experiment.error_message = value
+            summaries = []
+            for cell in cells:
+                experiment = session.get(SimulationStrategyValidationExperimentRecord, cell["experimentId"])
+                result = self._load(experiment.result_json) if experiment.result_json else {}
+                summaries.append({
+                    "experimentId": experiment.id,
+                    "strategyVersionId": cell["strategyVersionId"],
+                    "overrides": cell["overrides"],
+                    "status": experiment.status,
+                    "inputSnapshotHash": experiment.input_snapshot_hash,
+                    "metrics": result.get("metrics") or {},
+                    "errorMessage": experiment.error_message,
+                })
+        return {
+            "sweepKey": sweep_key,
+            "cellCount": len(cells),
+            "executedCount": len(pending),
+            "snapshotCount": len(panels),
+            "cells": summaries,
+        }
+
+    def _execute_sweep_cells(
+        self,
+        cells: list[dict[str, Any]],
+        panels: dict[str, tuple[ValidationBarPanel, str]],
+        max_workers: Optional[int],
+    ) -> list[tuple[str, Any]]:
+        workers = max(1, min(len(cells), max_workers or os.cpu_count() or 1, MAX_SWEEP_WORKERS))
+        if workers == 1:
+            return [
+                _sweep_cell_outcome(panels[cell["panelKey"]][0], cell["config"], cell["version"], panels[cell["panelKey"]][1])
+                for cell in cells
+            ]
+        segments = []
+        try:
+            specs = {}
+            for key, (bars, _) in panels.items():
+                owned, specs[key] = bars.share()
+                segments.extend(owned)
+            # ``spawn`` keeps workers independent of the parent's threads and
+            # database connections on every platform.
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_attach_sweep_panels,
+                initargs=(specs,),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_sweep_cell, cell["panelKey"], cell["config"], cell["version"], panels[cell["panelKey"]][1])
+                    for cell in cells
+                ]
+                return [future.result() for future in futures]
+        finally:
+            for segment in segments:
+                segment.close()
+                segment.unlink()
+
     def get_experiment(self, experiment_id: int) -> dict[str, Any]:
         with self.db.get_session() as session:
             experiment = session.get(SimulationStrategyValidationExperimentRecord, experiment_id)
@@ -546,7 +745,7 @@ class StrategyValidationService:
             )
         return detail
 
-    def _load_source_bars(self, session, version: dict[str, Any], config: dict[str, Any]) -> list[dict[str, Any]]:
+    def _load_source_bars(self, session, version: dict[str, Any], config: dict[str, Any]) -> ValidationBarPanel:
         start = date.fromisoformat(config["startDate"])
         end = date.fromisoformat(config["endDate"])
         lookback_start = start - timedelta(days=120)
@@ -574,19 +773,10 @@ class StrategyValidationService:
         row_filters = [StockDaily.code.in_(codes), StockDaily.date >= lookback_start, StockDaily.date <= execution_end]
         if source_filter is not None:
             row_filters.append(source_filter)
-        rows = session.execute(select(StockDaily).where(*row_filters).order_by(StockDaily.code, StockDaily.date)).scalars().all()
-        available: dict[str, int] = defaultdict(int)
-        for row in rows:
-            if row.close is not None and row.open is not None:
-                available[row.code] += 1
-        usable = {code for code, count in available.items() if count >= 22}
-        bars = [{
-            "code": row.code, "date": row.date, "open": row.open, "high": row.high, "low": row.low,
-            "close": row.close, "volume": row.volume, "amount": row.amount, "dataSource": row.data_source,
-            "sourceCreatedAt": row.created_at, "sourceUpdatedAt": row.updated_at,
-            "adjustmentMode": self._adjustment_mode(row.data_source, config["market"]),
-        } for row in rows if row.code in usable]
-        if not bars:
+        panel = self._stock_daily_panel(session, row_filters, config["market"])
+        usable = [code for code, count in zip(panel.codes, panel.tradable.sum(axis=0).tolist()) if count >= 22]
+        bars = panel.take(usable)
+        if not len(bars):
             raise StrategyValidationError("VALIDATION_HISTORY_INSUFFICIENT", "所选股票没有足够的本地日线历史（每只至少需要 22 根有效日线）。", 422)
         return bars
 
@@ -599,12 +789,14 @@ class StrategyValidationService:
         if not targets or not self.refresh_missing_data:
             return
         if self.market_data_fetcher is None:
-            from data_provider import DataFetcherManager
+            from data_provider import get_fetcher_manager
 
-            self.market_data_fetcher = DataFetcherManager()
+            self.market_data_fetcher = get_fetcher_manager()
         start = date.fromisoformat(config["startDate"]) - timedelta(days=120)
         end = date.fromisoformat(config["endDate"])
         failures: list[str] = []
+        frames: dict[str, Any] = {}
+        sources: dict[str, str] = {}
         preferred_fetcher = KLINE_FETCHER_BY_CONNECTION.get(self._kline_connection(version))
         for symbol in targets:
             try:
@@ -615,9 +807,14 @@ class StrategyValidationService:
                 if frame is None or frame.empty:
                     failures.append(f"{symbol}：数据源返回空行情")
                     continue
-                self.db.save_daily_data(frame, symbol, source)
+                frames[symbol], sources[symbol] = frame, source
             except Exception as exc:
                 failures.append(f"{symbol}：{str(exc)[:240]}")
+        if frames:
+            try:
+                self.db.save_daily_data_bulk(frames, sources)
+            except Exception as exc:
+                failures.append(f"{', '.join(frames)}：{str(exc)[:240]}")
         if failures:
             raise StrategyValidationError(
                 "VALIDATION_MARKET_DATA_REFRESH_FAILED",
@@ -625,7 +822,7 @@ class StrategyValidationService:
                 422,
             )
 
-    def _source_bars_for_symbols(self, session, config: dict[str, Any], version: dict[str, Any]) -> list[dict[str, Any]]:
+    def _source_bars_for_symbols(self, session, config: dict[str, Any], version: dict[str, Any]) -> ValidationBarPanel:
         start = date.fromisoformat(config["startDate"]) - timedelta(days=120)
         end = date.fromisoformat(config["endDate"])
         source_filter = self._stock_daily_source_filter(version)
@@ -644,7 +841,7 @@ class StrategyValidationService:
             if (key := self._market_symbol_key(symbol, config["market"])) in available_by_key
         ]
         if not codes:
-            return []
+            return ValidationBarPanel.empty()
         row_filters = [
             StockDaily.code.in_(list(dict.fromkeys(codes))),
             StockDaily.date >= start,
@@ -652,21 +849,44 @@ class StrategyValidationService:
         ]
         if source_filter is not None:
             row_filters.append(source_filter)
-        rows = session.execute(select(StockDaily).where(*row_filters).order_by(StockDaily.code, StockDaily.date)).scalars().all()
-        return [{
-            "code": row.code,
-            "date": row.date,
-            "open": row.open,
-            "high": row.high,
-            "low": row.low,
-            "close": row.close,
-            "volume": row.volume,
-            "amount": row.amount,
-            "dataSource": row.data_source,
-            "sourceCreatedAt": row.created_at,
-            "sourceUpdatedAt": row.updated_at,
-            "adjustmentMode": self._adjustment_mode(row.data_source, config["market"]),
-        } for row in rows]
+        return self._stock_daily_panel(session, row_filters, config["market"])
+
+    def _stock_daily_panel(self, session, row_filters: list[Any], market: str) -> ValidationBarPanel:
+        # Column tuples instead of ORM entities: identity-map bookkeeping for
+        # every StockDaily row used to dominate experiment creation.
+        rows = session.execute(select(
+            StockDaily.code, StockDaily.date, StockDaily.open, StockDaily.high, StockDaily.low,
+            StockDaily.close, StockDaily.volume, StockDaily.amount, StockDaily.data_source,
+            StockDaily.created_at, StockDaily.updated_at,
+        ).where(*row_filters).order_by(StockDaily.code, StockDaily.date))
+        return ValidationBarPanel.from_rows(rows, adjustment_mode=lambda source: self._adjustment_mode(source, market))
+
+    @staticmethod
+    def _frozen_bars(session, experiment_id: int) -> ValidationBarPanel:
+        record = SimulationStrategyValidationBarRecord
+        rows = session.execute(select(
+            record.code, record.date, record.open, record.high, record.low, record.close, record.volume,
+            record.amount, record.data_source, record.source_created_at, record.source_updated_at,
+            record.adjustment_mode,
+        ).where(record.experiment_id == experiment_id).order_by(record.code, record.date))
+        return ValidationBarPanel.from_rows(rows)
+
+    @staticmethod
+    def _freeze_bars(session, experiment_id: int, bars: ValidationBarPanel, chunk_size: int = 2000) -> None:
+        chunk: list[dict[str, Any]] = []
+        for item in bars.iter_records():
+            chunk.append({
+                "experiment_id": experiment_id,
+                "code": item["code"], "date": item["date"], "open": item["open"], "high": item["high"],
+                "low": item["low"], "close": item["close"], "volume": item["volume"], "amount": item["amount"],
+                "data_source": item["dataSource"], "source_created_at": item["sourceCreatedAt"],
+                "source_updated_at": item["sourceUpdatedAt"], "adjustment_mode": item["adjustmentMode"],
+            })
+            if len(chunk) >= chunk_size:
+                session.execute(insert(SimulationStrategyValidationBarRecord), chunk)
+                chunk = []
+        if chunk:
+            session.execute(insert(SimulationStrategyValidationBarRecord), chunk)
 
     @staticmethod
     def _kline_connection(version: dict[str, Any]) -> str:
@@ -683,7 +903,7 @@ class StrategyValidationService:
         return func.lower(StockDaily.data_source).in_(aliases)
 
     @classmethod
-    def _coverage_report(cls, config: dict[str, Any], bars: list[dict[str, Any]]) -> dict[str, Any]:
+    def _coverage_report(cls, config: dict[str, Any], bars: ValidationBarPanel) -> dict[str, Any]:
         start = date.fromisoformat(config["startDate"])
         end = date.fromisoformat(config["endDate"])
         expected_weekdays = sum(
@@ -691,32 +911,41 @@ class StrategyValidationService:
             if (start + timedelta(days=offset)).weekday() < 5
         )
         minimum_replay_bars = max(2, math.ceil(expected_weekdays * MIN_REPLAY_WEEKDAY_COVERAGE))
-        by_key: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        for bar in bars:
-            by_key[cls._market_symbol_key(str(bar["code"]), config["market"])].append(bar)
+        columns_by_key: dict[str, list[int]] = defaultdict(list)
+        for column, code in enumerate(bars.codes):
+            columns_by_key[cls._market_symbol_key(str(code), config["market"])].append(column)
+        valid_rows = cls._valid_ohlcv(bars)
+        start_day, end_day = np.datetime64(start, "D"), np.datetime64(end, "D")
         symbols: list[dict[str, Any]] = []
-        replay_dates: list[date] = []
+        replay_mask = np.zeros(bars.dates.shape, dtype=bool)
         for requested in config["symbols"]:
-            values = sorted(by_key.get(cls._market_symbol_key(requested, config["market"]), []), key=lambda item: item["date"])
-            valid = [item for item in values if cls._valid_ohlcv(item)]
-            lookback = [item for item in valid if item["date"] < start]
-            replay = [item for item in valid if start <= item["date"] <= end]
-            first = replay[0]["date"] if replay else None
-            last = replay[-1]["date"] if replay else None
-            replay_dates.extend(item["date"] for item in replay)
+            columns = columns_by_key.get(cls._market_symbol_key(requested, config["market"]), [])
+            valid = np.sort(np.concatenate([bars.dates[valid_rows[:, column]] for column in columns])) if columns else bars.dates[:0]
+            lookback_count = int(np.searchsorted(valid, start_day, side="left"))
+            replay = valid[lookback_count:int(np.searchsorted(valid, end_day, side="right"))]
+            first = replay[0].item() if replay.size else None
+            last = replay[-1].item() if replay.size else None
+            for column in columns:
+                replay_mask |= valid_rows[:, column] & (bars.dates >= start_day) & (bars.dates <= end_day)
+            # Matches the legacy "earliest row wins" rule when several stored
+            # codes normalise to the same requested symbol.
+            resolved = min(
+                ((int(np.argmax(bars.present[:, column])), column) for column in columns if bars.present[:, column].any()),
+                default=None,
+            )
             start_covered = first is not None and first <= start + timedelta(days=MAX_BOUNDARY_LAG_DAYS)
             end_covered = last is not None and last >= end - timedelta(days=MAX_BOUNDARY_LAG_DAYS)
             complete = (
-                len(lookback) >= MIN_LOOKBACK_BARS
-                and len(replay) >= minimum_replay_bars
+                lookback_count >= MIN_LOOKBACK_BARS
+                and replay.size >= minimum_replay_bars
                 and start_covered
                 and end_covered
             )
             symbols.append({
                 "requestedSymbol": requested,
-                "resolvedSymbol": values[0]["code"] if values else None,
-                "lookbackBars": len(lookback),
-                "replayBars": len(replay),
+                "resolvedSymbol": bars.codes[resolved[1]] if resolved else None,
+                "lookbackBars": lookback_count,
+                "replayBars": int(replay.size),
                 "minimumReplayBars": minimum_replay_bars,
                 "firstReplayDate": first.isoformat() if first else None,
                 "lastReplayDate": last.isoformat() if last else None,
@@ -724,28 +953,31 @@ class StrategyValidationService:
                 "endCovered": end_covered,
                 "complete": complete,
             })
-        unique_replay_dates = sorted(set(replay_dates))
+        unique_replay_dates = bars.dates[replay_mask]
         return {
             "complete": bool(symbols) and all(item["complete"] for item in symbols),
             "requestedStartDate": start.isoformat(),
             "requestedEndDate": end.isoformat(),
-            "actualReplayStartDate": unique_replay_dates[0].isoformat() if unique_replay_dates else None,
-            "actualReplayEndDate": unique_replay_dates[-1].isoformat() if unique_replay_dates else None,
+            "actualReplayStartDate": unique_replay_dates[0].item().isoformat() if unique_replay_dates.size else None,
+            "actualReplayEndDate": unique_replay_dates[-1].item().isoformat() if unique_replay_dates.size else None,
             "expectedWeekdays": expected_weekdays,
             "minimumWeekdayCoverage": MIN_REPLAY_WEEKDAY_COVERAGE,
             "symbols": symbols,
         }
 
     @staticmethod
-    def _valid_ohlcv(bar: dict[str, Any]) -> bool:
-        try:
-            open_price = float(bar["open"])
-            high = float(bar["high"])
-            low = float(bar["low"])
-            close = float(bar["close"])
-        except (KeyError, TypeError, ValueError):
-            return False
-        return open_price > 0 and close > 0 and high >= max(open_price, close) and low <= min(open_price, close) and low > 0
+    def _valid_ohlcv(bars: ValidationBarPanel) -> np.ndarray:
+        """Mask of rows with a positive, internally consistent OHLC quadruple."""
+        open_price, high, low, close = (bars.values[field] for field in ("open", "high", "low", "close"))
+        with np.errstate(invalid="ignore"):
+            return (
+                bars.present
+                & (open_price > 0)
+                & (close > 0)
+                & (high >= np.maximum(open_price, close))
+                & (low <= np.minimum(open_price, close))
+                & (low > 0)
+            )
 
     @staticmethod
     def _require_complete_coverage(coverage: dict[str, Any]) -> None:
@@ -763,15 +995,26 @@ class StrategyValidationService:
             422,
         )
 
-    def _run(self, config: dict[str, Any], version: dict[str, Any], bars: list[dict[str, Any]]) -> dict[str, Any]:
-        by_code: dict[str, list[dict[str, Any]]] = defaultdict(list)
-        for bar in bars:
-            if bar.get("open") is not None and bar.get("close") is not None:
-                by_code[bar["code"]].append(bar)
-        for values in by_code.values():
-            values.sort(key=lambda item: item["date"])
+    @classmethod
+    def _run(
+        cls,
+        config: dict[str, Any],
+        version: dict[str, Any],
+        bars: ValidationBarPanel,
+        snapshot_hash: Optional[str] = None,
+    ) -> dict[str, Any]:
+        tradable = bars.tradable
+        # Dense date x code price grids: one row lookup per replay day instead
+        # of scanning every symbol's bar list.
+        close_prices = np.where(tradable, bars.values["close"], np.nan)
+        open_prices = np.where(tradable, bars.values["open"], np.nan)
+        rows_by_date = {day: row for row, day in enumerate(bars.dates.tolist())}
+        features = ValidationFeatures.from_panel(bars)
+        # Ties rank by code descending, as the former sorted((score, code)) did.
+        code_order = np.argsort(np.argsort(np.array(bars.codes, dtype=object)))
         start, end = date.fromisoformat(config["startDate"]), date.fromisoformat(config["endDate"])
-        dates = sorted({bar["date"] for values in by_code.values() for bar in values if start <= bar["date"] <= end})
+        in_range = (bars.dates >= np.datetime64(start, "D")) & (bars.dates <= np.datetime64(end, "D"))
+        dates = bars.dates[in_range & tradable.any(axis=1)].tolist()
         if len(dates) < 2:
             raise StrategyValidationError("VALIDATION_HISTORY_INSUFFICIENT", "回测区间内至少需要两个交易日。", 422)
         frequency = config["rebalanceFrequency"]
@@ -804,10 +1047,10 @@ class StrategyValidationService:
 
         pending_rebalance: Optional[dict[str, Any]] = None
         for day_index, current_date in enumerate(dates):
-            price_map = self._prices_on(by_code, current_date)
-            last_close_prices.update(price_map)
+            row = rows_by_date[current_date]
+            last_close_prices.update(cls._prices_on(close_prices, bars.codes, row))
             if pending_rebalance is not None:
-                execution_prices = self._prices_on(by_code, current_date, field="open")
+                execution_prices = cls._prices_on(open_prices, bars.codes, row)
                 signal_date = pending_rebalance["signalDate"]
                 selected = pending_rebalance["selected"]
                 # Full rebalance is explicit and reproducible: sell first, then equal-weight buys.
@@ -818,11 +1061,11 @@ class StrategyValidationService:
                         continue
                     fill = raw_price * (1 - slippage)
                     gross = position["quantity"] * fill
-                    fees = self._transaction_fees(config, "sell", current_date, gross)
+                    fees = cls._transaction_fees(config, "sell", current_date, gross)
                     cash += gross - fees["total"]
                     total_turnover += gross
                     realized = (fill - position["averagePrice"]) * position["quantity"] - fees["total"] - position["entryFee"]
-                    trades.append(self._trade(code, "sell", position["quantity"], signal_date, current_date, raw_price, fill, fees, abs(raw_price - fill) * position["quantity"], realized))
+                    trades.append(cls._trade(code, "sell", position["quantity"], signal_date, current_date, raw_price, fill, fees, abs(raw_price - fill) * position["quantity"], realized))
                     del positions[code]
                 if selected:
                     allocation = min(cash / len(selected), cash * max_position_fraction)
@@ -833,10 +1076,10 @@ class StrategyValidationService:
                             continue
                         fill = raw_price * (1 + slippage)
                         quantity = math.floor(allocation / fill / lot_size) * lot_size
-                        fees = self._transaction_fees(config, "buy", current_date, quantity * fill) if quantity > 0 else self._empty_fees()
+                        fees = cls._transaction_fees(config, "buy", current_date, quantity * fill) if quantity > 0 else cls._empty_fees()
                         while quantity > 0 and quantity * fill + fees["total"] > min(allocation, cash) + 1e-8:
                             quantity -= lot_size
-                            fees = self._transaction_fees(config, "buy", current_date, quantity * fill) if quantity > 0 else self._empty_fees()
+                            fees = cls._transaction_fees(config, "buy", current_date, quantity * fill) if quantity > 0 else cls._empty_fees()
                         if quantity <= 0:
                             continue
                         gross = quantity * fill
@@ -845,30 +1088,27 @@ class StrategyValidationService:
                         cash -= gross + fees["total"]
                         total_turnover += gross
                         positions[code] = {"quantity": float(quantity), "averagePrice": fill, "entryFee": fees["total"]}
-                        trades.append(self._trade(code, "buy", quantity, signal_date, current_date, raw_price, fill, fees, abs(raw_price - fill) * quantity, None, allocation))
+                        trades.append(cls._trade(code, "buy", quantity, signal_date, current_date, raw_price, fill, fees, abs(raw_price - fill) * quantity, None, allocation))
                 pending_rebalance = None
             equity = cash + sum(position["quantity"] * last_close_prices.get(code, position["averagePrice"]) for code, position in positions.items())
             equity_curve.append({"date": current_date.isoformat(), "equity": round(equity, 4), "cash": round(cash, 4), "positionCount": len(positions)})
             # Signals use only information available through this close and
             # become eligible for execution on the following replay date.
             if current_date in signal_dates and day_index + 1 < len(dates):
-                ranked = []
-                for code, code_bars in by_code.items():
-                    history = [item for item in code_bars if item["date"] <= current_date]
-                    signal = self._score(policy, history)
-                    if signal is not None:
-                        ranked.append((signal, code))
+                scores = cls._policy_scores(policy, features.at(current_date))
+                candidates = np.flatnonzero(~np.isnan(scores))
+                ranked = candidates[np.lexsort((code_order[candidates], scores[candidates]))[::-1]]
                 pending_rebalance = {
                     "signalDate": current_date,
-                    "selected": [code for _, code in sorted(ranked, reverse=True)[:max_positions]],
+                    "selected": [bars.codes[column] for column in ranked[:max_positions].tolist()],
                 }
 
-        metrics = self._metrics(equity_curve, trades, float(config["initialCapital"]), total_turnover)
-        sources = sorted({str(bar.get("dataSource")) for bar in bars if bar.get("dataSource")})
-        adjustment_modes = sorted({str(bar.get("adjustmentMode")) for bar in bars if bar.get("adjustmentMode")})
-        source_times = [value for bar in bars for value in (bar.get("sourceCreatedAt"), bar.get("sourceUpdatedAt")) if isinstance(value, datetime)]
-        coverage = self._coverage_report(config, bars)
-        self._require_complete_coverage(coverage)
+        metrics = cls._metrics(equity_curve, trades, float(config["initialCapital"]), total_turnover)
+        sources = bars.sources()
+        adjustment_modes = bars.adjustment_modes()
+        recorded_from, recorded_to = bars.source_time_range()
+        coverage = cls._coverage_report(config, bars)
+        cls._require_complete_coverage(coverage)
         return {
             "engineVersion": ENGINE_VERSION,
             "methodology": "historical_ohlcv_policy_replay",
@@ -877,62 +1117,47 @@ class StrategyValidationService:
             "equityCurve": equity_curve,
             "trades": trades,
             "finalPositions": [{"code": code, **position} for code, position in sorted(positions.items())],
-            "marketSnapshot": {"sha256": self._bars_hash(bars), "hashAlgorithm": "sha256", "barCount": len(bars), "symbolCount": len(by_code), "sources": sources, "adjustmentModes": adjustment_modes, "sourceRecordedFrom": min(source_times).isoformat() if source_times else None, "sourceRecordedTo": max(source_times).isoformat() if source_times else None, "firstDate": min(bar["date"] for bar in bars).isoformat(), "lastDate": max(bar["date"] for bar in bars).isoformat()},
+            "marketSnapshot": {"sha256": snapshot_hash or cls._bars_hash(bars), "hashAlgorithm": "sha256", "barCount": len(bars), "symbolCount": int(tradable.any(axis=0).sum()), "sources": sources, "adjustmentModes": adjustment_modes, "sourceRecordedFrom": recorded_from.isoformat() if recorded_from else None, "sourceRecordedTo": recorded_to.isoformat() if recorded_to else None, "firstDate": bars.dates[0].item().isoformat(), "lastDate": bars.dates[-1].item().isoformat()},
             "dataQuality": coverage,
-            "strategyReplay": {"screeningPolicy": policy, "rebalanceFrequency": frequency, "executionRule": config["executionRule"], "maxPositions": max_positions, "maxPositionPercent": round(max_position_fraction * 100, 4), "universeMode": universe_mode, "experimentPurpose": self._experiment_purpose(config), "skippedExecutions": skipped_executions},
+            "strategyReplay": {"screeningPolicy": policy, "rebalanceFrequency": frequency, "executionRule": config["executionRule"], "maxPositions": max_positions, "maxPositionPercent": round(max_position_fraction * 100, 4), "universeMode": universe_mode, "experimentPurpose": cls._experiment_purpose(config), "skippedExecutions": skipped_executions},
             "strategyCoverage": {"level": "partial", "executedComponents": [universe_mode, "ohlcv_price_volume_proxy", "next_open_execution", "riskPolicy.max_position_pct", "configured_cost_model"], "omittedComponents": ["agent_graph", "llm_decisions", "historical_news", "historical_fundamentals", "point_in_time_market_universe", "decisionPolicy", "memoryPolicy", "non_ohlcv_screening_filters"]},
-            "costModel": self._cost_model_description(config),
+            "costModel": cls._cost_model_description(config),
             "limitations": limitations,
         }
 
     @staticmethod
-    def _score(policy: str, history: list[dict[str, Any]]) -> Optional[float]:
-        valid = [item for item in history if item.get("close") is not None]
-        if len(valid) < 21:
-            return None
-        closes = [float(item["close"]) for item in valid]
-        volumes = [float(item.get("volume") or 0) for item in valid]
-        current, prior5, prior20 = closes[-1], closes[-6], closes[-21]
-        if prior5 <= 0 or prior20 <= 0:
-            return None
-        mom5 = current / prior5 - 1
-        mom20 = current / prior20 - 1
-        returns = [closes[index] / closes[index - 1] - 1 for index in range(len(closes) - 19, len(closes)) if closes[index - 1] > 0]
-        volatility = statistics.pstdev(returns) if len(returns) >= 2 else 0.0
-        avg_volume = statistics.fmean(volumes[-21:-1]) if any(volumes[-21:-1]) else 0.0
-        volume_ratio = volumes[-1] / avg_volume if avg_volume > 0 else 1.0
-        ma20 = statistics.fmean(closes[-20:])
-        liquidity = math.log10(max(float(valid[-1].get("amount") or 1), 1)) / 10
-        if policy == "volume_breakout":
-            if current < max(closes[-21:-1]) or volume_ratio < 1.3 or current < ma20:
-                return None
-            return mom20 * 5 + volume_ratio * 0.2 + liquidity
-        if policy == "shrink_pullback":
-            if current < ma20 or not 0.98 <= current / ma20 <= 1.08 or volume_ratio > 1.5:
-                return None
-            return mom20 * 3 - abs(current / ma20 - 1) - volatility + liquidity
-        if policy == "oversold_reversal":
-            if mom5 > -0.01 or len(closes) < 2 or closes[-1] <= closes[-2]:
-                return None
-            return -mom5 - volatility + liquidity
-        if policy == "capital_heat":
-            if mom5 <= 0 or volume_ratio < 1.2:
-                return None
-            return mom5 * 5 + volume_ratio * 0.2 + liquidity
-        if policy == "low_volatility_quality":
-            return mom20 * 2 - volatility * 4 + liquidity
-        if mom20 <= -0.05:
-            return None
-        return mom20 * 3 + mom5 - volatility * 2 + liquidity
+    def _policy_scores(policy: str, features: dict[str, np.ndarray]) -> np.ndarray:
+        """Score one cross-section of symbols; NaN marks symbols the policy rejects."""
+        current, ma20 = features["close"], features["ma20"]
+        mom5, mom20 = features["mom5"], features["mom20"]
+        volatility, volume_ratio, liquidity = features["volatility19"], features["volumeRatio"], features["liquidity"]
+        # Symbols without 21 tradable bars carry NaN features and are never eligible.
+        eligible = features["priorsPositive"] == 1
+        with np.errstate(divide="ignore", invalid="ignore"):
+            if policy == "volume_breakout":
+                eligible &= (current >= features["priorHigh20"]) & (volume_ratio >= 1.3) & (current >= ma20)
+                score = mom20 * 5 + volume_ratio * 0.2 + liquidity
+            elif policy == "shrink_pullback":
+                ratio = current / ma20
+                eligible &= (current >= ma20) & (ratio >= 0.98) & (ratio <= 1.08) & (volume_ratio <= 1.5)
+                score = mom20 * 3 - np.abs(ratio - 1) - volatility + liquidity
+            elif policy == "oversold_reversal":
+                eligible &= (mom5 <= -0.01) & (current > features["previousClose"])
+                score = -mom5 - volatility + liquidity
+            elif policy == "capital_heat":
+                eligible &= (mom5 > 0) & (volume_ratio >= 1.2)
+                score = mom5 * 5 + volume_ratio * 0.2 + liquidity
+            elif policy == "low_volatility_quality":
+                score = mom20 * 2 - volatility * 4 + liquidity
+            else:
+                eligible &= mom20 > -0.05
+                score = mom20 * 3 + mom5 - volatility * 2 + liquidity
+        return np.where(eligible, score, np.nan)
 
     @staticmethod
-    def _prices_on(by_code: dict[str, list[dict[str, Any]]], target: date, field: str = "close") -> dict[str, float]:
-        result = {}
-        for code, bars in by_code.items():
-            match = next((item for item in bars if item["date"] == target and item.get(field) is not None), None)
-            if match:
-                result[code] = float(match[field])
-        return result
+    def _prices_on(prices: np.ndarray, codes: tuple[str, ...], row: int) -> dict[str, float]:
+        """Map each code with a price in ``prices[row]`` to that price."""
+        return {codes[column]: value for column, value in enumerate(prices[row].tolist()) if value == value}
 
     @staticmethod
     def _trade(code: str, side: str, quantity: float, signal_date: date, execution_date: date, raw_price: float, fill_price: float, fees: dict[str, float], slippage_cost: float, realized_pnl: Optional[float], position_limit_amount: Optional[float] = None) -> dict[str, Any]:
@@ -998,12 +1223,10 @@ class StrategyValidationService:
     def _integrity_status(self, session, experiment: SimulationStrategyValidationExperimentRecord) -> str:
         if not experiment.input_snapshot_hash:
             return "legacy_unverified"
-        rows = session.execute(select(SimulationStrategyValidationBarRecord).where(
-            SimulationStrategyValidationBarRecord.experiment_id == experiment.id
-        ).order_by(SimulationStrategyValidationBarRecord.code, SimulationStrategyValidationBarRecord.date)).scalars().all()
-        return "verified" if self._bars_hash([self._bar_dict(row) for row in rows]) == experiment.input_snapshot_hash else "failed"
+        bars = self._frozen_bars(session, experiment.id)
+        return "verified" if self._bars_hash(bars) == experiment.input_snapshot_hash else "failed"
 
-    def _require_snapshot_integrity(self, experiment: SimulationStrategyValidationExperimentRecord, bars: list[dict[str, Any]]) -> None:
+    def _require_snapshot_integrity(self, experiment: SimulationStrategyValidationExperimentRecord, bars: ValidationBarPanel) -> None:
         if not experiment.input_snapshot_hash or self._bars_hash(bars) != experiment.input_snapshot_hash:
             raise StrategyValidationError(
                 "VALIDATION_SNAPSHOT_INTEGRITY_FAILED",
@@ -1175,16 +1398,20 @@ class StrategyValidationService:
         return result
 
     @staticmethod
-    def _bar_dict(row: SimulationStrategyValidationBarRecord) -> dict[str, Any]:
-        return {"code": row.code, "date": row.date, "open": row.open, "high": row.high, "low": row.low, "close": row.close, "volume": row.volume, "amount": row.amount, "dataSource": row.data_source, "sourceCreatedAt": row.source_created_at, "sourceUpdatedAt": row.source_updated_at, "adjustmentMode": row.adjustment_mode}
-
-    @classmethod
-    def _bars_hash(cls, bars: list[dict[str, Any]]) -> str:
-        payload = [{
-            key: value.isoformat() if isinstance(value, (date, datetime)) else value
-            for key, value in bar.items()
-        } for bar in bars]
-        return cls._hash(payload)
+    def _bars_hash(bars: ValidationBarPanel) -> str:
+        # Streams the same canonical JSON list ``_hash`` would produce for the
+        # per-bar dicts, so frozen snapshot hashes stay comparable.
+        digest = hashlib.sha256(b"[")
+        for index, bar in enumerate(bars.iter_records()):
+            payload = {
+                key: value.isoformat() if isinstance(value, (date, datetime)) else value
+                for key, value in bar.items()
+            }
+            if index:
+                digest.update(b",")
+            digest.update(json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str, separators=(",", ":")).encode("utf-8"))
+        digest.update(b"]")
+        return digest.hexdigest()
 
     @staticmethod
     def _hash(value: Any) -> str:
@@ -1209,3 +1436,36 @@ class StrategyValidationService:
         try: decoded = json.loads(value or "{}")
         except (TypeError, ValueError): return {}
         return decoded if isinstance(decoded, dict) else {}
+
+
+# Sweep worker state: panels attached from the parent's shared memory once per
+# worker process and reused by every cell that worker replays.
+_SWEEP_PANELS: dict[str, ValidationBarPanel] = {}
+_SWEEP_SEGMENTS: list[Any] = []
+
+
+def _attach_sweep_panels(specs: dict[str, dict[str, Any]]) -> None:
+    for key, spec in specs.items():
+        panel, segments = ValidationBarPanel.attach(spec)
+        _SWEEP_PANELS[key] = panel
+        _SWEEP_SEGMENTS.extend(segments)
+
+
+def _run_sweep_cell(panel_key: str, config: dict[str, Any], version: dict[str, Any], snapshot_hash: str) -> tuple[str, Any]:
+    return _sweep_cell_outcome(_SWEEP_PANELS[panel_key], config, version, snapshot_hash)
+
+
+def _sweep_cell_outcome(
+    bars: ValidationBarPanel,
+    config: dict[str, Any],
+    version: dict[str, Any],
+    snapshot_hash: str,
+) -> tuple[str, Any]:
+    # Errors travel back as plain strings: StrategyValidationError does not
+    # survive pickling across the process boundary.
+    try:
+        return "completed", StrategyValidationService._run(config, version, bars, snapshot_hash)
+    except StrategyValidationError as exc:
+        return "failed", exc.message[:2000]
+    except Exception as exc:
+        return "failed", str(exc)[:2000] or "策略级历史验证执行失败。"
@@ -28,6 +28,7 @@ if TYPE_CHECKING:
     from asyncio import Queue as AsyncQueue
 
 from data_provider.base import canonical_stock_code, normalize_stock_code
+from src.services.concurrency_budget import resolve_analysis_worker_count
 from src.services.run_diagnostics import (
     activate_run_diagnostic_context,
     get_current_diagnostic_context,
@@ -213,8 +214,10 @@ class AnalysisTaskQueue:
     def executor(self) -> ThreadPoolExecutor:
         """懒加载线程池"""
         if self._executor is None:
+            # MAX_WORKERS 仍是数据阶段的并发数；额外线程留给 LLM 预算，
+            # 上游限速由各数据源/模型通道的并发预算保证。
             self._executor = ThreadPoolExecutor(
-                max_workers=self._max_workers,
+                max_workers=resolve_analysis_worker_count(self._max_workers),
                 thread_name_prefix="analysis_task_"
             )
         return self._executor
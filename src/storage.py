@@ -13,14 +13,17 @@ A股自选股智能分析系统 - 存储层
 
 import atexit
 from contextlib import contextmanager
+from dataclasses import dataclass
 import hashlib
 import json
 import logging
 import threading
 import time
+import zlib
 from datetime import datetime, date, timedelta, timezone
-from typing import Optional, List, Dict, Any, TYPE_CHECKING, Tuple, Callable, TypeVar, Union
+from typing import Optional, List, Dict, Any, TYPE_CHECKING, Tuple, Callable, TypeVar, Union, Mapping
 
+import numpy as np
 import pandas as pd
 from sqlalchemy import (
     create_engine,
@@ -37,13 +40,17 @@ from sqlalchemy import (
     UniqueConstraint,
     CheckConstraint,
     Text,
+    LargeBinary,
+    TypeDecorator,
     text,
+    type_coerce,
     select,
     and_,
     or_,
     delete,
     desc,
     event,
+    exists,
     func,
     case,
     inspect,
@@ -51,8 +58,12 @@ from sqlalchemy import (
     Table,
 )
 from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import (
+    attributes,
+    column_property,
     declarative_base,
+    deferred,
     sessionmaker,
     Session,
 )
@@ -73,6 +84,11 @@ STRATEGY_VALIDATION_INTEGRITY_SCHEMA_VERSION = "2026-08-16-strategy-validation-i
 AGENT_CENTER_SCHEMA_VERSION = "2026-08-16-agent-center-v1"
 DATA_SOURCE_MARKET_SCHEMA_VERSION = "2026-08-16-data-source-market-v1"
 INTELLIGENCE_ITEM_NULL_SCOPE_VALUE = "__dsa_null_scope__"
+HISTORY_COUNT_CACHE_TTL_SECONDS = 30.0
+# 不足该字节数的报告字段保持内联，避免为小字段建 blob
+ANALYSIS_BLOB_MIN_BYTES = 1024
+ANALYSIS_BLOB_CODEC = "zlib"
+ANALYSIS_REPORT_BLOB_FIELDS = ("raw_result", "news_content", "context_snapshot")
 
 # SQLAlchemy ORM 基类
 Base = declarative_base()
@@ -241,6 +257,9 @@ class IntelligenceSource(Base):
     last_status = Column(String(32))
     last_error = Column(Text)
     last_fetched_at = Column(DateTime, index=True)
+    # 条件请求校验值（ETag / Last-Modified），未变化的源只需一次 304
+    http_etag = Column(String(256))
+    http_last_modified = Column(String(64))
     created_at = Column(DateTime, default=datetime.now, index=True)
     updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now, index=True)
 
@@ -338,6 +357,86 @@ class ScreeningRun(Base):
     )
 
 
+def encode_analysis_blob(text_value: str) -> Tuple[str, bytes]:
+    """Return ``(sha256 digest, zlib payload)`` for one report field."""
+    raw = text_value.encode("utf-8")
+    return hashlib.sha256(raw).hexdigest(), zlib.compress(raw, 6)
+
+
+def decode_analysis_blob(data: bytes) -> str:
+    return zlib.decompress(data).decode("utf-8")
+
+
+class AnalysisBlob(Base):
+    """
+    分析报告大字段的内容寻址存储
+
+    raw_result / news_content / context_snapshot 按 SHA-256 去重、zlib 压缩后
+    保存在这里，AnalysisHistory 只记录 digest。同一股票同日重复的新闻、
+    上下文快照只存一份。
+    """
+    __tablename__ = 'analysis_blobs'
+
+    digest = Column(String(64), primary_key=True)
+    codec = Column(String(8), nullable=False, default=ANALYSIS_BLOB_CODEC)
+    raw_size = Column(Integer, nullable=False)
+    data = Column(LargeBinary, nullable=False)
+    created_at = Column(DateTime, default=datetime.now)
+
+
+class _ReportBlobText(TypeDecorator):
+    """Result type for report fields: inline text passes through, blob bytes are decompressed."""
+
+    impl = Text
+    cache_ok = True
+
+    def process_result_value(self, value: Any, dialect: Any) -> Any:
+        if isinstance(value, (bytes, bytearray, memoryview)):
+            return decode_analysis_blob(bytes(value))
+        return value
+
+
+def _resolved_report_field(inline_column: Any, ref_column: Any) -> Any:
+    """SQL expression yielding the inline text, or else the referenced blob."""
+    blob_data = (
+        select(AnalysisBlob.data)
+        .where(AnalysisBlob.digest == ref_column)
+        .correlate_except(AnalysisBlob)
+        .scalar_subquery()
+    )
+    return type_coerce(func.coalesce(inline_column, blob_data), _ReportBlobText)
+
+
+def _report_blob_field(name: str) -> hybrid_property:
+    """
+    Public accessor for a report field stored inline (``<name>_text``) or as a
+    blob reference (``<name>_ref``).
+
+    Reads return the decompressed text for both entity loads and column
+    selects; assignments store inline text, drop the blob reference and
+    replace the loaded resolved value so later reads never see stale content.
+    """
+    text_attr = f"{name}_text"
+    ref_attr = f"{name}_ref"
+    resolved_attr = f"_{name}_resolved"
+
+    def fget(self: Any) -> Optional[str]:
+        inline = self.__dict__.get(text_attr)
+        if inline is not None:
+            return inline
+        return getattr(self, resolved_attr)
+
+    def fset(self: Any, value: Optional[str]) -> None:
+        setattr(self, text_attr, value)
+        setattr(self, ref_attr, None)
+        attributes.set_committed_value(self, resolved_attr, value)
+
+    def expr(cls: Any) -> Any:
+        return getattr(cls, resolved_attr)
+
+    return hybrid_property(fget, fset, expr=expr)
+
+
 class AnalysisHistory(Base):
     """
     分析结果历史记录模型
@@ -362,10 +461,19 @@ class AnalysisHistory(Base):
     trend_prediction = Column(String(50))
     analysis_summary = Column(Text)
 
-    # 详细数据
-    raw_result = Column(Text)
-    news_content = Column(Text)
-    context_snapshot = Column(Text)
+    # 详细数据：小字段内联保存，大字段存入 analysis_blobs 并在 *_ref 中记录 digest；
+    # 读写统一通过 raw_result / news_content / context_snapshot 访问
+    raw_result_text = deferred(Column('raw_result', Text))
+    news_content_text = deferred(Column('news_content', Text))
+    context_snapshot_text = deferred(Column('context_snapshot', Text))
+    raw_result_ref = Column(String(64), nullable=True, index=True)
+    news_content_ref = Column(String(64), nullable=True, index=True)
+    context_snapshot_ref = Column(String(64), nullable=True, index=True)
+    raw_result = _report_blob_field('raw_result')
+    news_content = _report_blob_field('news_content')
+    context_snapshot = _report_blob_field('context_snapshot')
+    # 列表页所需的 raw_result / context_snapshot 小字段投影（JSON），列表查询不再加载大字段
+    list_summary = Column(Text, nullable=True)
 
     # 狙击点位（用于回测）
     ideal_buy = Column(Float)
@@ -384,6 +492,7 @@ class AnalysisHistory(Base):
 
     __table_args__ = (
         Index('ix_analysis_code_time', 'code', 'created_at'),
+        Index('ix_analysis_created_id', 'created_at', 'id'),
     )
 
     def to_dict(self) -> Dict[str, Any]:
@@ -413,6 +522,19 @@ class AnalysisHistory(Base):
         }
 
 
+for _field in ANALYSIS_REPORT_BLOB_FIELDS:
+    setattr(
+        AnalysisHistory,
+        f"_{_field}_resolved",
+        column_property(
+            _resolved_report_field(
+                AnalysisHistory.__table__.c[_field],
+                AnalysisHistory.__table__.c[f"{_field}_ref"],
+            )
+        ),
+    )
+
+
 class BacktestResult(Base):
     """单条分析记录的回测结果。"""
 
@@ -711,6 +833,30 @@ class PortfolioDailySnapshot(Base):
     )
 
 
+class PortfolioReplayCheckpoint(Base):
+    """Replay state (lots, cash balances, realized PnL) covering all events up to one date."""
+
+    __tablename__ = 'portfolio_replay_checkpoints'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    account_id = Column(Integer, ForeignKey('portfolio_accounts.id'), nullable=False, index=True)
+    cost_method = Column(String(8), nullable=False, default='fifo')  # fifo/avg
+    checkpoint_date = Column(Date, nullable=False, index=True)
+    base_currency = Column(String(8), nullable=False, default='CNY')
+    event_fingerprint = Column(Text, nullable=False)  # JSON: per event type [count, max_id]
+    state = Column(Text, nullable=False)  # JSON replay state
+    created_at = Column(DateTime, default=datetime.now, index=True)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'account_id',
+            'cost_method',
+            'checkpoint_date',
+            name='uix_portfolio_checkpoint_account_method_date',
+        ),
+    )
+
+
 class PortfolioFxRate(Base):
     """Cached FX rates used for cross-currency portfolio conversion."""
 
@@ -880,6 +1026,52 @@ class LLMUsage(Base):
     called_at = Column(DateTime, default=datetime.now, index=True)
 
 
+LLM_USAGE_ROLLUP_GRANULARITIES = ("hour", "day")
+
+
+class LLMUsageRollup(Base):
+    """Pre-aggregated llm_usage totals for one closed hour or day bucket.
+
+    Rows are written by ``DatabaseManager.compact_llm_usage_rollups``; the
+    dimensions match what usage summaries group and filter by.
+    ``strategy_version_id`` is 0 for calls without strategy attribution so the
+    unique key stays NULL-free.
+    """
+
+    __tablename__ = 'llm_usage_rollups'
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    granularity = Column(String(8), nullable=False)  # 'hour' | 'day'
+    bucket_start = Column(DateTime, nullable=False)
+    call_type = Column(String(32), nullable=False)
+    model = Column(String(128), nullable=False)
+    strategy_version_id = Column(Integer, nullable=False, default=0)
+    calls = Column(Integer, nullable=False, default=0)
+    attributed_calls = Column(Integer, nullable=False, default=0)
+    prompt_tokens = Column(Integer, nullable=False, default=0)
+    completion_tokens = Column(Integer, nullable=False, default=0)
+    total_tokens = Column(Integer, nullable=False, default=0)
+    max_total_tokens = Column(Integer, nullable=False, default=0)
+
+    __table_args__ = (
+        UniqueConstraint(
+            'granularity', 'bucket_start', 'call_type', 'model', 'strategy_version_id',
+            name='uix_llm_usage_rollup_bucket',
+        ),
+        Index('ix_llm_usage_rollup_strategy', 'granularity', 'strategy_version_id', 'bucket_start'),
+    )
+
+
+class LLMUsageRollupState(Base):
+    """Compaction watermark: buckets before ``compacted_until`` are rolled up."""
+
+    __tablename__ = 'llm_usage_rollup_state'
+
+    granularity = Column(String(8), primary_key=True)
+    compacted_until = Column(DateTime, nullable=False)
+    updated_at = Column(DateTime, default=datetime.now, onupdate=datetime.now)
+
+
 _LLM_USAGE_TELEMETRY_COLUMN_SQL: Dict[str, str] = {
     "strategy_id": "INTEGER",
     "strategy_version_id": "INTEGER",
@@ -945,6 +1137,48 @@ _STRATEGY_PRODUCT_HISTORY_COLUMNS: Dict[str, Dict[str, str]] = {
         "completed_at": "DATETIME",
     },
 }
+_INTELLIGENCE_SOURCE_HTTP_CACHE_COLUMNS: Dict[str, str] = {
+    "http_etag": "VARCHAR(256)",
+    "http_last_modified": "VARCHAR(64)",
+}
+# 历史列表渲染只读取 raw_result / context_snapshot 中的这些路径（动作、模型、
+# 护栏原因、实时行情、阶段摘要、复盘区域），保存时投影到 list_summary。
+_HISTORY_LIST_QUOTE_KEYS = (
+    "price",
+    "change_pct",
+    "pct_chg",
+    "volume_ratio",
+    "volumeRatio",
+    "turnover_rate",
+    "turnoverRate",
+    "turnover",
+)
+_HISTORY_LIST_RAW_RESULT_PATHS: Tuple[Tuple[str, ...], ...] = (
+    ("model_used",),
+    ("operation_advice",),
+    ("action",),
+    ("action_label",),
+    ("report_language",),
+    ("guardrail_reason",),
+    ("downgrade_reason",),
+    ("decision_score_guardrail_reason",),
+    ("metadata", "guardrail_reason"),
+    ("metadata", "downgrade_reason"),
+    ("dashboard", "decision_score_calibration", "guardrail_reason"),
+    ("dashboard", "decision_score_calibration", "downgrade_reason"),
+    ("dashboard", "decision_stability", "applied"),
+    ("dashboard", "decision_stability", "guardrail_reason"),
+    ("dashboard", "decision_stability", "downgrade_reason"),
+    ("dashboard", "decision_stability", "reason"),
+)
+_HISTORY_LIST_CONTEXT_PATHS: Tuple[Tuple[str, ...], ...] = (
+    *(("enhanced_context", "realtime", key) for key in _HISTORY_LIST_QUOTE_KEYS),
+    *(("realtime_quote_raw", key) for key in _HISTORY_LIST_QUOTE_KEYS),
+    *(("realtime_quote", key) for key in _HISTORY_LIST_QUOTE_KEYS),
+    ("market_phase_summary",),
+    ("market_review_region",),
+    ("market_review_payload", "region"),
+)
 _LLM_USAGE_INTEGER_TELEMETRY_COLUMNS = {
     column
     for column, column_type in _LLM_USAGE_TELEMETRY_COLUMN_SQL.items()
@@ -1871,6 +2105,299 @@ class SkillOpinionOutcomeRecord(Base):
     )
 
 
+def _load_json_mapping(value: Any) -> Dict[str, Any]:
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, str) and value:
+        try:
+            parsed = json.loads(value)
+        except (TypeError, ValueError):
+            return {}
+        return parsed if isinstance(parsed, dict) else {}
+    return {}
+
+
+def _project_json_paths(payload: Any, paths: Tuple[Tuple[str, ...], ...]) -> Dict[str, Any]:
+    """Copy only the given nested key paths of a JSON object, keeping its shape."""
+    source = _load_json_mapping(payload)
+    projected: Dict[str, Any] = {}
+    for path in paths:
+        node: Any = source
+        for key in path:
+            node = node.get(key) if isinstance(node, Mapping) else None
+            if node is None:
+                break
+        if node is None:
+            continue
+        target = projected
+        for key in path[:-1]:
+            target = target.setdefault(key, {})
+        target[path[-1]] = node
+    return projected
+
+
+def build_analysis_list_summary(raw_result: Any, context_snapshot: Any) -> Dict[str, Any]:
+    """Project the raw_result/context_snapshot fields the history list renders."""
+    return {
+        "raw_result": _project_json_paths(raw_result, _HISTORY_LIST_RAW_RESULT_PATHS),
+        "context_snapshot": _project_json_paths(context_snapshot, _HISTORY_LIST_CONTEXT_PATHS),
+    }
+
+
+@dataclass(frozen=True)
+class AnalysisHistoryListRow:
+    """History list projection: scalar columns plus the projected JSON subsets.
+
+    ``raw_result`` / ``context_snapshot`` hold only the list-facing paths, so
+    renderers written against ``AnalysisHistory`` can consume either type.
+    """
+
+    id: int
+    query_id: Optional[str]
+    code: str
+    name: Optional[str]
+    report_type: Optional[str]
+    sentiment_score: Optional[int]
+    operation_advice: Optional[str]
+    trend_prediction: Optional[str]
+    analysis_summary: Optional[str]
+    created_at: Optional[datetime]
+    raw_result: Dict[str, Any]
+    context_snapshot: Dict[str, Any]
+
+
+LLM_USAGE_WRITE_MODES = ("async", "sync")
+LLM_USAGE_ENQUEUE_WAIT_SECONDS = 0.05
+LLM_USAGE_READ_FLUSH_TIMEOUT_SECONDS = 2.0
+LLM_USAGE_ROLLUP_GRACE = timedelta(minutes=1)
+LLM_USAGE_ROLLUP_COMPACT_INTERVAL_SECONDS = 300.0
+LLM_USAGE_ROLLUP_COMPACT_CHUNK = timedelta(days=7)
+
+
+class LLMUsageWriter:
+    """
+    LLM 调用遥测的后台批量写入器
+
+    热路径只把已规范化的行放进有界内存队列，由单个写线程每
+    ``flush_interval_ms`` 毫秒或攒满 ``batch_size`` 条时一次性批量插入，
+    避免每次 LLM 调用都单独占用一次 SQLite 写事务。
+
+    - 队列已满时先唤醒写线程并短暂等待腾出空位，仍无空位则丢弃并计数
+    - ``flush()`` 等待已入队记录全部落库；``close()`` 停止写线程并写完剩余记录
+    - ``synchronous=True`` 时不启动线程，``submit()`` 直接同步写入（测试与内存库使用）
+    - ``maintenance`` 在写线程空闲（队列已清空）时按 ``maintenance_interval``
+      秒的间隔调用，用于 rollup 压缩等后台写入，不占用读请求的线程
+    """
+
+    def __init__(
+        self,
+        write_batch: Callable[[List[Dict[str, Any]]], None],
+        *,
+        flush_interval_ms: int = 500,
+        batch_size: int = 200,
+        max_queue: int = 10000,
+        synchronous: bool = False,
+        maintenance: Optional[Callable[[], Any]] = None,
+        maintenance_interval: float = LLM_USAGE_ROLLUP_COMPACT_INTERVAL_SECONDS,
+    ):
+        self._write_batch = write_batch
+        self._maintenance = maintenance
+        self._maintenance_interval = max(0.0, float(maintenance_interval))
+        self._next_maintenance = 0.0
+        self._flush_interval = max(1, int(flush_interval_ms)) / 1000
+        self._batch_size = max(1, int(batch_size))
+        self._max_queue = max(self._batch_size, int(max_queue))
+        self._synchronous = bool(synchronous)
+        self._condition = threading.Condition()
+        self._queue: List[Dict[str, Any]] = []
+        self._in_flight = 0
+        self._flush_requested = False
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._enqueued = 0
+        self._written = 0
+        self._dropped = 0
+        self._failed = 0
+        self._batches = 0
+        self._backpressure_waits = 0
+
+    @property
+    def synchronous(self) -> bool:
+        return self._synchronous
+
+    @property
+    def max_flush_latency(self) -> timedelta:
+        """一条记录从 ``called_at`` 到落库的最长延迟上界。
+
+        记录最多等待一个刷新间隔才被取走；队列积满时需按批写完
+        ``max_queue / batch_size`` 批，按每批在一个刷新间隔内提交估算。
+        """
+        if self._synchronous:
+            return timedelta(0)
+        batches = -(-self._max_queue // self._batch_size)
+        return timedelta(seconds=self._flush_interval * (batches + 1) + LLM_USAGE_ENQUEUE_WAIT_SECONDS)
+
+    def submit(self, row: Dict[str, Any]) -> bool:
+        """提交一行遥测；返回 False 表示因队列满或写入器已关闭而被丢弃。"""
+        if self._synchronous:
+            with self._condition:
+                self._enqueued += 1
+            self._write_rows([row])
+            return True
+
+        with self._condition:
+            if self._closed:
+                self._dropped += 1
+                return False
+            if len(self._queue) >= self._max_queue:
+                self._backpressure_waits += 1
+                self._flush_requested = True
+                self._condition.notify_all()
+                self._condition.wait_for(
+                    lambda: self._closed or len(self._queue) < self._max_queue,
+                    timeout=LLM_USAGE_ENQUEUE_WAIT_SECONDS,
+                )
+                if self._closed or len(self._queue) >= self._max_queue:
+                    self._dropped += 1
+                    dropped = self._dropped
+                    if dropped == 1 or dropped % 100 == 0:
+                        logger.warning("[LLM usage] 遥测队列已满，已丢弃 %s 条记录", dropped)
+                    return False
+            self._queue.append(row)
+            self._enqueued += 1
+            self._ensure_thread_locked()
+            if len(self._queue) >= self._batch_size:
+                self._condition.notify_all()
+        return True
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """等待已入队记录全部写入；超时返回 False。"""
+        if self._synchronous:
+            return True
+        with self._condition:
+            if not self._queue and not self._in_flight:
+                return True
+            if self._thread is None or not self._thread.is_alive():
+                batch = self._take_batch_locked(len(self._queue))
+            else:
+                batch = None
+                self._flush_requested = True
+                self._condition.notify_all()
+        if batch is not None:
+            self._write_rows(batch)
+            with self._condition:
+                self._in_flight -= len(batch)
+                self._condition.notify_all()
+            return True
+        with self._condition:
+            return self._condition.wait_for(
+                lambda: not self._queue and not self._in_flight,
+                timeout=timeout,
+            )
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        """停止写线程并写完剩余记录（可重复调用）。"""
+        with self._condition:
+            self._closed = True
+            thread = self._thread
+            self._condition.notify_all()
+        if thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+        with self._condition:
+            remaining = self._take_batch_locked(len(self._queue))
+        if remaining:
+            self._write_rows(remaining)
+            with self._condition:
+                self._in_flight -= len(remaining)
+                self._condition.notify_all()
+
+    def stats(self) -> Dict[str, Any]:
+        """返回队列深度与入队/写入/丢弃/失败计数。"""
+        with self._condition:
+            return {
+                "mode": "sync" if self._synchronous else "async",
+                "queued": len(self._queue),
+                "in_flight": self._in_flight,
+                "max_queue": self._max_queue,
+                "batch_size": self._batch_size,
+                "flush_interval_ms": int(self._flush_interval * 1000),
+                "enqueued": self._enqueued,
+                "written": self._written,
+                "dropped": self._dropped,
+                "failed": self._failed,
+                "batches": self._batches,
+                "backpressure_waits": self._backpressure_waits,
+            }
+
+    def _ensure_thread_locked(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._thread = threading.Thread(
+            target=self._run,
+            name="llm-usage-writer",
+            daemon=True,
+        )
+        self._thread.start()
+
+    def _take_batch_locked(self, size: int) -> List[Dict[str, Any]]:
+        batch = self._queue[:size]
+        del self._queue[:size]
+        self._in_flight += len(batch)
+        self._condition.notify_all()
+        return batch
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                deadline = time.monotonic() + self._flush_interval
+                while (
+                    not self._closed
+                    and not self._flush_requested
+                    and len(self._queue) < self._batch_size
+                ):
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        break
+                    self._condition.wait(remaining)
+                if not self._queue:
+                    self._flush_requested = False
+                    if self._closed:
+                        return
+                    batch = None
+                else:
+                    batch = self._take_batch_locked(self._batch_size)
+                    if not self._queue:
+                        self._flush_requested = False
+            if batch is None:
+                self._run_maintenance()
+                continue
+            self._write_rows(batch)
+            with self._condition:
+                self._in_flight -= len(batch)
+                self._condition.notify_all()
+
+    def _run_maintenance(self) -> None:
+        if self._maintenance is None or time.monotonic() < self._next_maintenance:
+            return
+        self._next_maintenance = time.monotonic() + self._maintenance_interval
+        try:
+            self._maintenance()
+        except Exception as exc:
+            logger.warning("[LLM usage] 后台维护任务失败: %s", exc)
+
+    def _write_rows(self, rows: List[Dict[str, Any]]) -> None:
+        try:
+            self._write_batch(rows)
+        except Exception as exc:
+            with self._condition:
+                self._failed += len(rows)
+            logger.warning("[LLM usage] 批量写入 %s 条遥测失败: %s", len(rows), exc)
+            return
+        with self._condition:
+            self._written += len(rows)
+            self._batches += 1
+
+
 class _DatabaseManagerMeta(type):
     """Serialize DatabaseManager construction across __new__ and __init__."""
 
@@ -1922,6 +2449,8 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
             self._sqlite_busy_timeout_ms = config.sqlite_busy_timeout_ms
             self._sqlite_write_retry_max = config.sqlite_write_retry_max
             self._sqlite_write_retry_base_delay = config.sqlite_write_retry_base_delay
+            self._history_count_cache: Dict[Tuple[Any, ...], Tuple[float, int]] = {}
+            self._history_count_cache_lock = threading.Lock()
 
             engine_kwargs = {
                 "echo": False,
@@ -1955,15 +2484,21 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
             self._ensure_strategy_product_history_columns()
             self._ensure_decision_signal_profile_schema()
             self._ensure_strategy_definition_schema()
+            self._ensure_intelligence_source_http_cache_columns()
+            self._ensure_analysis_history_list_schema()
             self._ensure_intelligence_item_scope_values()
             self._ensure_schema_migration_record()
             self._ensure_intelligence_items_unique_index()
 
+            self._llm_usage_writer = self._build_llm_usage_writer(config)
+
             self._initialized = True
             logger.info(f"数据库初始化完成: {db_url}")
 
-            # 注册退出钩子，确保程序退出时关闭数据库连接
+            # 注册退出钩子，确保程序退出时关闭数据库连接；
+            # atexit 后注册先执行，遥测写入器会在引擎释放前写完剩余记录
             atexit.register(DatabaseManager._cleanup_engine, self._engine)
+            atexit.register(self._llm_usage_writer.close)
         except Exception:
             self._initialized = False
             try:
@@ -2508,6 +3043,45 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
             except Exception as exc:
                 logger.warning("策略产品历史字段迁移失败，保留原历史表继续启动: table=%s error=%s", table_name, exc)
 
+    def _ensure_intelligence_source_http_cache_columns(self) -> None:
+        """Best-effort conditional-GET validator columns for existing SQLite source tables."""
+        if not self._is_sqlite_engine:
+            return
+        table_name = IntelligenceSource.__tablename__
+        try:
+            existing = {column["name"] for column in inspect(self._engine).get_columns(table_name)}
+            with self._engine.begin() as connection:
+                for column, column_type in _INTELLIGENCE_SOURCE_HTTP_CACHE_COLUMNS.items():
+                    if column not in existing:
+                        connection.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN {column} {column_type}")
+        except Exception as exc:
+            logger.warning("资讯源条件请求字段迁移失败，保留原表继续启动: error=%s", exc)
+
+    def _ensure_analysis_history_list_schema(self) -> None:
+        """Best-effort list projection, blob reference columns and indexes for existing SQLite history tables."""
+        if not self._is_sqlite_engine:
+            return
+        table_name = AnalysisHistory.__tablename__
+        try:
+            existing = {column["name"] for column in inspect(self._engine).get_columns(table_name)}
+            with self._engine.begin() as connection:
+                if "list_summary" not in existing:
+                    connection.exec_driver_sql(f"ALTER TABLE {table_name} ADD COLUMN list_summary TEXT")
+                connection.exec_driver_sql(
+                    f"CREATE INDEX IF NOT EXISTS ix_analysis_created_id ON {table_name} (created_at, id)"
+                )
+                for field in ANALYSIS_REPORT_BLOB_FIELDS:
+                    ref_column = f"{field}_ref"
+                    if ref_column not in existing:
+                        connection.exec_driver_sql(
+                            f"ALTER TABLE {table_name} ADD COLUMN {ref_column} VARCHAR(64)"
+                        )
+                    connection.exec_driver_sql(
+                        f"CREATE INDEX IF NOT EXISTS ix_{table_name}_{ref_column} ON {table_name} ({ref_column})"
+                    )
+        except Exception as exc:
+            logger.warning("分析历史列表投影/大字段引用列迁移失败，保留原表继续启动: error=%s", exc)
+
     def _ensure_intelligence_item_scope_values(self) -> None:
         """Backfill nullable intelligence item scopes so SQLite unique keys work."""
         if not self._is_sqlite_engine:
@@ -2546,6 +3120,9 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         """重置单例（用于测试）"""
         with cls._init_lock:
             if cls._instance is not None:
+                writer = getattr(cls._instance, '_llm_usage_writer', None)
+                if writer is not None:
+                    writer.close()
                 if hasattr(cls._instance, '_engine') and cls._instance._engine is not None:
                     cls._instance._engine.dispose()
                 cls._instance._initialized = False
@@ -3204,6 +3781,126 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
 
             return list(results)
 
+    def _store_report_field(self, session: Session, row: AnalysisHistory, field: str, value: Optional[str]) -> None:
+        """
+        写入报告大字段：小于 ANALYSIS_BLOB_MIN_BYTES 的保持内联，其余按 digest
+        去重压缩进 analysis_blobs，行上只保留引用。
+        """
+        if value is None or len(value.encode("utf-8")) < ANALYSIS_BLOB_MIN_BYTES:
+            setattr(row, f"{field}_text", value)
+            setattr(row, f"{field}_ref", None)
+            return
+        digest = self._store_analysis_blob(session, value)
+        setattr(row, f"{field}_text", None)
+        setattr(row, f"{field}_ref", digest)
+
+    def _store_analysis_blob(self, session: Session, value: str) -> str:
+        digest, payload = encode_analysis_blob(value)
+        # 复用已有 blob 时锁定该行，直到本事务提交，避免并发的孤儿清理删掉它
+        existing = session.execute(
+            select(AnalysisBlob.digest).where(AnalysisBlob.digest == digest).with_for_update()
+        ).first()
+        if existing is not None:
+            return digest
+        values = {
+            "digest": digest,
+            "codec": ANALYSIS_BLOB_CODEC,
+            "raw_size": len(value.encode("utf-8")),
+            "data": payload,
+            "created_at": datetime.now(),
+        }
+        if self._is_sqlite_engine:
+            session.execute(
+                sqlite_insert(AnalysisBlob)
+                .values(**values)
+                .on_conflict_do_nothing(index_elements=["digest"])
+            )
+        else:
+            session.add(AnalysisBlob(**values))
+            session.flush()
+        return digest
+
+    @staticmethod
+    def _delete_orphan_analysis_blobs(session: Session, digests: List[str]) -> int:
+        """
+        删除不再被任何分析历史引用的 blob（仅检查给定 digest）。
+
+        引用检查与删除是当前写事务中的同一条条件 DELETE，只删除此刻引用数
+        仍为零的 blob；保存侧复用 blob 时会锁定该行，两者不会交错。
+        """
+        candidates = sorted({digest for digest in digests if digest})
+        if not candidates:
+            return 0
+        unreferenced = [
+            ~exists().where(getattr(AnalysisHistory, f"{field}_ref") == AnalysisBlob.digest)
+            for field in ANALYSIS_REPORT_BLOB_FIELDS
+        ]
+        result = session.execute(
+            delete(AnalysisBlob)
+            .where(AnalysisBlob.digest.in_(candidates), *unreferenced)
+            .execution_options(synchronize_session=False)
+        )
+        return result.rowcount or 0
+
+    def migrate_analysis_history_blobs(
+        self,
+        batch_size: int = 100,
+        max_batches: Optional[int] = None,
+        stop_event: Optional[threading.Event] = None,
+    ) -> int:
+        """
+        把旧记录中内联的大字段迁入 analysis_blobs，并补写缺失的 list_summary。
+
+        按 id 分批推进，每批一个写事务；已迁移的行不会再次命中，可以在后台
+        反复调用（例如每次启动）。``stop_event`` 置位后在当前批次提交后停止。
+
+        Returns:
+            本次处理的记录数
+        """
+        oversized = or_(
+            *(
+                func.length(getattr(AnalysisHistory, f"{field}_text")) >= ANALYSIS_BLOB_MIN_BYTES
+                for field in ANALYSIS_REPORT_BLOB_FIELDS
+            )
+        )
+        migrated = 0
+        batches = 0
+        last_id = 0
+        while max_batches is None or batches < max_batches:
+            if stop_event is not None and stop_event.is_set():
+                logger.info("分析历史大字段迁移已停止: rows=%s", migrated)
+                break
+
+            def _write(session: Session) -> Tuple[int, int]:
+                rows = session.execute(
+                    select(AnalysisHistory)
+                    .where(
+                        AnalysisHistory.id > last_id,
+                        or_(oversized, AnalysisHistory.list_summary.is_(None)),
+                    )
+                    .order_by(AnalysisHistory.id)
+                    .limit(batch_size)
+                ).scalars().all()
+                for row in rows:
+                    values = {field: getattr(row, field) for field in ANALYSIS_REPORT_BLOB_FIELDS}
+                    if row.list_summary is None:
+                        row.list_summary = self._safe_json_dumps(
+                            build_analysis_list_summary(values["raw_result"], values["context_snapshot"])
+                        )
+                    for field, value in values.items():
+                        if getattr(row, f"{field}_ref") is None:
+                            self._store_report_field(session, row, field, value)
+                return len(rows), (rows[-1].id if rows else last_id)
+
+            count, last_id = self._run_write_transaction("migrate analysis history blobs", _write)
+            batches += 1
+            migrated += count
+            if count < batch_size:
+                break
+        if migrated:
+            logger.info("分析历史大字段迁移完成: rows=%s", migrated)
+        return migrated
+
     def save_analysis_history(
         self,
         result: Any,
@@ -3227,6 +3924,10 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         context_text = None
         if save_snapshot and context_snapshot is not None:
             context_text = self._safe_json_dumps(context_snapshot)
+        list_summary = build_analysis_list_summary(
+            raw_result,
+            context_snapshot if context_text is not None else None,
+        )
 
         try:
             def _write(session: Session) -> int:
@@ -3239,22 +3940,25 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
                     operation_advice=result.operation_advice,
                     trend_prediction=result.trend_prediction,
                     analysis_summary=result.analysis_summary,
-                    raw_result=self._safe_json_dumps(raw_result),
-                    news_content=news_content,
-                    context_snapshot=context_text,
+                    list_summary=self._safe_json_dumps(list_summary),
                     ideal_buy=sniper_points.get("ideal_buy"),
                     secondary_buy=sniper_points.get("secondary_buy"),
                     stop_loss=sniper_points.get("stop_loss"),
                     take_profit=sniper_points.get("take_profit"),
                     created_at=datetime.now(),
                 )
+                self._store_report_field(session, history, "raw_result", self._safe_json_dumps(raw_result))
+                self._store_report_field(session, history, "news_content", news_content)
+                self._store_report_field(session, history, "context_snapshot", context_text)
                 session.add(history)
                 session.flush()
                 return int(history.id or 0)
-            return self._run_write_transaction(
+            saved_id = self._run_write_transaction(
                 f"save_analysis_history[{result.code}]",
                 _write,
             )
+            self._invalidate_history_count_cache()
+            return saved_id
         except Exception as e:
             logger.error(f"保存分析历史失败: {e}")
             return 0
@@ -3365,7 +4069,16 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
                             runs.append(run_payload)
                     existing_diagnostics["notification_runs"] = runs
                     context_snapshot["diagnostics"] = existing_diagnostics
-                row.context_snapshot = self._safe_json_dumps(context_snapshot)
+                previous_ref = row.context_snapshot_ref
+                self._store_report_field(
+                    session,
+                    row,
+                    "context_snapshot",
+                    self._safe_json_dumps(context_snapshot),
+                )
+                if previous_ref and previous_ref != row.context_snapshot_ref:
+                    session.flush()
+                    self._delete_orphan_analysis_blobs(session, [previous_ref])
                 return 1
 
             return self._run_write_transaction(
@@ -3474,26 +4187,8 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         Returns:
             Tuple[List[AnalysisHistory], int]: (记录列表, 总数)
         """
-        from sqlalchemy import func
-        
         with self.get_session() as session:
-            conditions = []
-            
-            if code:
-                if isinstance(code, list):
-                    codes = [c for c in code if c]
-                    if codes:
-                        conditions.append(AnalysisHistory.code.in_(codes))
-                else:
-                    conditions.append(AnalysisHistory.code == code)
-            if report_type:
-                conditions.append(AnalysisHistory.report_type == report_type)
-            if start_date:
-                # created_at >= start_date 00:00:00
-                conditions.append(AnalysisHistory.created_at >= datetime.combine(start_date, datetime.min.time()))
-            if end_date:
-                # created_at < end_date+1 00:00:00 (即 <= end_date 23:59:59)
-                conditions.append(AnalysisHistory.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+            conditions = self._analysis_history_filter_conditions(code, report_type, start_date, end_date)
             
             # 构建 where 子句
             where_clause = and_(*conditions) if conditions else True
@@ -3514,6 +4209,165 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
             
             return list(results), total
     
+    @staticmethod
+    def _analysis_history_filter_conditions(
+        code: Optional[Union[str, List[str]]],
+        report_type: Optional[str],
+        start_date: Optional[date],
+        end_date: Optional[date],
+    ) -> List[Any]:
+        conditions = []
+        if code:
+            if isinstance(code, list):
+                codes = [c for c in code if c]
+                if codes:
+                    conditions.append(AnalysisHistory.code.in_(codes))
+            else:
+                conditions.append(AnalysisHistory.code == code)
+        if report_type:
+            conditions.append(AnalysisHistory.report_type == report_type)
+        if start_date:
+            # created_at >= start_date 00:00:00
+            conditions.append(AnalysisHistory.created_at >= datetime.combine(start_date, datetime.min.time()))
+        if end_date:
+            # created_at < end_date+1 00:00:00 (即 <= end_date 23:59:59)
+            conditions.append(AnalysisHistory.created_at < datetime.combine(end_date + timedelta(days=1), datetime.min.time()))
+        return conditions
+
+    def _invalidate_history_count_cache(self) -> None:
+        with self._history_count_cache_lock:
+            self._history_count_cache.clear()
+
+    def count_analysis_history(
+        self,
+        code: Optional[Union[str, List[str]]] = None,
+        report_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        cache_ttl_seconds: float = HISTORY_COUNT_CACHE_TTL_SECONDS,
+    ) -> int:
+        """
+        统计分析历史记录数，结果按筛选条件缓存 cache_ttl_seconds 秒。
+
+        本进程内的保存/删除会立即清空缓存；其它进程的写入最多延迟一个 TTL
+        反映到总数上（列表总数因此是近似值）。cache_ttl_seconds<=0 时直接查询。
+        """
+        codes = code if isinstance(code, list) else [code]
+        cache_key = (
+            tuple(sorted(str(c) for c in codes if c)),
+            report_type,
+            start_date,
+            end_date,
+        )
+        now = time.monotonic()
+        if cache_ttl_seconds > 0:
+            with self._history_count_cache_lock:
+                cached = self._history_count_cache.get(cache_key)
+            if cached is not None and cached[0] > now:
+                return cached[1]
+
+        conditions = self._analysis_history_filter_conditions(code, report_type, start_date, end_date)
+        with self.get_session() as session:
+            total = session.execute(
+                select(func.count(AnalysisHistory.id)).where(and_(*conditions) if conditions else True)
+            ).scalar() or 0
+
+        if cache_ttl_seconds > 0:
+            with self._history_count_cache_lock:
+                self._history_count_cache[cache_key] = (now + cache_ttl_seconds, int(total))
+        return int(total)
+
+    def get_analysis_history_summaries(
+        self,
+        code: Optional[Union[str, List[str]]] = None,
+        report_type: Optional[str] = None,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        *,
+        before: Optional[Tuple[datetime, int]] = None,
+        offset: int = 0,
+        limit: int = 20,
+    ) -> List[AnalysisHistoryListRow]:
+        """
+        历史列表的轻量查询：只取标量列与 list_summary，不加载 raw_result /
+        news_content / context_snapshot 大字段。
+
+        按 (created_at, id) 倒序；传入 before=(created_at, id) 时做 keyset
+        翻页，只返回严格排在该游标之后的记录，offset 仅为兼容页码翻页保留。
+        未写入 list_summary 的旧记录按 id 批量回读大字段并在内存中投影。
+
+        Returns:
+            AnalysisHistoryListRow 列表
+        """
+        conditions = self._analysis_history_filter_conditions(code, report_type, start_date, end_date)
+        if before is not None:
+            before_created_at, before_id = before
+            conditions.append(
+                or_(
+                    AnalysisHistory.created_at < before_created_at,
+                    and_(
+                        AnalysisHistory.created_at == before_created_at,
+                        AnalysisHistory.id < int(before_id),
+                    ),
+                )
+            )
+
+        with self.get_session() as session:
+            query = (
+                select(
+                    AnalysisHistory.id,
+                    AnalysisHistory.query_id,
+                    AnalysisHistory.code,
+                    AnalysisHistory.name,
+                    AnalysisHistory.report_type,
+                    AnalysisHistory.sentiment_score,
+                    AnalysisHistory.operation_advice,
+                    AnalysisHistory.trend_prediction,
+                    AnalysisHistory.analysis_summary,
+                    AnalysisHistory.created_at,
+                    AnalysisHistory.list_summary,
+                )
+                .where(and_(*conditions) if conditions else True)
+                .order_by(desc(AnalysisHistory.created_at), desc(AnalysisHistory.id))
+                .limit(limit)
+            )
+            if offset:
+                query = query.offset(offset)
+            rows = session.execute(query).all()
+
+            legacy_ids = [row.id for row in rows if not row.list_summary]
+            legacy_summaries: Dict[int, Dict[str, Any]] = {}
+            if legacy_ids:
+                for legacy_id, raw_result, context_snapshot in session.execute(
+                    select(
+                        AnalysisHistory.id,
+                        AnalysisHistory.raw_result,
+                        AnalysisHistory.context_snapshot,
+                    ).where(AnalysisHistory.id.in_(legacy_ids))
+                ).all():
+                    legacy_summaries[legacy_id] = build_analysis_list_summary(raw_result, context_snapshot)
+
+        items: List[AnalysisHistoryListRow] = []
+        for row in rows:
+            summary = legacy_summaries.get(row.id) or _load_json_mapping(row.list_summary)
+            items.append(
+                AnalysisHistoryListRow(
+                    id=row.id,
+                    query_id=row.query_id,
+                    code=row.code,
+                    name=row.name,
+                    report_type=row.report_type,
+                    sentiment_score=row.sentiment_score,
+                    operation_advice=row.operation_advice,
+                    trend_prediction=row.trend_prediction,
+                    analysis_summary=row.analysis_summary,
+                    created_at=row.created_at,
+                    raw_result=_load_json_mapping(summary.get("raw_result")),
+                    context_snapshot=_load_json_mapping(summary.get("context_snapshot")),
+                )
+            )
+        return items
+
     def get_analysis_history_by_id(self, record_id: int) -> Optional[AnalysisHistory]:
         """
         根据数据库主键 ID 查询单条分析历史记录
@@ -3607,15 +4461,30 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
                     SkillOpinionSampleRecord.analysis_history_id.in_(existing_ids)
                 )
             )
+            blob_refs = [
+                digest
+                for ref_row in session.execute(
+                    select(
+                        AnalysisHistory.raw_result_ref,
+                        AnalysisHistory.news_content_ref,
+                        AnalysisHistory.context_snapshot_ref,
+                    ).where(AnalysisHistory.id.in_(existing_ids))
+                ).all()
+                for digest in ref_row
+                if digest
+            ]
             result = session.execute(
                 delete(AnalysisHistory).where(AnalysisHistory.id.in_(existing_ids))
             )
+            self._delete_orphan_analysis_blobs(session, blob_refs)
             return result.rowcount or 0
 
-        return self._run_write_transaction(
+        deleted = self._run_write_transaction(
             "delete analysis history records",
             _write,
         )
+        self._invalidate_history_count_cache()
+        return deleted
 
     def get_distinct_stocks_from_history(
         self,
@@ -3899,6 +4768,114 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
             logger.error(f"保存 {code} 数据失败: {e}")
             raise
     
+    _DAILY_VALUE_COLUMNS = (
+        'open', 'high', 'low', 'close', 'volume', 'amount',
+        'pct_chg', 'ma5', 'ma10', 'ma20', 'volume_ratio',
+    )
+
+    def save_daily_data_bulk(
+        self,
+        frames: Mapping[str, pd.DataFrame],
+        data_source: Union[str, Mapping[str, str]] = "Unknown",
+        batch_rows: int = 50_000,
+    ) -> Dict[str, int]:
+        """
+        批量保存多只股票的日线数据
+
+        与 `save_daily_data` 语义一致（按 `(code, date)` UPSERT，同一股票重复日期以最后一条为准），
+        但面向全市场回填：
+        - 由 NumPy 列向量化构造参数行，不逐行 `to_dict`/`pd.isna`
+        - SQLite 分支对预编译的单行 UPSERT 调用 `executemany`，绑定参数按行计，不受变量上限约束
+        - 不预读已有日期：写入前记录 `max(id)`，写入后统计 `id` 更大的行即新增数，其余为更新
+        - 每 `batch_rows` 行提交一次事务，而不是每只股票一个 `BEGIN IMMEDIATE` 写窗口
+
+        Args:
+            frames: 股票代码 -> 日线 DataFrame
+            data_source: 统一的数据来源名称，或股票代码 -> 数据来源
+            batch_rows: 每个写事务包含的最大行数
+
+        Returns:
+            {"symbols": 股票数, "rows": 写入行数, "inserted": 新增数, "updated": 更新数}
+        """
+        summary = {"symbols": 0, "rows": 0, "inserted": 0, "updated": 0}
+        frames = {code: df for code, df in frames.items() if df is not None and not df.empty}
+        if not frames:
+            return summary
+        if not self._is_sqlite_engine:
+            for code, df in frames.items():
+                source = data_source if isinstance(data_source, str) else data_source.get(code, "Unknown")
+                inserted = self.save_daily_data(df, code, source)
+                summary["symbols"] += 1
+                summary["rows"] += df['date'].map(self._normalize_daily_date).nunique()
+                summary["inserted"] += inserted
+            summary["updated"] = summary["rows"] - summary["inserted"]
+            return summary
+
+        now = datetime.now().strftime('%Y-%m-%d %H:%M:%S.%f')
+        codes, dates, values, sources = [], [], [], []
+        for code, df in frames.items():
+            frame_dates = pd.to_datetime(df['date']).dt.strftime('%Y-%m-%d').to_numpy(dtype=object)
+            # 同一股票重复日期以最后一条为准
+            keep = ~pd.Index(frame_dates).duplicated(keep='last')
+            frame_values = np.full((len(df), len(self._DAILY_VALUE_COLUMNS)), np.nan)
+            for index, column in enumerate(self._DAILY_VALUE_COLUMNS):
+                if column in df:
+                    frame_values[:, index] = pd.to_numeric(df[column], errors='raise').to_numpy(dtype=float)
+            codes.append(np.full(int(keep.sum()), code, dtype=object))
+            dates.append(frame_dates[keep])
+            values.append(frame_values[keep])
+            source = data_source if isinstance(data_source, str) else data_source.get(code, "Unknown")
+            sources.append(np.full(int(keep.sum()), source, dtype=object))
+        matrix = np.concatenate(values)
+        cells = matrix.astype(object)
+        cells[np.isnan(matrix)] = None
+        rows = list(zip(
+            np.concatenate(codes),
+            np.concatenate(dates),
+            *cells.T,
+            np.concatenate(sources),
+            [now] * len(matrix),
+            [now] * len(matrix),
+        ))
+        columns = ('code', 'date', *self._DAILY_VALUE_COLUMNS, 'data_source', 'created_at', 'updated_at')
+        updates = [*self._DAILY_VALUE_COLUMNS, 'data_source', 'updated_at']
+        upsert = (
+            f"INSERT INTO {StockDaily.__tablename__} ({', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in columns)}) "
+            f"ON CONFLICT(code, date) DO UPDATE SET {', '.join(f'{name} = excluded.{name}' for name in updates)}"
+        )
+
+        def _write(chunk: List[tuple]) -> Callable[[Session], int]:
+            def _operation(session: Session) -> int:
+                connection = session.connection()
+                max_id = connection.execute(select(func.coalesce(func.max(StockDaily.id), 0))).scalar_one()
+                connection.exec_driver_sql(upsert, chunk)
+                return connection.execute(
+                    select(func.count()).select_from(StockDaily).where(StockDaily.id > max_id)
+                ).scalar_one()
+            return _operation
+
+        batch_rows = max(1, int(batch_rows))
+        try:
+            for start in range(0, len(rows), batch_rows):
+                chunk = rows[start:start + batch_rows]
+                inserted = self._run_write_transaction(
+                    f"save_daily_data_bulk[{start // batch_rows}]",
+                    _write(chunk),
+                )
+                summary["inserted"] += inserted
+                summary["updated"] += len(chunk) - inserted
+        except Exception as e:
+            logger.error(f"批量保存日线数据失败: {e}")
+            raise
+        summary["symbols"] = len(frames)
+        summary["rows"] = len(rows)
+        logger.info(
+            f"批量保存 {summary['symbols']} 只股票日线成功，"
+            f"新增 {summary['inserted']} 条，更新 {summary['updated']} 条"
+        )
+        return summary
+
     def get_analysis_context(
         self, 
         code: str,
@@ -4506,7 +5483,12 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         stock_code: Optional[str] = None,
         **telemetry: Any,
     ) -> None:
-        """Append one LLM call record to llm_usage."""
+        """Queue one LLM call record for llm_usage.
+
+        Rows go through the process-wide telemetry writer, which bulk-inserts
+        them off the caller's thread (or inline in ``sync`` mode). ``called_at``
+        is stamped here so batching never shifts the recorded call time.
+        """
         row_values: Dict[str, Any] = {
             "call_type": call_type,
             "model": model or "unknown",
@@ -4517,17 +5499,63 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         }
         for column in _LLM_USAGE_TELEMETRY_COLUMN_SQL:
             row_values[column] = None if column in _LLM_USAGE_DROPPED_FREE_TEXT_COLUMNS else telemetry.get(column)
-        row = LLMUsage(**row_values)
-        with self.session_scope() as session:
-            session.add(row)
+        row_values["called_at"] = datetime.now()
+        self._llm_usage_writer.submit(row_values)
+
+    def flush_llm_usage(self, timeout: Optional[float] = None) -> bool:
+        """Block until queued LLM usage rows are written; False on timeout."""
+        return self._llm_usage_writer.flush(timeout=timeout)
+
+    def get_llm_usage_writer_stats(self) -> Dict[str, Any]:
+        """Return queue depth plus enqueued/written/dropped/failed counters."""
+        return self._llm_usage_writer.stats()
+
+    def _build_llm_usage_writer(self, config: Any) -> LLMUsageWriter:
+        mode = getattr(config, "llm_usage_write_mode", "async")
+        mode = mode.strip().lower() if isinstance(mode, str) else "sync"
+        # 内存 SQLite 每个线程各自一个库，后台线程写入对调用方不可见，只能同步写
+        synchronous = mode != "async" or (self._is_sqlite_engine and not self._sqlite_file_db)
+        return LLMUsageWriter(
+            self._insert_llm_usage_rows,
+            flush_interval_ms=_coerce_positive_int_setting(
+                getattr(config, "llm_usage_flush_interval_ms", None), 500
+            ),
+            batch_size=_coerce_positive_int_setting(
+                getattr(config, "llm_usage_batch_size", None), 200
+            ),
+            max_queue=_coerce_positive_int_setting(
+                getattr(config, "llm_usage_queue_max", None), 10000
+            ),
+            synchronous=synchronous,
+            maintenance=self._compact_llm_usage_rollups_in_writer,
+        )
+
+    def _compact_llm_usage_rollups_in_writer(self) -> None:
+        # 写线程自身调用，不能再等待 flush（会等到自己）；队列已清空，
+        # 之后入队的记录由 grace 覆盖
+        self._compact_llm_usage_rollups(datetime.now())
+
+    def _insert_llm_usage_rows(self, rows: List[Dict[str, Any]]) -> None:
+        self._run_write_transaction(
+            "llm_usage_batch",
+            lambda session: session.execute(LLMUsage.__table__.insert(), rows),
+        )
 
     def get_llm_usage_summary(
         self,
         from_dt: datetime,
         to_dt: datetime,
+        strategy_version_id: Optional[int] = None,
     ) -> Dict[str, Any]:
         """Return aggregated token usage between from_dt and to_dt.
 
+        Whole buckets already compacted into ``llm_usage_rollups`` are read
+        from the rollups; only the partial edges of the window and the
+        not-yet-compacted tail (including the open hour) scan raw rows.
+        This is a pure read: compaction runs on the telemetry writer thread
+        or via ``compact_llm_usage_rollups``.
+        ``strategy_version_id`` narrows the summary to one strategy version.
+
         Returns a dict with keys:
           total_calls, total_prompt_tokens, total_completion_tokens, total_tokens,
           by_call_type: list of {call_type, calls, prompt_tokens,
@@ -4535,82 +5563,317 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
           by_model: list of {model, calls, prompt_tokens, completion_tokens,
             total_tokens, max_total_tokens}
         """
+        self.flush_llm_usage(timeout=LLM_USAGE_READ_FLUSH_TIMEOUT_SECONDS)
+
+        cells: Dict[Tuple[str, str], List[int]] = {}
         with self.session_scope() as session:
-            base_filter = and_(
-                LLMUsage.called_at >= from_dt,
-                LLMUsage.called_at <= to_dt,
+            day_spans, hour_spans, raw_spans = _plan_llm_usage_rollup_spans(
+                from_dt,
+                to_dt,
+                self._llm_usage_rollup_watermarks(session),
             )
+            if raw_spans:
+                raw_conditions = [
+                    and_(
+                        LLMUsage.called_at >= span_start,
+                        LLMUsage.called_at <= span_end if inclusive else LLMUsage.called_at < span_end,
+                    )
+                    for span_start, span_end, inclusive in raw_spans
+                ]
+                raw_filter = or_(*raw_conditions)
+                if strategy_version_id is not None:
+                    raw_filter = and_(raw_filter, LLMUsage.strategy_version_id == int(strategy_version_id))
+                raw_rows = session.execute(
+                    select(
+                        LLMUsage.call_type,
+                        LLMUsage.model,
+                        func.count(LLMUsage.id),
+                        func.coalesce(func.sum(case((LLMUsage.strategy_version_id.is_not(None), 1), else_=0)), 0),
+                        func.coalesce(func.sum(LLMUsage.prompt_tokens), 0),
+                        func.coalesce(func.sum(LLMUsage.completion_tokens), 0),
+                        func.coalesce(func.sum(LLMUsage.total_tokens), 0),
+                        func.coalesce(func.max(LLMUsage.total_tokens), 0),
+                    )
+                    .where(raw_filter)
+                    .group_by(LLMUsage.call_type, LLMUsage.model)
+                ).all()
+                for call_type, model, *measures in raw_rows:
+                    _merge_llm_usage_measures(cells, (call_type, model), measures)
 
-            # Overall totals
-            totals = session.execute(
-                select(
-                    func.count(LLMUsage.id).label("calls"),
-                    func.coalesce(func.sum(LLMUsage.prompt_tokens), 0).label("prompt_tokens"),
-                    func.coalesce(func.sum(LLMUsage.completion_tokens), 0).label("completion_tokens"),
-                    func.coalesce(func.sum(LLMUsage.total_tokens), 0).label("tokens"),
-                    func.coalesce(func.sum(case((LLMUsage.strategy_version_id.is_not(None), 1), else_=0)), 0).label("attributed_calls"),
-                ).where(base_filter)
-            ).one()
-
-            # Breakdown by call_type
-            by_type_rows = session.execute(
-                select(
-                    LLMUsage.call_type,
-                    func.count(LLMUsage.id).label("calls"),
-                    func.coalesce(func.sum(LLMUsage.prompt_tokens), 0).label("prompt_tokens"),
-                    func.coalesce(func.sum(LLMUsage.completion_tokens), 0).label("completion_tokens"),
-                    func.coalesce(func.sum(LLMUsage.total_tokens), 0).label("tokens"),
-                )
-                .where(base_filter)
-                .group_by(LLMUsage.call_type)
-                .order_by(desc(func.sum(LLMUsage.total_tokens)))
-            ).all()
-
-            # Breakdown by model
-            by_model_rows = session.execute(
-                select(
-                    LLMUsage.model,
-                    func.count(LLMUsage.id).label("calls"),
-                    func.coalesce(func.sum(LLMUsage.prompt_tokens), 0).label("prompt_tokens"),
-                    func.coalesce(func.sum(LLMUsage.completion_tokens), 0).label("completion_tokens"),
-                    func.coalesce(func.sum(LLMUsage.total_tokens), 0).label("tokens"),
-                    func.coalesce(func.max(LLMUsage.total_tokens), 0).label("max_total_tokens"),
+            rollup_conditions = [
+                and_(
+                    LLMUsageRollup.granularity == granularity,
+                    LLMUsageRollup.bucket_start >= span_start,
+                    LLMUsageRollup.bucket_start < span_end,
                 )
-                .where(base_filter)
-                .group_by(LLMUsage.model)
-                .order_by(desc(func.sum(LLMUsage.total_tokens)))
-            ).all()
-
+                for granularity, spans in (("day", day_spans), ("hour", hour_spans))
+                for span_start, span_end in spans
+            ]
+            if rollup_conditions:
+                rollup_filter = or_(*rollup_conditions)
+                if strategy_version_id is not None:
+                    rollup_filter = and_(
+                        rollup_filter,
+                        LLMUsageRollup.strategy_version_id == int(strategy_version_id),
+                    )
+                rollup_rows = session.execute(
+                    select(
+                        LLMUsageRollup.call_type,
+                        LLMUsageRollup.model,
+                        func.coalesce(func.sum(LLMUsageRollup.calls), 0),
+                        func.coalesce(func.sum(LLMUsageRollup.attributed_calls), 0),
+                        func.coalesce(func.sum(LLMUsageRollup.prompt_tokens), 0),
+                        func.coalesce(func.sum(LLMUsageRollup.completion_tokens), 0),
+                        func.coalesce(func.sum(LLMUsageRollup.total_tokens), 0),
+                        func.coalesce(func.max(LLMUsageRollup.max_total_tokens), 0),
+                    )
+                    .where(rollup_filter)
+                    .group_by(LLMUsageRollup.call_type, LLMUsageRollup.model)
+                ).all()
+                for call_type, model, *measures in rollup_rows:
+                    _merge_llm_usage_measures(cells, (call_type, model), measures)
+
+        totals = [0, 0, 0, 0, 0, 0]
+        by_call_type: Dict[str, List[int]] = {}
+        by_model: Dict[str, List[int]] = {}
+        for (call_type, model), measures in cells.items():
+            _merge_llm_usage_measures({0: totals}, 0, measures)
+            _merge_llm_usage_measures(by_call_type, call_type, measures)
+            _merge_llm_usage_measures(by_model, model, measures)
+
+        calls, attributed_calls, prompt_tokens, completion_tokens, tokens, _ = totals
         return {
-            "total_calls": totals.calls,
-            "total_prompt_tokens": totals.prompt_tokens,
-            "total_completion_tokens": totals.completion_tokens,
-            "total_tokens": totals.tokens,
-            "attributed_calls": totals.attributed_calls,
-            "unattributed_calls": max(0, totals.calls - totals.attributed_calls),
+            "total_calls": calls,
+            "total_prompt_tokens": prompt_tokens,
+            "total_completion_tokens": completion_tokens,
+            "total_tokens": tokens,
+            "attributed_calls": attributed_calls,
+            "unattributed_calls": max(0, calls - attributed_calls),
             "by_call_type": [
                 {
-                    "call_type": r.call_type,
-                    "calls": r.calls,
-                    "prompt_tokens": r.prompt_tokens,
-                    "completion_tokens": r.completion_tokens,
-                    "total_tokens": r.tokens,
+                    "call_type": call_type,
+                    "calls": m[0],
+                    "prompt_tokens": m[2],
+                    "completion_tokens": m[3],
+                    "total_tokens": m[4],
                 }
-                for r in by_type_rows
+                for call_type, m in sorted(by_call_type.items(), key=lambda item: -item[1][4])
             ],
             "by_model": [
                 {
-                    "model": r.model,
-                    "calls": r.calls,
-                    "prompt_tokens": r.prompt_tokens,
-                    "completion_tokens": r.completion_tokens,
-                    "total_tokens": r.tokens,
-                    "max_total_tokens": r.max_total_tokens,
+                    "model": model,
+                    "calls": m[0],
+                    "prompt_tokens": m[2],
+                    "completion_tokens": m[3],
+                    "total_tokens": m[4],
+                    "max_total_tokens": m[5],
                 }
-                for r in by_model_rows
+                for model, m in sorted(by_model.items(), key=lambda item: -item[1][4])
             ],
         }
 
+    def compact_llm_usage_rollups(self, now: Optional[datetime] = None) -> Dict[str, int]:
+        """Roll closed hours of llm_usage into hourly rollups, then whole days
+        of hourly rollups into daily rollups.
+
+        Each granularity advances its own watermark in ``llm_usage_rollup_state``
+        chunk by chunk, so repeated calls are cheap no-ops until another bucket
+        closes. An hour is only compacted once it has been closed for longer
+        than the telemetry writer's maximum flush latency, so batched rows
+        always land ahead of the watermark. Rows inserted later with a
+        ``called_at`` behind the watermark (e.g. manual backfills) are not
+        folded into existing rollups.
+
+        Returns the number of rollup rows written per granularity; nothing is
+        compacted while queued telemetry cannot be flushed.
+        """
+        now = now or datetime.now()
+        if not self.flush_llm_usage(timeout=LLM_USAGE_READ_FLUSH_TIMEOUT_SECONDS):
+            logger.warning("[LLM usage] 遥测队列未能写完，本次跳过 rollup 压缩")
+            return {"hour": 0, "day": 0}
+        return self._compact_llm_usage_rollups(now)
+
+    def _compact_llm_usage_rollups(self, now: datetime) -> Dict[str, int]:
+        grace = max(LLM_USAGE_ROLLUP_GRACE, self._llm_usage_writer.max_flush_latency)
+        written = {
+            "hour": self._compact_llm_usage_granularity(
+                "hour",
+                _floor_llm_usage_bucket(now - grace, "hour"),
+            ),
+            "day": 0,
+        }
+        with self.session_scope() as session:
+            hour_watermark = self._llm_usage_rollup_watermarks(session).get("hour")
+        if hour_watermark is not None:
+            written["day"] = self._compact_llm_usage_granularity(
+                "day",
+                _floor_llm_usage_bucket(hour_watermark, "day"),
+            )
+        return written
+
+    def _llm_usage_rollup_watermarks(self, session: Session) -> Dict[str, datetime]:
+        return {
+            granularity: compacted_until
+            for granularity, compacted_until in session.execute(
+                select(LLMUsageRollupState.granularity, LLMUsageRollupState.compacted_until)
+            ).all()
+        }
+
+    def _compact_llm_usage_granularity(self, granularity: str, end: datetime) -> int:
+        with self.session_scope() as session:
+            watermark = self._llm_usage_rollup_watermarks(session).get(granularity)
+            start = watermark
+            if start is None:
+                if granularity == "hour":
+                    first = session.execute(select(func.min(LLMUsage.called_at))).scalar()
+                else:
+                    first = session.execute(
+                        select(func.min(LLMUsageRollup.bucket_start)).where(LLMUsageRollup.granularity == "hour")
+                    ).scalar()
+                start = _floor_llm_usage_bucket(first, granularity) if first is not None else end
+        if start >= end:
+            if watermark is None:
+                # 首次压缩且没有已关闭的桶：直接把水位落在 end，之后只增量推进
+                self._run_write_transaction(
+                    f"llm_usage_rollup_state[{granularity}]",
+                    lambda session: self._advance_llm_usage_watermark(session, granularity, end, end),
+                )
+            return 0
+
+        written = 0
+        chunk_start = start
+        while chunk_start < end:
+            chunk_end = min(end, chunk_start + LLM_USAGE_ROLLUP_COMPACT_CHUNK)
+            written += self._run_write_transaction(
+                f"llm_usage_rollup[{granularity}]",
+                lambda session, lo=chunk_start, hi=chunk_end: self._write_llm_usage_rollup_chunk(
+                    session, granularity, lo, hi
+                ),
+            )
+            chunk_start = chunk_end
+        return written
+
+    def _advance_llm_usage_watermark(
+        self,
+        session: Session,
+        granularity: str,
+        expected: datetime,
+        compacted_until: datetime,
+    ) -> bool:
+        state = session.get(LLMUsageRollupState, granularity)
+        if state is None:
+            session.add(LLMUsageRollupState(granularity=granularity, compacted_until=compacted_until))
+            return True
+        if state.compacted_until != expected:
+            # 其他线程已推进过水位，本次结果作废
+            return False
+        state.compacted_until = compacted_until
+        return True
+
+    def _write_llm_usage_rollup_chunk(
+        self,
+        session: Session,
+        granularity: str,
+        start: datetime,
+        end: datetime,
+    ) -> int:
+        state = session.get(LLMUsageRollupState, granularity)
+        if state is not None and state.compacted_until != start:
+            return 0
+
+        cells: Dict[Tuple[datetime, str, str, int], List[int]] = {}
+        if granularity == "hour":
+            bucket = self._llm_usage_hour_bucket_expression()
+            strategy_key = func.coalesce(LLMUsage.strategy_version_id, 0)
+            rows = session.execute(
+                select(
+                    bucket,
+                    LLMUsage.call_type,
+                    LLMUsage.model,
+                    strategy_key,
+                    func.count(LLMUsage.id),
+                    func.coalesce(func.sum(case((LLMUsage.strategy_version_id.is_not(None), 1), else_=0)), 0),
+                    func.coalesce(func.sum(LLMUsage.prompt_tokens), 0),
+                    func.coalesce(func.sum(LLMUsage.completion_tokens), 0),
+                    func.coalesce(func.sum(LLMUsage.total_tokens), 0),
+                    func.coalesce(func.max(LLMUsage.total_tokens), 0),
+                )
+                .where(and_(LLMUsage.called_at >= start, LLMUsage.called_at < end))
+                .group_by(bucket, LLMUsage.call_type, LLMUsage.model, strategy_key)
+            ).all()
+            for bucket_value, call_type, model, version_key, *measures in rows:
+                if isinstance(bucket_value, str):
+                    bucket_value = datetime.strptime(bucket_value, "%Y-%m-%d %H:%M:%S")
+                _merge_llm_usage_measures(
+                    cells,
+                    (_floor_llm_usage_bucket(bucket_value, "hour"), call_type, model, int(version_key or 0)),
+                    measures,
+                )
+        else:
+            rows = session.execute(
+                select(
+                    LLMUsageRollup.bucket_start,
+                    LLMUsageRollup.call_type,
+                    LLMUsageRollup.model,
+                    LLMUsageRollup.strategy_version_id,
+                    LLMUsageRollup.calls,
+                    LLMUsageRollup.attributed_calls,
+                    LLMUsageRollup.prompt_tokens,
+                    LLMUsageRollup.completion_tokens,
+                    LLMUsageRollup.total_tokens,
+                    LLMUsageRollup.max_total_tokens,
+                ).where(
+                    and_(
+                        LLMUsageRollup.granularity == "hour",
+                        LLMUsageRollup.bucket_start >= start,
+                        LLMUsageRollup.bucket_start < end,
+                    )
+                )
+            ).all()
+            for bucket_value, call_type, model, version_key, *measures in rows:
+                _merge_llm_usage_measures(
+                    cells,
+                    (_floor_llm_usage_bucket(bucket_value, "day"), call_type, model, version_key),
+                    measures,
+                )
+
+        session.execute(
+            delete(LLMUsageRollup).where(
+                and_(
+                    LLMUsageRollup.granularity == granularity,
+                    LLMUsageRollup.bucket_start >= start,
+                    LLMUsageRollup.bucket_start < end,
+                )
+            )
+        )
+        if cells:
+            session.execute(
+                LLMUsageRollup.__table__.insert(),
+                [
+                    {
+                        "granularity": granularity,
+                        "bucket_start": bucket_start,
+                        "call_type": call_type,
+                        "model": model,
+                        "strategy_version_id": version_key,
+                        "calls": m[0],
+                        "attributed_calls": m[1],
+                        "prompt_tokens": m[2],
+                        "completion_tokens": m[3],
+                        "total_tokens": m[4],
+                        "max_total_tokens": m[5],
+                    }
+                    for (bucket_start, call_type, model, version_key), m in cells.items()
+                ],
+            )
+        self._advance_llm_usage_watermark(session, granularity, start, end)
+        return len(cells)
+
+    def _llm_usage_hour_bucket_expression(self):
+        if self._is_sqlite_engine:
+            return func.strftime("%Y-%m-%d %H:00:00", LLMUsage.called_at)
+        return func.date_trunc("hour", LLMUsage.called_at)
+
     def get_llm_usage_records(
         self,
         from_dt: datetime,
@@ -4624,6 +5887,7 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         newest call first, and limit is clamped to the public API range.
         """
         normalized_limit = max(1, min(int(limit or 50), 200))
+        self.flush_llm_usage(timeout=LLM_USAGE_READ_FLUSH_TIMEOUT_SECONDS)
         with self.session_scope() as session:
             rows = session.execute(
                 select(
@@ -4673,6 +5937,76 @@ class DatabaseManager(metaclass=_DatabaseManagerMeta):
         ]
 
 
+def _floor_llm_usage_bucket(value: datetime, granularity: str) -> datetime:
+    if granularity == "day":
+        return value.replace(hour=0, minute=0, second=0, microsecond=0)
+    return value.replace(minute=0, second=0, microsecond=0)
+
+
+def _ceil_llm_usage_bucket(value: datetime, granularity: str) -> datetime:
+    floored = _floor_llm_usage_bucket(value, granularity)
+    if floored == value:
+        return floored
+    return floored + (timedelta(days=1) if granularity == "day" else timedelta(hours=1))
+
+
+def _plan_llm_usage_rollup_spans(
+    from_dt: datetime,
+    to_dt: datetime,
+    watermarks: Mapping[str, datetime],
+) -> Tuple[List[Tuple[datetime, datetime]], List[Tuple[datetime, datetime]], List[Tuple[datetime, datetime, bool]]]:
+    """把 [from_dt, to_dt] 拆成日 rollup、小时 rollup 与原始行三类区间。
+
+    rollup 区间只包含完整落在窗口内且已压缩的桶（左闭右开）；其余部分
+    （窗口两端不足一桶的零头、水位之后的未压缩尾部）回退到原始行，
+    原始行区间的第三项表示右端点是否闭合。
+    """
+    hour_watermark = watermarks.get("hour")
+    hour_lo = _ceil_llm_usage_bucket(from_dt, "hour")
+    hour_hi = (
+        _floor_llm_usage_bucket(min(to_dt, hour_watermark), "hour")
+        if hour_watermark is not None
+        else None
+    )
+    if hour_hi is None or hour_hi <= hour_lo:
+        return [], [], [(from_dt, to_dt, True)]
+
+    day_spans: List[Tuple[datetime, datetime]] = []
+    hour_spans: List[Tuple[datetime, datetime]] = []
+    day_watermark = watermarks.get("day")
+    day_lo = _ceil_llm_usage_bucket(hour_lo, "day")
+    day_hi = (
+        _floor_llm_usage_bucket(min(hour_hi, day_watermark), "day")
+        if day_watermark is not None
+        else None
+    )
+    if day_hi is not None and day_hi > day_lo:
+        day_spans.append((day_lo, day_hi))
+        hour_spans.extend(
+            span for span in ((hour_lo, day_lo), (day_hi, hour_hi)) if span[0] < span[1]
+        )
+    else:
+        hour_spans.append((hour_lo, hour_hi))
+
+    raw_spans: List[Tuple[datetime, datetime, bool]] = []
+    if from_dt < hour_lo:
+        raw_spans.append((from_dt, hour_lo, False))
+    raw_spans.append((hour_hi, to_dt, True))
+    return day_spans, hour_spans, raw_spans
+
+
+def _merge_llm_usage_measures(cells: Dict[Any, List[int]], key: Any, measures: Any) -> None:
+    """累加 (calls, attributed_calls, prompt, completion, total, max_total) 六元组，最后一项取最大值。"""
+    values = [int(value or 0) for value in measures]
+    current = cells.get(key)
+    if current is None:
+        cells[key] = values
+        return
+    for index in range(5):
+        current[index] += values[index]
+    current[5] = max(current[5], values[5])
+
+
 # 便捷函数
 def get_db() -> DatabaseManager:
     """获取数据库管理器实例的快捷方式"""
@@ -4691,7 +6025,7 @@ def persist_llm_usage(
     validation_experiment_id: Optional[int] = None,
     usage_scope: Optional[str] = None,
 ) -> None:
-    """Fire-and-forget: write one LLM call record to llm_usage. Never raises."""
+    """Fire-and-forget: queue one LLM call record for llm_usage. Never raises."""
     try:
         if usage is None:
             usage = {}
@@ -4764,6 +6098,16 @@ def persist_llm_usage(
         logging.getLogger(__name__).warning("[LLM usage] failed to persist usage record: %s", exc)
 
 
+def _coerce_positive_int_setting(value: Any, default: int) -> int:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        return default
+    try:
+        parsed = int(value)
+    except (TypeError, ValueError):
+        return default
+    return parsed if parsed > 0 else default
+
+
 def _coerce_llm_usage_non_negative_int(value: Any) -> Optional[int]:
     if value is None:
         return None
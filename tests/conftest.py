@@ -5,6 +5,7 @@ from __future__ import annotations
 
 import asyncio
 import concurrent.futures
+import os
 import time
 import threading
 from collections.abc import Awaitable, Callable
@@ -21,6 +22,10 @@ from anyio._backends import _asyncio
 
 T = TypeVar("T")
 
+# Tests read llm_usage right after the call that records it; keep telemetry
+# writes inline unless a test opts into the batched writer explicitly.
+os.environ.setdefault("LLM_USAGE_WRITE_MODE", "sync")
+
 _original_call_soon_threadsafe = asyncio.BaseEventLoop.call_soon_threadsafe
 
 
@@ -680,7 +680,7 @@ class AlertApiTestCase(unittest.TestCase):
         async def _run_inline(func, *args, **kwargs):
             return func(*args, **kwargs)
 
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             resp = self.client.post(f"/api/v1/alerts/rules/{rule['id']}/test")
 
@@ -704,7 +704,7 @@ class AlertApiTestCase(unittest.TestCase):
         async def _run_inline(func, *args, **kwargs):
             return func(*args, **kwargs)
 
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             resp = self.client.post(f"/api/v1/alerts/rules/{rule['id']}/test")
 
@@ -758,7 +758,7 @@ class AlertApiTestCase(unittest.TestCase):
         async def _run_inline(func, *args, **kwargs):
             return func(*args, **kwargs)
 
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             triggered_resp = self.client.post(f"/api/v1/alerts/rules/{triggered_rule['id']}/test")
             not_triggered_resp = self.client.post(f"/api/v1/alerts/rules/{not_triggered_rule['id']}/test")
@@ -17,6 +17,7 @@ import pandas as pd
 from src.config import Config
 from src.notification import ChannelAttemptResult, NotificationDispatchResult
 from src.services.alert_indicators import (
+    IndicatorCache,
     _calculate_rsi,
     compute_requested_days,
     compute_required_bars,
@@ -223,6 +224,113 @@ class AlertIndicatorHelperTestCase(unittest.TestCase):
         self.assertEqual(result.data_timestamp, pd.Timestamp("2026-05-18").to_pydatetime())
 
 
+    def test_indicator_cache_computes_each_series_once_across_thresholds(self) -> None:
+        cache = IndicatorCache()
+        frame = pd.DataFrame({
+            "date": pd.date_range("2026-01-01", periods=20),
+            "close": [10 + (index % 5) for index in range(20)],
+        })
+        now = pd.Timestamp("2026-02-01 17:00:00").to_pydatetime()
+        results = [
+            evaluate_indicator_alert(
+                "rsi_threshold",
+                "TEST",
+                normalize_indicator_parameters("rsi_threshold", {"period": 6, "threshold": threshold}),
+                frame,
+                now=now,
+                indicator_cache=cache,
+            )
+            for threshold in (30, 50, 70)
+        ]
+        uncached = evaluate_indicator_alert(
+            "rsi_threshold",
+            "TEST",
+            normalize_indicator_parameters("rsi_threshold", {"period": 6, "threshold": 30}),
+            frame,
+            now=now,
+        )
+
+        self.assertEqual(cache.stats, {"hits": 2, "extended": 0, "computed": 1})
+        self.assertTrue(all(result.observed_value == uncached.observed_value for result in results))
+
+    def test_indicator_cache_extends_series_by_one_new_bar(self) -> None:
+        closes = [10.0, 10.4, 9.8, 10.9, 11.3, 10.7, 10.1, 11.6, 12.0, 11.2, 11.8, 12.5, 12.1, 11.4, 12.9, 13.2]
+        full = pd.DataFrame({
+            "date": pd.date_range("2026-01-01", periods=len(closes)),
+            "high": [value + 0.5 for value in closes],
+            "low": [value - 0.7 for value in closes],
+            "close": closes,
+        })
+        now = pd.Timestamp("2026-02-01 17:00:00").to_pydatetime()
+        cases = {
+            "ma_price_cross": {"window": 3, "direction": "above"},
+            "rsi_threshold": {"period": 4, "threshold": 50},
+            "macd_cross": {"fast_period": 3, "slow_period": 6, "signal_period": 3},
+            "kdj_cross": {"period": 4, "k_period": 3, "d_period": 3},
+            "cci_threshold": {"period": 4, "threshold": 100},
+        }
+
+        for alert_type, raw_params in cases.items():
+            with self.subTest(alert_type=alert_type):
+                params = normalize_indicator_parameters(alert_type, raw_params)
+                cache = IndicatorCache()
+                evaluate_indicator_alert(alert_type, "TEST", params, full.iloc[:-1], now=now, indicator_cache=cache)
+                extended = evaluate_indicator_alert(alert_type, "TEST", params, full, now=now, indicator_cache=cache)
+                recomputed = evaluate_indicator_alert(alert_type, "TEST", params, full, now=now)
+
+                self.assertEqual(cache.stats["extended"], 1)
+                self.assertEqual(cache.stats["computed"], 1)
+                self.assertEqual(extended.status, recomputed.status)
+                self.assertAlmostEqual(extended.observed_value, recomputed.observed_value)
+
+    def test_indicator_cache_matches_uncached_results_on_a_rolling_window(self) -> None:
+        closes = [10.0, 10.4, 9.8, 10.9, 11.3, 10.7, 10.1, 11.6, 12.0, 11.2, 11.8, 12.5, 12.1, 11.4, 12.9, 13.2, 12.6, 13.5]
+        full = pd.DataFrame({
+            "date": pd.date_range("2026-01-01", periods=len(closes)),
+            "high": [value + 0.5 for value in closes],
+            "low": [value - 0.7 for value in closes],
+            "close": closes,
+        })
+        now = pd.Timestamp("2026-02-01 17:00:00").to_pydatetime()
+        window = 12
+        cases = {
+            "ma_price_cross": {"window": 3, "direction": "above"},
+            "rsi_threshold": {"period": 4, "threshold": 50},
+            "macd_cross": {"fast_period": 3, "slow_period": 6, "signal_period": 3},
+            "kdj_cross": {"period": 4, "k_period": 3, "d_period": 3},
+            "cci_threshold": {"period": 4, "threshold": 100},
+        }
+
+        for alert_type, raw_params in cases.items():
+            with self.subTest(alert_type=alert_type):
+                params = normalize_indicator_parameters(alert_type, raw_params)
+                cache = IndicatorCache()
+                for end in range(window, len(closes) + 1):
+                    rolled = full.iloc[end - window:end].reset_index(drop=True)
+                    cached = evaluate_indicator_alert(alert_type, "TEST", params, rolled, now=now, indicator_cache=cache)
+                    uncached = evaluate_indicator_alert(alert_type, "TEST", params, rolled, now=now)
+                    self.assertEqual(cached.status, uncached.status)
+                    self.assertEqual(cached.observed_value, uncached.observed_value)
+
+                # Dropping the oldest bar changes the seed, so every slide recomputes.
+                self.assertEqual(cache.stats["computed"], len(closes) - window + 1)
+                self.assertEqual(cache.stats["extended"], 0)
+
+    def test_indicator_cache_recomputes_when_history_is_revised(self) -> None:
+        cache = IndicatorCache()
+        params = normalize_indicator_parameters("ma_price_cross", {"window": 2, "direction": "above"})
+        now = pd.Timestamp("2026-02-01 17:00:00").to_pydatetime()
+        original = pd.DataFrame({"date": pd.date_range("2026-01-01", periods=3), "close": [10, 9, 12]})
+        revised = pd.DataFrame({"date": pd.date_range("2026-01-01", periods=3), "close": [10, 13, 12]})
+
+        first = evaluate_indicator_alert("ma_price_cross", "TEST", params, original, now=now, indicator_cache=cache)
+        second = evaluate_indicator_alert("ma_price_cross", "TEST", params, revised, now=now, indicator_cache=cache)
+
+        self.assertEqual(first.status, "triggered")
+        self.assertEqual(second.status, "not_triggered")
+        self.assertEqual(cache.stats["computed"], 2)
+
+
 class AlertWorkerTestCase(unittest.TestCase):
     def setUp(self) -> None:
         self.temp_dir = tempfile.TemporaryDirectory()
@@ -781,7 +889,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             stats = worker.run_once()
 
@@ -805,7 +913,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             stats = worker.run_once()
 
@@ -836,7 +944,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             stats = worker.run_once()
 
@@ -874,7 +982,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             first = worker.run_once()
             second = worker.run_once()
@@ -920,7 +1028,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             first = worker.run_once()
             second = worker.run_once()
@@ -931,6 +1039,59 @@ class AlertWorkerTestCase(unittest.TestCase):
         self.assertEqual(manager.get_daily_data.call_count, 2)
         manager.get_daily_data.assert_called_with("600519", days=33)
 
+    def test_rules_on_same_symbol_share_one_realtime_quote_per_cycle(self) -> None:
+        self._create_rule(target="600519")
+        self._create_rule(
+            name="Moutai drop",
+            target="600519",
+            alert_type="price_change_percent",
+            parameters={"direction": "down", "change_pct": 3.0},
+        )
+        quote = AsyncMock(return_value=SimpleNamespace(price=1810.0, change_pct=-4.0))
+        worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=self._notifier())
+
+        with patch("src.agent.events.EventMonitor._get_realtime_quote", new=quote):
+            stats = worker.run_once()
+
+        self.assertEqual(stats["evaluated"], 2)
+        self.assertEqual(stats["triggered"], 2)
+        self.assertEqual(quote.await_count, 1)
+
+    def test_volume_and_indicator_rules_share_widest_daily_fetch(self) -> None:
+        self._create_rule(
+            name="Volume",
+            target="600519",
+            alert_type="volume_spike",
+            parameters={"multiplier": 2.0},
+        )
+        self._create_rule(
+            name="MA",
+            target="600519",
+            alert_type="ma_price_cross",
+            parameters={"window": 2, "direction": "above"},
+        )
+        manager = MagicMock()
+        manager.get_daily_data.return_value = (
+            pd.DataFrame({
+                "date": [date(2026, 5, 13), date(2026, 5, 14), date(2026, 5, 15)],
+                "close": [10, 9, 12],
+                "volume": [1000, 1000, 5000],
+            }),
+            "unit-test",
+        )
+
+        async def _run_inline(func, *args, **kwargs):
+            return func(*args, **kwargs)
+
+        worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=self._notifier())
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
+             patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
+            stats = worker.run_once()
+
+        self.assertEqual(stats["evaluated"], 2)
+        self.assertEqual(stats["triggered"], 2)
+        manager.get_daily_data.assert_called_once_with("600519", days=33)
+
     def test_db_triggered_history_deduplicates_same_daily_signal(self) -> None:
         rule = self._create_rule(
             name="MA",
@@ -953,7 +1114,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             first = worker.run_once()
             second = worker.run_once()
@@ -1000,7 +1161,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=self._notifier())
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             first = worker.run_once()
             second = worker.run_once()
@@ -1036,7 +1197,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             first = worker.run_once()
             second = worker.run_once()
@@ -1078,7 +1239,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=self._notifier())
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             first = worker.run_once()
             second = worker.run_once()
@@ -1154,7 +1315,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             stats = worker.run_once()
 
@@ -1181,7 +1342,7 @@ class AlertWorkerTestCase(unittest.TestCase):
             return func(*args, **kwargs)
 
         worker = AlertWorker(config_provider=lambda: self._config(), service=self.service, notifier=notifier)
-        with patch("data_provider.DataFetcherManager", return_value=manager), \
+        with patch("data_provider.base.DataFetcherManager", return_value=manager), \
              patch("src.services.alert_service.asyncio.to_thread", new=_run_inline):
             stats = worker.run_once()
 
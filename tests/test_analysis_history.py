@@ -13,6 +13,7 @@ import json
 import os
 import sys
 import tempfile
+import threading
 import unittest
 from datetime import datetime
 from pathlib import Path
@@ -38,8 +39,11 @@ except ModuleNotFoundError:
     get_stock_bar = None
 
 from src.config import Config
+from sqlalchemy import select, text
+
 from src.storage import (
     DatabaseManager,
+    AnalysisBlob,
     AnalysisHistory,
     BacktestResult,
     DecisionSignalFeedbackRecord,
@@ -48,7 +52,7 @@ from src.storage import (
 )
 from src.analyzer import AnalysisResult
 from src.daily_market_context_guardrail import apply_daily_market_context_guardrail
-from src.services.history_service import HistoryService
+from src.services.history_service import HistoryService, InvalidHistoryCursorError
 import src.auth as auth
 
 
@@ -165,7 +169,7 @@ class AnalysisHistoryTestCase(unittest.TestCase):
 
     def test_history_query_failure_is_not_returned_as_an_empty_success(self) -> None:
         db = MagicMock()
-        db.get_analysis_history_paginated.side_effect = RuntimeError("database unavailable")
+        db.get_analysis_history_summaries.side_effect = RuntimeError("database unavailable")
 
         with self.assertRaisesRegex(RuntimeError, "database unavailable"):
             HistoryService(db).get_history_list(page=1, limit=20)
@@ -311,6 +315,117 @@ class AnalysisHistoryTestCase(unittest.TestCase):
             self.assertEqual(row.stop_loss, 110.0)
             self.assertEqual(row.take_profit, 150.0)
 
+    def test_large_report_fields_are_deduplicated_into_compressed_blobs(self) -> None:
+        """Large report fields share one compressed blob and still read back transparently."""
+        news = "重复新闻正文。" * 400
+        context_snapshot = {"enhanced_context": {"board_rankings": ["白酒"] * 300}}
+        saved_ids = [
+            self.db.save_analysis_history(
+                result=self._build_result(),
+                query_id=f"query_blob_{index}",
+                report_type="simple",
+                news_content=news,
+                context_snapshot=context_snapshot,
+                save_snapshot=True,
+            )
+            for index in range(2)
+        ]
+
+        with self.db.get_session() as session:
+            blobs = session.query(AnalysisBlob).all()
+            self.assertEqual(len(blobs), 2)
+            self.assertTrue(all(len(blob.data) < blob.raw_size for blob in blobs))
+            row = session.get(AnalysisHistory, saved_ids[0])
+            self.assertIsNotNone(row.news_content_ref)
+            self.assertEqual(row.news_content, news)
+            self.assertEqual(json.loads(row.to_dict()["context_snapshot"]), context_snapshot)
+            self.assertEqual(json.loads(row.raw_result)["code"], "600519")
+            selected = session.execute(
+                select(AnalysisHistory.news_content).where(AnalysisHistory.id == saved_ids[1])
+            ).scalar_one()
+            self.assertEqual(selected, news)
+
+        self.assertEqual(self.db.delete_analysis_history_records([saved_ids[0]]), 1)
+        with self.db.get_session() as session:
+            self.assertEqual(session.query(AnalysisBlob).count(), 2)
+        self.assertEqual(self.db.delete_analysis_history_records([saved_ids[1]]), 1)
+        with self.db.get_session() as session:
+            self.assertEqual(session.query(AnalysisBlob).count(), 0)
+
+    def test_assigning_report_field_replaces_resolved_blob_content(self) -> None:
+        """Setting a blob-backed field inline (even to None) is what later reads return."""
+        saved_id = self.db.save_analysis_history(
+            result=self._build_result(),
+            query_id="query_blob_reassign",
+            report_type="simple",
+            news_content="会被清空的新闻。" * 400,
+            context_snapshot=None,
+            save_snapshot=False,
+        )
+
+        with self.db.get_session() as session:
+            row = session.get(AnalysisHistory, saved_id)
+            self.assertIsNotNone(row.news_content)
+            row.news_content = None
+            self.assertIsNone(row.news_content)
+            row.news_content = "短新闻"
+            self.assertEqual(row.news_content, "短新闻")
+            row.news_content = None
+            session.commit()
+
+        with self.db.get_session() as session:
+            row = session.get(AnalysisHistory, saved_id)
+            self.assertIsNone(row.news_content)
+            self.assertIsNone(row.news_content_ref)
+
+    def test_blob_migration_stops_when_stop_event_is_set(self) -> None:
+        with self.db.get_session() as session:
+            session.add(AnalysisHistory(
+                query_id="query_legacy_stopped",
+                code="600519",
+                name="贵州茅台",
+                report_type="simple",
+                news_content="旧版内联新闻。" * 400,
+            ))
+            session.commit()
+
+        stop_event = threading.Event()
+        stop_event.set()
+        self.assertEqual(self.db.migrate_analysis_history_blobs(batch_size=10, stop_event=stop_event), 0)
+        self.assertEqual(self.db.migrate_analysis_history_blobs(batch_size=10), 1)
+
+    def test_blob_migration_moves_legacy_inline_fields(self) -> None:
+        """Legacy rows with inline report text are moved into blobs and keep their content."""
+        news = "旧版内联新闻。" * 400
+        with self.db.get_session() as session:
+            legacy = AnalysisHistory(
+                query_id="query_legacy_inline",
+                code="600519",
+                name="贵州茅台",
+                report_type="simple",
+                raw_result=json.dumps({"model_used": "legacy/model"}),
+                news_content=news,
+                created_at=datetime(2026, 1, 5, 9, 30),
+            )
+            session.add(legacy)
+            session.commit()
+            legacy_id = legacy.id
+
+        self.assertEqual(self.db.migrate_analysis_history_blobs(batch_size=10), 1)
+        self.assertEqual(self.db.migrate_analysis_history_blobs(batch_size=10), 0)
+
+        with self.db.get_session() as session:
+            row = session.get(AnalysisHistory, legacy_id)
+            self.assertIsNotNone(row.news_content_ref)
+            self.assertIsNone(row.raw_result_ref)
+            self.assertEqual(row.news_content, news)
+            self.assertEqual(json.loads(row.list_summary)["raw_result"], {"model_used": "legacy/model"})
+            inline_news = session.execute(
+                text("SELECT news_content FROM analysis_history WHERE id = :id"),
+                {"id": legacy_id},
+            ).scalar_one()
+            self.assertIsNone(inline_news)
+
     def test_history_display_resolves_bare_jp_kr_code_from_stock_pool(self) -> None:
         result = self._build_result()
         result.code = "005930"
@@ -675,6 +790,39 @@ class AnalysisHistoryTestCase(unittest.TestCase):
         self.assertEqual(item["market_phase_summary"]["phase"], "intraday")
         self.assertEqual(item["market_phase_summary"]["minutes_to_close"], 300)
 
+    def test_history_list_pages_by_cursor_without_loading_report_blobs(self) -> None:
+        """Keyset pages visit every row once; legacy rows without list_summary still render."""
+        for index in range(5):
+            self._save_history(f"query_cursor_{index}")
+        with self.db.get_session() as session:
+            legacy = session.query(AnalysisHistory).filter(AnalysisHistory.query_id == "query_cursor_0").one()
+            legacy.raw_result = json.dumps({"model_used": "legacy/model"})
+            legacy.list_summary = None
+            session.commit()
+
+        rows = self.db.get_analysis_history_summaries(limit=10)
+        self.assertEqual(len(rows), 5)
+        self.assertFalse(hasattr(rows[0], "news_content"))
+
+        service = HistoryService(self.db)
+        seen = []
+        cursor = None
+        for _ in range(5):
+            payload = service.get_history_list(limit=2, cursor=cursor)
+            self.assertEqual(payload["total"], 5)
+            seen.extend(payload["items"])
+            cursor = payload["next_cursor"]
+            if cursor is None:
+                break
+
+        self.assertEqual(
+            [item["query_id"] for item in seen],
+            [f"query_cursor_{index}" for index in range(4, -1, -1)],
+        )
+        self.assertEqual(seen[-1]["model_used"], "legacy/model")
+        with self.assertRaises(InvalidHistoryCursorError):
+            service.get_history_list(limit=2, cursor="not-a-cursor")
+
     def test_history_persistence_keeps_softened_operation_advice_from_guardrail(self) -> None:
         """Conservative-market guardrail short operation_advice is persisted and exposed to history list."""
         result = self._build_result()
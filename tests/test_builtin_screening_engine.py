@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 """Regression contracts for the DSA-owned screening implementation."""
 
+import json
 import os
 from pathlib import Path
 import tempfile
 from types import SimpleNamespace
 from unittest.mock import call, patch
 
+import numpy as np
 import pandas as pd
+import pytest
 from fastapi import FastAPI
 from fastapi.testclient import TestClient as FastAPITestClient
 
@@ -20,6 +23,7 @@ from src.services.screening.filter import apply_hard_filters
 from src.services.screening.config import Config as ScreeningRuntimeConfig
 from src.services.screening.models import HardFilterConfig, Pick, ScreeningConfig, Strategy
 from src.services.screening.scorer import compute_screen_scores
+from src.services.screening import daily as screening_daily
 from src.services.screening import snapshot as screening_snapshot
 from src.services.screening.strategy import list_strategies, load_all_strategies
 
@@ -202,6 +206,129 @@ def test_pipeline_passes_daily_history_cache_settings_to_enrichment(monkeypatch)
     assert result.daily_enriched is True
 
 
+def _daily_history_frame() -> pd.DataFrame:
+    frame = pd.DataFrame(
+        {
+            "date": pd.date_range("2026-01-05", periods=5, freq="B"),
+            "close": [10.0, 10.2, 10.1, 10.4, 10.6],
+            "volume": [1000, 1200, 900, 1500, 1300],
+            "note": ["a", None, "c", "d", "e"],
+        }
+    )
+    frame.attrs.update({"daily_source": "tencent", "daily_requested_source": "auto", "daily_source_order": ["tencent"]})
+    return frame
+
+
+def test_daily_history_cache_round_trips_binary_columns_with_ttl(tmp_path, monkeypatch) -> None:
+    path = screening_daily._daily_history_cache_path(tmp_path, code="000001", source="auto", lookback_days=120)
+    frame = _daily_history_frame()
+
+    screening_daily._write_daily_history_cache(path, frame, code="000001", source="auto", lookback_days=120)
+    cached = screening_daily._read_daily_history_cache(path, ttl_seconds=300)
+
+    assert path.suffix == ".npz"
+    assert screening_daily._daily_history_meta_path(path).exists()
+    pd.testing.assert_frame_equal(cached, frame, check_dtype=False)
+    assert cached["date"].dtype.kind == "M"
+    assert cached.attrs["daily_source"] == "tencent"
+    assert "daily_stale" not in cached.attrs
+
+    old = path.stat().st_mtime - 600
+    os.utime(path, (old, old))
+    assert screening_daily._read_daily_history_cache(path, ttl_seconds=300) is None
+    stale = screening_daily._read_daily_history_cache(path, ttl_seconds=300, allow_stale=True)
+    assert stale.attrs["daily_stale"] is True
+
+    meta_path = screening_daily._daily_history_meta_path(path)
+    meta_path.write_text(meta_path.read_text(encoding="utf-8").replace('"version": 2', '"version": 1'), encoding="utf-8")
+    assert screening_daily._read_daily_history_cache(path, ttl_seconds=None, allow_stale=True) is None
+
+
+def test_daily_history_bundle_serves_entries_until_files_change(tmp_path) -> None:
+    paths = []
+    for code in ("000001", "000002"):
+        path = screening_daily._daily_history_cache_path(tmp_path, code=code, source="auto", lookback_days=120)
+        screening_daily._write_daily_history_cache(path, _daily_history_frame(), code=code, source="auto", lookback_days=120)
+        paths.append(path)
+
+    assert screening_daily.write_daily_history_bundle(tmp_path) == 2
+    data_files = list((tmp_path / "_bundle").glob("*.bin"))
+    assert screening_daily.write_daily_history_bundle(tmp_path) == 2
+    assert list((tmp_path / "_bundle").glob("*.bin")) == data_files
+
+    with patch.object(screening_daily.np, "load", side_effect=AssertionError("bundle should serve this entry")):
+        bundled = screening_daily._read_daily_history_cache(paths[0], ttl_seconds=None)
+    pd.testing.assert_frame_equal(bundled, _daily_history_frame(), check_dtype=False)
+
+    changed = _daily_history_frame().assign(close=1.0)
+    screening_daily._write_daily_history_cache(paths[0], changed, code="000001", source="auto", lookback_days=120)
+    assert screening_daily._read_daily_history_cache(paths[0], ttl_seconds=None)["close"].tolist() == [1.0] * 5
+
+
+def _daily_feature_history(seed: int, periods: int) -> pd.DataFrame:
+    import numpy as np
+
+    rng = np.random.default_rng(seed)
+    close = np.cumprod(1 + rng.normal(0, 0.02, periods)) * 10
+    return pd.DataFrame(
+        {
+            "date": pd.bdate_range("2025-01-01", periods=periods).astype(str),
+            "open": close * (1 + rng.normal(0, 0.01, periods)),
+            "high": close * 1.02,
+            "low": close * 0.98,
+            "close": close,
+            "volume": rng.integers(100, 1000, periods).astype(float),
+        }
+    )
+
+
+def test_daily_feature_batch_matches_single_symbol_features() -> None:
+    histories = {
+        "000001": _daily_feature_history(1, 120),
+        "000002": _daily_feature_history(2, 40).iloc[::-1],
+        "000003": _daily_feature_history(3, 8).drop(columns="volume"),
+        "000004": pd.DataFrame({"date": ["2025-01-02"], "open": [1.0]}),
+    }
+    histories["000002"].attrs["daily_stale"] = True
+
+    panel, errors = screening_daily.stack_daily_histories(histories)
+    batch = screening_daily.compute_daily_features_batch(panel)
+
+    assert errors == {"000004": "daily history has no close column"}
+    assert list(batch) == ["000001", "000002", "000003"]
+    for code in batch:
+        assert batch[code] == screening_daily.compute_daily_features(histories[code])
+    assert batch["000001"]["daily_data_points"] == 120
+    assert batch["000001"]["macd_status"] in {"bullish", "bearish", "neutral"}
+    assert "stale_cache" in batch["000002"]["daily_quality_flags"]
+    assert "missing_volume" in batch["000003"]["daily_quality_flags"]
+    assert batch["000003"]["rsi14"] is None
+
+
+def test_enrich_daily_features_fetches_then_scores_all_candidates_in_one_batch(monkeypatch) -> None:
+    histories = {"000001": _daily_feature_history(1, 90), "000002": pd.DataFrame({"open": [1.0]})}
+    candidates = pd.DataFrame({"code": ["000001", "000002"], "name": ["a", "b"]})
+    batches = []
+    original_batch = screening_daily.compute_daily_features_batch
+
+    def counting_batch(panel):
+        batches.append(sorted(panel["code"].unique()))
+        return original_batch(panel)
+
+    monkeypatch.setattr(screening_daily, "compute_daily_features_batch", counting_batch)
+    enriched = screening_daily.enrich_daily_features(
+        candidates,
+        max_workers=2,
+        history_fetcher=lambda code, **_kwargs: histories[code].copy(),
+    )
+
+    assert batches == [["000001"]]
+    assert enriched.at[0, "daily_data_points"] == 90
+    assert enriched.at[1, "daily_quality_flags"] == "fetch_failed"
+    assert enriched.attrs["daily_success_count"] == 1
+    assert enriched.attrs["daily_errors"] == ["000002: daily history has no close column"]
+
+
 def test_dsa_post_analyzer_records_attempted_and_capped_statuses(monkeypatch) -> None:
     picks = [
         Pick(
@@ -815,3 +942,85 @@ def test_fresh_snapshot_cache_reuses_fallback_from_same_source_chain(tmp_path, m
     assert second.attrs["snapshot_source"] == "last_good_cache"
     assert second.attrs["last_good_snapshot_source"] == "sina"
     assert second.attrs["fallback_used"] is False
+
+
+def test_last_good_snapshot_is_memory_mapped_once_and_shared_in_process(tmp_path, monkeypatch) -> None:
+    snapshot = pd.DataFrame(
+        {
+            "code": ["000001", "600519"],
+            "name": ["Ping An", None],
+            "price": [10.0, 1500.5],
+            "volume_ratio": [1.5, float("nan")],
+        }
+    )
+    snapshot.attrs["snapshot_source"] = "sina"
+    cache_path = tmp_path / "snapshot-cache.json"
+    screening_snapshot._write_last_good_snapshot(cache_path, snapshot, source_priority=["sina"])
+    assert len(list(tmp_path.glob("snapshot-cache.*.bin"))) == 1
+
+    monkeypatch.setattr(screening_snapshot, "_SNAPSHOT_FRAMES", {})
+    cold = screening_snapshot._read_last_good_snapshot(
+        cache_path,
+        required_columns=["volume_ratio"],
+        source_errors=[],
+    )
+    pd.testing.assert_frame_equal(cold, snapshot, check_dtype=False)
+
+    with patch.object(
+        screening_snapshot.json,
+        "loads",
+        side_effect=AssertionError("hot snapshot should not re-parse the cache index"),
+    ):
+        hot = screening_snapshot._read_last_good_snapshot(
+            cache_path,
+            required_columns=["volume_ratio"],
+            source_errors=["sina: down"],
+        )
+    assert hot.attrs["source_errors"] == ["sina: down"]
+    assert cold.attrs["source_errors"] == []
+
+    screening_snapshot._write_last_good_snapshot(cache_path, snapshot.head(1), source_priority=["sina"])
+    assert len(list(tmp_path.glob("snapshot-cache.*.bin"))) == 1
+    monkeypatch.setattr(screening_snapshot, "_SNAPSHOT_FRAMES", {})
+    refreshed = screening_snapshot._read_last_good_snapshot(cache_path, required_columns=[], source_errors=[])
+    assert refreshed["code"].tolist() == ["000001"]
+
+
+@pytest.mark.parametrize("copy_on_write", [True, False])
+def test_last_good_snapshot_edits_never_reach_the_shared_frame(tmp_path, monkeypatch, copy_on_write) -> None:
+    snapshot = pd.DataFrame({"code": ["000001", "600519"], "price": [10.0, 1500.5]})
+    cache_path = tmp_path / "snapshot-cache.json"
+    screening_snapshot._write_last_good_snapshot(cache_path, snapshot, source_priority=["sina"])
+    monkeypatch.setattr(screening_snapshot, "_SNAPSHOT_FRAMES", {})
+    monkeypatch.setattr(screening_snapshot, "_copy_on_write_enabled", lambda: copy_on_write)
+
+    first = screening_snapshot._read_last_good_snapshot(cache_path, required_columns=["price"], source_errors=[])
+    shared = next(iter(screening_snapshot._SNAPSHOT_FRAMES.values()))[2]
+    # The decoded numeric column is a read-only view over the memory map.
+    assert not shared["price"].to_numpy().flags.writeable
+    assert np.shares_memory(first["price"].to_numpy(), shared["price"].to_numpy()) is copy_on_write
+
+    first.loc[0, "price"] = -1.0
+    second = screening_snapshot._read_last_good_snapshot(cache_path, required_columns=["price"], source_errors=[])
+
+    assert second["price"].tolist() == [10.0, 1500.5]
+
+
+def test_legacy_json_snapshot_cache_is_still_readable(tmp_path) -> None:
+    cache_path = tmp_path / "snapshot-cache.json"
+    cache_path.write_text(
+        json.dumps(
+            {
+                "version": 1,
+                "created_at": "2026-01-01T00:00:00+00:00",
+                "metadata": {"snapshot_source": "sina", "source_priority": ["sina"]},
+                "frame": {"columns": ["code", "price"], "index": [0], "data": [["000001", 10.0]]},
+            }
+        ),
+        encoding="utf-8",
+    )
+
+    cached = screening_snapshot._read_last_good_snapshot(cache_path, required_columns=["price"], source_errors=[])
+
+    assert cached.loc[0, "code"] == "000001"
+    assert cached.attrs["fallback_used"] is True
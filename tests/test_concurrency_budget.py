@@ -0,0 +1,149 @@
+# -*- coding: utf-8 -*-
+"""Tests for per-data-source and per-LLM-channel concurrency budgets."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from data_provider.base import AKSHARE_DATA_SOURCE, DataFetcherManager
+from src.services.concurrency_budget import (
+    ConcurrencyBudgets,
+    budget_snapshot,
+    data_source_slot,
+    resolve_analysis_worker_count,
+    resolve_data_source_limit,
+    resolve_llm_limit,
+)
+from src.services.run_diagnostics import (
+    activate_run_diagnostic_context,
+    current_diagnostic_snapshot,
+    reset_run_diagnostic_context,
+)
+
+
+class ConcurrencyBudgetsTestCase(unittest.TestCase):
+    def _run_concurrently(self, budgets, key, limit, count, hold=0.05):
+        active = {"now": 0, "peak": 0}
+        lock = threading.Lock()
+
+        def work():
+            with budgets.slot("data_source", key, limit):
+                with lock:
+                    active["now"] += 1
+                    active["peak"] = max(active["peak"], active["now"])
+                time.sleep(hold)
+                with lock:
+                    active["now"] -= 1
+
+        threads = [threading.Thread(target=work) for _ in range(count)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(timeout=5)
+        return active["peak"]
+
+    def test_slot_caps_concurrency_per_key(self) -> None:
+        budgets = ConcurrencyBudgets()
+        self.assertEqual(self._run_concurrently(budgets, "AkshareFetcher", 2, 6), 2)
+
+        snapshot = {entry["key"]: entry for entry in budgets.snapshot()}
+        self.assertEqual(snapshot["AkshareFetcher"]["acquired"], 6)
+        self.assertEqual(snapshot["AkshareFetcher"]["active"], 0)
+        self.assertGreater(snapshot["AkshareFetcher"]["total_wait_ms"], 0)
+        self.assertGreater(snapshot["AkshareFetcher"]["max_queue_depth"], 1)
+
+    def test_keys_do_not_share_slots(self) -> None:
+        budgets = ConcurrencyBudgets()
+        release = threading.Event()
+        entered = threading.Event()
+
+        def hold_akshare():
+            with budgets.slot("data_source", "AkshareFetcher", 1):
+                entered.set()
+                release.wait(timeout=5)
+
+        holder = threading.Thread(target=hold_akshare)
+        holder.start()
+        try:
+            self.assertTrue(entered.wait(timeout=5))
+            started = time.monotonic()
+            with budgets.slot("data_source", "TushareFetcher", 1):
+                pass
+            self.assertLess(time.monotonic() - started, 1.0)
+        finally:
+            release.set()
+            holder.join(timeout=5)
+
+    def test_waits_are_recorded_in_active_diagnostics(self) -> None:
+        budgets = ConcurrencyBudgets()
+        token = activate_run_diagnostic_context(trace_id="trace-budget")
+        try:
+            with budgets.slot("llm", "gemini/gemini-2.5-flash", 1):
+                pass
+            snapshot = current_diagnostic_snapshot()
+        finally:
+            reset_run_diagnostic_context(token)
+
+        self.assertEqual(
+            [(entry["budget"], entry["key"], entry["acquired"]) for entry in snapshot["budget_waits"]],
+            [("llm", "gemini/gemini-2.5-flash", 1)],
+        )
+
+    def test_snapshot_stays_sortable_for_non_string_keys(self) -> None:
+        budgets = ConcurrencyBudgets()
+        models = [object(), object(), None]
+        for model in models:
+            with budgets.slot("llm", model, 1):
+                pass
+
+        keys = [entry["key"] for entry in budgets.snapshot()]
+        self.assertEqual(len(keys), 3)
+        self.assertTrue(all(isinstance(key, str) for key in keys))
+
+    def test_data_source_limit_is_configurable_and_reported(self) -> None:
+        config = SimpleNamespace(data_source_max_concurrency=2)
+        self.assertEqual(resolve_data_source_limit(config), 2)
+        self.assertEqual(resolve_data_source_limit(SimpleNamespace(data_source_max_concurrency=0)), 3)
+
+        with data_source_slot("BudgetProbeFetcher", config):
+            pass
+
+        entry = next(item for item in budget_snapshot() if item["key"] == "BudgetProbeFetcher")
+        self.assertEqual((entry["budget"], entry["limit"], entry["acquired"]), ("data_source", 2, 1))
+
+    def test_board_and_adapter_calls_take_data_source_slots(self) -> None:
+        class _BoardFetcher:
+            name = "BoardProbeFetcher"
+            priority = 0
+
+            def get_belong_board(self, _stock_code):
+                return [{"name": "银行", "type": "行业"}]
+
+        def acquired(key):
+            return next((item["acquired"] for item in budget_snapshot() if item["key"] == key), 0)
+
+        manager = DataFetcherManager(fetchers=[_BoardFetcher()])
+        adapter_before = acquired(AKSHARE_DATA_SOURCE)
+        self.assertTrue(manager.get_belong_boards("600000"))
+        self.assertEqual(
+            manager._call_adapter_method(AKSHARE_DATA_SOURCE, lambda code: {"code": code}, "600000"),
+            {"code": "600000"},
+        )
+
+        self.assertEqual(acquired("BoardProbeFetcher"), 1)
+        self.assertEqual(acquired(AKSHARE_DATA_SOURCE), adapter_before + 1)
+
+    def test_worker_count_adds_llm_budget_to_io_workers(self) -> None:
+        config = SimpleNamespace(llm_max_concurrency=5)
+        self.assertEqual(resolve_llm_limit(config), 5)
+        self.assertEqual(resolve_analysis_worker_count(3, config), 8)
+        self.assertEqual(resolve_llm_limit(SimpleNamespace(llm_max_concurrency=0)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -10,6 +10,7 @@ from datetime import date, datetime
 import pytest
 
 from src.config import Config
+from src.repositories.stock_repo import StockRepository
 from src.services.decision_signal_outcome_service import DecisionSignalOutcomeService
 from src.storage import DatabaseManager, DecisionSignalOutcomeRecord, DecisionSignalRecord, StockDaily
 
@@ -624,6 +625,53 @@ def test_insufficient_forward_bars_and_force_idempotency(isolated_db) -> None:
     assert forced["stock_return_pct"] == 10.0
 
 
+def test_batch_loads_each_stock_bars_once_across_anchors_and_horizons(isolated_db) -> None:
+    class CountingStockRepo(StockRepository):
+        def __init__(self, db):
+            super().__init__(db)
+            self.window_calls = []
+
+        def get_daily_on_date(self, **_kwargs):
+            raise AssertionError("batch outcomes must not read anchor bars one by one")
+
+        def get_forward_bars(self, **_kwargs):
+            raise AssertionError("batch outcomes must not read forward bars one by one")
+
+        def get_bars_for_anchor_window(self, **kwargs):
+            self.window_calls.append(kwargs)
+            return super().get_bars_for_anchor_window(**kwargs)
+
+    early_id = _add_signal(isolated_db, action="buy", session_date="2024-01-02")
+    late_id = _add_signal(isolated_db, action="sell", session_date="2024-01-04")
+    other_id = _add_signal(isolated_db, code="000001", action="buy", session_date="2024-01-02")
+    _seed_bars(isolated_db, closes=[101, 102, 103, 104, 105, 106, 107, 108, 109, 110, 111, 112])
+    _seed_bars(isolated_db, code="000001", closes=[99, 98, 97])
+    stock_repo = CountingStockRepo(isolated_db)
+    service = DecisionSignalOutcomeService(db_manager=isolated_db, stock_repo=stock_repo)
+
+    result = service.run_outcomes(horizons=["1d", "3d", "10d"], limit=10)
+
+    assert sorted(call["code"] for call in stock_repo.window_calls) == ["000001", "600519"]
+    assert all(call["eval_window_days"] == 10 for call in stock_repo.window_calls)
+    assert result["created"] == 9
+    by_key = {(item["signal_id"], item["horizon"]): item for item in result["items"]}
+    assert [(item["signal_id"], item["horizon"]) for item in result["items"]] == [
+        (signal_id, horizon)
+        for signal_id in (other_id, late_id, early_id)
+        for horizon in ("1d", "3d", "10d")
+    ]
+    assert by_key[(early_id, "3d")]["stock_return_pct"] == 3.0
+    assert by_key[(early_id, "10d")]["end_close"] == 110.0
+    assert by_key[(late_id, "1d")]["start_price"] == 102.0
+    assert by_key[(late_id, "10d")]["end_close"] == 112.0
+    assert by_key[(other_id, "3d")]["outcome"] == "miss"
+    assert by_key[(other_id, "10d")]["unable_reason"] == "insufficient_forward_bars"
+
+    repeated = service.run_outcomes(horizons=["1d", "3d"], limit=10)
+    assert repeated["evaluated"] == 0
+    assert len(stock_repo.window_calls) == 2
+
+
 def test_batch_progresses_past_completed_outcomes(isolated_db) -> None:
     older_missing_id = _add_signal(isolated_db, code="000010", action="buy", horizon="1d")
     newer_completed_id = _add_signal(isolated_db, code="000011", action="buy", horizon="1d")
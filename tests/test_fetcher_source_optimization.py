@@ -18,6 +18,9 @@ from data_provider.base import (
     DataFetchError,
     DataFetcherManager,
     STANDARD_COLUMNS,
+    _LazyFetcher,
+    get_fetcher_manager,
+    reset_fetcher_manager,
 )
 from data_provider.realtime_types import RealtimeSource, UnifiedRealtimeQuote
 
@@ -28,6 +31,14 @@ class _StubFetcher:
         self.priority = priority
 
 
+def _stub_fetcher_class(name: str, priority: int) -> type:
+    return type(name, (_StubFetcher,), {
+        "name": name,
+        "priority": priority,
+        "__init__": lambda self: None,
+    })
+
+
 class _EmptyRawFetcher(BaseFetcher):
     name = "EmptyRawFetcher"
     priority = 0
@@ -116,21 +127,21 @@ class TestFetcherSourceOptimization(unittest.TestCase):
                 "LONGBRIDGE_APP_SECRET": "",
                 "LONGBRIDGE_ACCESS_TOKEN": "",
             },
-        ), patch("data_provider.efinance_fetcher.EfinanceFetcher", return_value=_StubFetcher("EfinanceFetcher", 0)), patch(
+        ), patch("data_provider.efinance_fetcher.EfinanceFetcher", new=_stub_fetcher_class("EfinanceFetcher", 0)), patch(
             "data_provider.tencent_fetcher.TencentFetcher",
             return_value=_StubFetcher("TencentFetcher", 5),
         ), patch(
             "data_provider.akshare_fetcher.AkshareFetcher",
-            return_value=_StubFetcher("AkshareFetcher", 1),
+            new=_stub_fetcher_class("AkshareFetcher", 1),
         ), patch(
             "data_provider.pytdx_fetcher.PytdxFetcher",
-            return_value=_StubFetcher("PytdxFetcher", 2),
+            new=_stub_fetcher_class("PytdxFetcher", 2),
         ), patch(
             "data_provider.baostock_fetcher.BaostockFetcher",
-            return_value=_StubFetcher("BaostockFetcher", 3),
+            new=_stub_fetcher_class("BaostockFetcher", 3),
         ), patch(
             "data_provider.yfinance_fetcher.YfinanceFetcher",
-            return_value=_StubFetcher("YfinanceFetcher", 4),
+            new=_stub_fetcher_class("YfinanceFetcher", 4),
         ), patch(
             "data_provider.tushare_fetcher.TushareFetcher",
             return_value=_StubFetcher("TushareFetcher", -1),
@@ -155,6 +166,72 @@ class TestFetcherSourceOptimization(unittest.TestCase):
         mock_tushare.assert_not_called()
         mock_longbridge.assert_not_called()
 
+    def test_default_fetcher_is_instantiated_on_first_route(self):
+        created = []
+
+        class _CountingFetcher(_StubFetcher):
+            name = "EfinanceFetcher"
+            priority = 0
+
+            def __init__(self):
+                created.append(self)
+
+            def get_daily_data(self, **kwargs):
+                return "frame"
+
+        lazy = _LazyFetcher(_CountingFetcher)
+        self.assertEqual((lazy.name, lazy.priority), ("EfinanceFetcher", 0))
+        self.assertFalse(lazy.is_instantiated)
+        self.assertEqual(created, [])
+
+        self.assertEqual(lazy.get_daily_data(stock_code="600519"), "frame")
+        self.assertEqual(lazy.get_daily_data(stock_code="000001"), "frame")
+        self.assertTrue(lazy.is_instantiated)
+        self.assertEqual(len(created), 1)
+
+    def test_capability_probe_does_not_instantiate_default_fetcher(self):
+        created = []
+
+        class _CountingFetcher(_StubFetcher):
+            name = "BaostockFetcher"
+            priority = 3
+
+            def __init__(self):
+                created.append(self)
+
+            def get_stock_name(self, stock_code):
+                return "名称"
+
+        lazy = _LazyFetcher(_CountingFetcher)
+        self.assertTrue(hasattr(lazy, "get_stock_name"))
+        self.assertFalse(hasattr(lazy, "get_chip_distribution"))
+        self.assertFalse(hasattr(lazy, "get_belong_board"))
+        self.assertFalse(lazy.is_instantiated)
+        self.assertEqual(created, [])
+
+        self.assertEqual(lazy.get_stock_name("600519"), "名称")
+        self.assertEqual(len(created), 1)
+
+    @patch("src.config.get_config")
+    def test_shared_manager_is_reused_until_source_config_changes(self, mock_get_config):
+        mock_get_config.return_value = SimpleNamespace(tushare_token="")
+        reset_fetcher_manager()
+        try:
+            with patch(
+                "data_provider.base.DataFetcherManager",
+                side_effect=lambda: MagicMock(),
+            ) as manager_factory:
+                first = get_fetcher_manager()
+                self.assertIs(get_fetcher_manager(), first)
+                self.assertEqual(manager_factory.call_count, 1)
+
+                mock_get_config.return_value = SimpleNamespace(tushare_token="token")
+                rebuilt = get_fetcher_manager()
+                self.assertIsNot(rebuilt, first)
+                self.assertEqual(manager_factory.call_count, 2)
+        finally:
+            reset_fetcher_manager()
+
     @patch("src.config.get_config")
     def test_daily_fallback_tries_akshare_before_tencent(self, mock_get_config):
         mock_get_config.return_value = SimpleNamespace()
@@ -204,21 +281,21 @@ class TestFetcherSourceOptimization(unittest.TestCase):
             longbridge_oauth_client_id="client-1",
         )
 
-        with patch("data_provider.efinance_fetcher.EfinanceFetcher", return_value=_StubFetcher("EfinanceFetcher", 0)), patch(
+        with patch("data_provider.efinance_fetcher.EfinanceFetcher", new=_stub_fetcher_class("EfinanceFetcher", 0)), patch(
             "data_provider.tencent_fetcher.TencentFetcher",
             return_value=_StubFetcher("TencentFetcher", 5),
         ), patch(
             "data_provider.akshare_fetcher.AkshareFetcher",
-            return_value=_StubFetcher("AkshareFetcher", 1),
+            new=_stub_fetcher_class("AkshareFetcher", 1),
         ), patch(
             "data_provider.pytdx_fetcher.PytdxFetcher",
-            return_value=_StubFetcher("PytdxFetcher", 2),
+            new=_stub_fetcher_class("PytdxFetcher", 2),
         ), patch(
             "data_provider.baostock_fetcher.BaostockFetcher",
-            return_value=_StubFetcher("BaostockFetcher", 3),
+            new=_stub_fetcher_class("BaostockFetcher", 3),
         ), patch(
             "data_provider.yfinance_fetcher.YfinanceFetcher",
-            return_value=_StubFetcher("YfinanceFetcher", 4),
+            new=_stub_fetcher_class("YfinanceFetcher", 4),
         ), patch(
             "data_provider.tushare_fetcher.TushareFetcher",
             return_value=_StubFetcher("TushareFetcher", -1),
@@ -7,7 +7,7 @@ import os
 import sys
 import time
 import unittest
-from threading import BoundedSemaphore, Event
+from threading import Event
 from types import SimpleNamespace
 from unittest.mock import patch
 
@@ -16,6 +16,7 @@ import numpy as np
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from data_provider.base import DataFetcherManager
+from data_provider.timeout_executor import TimeoutExecutor, cancellation_requested
 
 
 class _DummyFetcher:
@@ -389,27 +390,95 @@ class TestFundamentalContext(unittest.TestCase):
         self.assertGreater(budgets.get("dragon_tiger", 0.0), 0.0)
         self.assertGreater(budgets.get("boards", 0.0), 0.0)
 
+    def test_hanging_block_is_abandoned_at_block_timeout_and_signalled(self) -> None:
+        manager = DataFetcherManager(fetchers=[])
+        cfg = SimpleNamespace(
+            enable_fundamental_pipeline=True,
+            fundamental_cache_ttl_seconds=0,
+            fundamental_stage_timeout_seconds=0.2,
+            fundamental_fetch_timeout_seconds=0.2,
+            fundamental_retry_max=1,
+        )
+        bundle = {
+            "status": "not_supported",
+            "growth": {},
+            "earnings": {},
+            "institution": {},
+            "source_chain": [],
+            "errors": [],
+        }
+        release = Event()
+        observed_cancel = Event()
+
+        def _hanging_boards(_stock_code: str, budget_seconds: float = 0.0):
+            release.wait(timeout=2.0)
+            if cancellation_requested():
+                observed_cancel.set()
+            return {"status": "ok", "source_chain": [], "errors": [], "data": {}}
+
+        try:
+            with patch("src.config.get_config", return_value=cfg), \
+                    patch.object(manager, "get_realtime_quote", return_value=None), \
+                    patch(
+                        "data_provider.fundamental_adapter.AkshareFundamentalAdapter.get_fundamental_bundle",
+                        return_value=bundle,
+                    ), \
+                    patch.object(manager, "get_capital_flow_context", return_value={"status": "not_supported", "source_chain": []}), \
+                    patch.object(manager, "get_dragon_tiger_context", return_value={"status": "not_supported", "source_chain": []}), \
+                    patch.object(manager, "get_board_context", side_effect=_hanging_boards):
+                started = time.monotonic()
+                ctx = manager.get_fundamental_context("600519")
+                elapsed = time.monotonic() - started
+        finally:
+            release.set()
+
+        # The old collector waited block_timeout + 1s for every block.
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(ctx["boards"]["status"], "failed")
+        self.assertIn("boards timeout", ctx["boards"]["errors"])
+        self.assertTrue(observed_cancel.wait(timeout=2.0))
+
     def test_run_with_timeout_limits_hanging_workers(self) -> None:
         manager = DataFetcherManager(fetchers=[])
-        manager._fundamental_timeout_slots = BoundedSemaphore(1)
+        manager._fundamental_timeout_executor = TimeoutExecutor(max_workers=1, max_queue=0)
 
         unblock = Event()
+        observed_cancel = Event()
 
         def _hanging_task():
             unblock.wait(timeout=0.5)
+            if cancellation_requested():
+                observed_cancel.set()
             return 1
 
         try:
-            result, err, _ = manager._run_with_timeout(_hanging_task, 0.01, "hang")
+            result, err, _ = manager._run_with_timeout(_hanging_task, 0.05, "hang")
             self.assertIsNone(result)
             self.assertIn("timeout", err or "")
 
             result2, err2, _ = manager._run_with_timeout(_hanging_task, 0.01, "hang")
             self.assertIsNone(result2)
             self.assertIn("worker pool exhausted", err2 or "")
+
+            metrics = manager.get_fundamental_executor_metrics()
+            self.assertEqual(metrics["running"], 1)
+            self.assertEqual(metrics["abandoned"], 1)
+            self.assertEqual(metrics["rejected"], 1)
         finally:
             unblock.set()
-            time.sleep(0.02)
+        self.assertTrue(observed_cancel.wait(timeout=1.0))
+
+    def test_timeout_executor_reports_block_latency_percentiles(self) -> None:
+        executor = TimeoutExecutor(max_workers=2, max_queue=4)
+        for _ in range(5):
+            result, err, _ = executor.run(lambda: "ok", 1.0, "capital_flow")
+            self.assertEqual((result, err), ("ok", None))
+
+        metrics = executor.metrics()
+        self.assertEqual(metrics["queued"], 0)
+        self.assertEqual(metrics["running"], 0)
+        self.assertEqual(metrics["latency_ms"]["capital_flow"]["count"], 5)
+        self.assertIsNotNone(metrics["latency_ms"]["capital_flow"]["p95"])
 
     def test_infer_block_status_treats_all_null_payload_as_non_ok(self) -> None:
         self.assertEqual(
@@ -257,6 +257,93 @@ class IntelligenceServiceTestCase(unittest.TestCase):
         self.assertEqual(result["saved_count"], 300)
         self.assertTrue(all(item["ok"] for item in result["results"]))
 
+    def test_fetch_enabled_sources_runs_concurrently_with_per_host_limit(self) -> None:
+        for index in range(6):
+            self.service.create_source({
+                "name": f"host-a-{index}", "url": f"https://a.example.com/{index}.xml", "scope_type": "market",
+            })
+        self.service.create_source({"name": "host-b", "url": "https://b.example.com/rss.xml", "scope_type": "market"})
+        lock = threading.Lock()
+        active = {"a.example.com": 0, "b.example.com": 0, "total": 0}
+        peak = {"a.example.com": 0, "total": 0}
+
+        def slow_get(url, **_kwargs):
+            host = url.split("/")[2]
+            with lock:
+                active[host] += 1
+                active["total"] += 1
+                peak["a.example.com"] = max(peak["a.example.com"], active["a.example.com"])
+                peak["total"] = max(peak["total"], active["total"])
+            time.sleep(0.05)
+            with lock:
+                active[host] -= 1
+                active["total"] -= 1
+            return self._mock_response(source_url=url)
+
+        with patch("src.services.intelligence_service.requests.get", side_effect=slow_get):
+            result = self.service.fetch_enabled_sources()
+
+        self.assertEqual(result["source_count"], 7)
+        self.assertTrue(all(item["ok"] for item in result["results"]))
+        self.assertEqual(peak["a.example.com"], 2)
+        self.assertGreaterEqual(peak["total"], 3)
+
+    def test_unchanged_feed_uses_conditional_get_and_skips_known_urls(self) -> None:
+        source = self.service.create_source({
+            "name": "etag-feed", "url": "https://feeds.example.com/rss.xml", "scope_type": "market",
+        })
+        first_response = self._mock_response()
+        first_response.headers = {"ETag": '"v1"', "Last-Modified": "Wed, 17 Jun 2026 08:00:00 GMT"}
+        not_modified = Mock()
+        not_modified.status_code = 304
+        not_modified.url = "https://feeds.example.com/rss.xml"
+        not_modified.headers = {}
+        changed = self._mock_response()
+        changed.headers = {"ETag": '"v2"'}
+
+        with patch("src.services.intelligence_service.requests.get", side_effect=[first_response, not_modified, changed]) as mock_get:
+            first = self.service.fetch_source(source["id"])
+            second = self.service.fetch_source(source["id"])
+            third = self.service.fetch_source(source["id"])
+
+        self.assertEqual(first["saved_count"], 2)
+        self.assertNotIn("If-None-Match", mock_get.call_args_list[0].kwargs["headers"])
+        self.assertEqual(mock_get.call_args_list[1].kwargs["headers"]["If-None-Match"], '"v1"')
+        self.assertEqual(
+            mock_get.call_args_list[1].kwargs["headers"]["If-Modified-Since"],
+            "Wed, 17 Jun 2026 08:00:00 GMT",
+        )
+        self.assertTrue(second["not_modified"])
+        self.assertEqual(second["fetched_count"], 0)
+        self.assertFalse(not_modified.raise_for_status.called)
+        self.assertFalse(third["not_modified"])
+        self.assertEqual(third["fetched_count"], 2)
+        self.assertEqual(third["saved_count"], 0)
+        stored = IntelligenceRepository().get_source(source["id"])
+        self.assertEqual(stored.http_etag, '"v2"')
+        self.assertIsNone(stored.http_last_modified)
+
+    def test_refetch_refreshes_changed_content_of_known_items(self) -> None:
+        source = self.service.create_source({
+            "name": "edited-feed", "url": "https://feeds.example.com/rss.xml", "scope_type": "market",
+        })
+        edited = self._mock_response()
+        edited.iter_content.return_value = [
+            self._feed_fixture("https://feeds.example.com/rss.xml").replace(
+                b"Second summary.", b"Corrected second summary."
+            )
+        ]
+
+        with patch("src.services.intelligence_service.requests.get", side_effect=[self._mock_response(), edited]):
+            self.service.fetch_source(source["id"])
+            second = self.service.fetch_source(source["id"])
+
+        self.assertEqual(second["saved_count"], 0)
+        items = {item["title"]: item for item in self.service.list_items(scope_type="market", market="cn")["items"]}
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items["Second item"]["summary"], "Corrected second summary.")
+        self.assertEqual(items["Policy support lifts AI supply chain"]["summary"], "Market-level catalyst with evidence link.")
+
     def test_fetch_entry_redacts_no_url_link_with_placeholder(self) -> None:
         source = self.service.create_source({
             "name": "market-no-link",
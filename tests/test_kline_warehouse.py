@@ -0,0 +1,227 @@
+# -*- coding: utf-8 -*-
+"""Tests for the local columnar daily K-line warehouse."""
+
+import sys
+import tempfile
+import unittest
+from datetime import date, timedelta
+from pathlib import Path
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pandas as pd
+
+if "litellm" not in sys.modules:
+    sys.modules["litellm"] = MagicMock()
+if "json_repair" not in sys.modules:
+    sys.modules["json_repair"] = MagicMock()
+
+from data_provider.base import BaseFetcher, DataFetcherManager
+from data_provider.kline_warehouse import KlineWarehouse
+
+
+def _bars(start: date, end: date, scale: float = 1.0) -> pd.DataFrame:
+    dates = pd.bdate_range(start, end)
+    close = (10.0 + np.arange(len(dates)) * 0.01) * scale
+    return pd.DataFrame({
+        "date": dates,
+        "open": close,
+        "high": close + 0.1,
+        "low": close - 0.1,
+        "close": close,
+        "volume": np.arange(len(dates), dtype=float) + 1000.0,
+        "amount": close * 1000.0,
+        "pct_chg": np.zeros(len(dates)),
+    })
+
+
+class _TableFetcher(BaseFetcher):
+    name = "TableFetcher"
+    priority = 0
+
+    def __init__(self, table: pd.DataFrame):
+        self.table = table
+        self.calls = []
+
+    def _fetch_raw_data(self, stock_code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        self.calls.append((stock_code, start_date, end_date))
+        mask = (self.table["date"] >= pd.Timestamp(start_date)) & (self.table["date"] <= pd.Timestamp(end_date))
+        return self.table[mask].copy()
+
+    def _normalize_data(self, df: pd.DataFrame, stock_code: str) -> pd.DataFrame:
+        return df.assign(code=stock_code)
+
+
+class KlineWarehouseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self._tmp.name)
+        self.warehouse = KlineWarehouse(self.root)
+
+    def tearDown(self) -> None:
+        self._tmp.cleanup()
+
+    def test_single_partition_read_returns_memory_mapped_views(self) -> None:
+        self.warehouse.write("cn", "600519", _bars(date(2024, 1, 1), date(2024, 6, 28)), source="A", start=date(2024, 1, 1), end=date(2024, 6, 30))
+        self.warehouse.write("cn", "000001", _bars(date(2024, 1, 1), date(2024, 6, 28), 2.0), source="A", start=date(2024, 1, 1), end=date(2024, 6, 30))
+
+        sliced = self.warehouse.read("cn", ["600519", "000001", "300750"], date(2024, 3, 1), date(2024, 3, 29))
+
+        self.assertEqual(sorted(sliced), ["000001", "600519"])
+        self.assertEqual(len(sliced["600519"]), 21)
+        self.assertIsInstance(sliced["600519"].values["close"].base, np.memmap)
+        self.assertAlmostEqual(float(sliced["000001"].values["close"][0]) / float(sliced["600519"].values["close"][0]), 2.0)
+        partition = self.warehouse.partitions()["cn/2024"]
+        self.assertEqual(partition["minDate"], "2024-01-01")
+        self.assertEqual(partition["maxDate"], "2024-06-28")
+
+    def test_incremental_append_prefers_newer_rows_and_compacts(self) -> None:
+        self.warehouse.MAX_SEGMENTS = 3
+        self.warehouse.write("cn", "600519", _bars(date(2023, 12, 1), date(2024, 1, 31)), source="A", start=date(2023, 12, 1), end=date(2024, 1, 31))
+        revised = _bars(date(2024, 1, 29), date(2024, 2, 29))
+        revised.loc[0, "close"] = 99.0
+        self.warehouse.write("cn", "600519", revised, source="A", start=date(2024, 1, 29), end=date(2024, 2, 29))
+        for month in (3, 4, 5):
+            self.warehouse.write("cn", "600519", _bars(date(2024, month, 1), date(2024, month, 28)), source="A", start=date(2024, month, 1), end=date(2024, month, 28))
+
+        coverage = self.warehouse.coverage("cn", "600519")
+        frame = self.warehouse.frame("cn", "600519", date(2023, 12, 1), date(2024, 5, 28))
+
+        self.assertEqual((coverage.start, coverage.end), (date(2023, 12, 1), date(2024, 5, 28)))
+        self.assertTrue(frame["date"].is_monotonic_increasing)
+        self.assertFalse(frame["date"].duplicated().any())
+        self.assertEqual(float(frame.loc[frame["date"] == "2024-01-29", "close"].iloc[0]), 99.0)
+        self.assertLessEqual(len(self.warehouse.partitions()["cn/2024"]["segments"]), 3)
+
+    def test_per_symbol_backfill_merges_only_small_tail_segments(self) -> None:
+        self.warehouse.MAX_SEGMENTS = 100
+        rewritten = []
+        write_segment = self.warehouse._write_segment
+
+        def counting_write_segment(*args, **kwargs):
+            rewritten.append(len(kwargs["codes"]))
+            return write_segment(*args, **kwargs)
+
+        bars = _bars(date(2024, 1, 1), date(2024, 3, 29))
+        with patch.object(self.warehouse, "_write_segment", side_effect=counting_write_segment):
+            for number in range(64):
+                self.warehouse.write("cn", f"{600000 + number}", bars, source="A", start=date(2024, 1, 1), end=date(2024, 3, 31))
+
+        segments = self.warehouse.partitions()["cn/2024"]["segments"]
+        self.assertLessEqual(len(segments), 7)
+        # Each row is rewritten a logarithmic number of times, not once per write.
+        self.assertLessEqual(sum(rewritten), 64 * len(bars) * 8)
+        sliced = self.warehouse.read("cn", ["600000", "600063"], date(2024, 1, 1), date(2024, 3, 29))
+        self.assertEqual([len(sliced["600000"]), len(sliced["600063"])], [len(bars), len(bars)])
+
+    def test_reader_with_stale_index_retries_after_concurrent_compaction(self) -> None:
+        for month in (1, 2, 3):
+            self.warehouse.write("cn", "600519", _bars(date(2024, month, 1), date(2024, month, 28)), source="A", start=date(2024, month, 1), end=date(2024, month, 28))
+        reader = KlineWarehouse(self.root)
+        stale = reader._load_index()
+        self.warehouse.compact()
+        load_index = reader._load_index
+
+        def stale_then_fresh(force: bool = False) -> dict:
+            return load_index(force=True) if force else stale
+
+        with patch.object(reader, "_load_index", side_effect=stale_then_fresh) as loads:
+            frame = reader.frame("cn", "600519", date(2024, 1, 1), date(2024, 3, 28))
+
+        self.assertEqual([call.kwargs.get("force") for call in loads.call_args_list], [False, True])
+        self.assertEqual(len(frame), sum(len(_bars(date(2024, month, 1), date(2024, month, 28))) for month in (1, 2, 3)))
+
+    def test_source_change_and_invalidate_hide_stale_rows(self) -> None:
+        self.warehouse.write("cn", "600519", _bars(date(2024, 1, 1), date(2024, 3, 29)), source="A", start=date(2024, 1, 1), end=date(2024, 3, 31))
+        self.warehouse.write("cn", "600519", _bars(date(2024, 3, 1), date(2024, 3, 29), 3.0), source="B", start=date(2024, 3, 1), end=date(2024, 3, 31))
+
+        self.assertIsNone(self.warehouse.frame("cn", "600519", date(2024, 1, 1), date(2024, 2, 28)))
+        self.assertEqual(self.warehouse.coverage("cn", "600519").source, "B")
+
+        self.warehouse.compact()
+        self.warehouse.invalidate("cn", "600519")
+
+        self.assertIsNone(self.warehouse.coverage("cn", "600519"))
+        self.assertEqual(self.warehouse.read("cn", ["600519"], date(2024, 1, 1), date(2024, 3, 31)), {})
+
+    def test_rows_from_today_are_not_stored(self) -> None:
+        today = date.today()
+        written = self.warehouse.write("us", "AAPL", _bars(today - timedelta(days=20), today), source="A", start=today - timedelta(days=20), end=today)
+
+        coverage = self.warehouse.coverage("us", "AAPL")
+        frame = self.warehouse.frame("us", "AAPL", today - timedelta(days=20), today)
+
+        self.assertEqual(coverage.end, today - timedelta(days=1))
+        self.assertEqual(len(frame), written)
+        self.assertLess(frame["date"].max().date(), today)
+
+
+class DataFetcherManagerKlineWarehouseTest(unittest.TestCase):
+    def setUp(self) -> None:
+        self._tmp = tempfile.TemporaryDirectory()
+        config = SimpleNamespace(kline_warehouse_dir=self._tmp.name)
+        self._config_patch = patch("src.config.get_config", return_value=config)
+        self._config_patch.start()
+
+    def tearDown(self) -> None:
+        self._config_patch.stop()
+        KlineWarehouse._instances.pop(str(Path(self._tmp.name).resolve()), None)
+        self._tmp.cleanup()
+
+    def test_closed_range_is_served_from_warehouse_after_first_fetch(self) -> None:
+        fetcher = _TableFetcher(_bars(date(2023, 1, 2), date(2024, 6, 28)))
+        manager = DataFetcherManager(fetchers=[fetcher])
+
+        first, first_source = manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-05-31")
+        second, second_source = manager.get_daily_data("600519", start_date="2023-09-01", end_date="2024-02-29")
+
+        self.assertEqual(len(fetcher.calls), 1)
+        self.assertEqual((first_source, second_source), ("TableFetcher", "TableFetcher"))
+        expected = first[(first["date"] >= "2023-09-01") & (first["date"] <= "2024-02-29")]
+        pd.testing.assert_series_equal(
+            second["close"].reset_index(drop=True),
+            expected["close"].reset_index(drop=True),
+        )
+        self.assertEqual(list(second.columns[:2]), ["code", "date"])
+        self.assertIn("ma20", second.columns)
+
+    def test_missing_tail_is_fetched_incrementally_from_the_same_source(self) -> None:
+        fetcher = _TableFetcher(_bars(date(2023, 1, 2), date(2024, 6, 28)))
+        manager = DataFetcherManager(fetchers=[fetcher])
+        manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-03-29")
+
+        df, _source = manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-06-28")
+
+        self.assertEqual(len(fetcher.calls), 2)
+        self.assertEqual(fetcher.calls[1][1], "2024-03-25")
+        self.assertEqual(df["date"].max(), pd.Timestamp("2024-06-28"))
+        self.assertEqual(len(df), len(pd.bdate_range("2023-06-01", "2024-06-28")))
+
+    def test_suspension_longer_than_a_week_still_appends_the_tail(self) -> None:
+        table = _bars(date(2023, 1, 2), date(2024, 6, 28))
+        suspended = (table["date"] > "2024-02-16") & (table["date"] < "2024-04-15")
+        fetcher = _TableFetcher(table[~suspended].reset_index(drop=True))
+        manager = DataFetcherManager(fetchers=[fetcher])
+        manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-03-29")
+
+        df, _source = manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-06-28")
+
+        self.assertEqual([call[1] for call in fetcher.calls], ["2023-06-01", "2024-02-12"])
+        self.assertIsNotNone(manager._get_kline_warehouse().coverage("cn", "600519"))
+        self.assertEqual(len(df), int((fetcher.table["date"] >= "2023-06-01").sum()))
+
+    def test_readjusted_history_triggers_full_refetch(self) -> None:
+        fetcher = _TableFetcher(_bars(date(2023, 1, 2), date(2024, 6, 28)))
+        manager = DataFetcherManager(fetchers=[fetcher])
+        manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-03-29")
+        fetcher.table = _bars(date(2023, 1, 2), date(2024, 6, 28), 0.9)
+
+        df, _source = manager.get_daily_data("600519", start_date="2023-06-01", end_date="2024-06-28")
+
+        self.assertEqual([call[1] for call in fetcher.calls], ["2023-06-01", "2024-03-25", "2023-06-01"])
+        self.assertAlmostEqual(float(df["close"].iloc[0]), float(fetcher.table.loc[fetcher.table["date"] == "2023-06-01", "close"].iloc[0]))
+
+
+if __name__ == "__main__":
+    unittest.main()
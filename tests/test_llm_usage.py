@@ -8,6 +8,8 @@ import os
 import sqlite3
 import sys
 import tempfile
+import threading
+import time
 import unittest
 from datetime import datetime, timedelta
 from pathlib import Path
@@ -42,6 +44,9 @@ from src.llm.provider_cache import filter_prompt_cache_telemetry
 from src.storage import (
     DatabaseManager,
     LLMUsage,
+    LLMUsageRollup,
+    LLMUsageRollupState,
+    LLMUsageWriter,
     persist_llm_usage,
     _LLM_USAGE_TELEMETRY_COLUMN_SQL,
 )
@@ -1550,6 +1555,122 @@ class TestGetLLMUsageSummary(unittest.TestCase):
         self.assertEqual(result["by_model"], [])
 
 
+class TestLLMUsageRollups(unittest.TestCase):
+    def setUp(self):
+        self.db = _fresh_db()
+        self.now = datetime(2026, 3, 10, 15, 30)
+        rows = [
+            # 3/8: two attributed analysis calls in one hour, one agent call later
+            ("analysis", "gemini/gemini-2.5-flash", 7, datetime(2026, 3, 8, 9, 5), 100),
+            ("analysis", "gemini/gemini-2.5-flash", 7, datetime(2026, 3, 8, 9, 50), 300),
+            ("agent", "openai/gpt-4o", None, datetime(2026, 3, 8, 22, 10), 50),
+            # 3/10: closed hour and the still-open 15:00 hour
+            ("analysis", "gemini/gemini-2.5-flash", None, datetime(2026, 3, 10, 11, 0), 40),
+            ("agent", "openai/gpt-4o", 7, datetime(2026, 3, 10, 15, 10), 20),
+        ]
+        with self.db.session_scope() as session:
+            for call_type, model, version_id, called_at, total in rows:
+                session.add(LLMUsage(
+                    call_type=call_type,
+                    model=model,
+                    strategy_version_id=version_id,
+                    prompt_tokens=total // 2,
+                    completion_tokens=total - total // 2,
+                    total_tokens=total,
+                    called_at=called_at,
+                ))
+
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def _rollups(self, granularity):
+        with self.db.session_scope() as session:
+            return {
+                (row.bucket_start, row.call_type, row.strategy_version_id): (row.calls, row.total_tokens, row.max_total_tokens)
+                for row in session.query(LLMUsageRollup).filter(LLMUsageRollup.granularity == granularity)
+            }
+
+    def test_compaction_rolls_closed_hours_and_days_once(self):
+        written = self.db.compact_llm_usage_rollups(now=self.now)
+
+        self.assertEqual(self._rollups("hour"), {
+            (datetime(2026, 3, 8, 9), "analysis", 7): (2, 400, 300),
+            (datetime(2026, 3, 8, 22), "agent", 0): (1, 50, 50),
+            (datetime(2026, 3, 10, 11), "analysis", 0): (1, 40, 40),
+        })
+        self.assertEqual(self._rollups("day"), {
+            (datetime(2026, 3, 8), "analysis", 7): (2, 400, 300),
+            (datetime(2026, 3, 8), "agent", 0): (1, 50, 50),
+        })
+        self.assertEqual(written, {"hour": 3, "day": 2})
+        self.assertEqual(self.db.compact_llm_usage_rollups(now=self.now), {"hour": 0, "day": 0})
+
+    def test_summary_reads_rollups_for_compacted_buckets_and_raw_rows_for_open_bucket(self):
+        self.db.compact_llm_usage_rollups(now=self.now)
+        with self.db.session_scope() as session:
+            # Compacted raw rows are no longer consulted for whole buckets.
+            session.query(LLMUsage).filter(LLMUsage.called_at < datetime(2026, 3, 9)).delete()
+
+        result = self.db.get_llm_usage_summary(datetime(2026, 3, 1), self.now)
+        scoped = self.db.get_llm_usage_summary(datetime(2026, 3, 1), self.now, strategy_version_id=7)
+
+        self.assertEqual(result["total_calls"], 5)
+        self.assertEqual(result["total_tokens"], 510)
+        self.assertEqual(result["attributed_calls"], 3)
+        by_model = {row["model"]: row for row in result["by_model"]}
+        self.assertEqual(by_model["gemini/gemini-2.5-flash"]["max_total_tokens"], 300)
+        self.assertEqual(by_model["openai/gpt-4o"]["calls"], 2)
+        self.assertEqual([row["call_type"] for row in result["by_call_type"]], ["analysis", "agent"])
+        self.assertEqual(scoped["total_calls"], 3)
+        self.assertEqual(scoped["total_tokens"], 420)
+
+    def test_partial_window_edges_fall_back_to_raw_rows(self):
+        self.db.compact_llm_usage_rollups(now=self.now)
+
+        result = self.db.get_llm_usage_summary(datetime(2026, 3, 8, 9, 30), datetime(2026, 3, 10, 11, 0))
+
+        self.assertEqual(result["total_calls"], 3)
+        self.assertEqual(result["total_tokens"], 390)
+
+    def test_summary_does_not_compact(self):
+        result = self.db.get_llm_usage_summary(datetime(2026, 3, 1), self.now)
+
+        self.assertEqual(result["total_calls"], 5)
+        self.assertEqual(self._rollups("hour"), {})
+        with self.db.session_scope() as session:
+            self.assertEqual(session.query(LLMUsageRollupState).count(), 0)
+
+    def test_grace_covers_writer_flush_latency(self):
+        with self.db.session_scope() as session:
+            session.add(LLMUsage(
+                call_type="agent",
+                model="openai/gpt-4o",
+                prompt_tokens=1,
+                completion_tokens=1,
+                total_tokens=2,
+                called_at=datetime(2026, 3, 10, 13, 40),
+            ))
+        self.db._llm_usage_writer.close()
+        self.db._llm_usage_writer = LLMUsageWriter(
+            self.db._insert_llm_usage_rows,
+            flush_interval_ms=3_600_000,
+            batch_size=10,
+            max_queue=10,
+        )
+        try:
+            self.assertGreater(self.db._llm_usage_writer.max_flush_latency, timedelta(hours=1))
+            self.db.compact_llm_usage_rollups(now=self.now)
+        finally:
+            self.db._llm_usage_writer.close()
+
+        # The 13:00 hour closed less than one writer flush latency before now.
+        self.assertEqual(set(self._rollups("hour")), {
+            (datetime(2026, 3, 8, 9), "analysis", 7),
+            (datetime(2026, 3, 8, 22), "agent", 0),
+            (datetime(2026, 3, 10, 11), "analysis", 0),
+        })
+
+
 class TestPersistUsageHelper(unittest.TestCase):
     """Test that _persist_usage swallows exceptions and writes correctly."""
 
@@ -1765,6 +1886,110 @@ class TestPersistUsageHelper(unittest.TestCase):
             self.fail(f"persist_llm_usage raised unexpectedly: {exc}")
 
 
+class TestLLMUsageWriter(unittest.TestCase):
+    def tearDown(self):
+        DatabaseManager.reset_instance()
+
+    def test_batches_rows_and_flushes_before_usage_reads(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            DatabaseManager.reset_instance()
+            db = DatabaseManager(db_url=f"sqlite:///{Path(tmpdir) / 'usage.sqlite'}")
+            db._llm_usage_writer.close()
+            batches = []
+
+            def write_batch(rows):
+                batches.append(len(rows))
+                db._insert_llm_usage_rows(rows)
+
+            db._llm_usage_writer = LLMUsageWriter(write_batch, flush_interval_ms=60_000, batch_size=3)
+
+            for _ in range(4):
+                persist_llm_usage({"total_tokens": 7}, "openai/gpt-4o", call_type="analysis")
+            self.assertTrue(db.flush_llm_usage(timeout=5))
+            self.assertEqual(batches, [3, 1])
+
+            persist_llm_usage({"total_tokens": 5}, "openai/gpt-4o", call_type="agent")
+            summary = db.get_llm_usage_summary(
+                datetime.now() - timedelta(minutes=1),
+                datetime.now() + timedelta(minutes=1),
+            )
+            self.assertEqual(summary["total_calls"], 5)
+            self.assertEqual(summary["total_tokens"], 33)
+            stats = db.get_llm_usage_writer_stats()
+            self.assertEqual(stats["written"], 5)
+            self.assertEqual(stats["dropped"], 0)
+            DatabaseManager.reset_instance()
+
+    def test_full_queue_drops_and_counts_rows_until_drained(self):
+        written = []
+        release = threading.Event()
+
+        def write_batch(rows):
+            release.wait(5)
+            written.extend(rows)
+
+        writer = LLMUsageWriter(write_batch, flush_interval_ms=1, batch_size=1, max_queue=1)
+        try:
+            self.assertTrue(writer.submit({"id": 1}))
+            deadline = time.monotonic() + 5
+            while writer.stats()["in_flight"] == 0 and time.monotonic() < deadline:
+                time.sleep(0.001)
+            self.assertTrue(writer.submit({"id": 2}))
+            self.assertFalse(writer.submit({"id": 3}))
+            release.set()
+            self.assertTrue(writer.flush(timeout=5))
+        finally:
+            release.set()
+            writer.close()
+
+        self.assertEqual(written, [{"id": 1}, {"id": 2}])
+        stats = writer.stats()
+        self.assertEqual(stats["dropped"], 1)
+        self.assertEqual(stats["backpressure_waits"], 1)
+        self.assertFalse(writer.submit({"id": 4}))
+
+    def test_close_writes_pending_rows(self):
+        written = []
+        writer = LLMUsageWriter(written.extend, flush_interval_ms=60_000, batch_size=100)
+        writer.submit({"id": 1})
+        writer.submit({"id": 2})
+
+        writer.close()
+
+        self.assertEqual(written, [{"id": 1}, {"id": 2}])
+        self.assertEqual(writer.stats()["queued"], 0)
+
+    def test_maintenance_runs_on_writer_thread_once_queue_is_idle(self):
+        calls = []
+        written = []
+        ran = threading.Event()
+
+        def maintenance():
+            calls.append((threading.current_thread().name, len(written)))
+            ran.set()
+
+        writer = LLMUsageWriter(
+            written.extend,
+            flush_interval_ms=1,
+            batch_size=100,
+            maintenance=maintenance,
+            maintenance_interval=3600,
+        )
+        try:
+            writer.submit({"id": 1})
+            self.assertTrue(ran.wait(5))
+            writer.submit({"id": 2})
+            self.assertTrue(writer.flush(timeout=5))
+        finally:
+            writer.close()
+
+        self.assertEqual(calls, [("llm-usage-writer", 1)])
+
+    def test_in_memory_database_writes_synchronously(self):
+        db = _fresh_db()
+        self.assertTrue(db._llm_usage_writer.synchronous)
+
+
 class TestLLMUsageMigration(unittest.TestCase):
     def tearDown(self):
         DatabaseManager.reset_instance()
@@ -21,7 +21,14 @@ from sqlalchemy import select
 from src.config import Config
 from src.repositories.portfolio_repo import PortfolioBusyError, PortfolioRepository
 from src.services.portfolio_service import _AvgState, PortfolioConflictError, PortfolioOversellError, PortfolioService
-from src.storage import DatabaseManager, PortfolioDailySnapshot, PortfolioPosition, PortfolioPositionLot, PortfolioTrade
+from src.storage import (
+    DatabaseManager,
+    PortfolioDailySnapshot,
+    PortfolioPosition,
+    PortfolioPositionLot,
+    PortfolioReplayCheckpoint,
+    PortfolioTrade,
+)
 
 
 class PortfolioServiceTestCase(unittest.TestCase):
@@ -1125,6 +1132,120 @@ class PortfolioServiceTestCase(unittest.TestCase):
         self.assertEqual(len(snapshot_rows), 0)
         self.assertEqual(len(lot_rows), 0)
 
+    def _replay_checkpoint_dates(self, aid: int) -> list:
+        with self.db.get_session() as session:
+            rows = session.execute(
+                select(PortfolioReplayCheckpoint).where(PortfolioReplayCheckpoint.account_id == aid)
+            ).scalars().all()
+        return sorted(row.checkpoint_date for row in rows)
+
+    def test_snapshot_resumes_from_replay_checkpoint(self) -> None:
+        account = self.service.create_account(name="Main", broker="Demo", market="cn", base_currency="CNY")
+        aid = account["id"]
+        self.service.record_cash_ledger(
+            account_id=aid,
+            event_date=date(2026, 1, 1),
+            direction="in",
+            amount=10000,
+            currency="CNY",
+        )
+        for trade_date, side, quantity, price in (
+            (date(2026, 1, 2), "buy", 100, 10),
+            (date(2026, 1, 5), "sell", 40, 12),
+            (date(2026, 1, 12), "buy", 10, 11),
+        ):
+            self.service.record_trade(
+                account_id=aid,
+                symbol="600519",
+                trade_date=trade_date,
+                side=side,
+                quantity=quantity,
+                price=price,
+                fee=1.5,
+                market="cn",
+                currency="CNY",
+            )
+        self.service.record_corporate_action(
+            account_id=aid,
+            symbol="600519",
+            effective_date=date(2026, 1, 6),
+            action_type="cash_dividend",
+            market="cn",
+            currency="CNY",
+            cash_dividend_per_share=0.5,
+        )
+        self._save_close("600519", date(2026, 1, 15), 13.0)
+
+        self.service.get_portfolio_snapshot(account_id=aid, as_of=date(2026, 1, 10), cost_method="fifo")
+        self.assertEqual(self._replay_checkpoint_dates(aid), [date(2026, 1, 9)])
+
+        with patch.object(self.service.repo, "list_trades", wraps=self.service.repo.list_trades) as list_trades:
+            resumed = self.service.get_portfolio_snapshot(account_id=aid, as_of=date(2026, 1, 15), cost_method="fifo")
+        self.assertEqual(list_trades.call_args.kwargs["after"], date(2026, 1, 9))
+        self.assertEqual(self._replay_checkpoint_dates(aid), [date(2026, 1, 9), date(2026, 1, 14)])
+
+        with self.db.get_session() as session:
+            session.query(PortfolioReplayCheckpoint).delete()
+            session.commit()
+        full = self.service.get_portfolio_snapshot(account_id=aid, as_of=date(2026, 1, 15), cost_method="fifo")
+
+        resumed_acc = resumed["accounts"][0]
+        full_acc = full["accounts"][0]
+        for field_name in ("total_cash", "total_market_value", "realized_pnl", "unrealized_pnl", "fee_total"):
+            self.assertEqual(resumed_acc[field_name], full_acc[field_name], field_name)
+        self.assertEqual(resumed_acc["positions"], full_acc["positions"])
+        self.assertAlmostEqual(resumed_acc["positions"][0]["quantity"], 70.0, places=6)
+
+    def test_backdated_event_invalidates_replay_checkpoints(self) -> None:
+        account = self.service.create_account(name="Main", broker="Demo", market="cn", base_currency="CNY")
+        aid = account["id"]
+        self.service.record_cash_ledger(
+            account_id=aid,
+            event_date=date(2026, 1, 1),
+            direction="in",
+            amount=10000,
+            currency="CNY",
+        )
+        trade = self.service.record_trade(
+            account_id=aid,
+            symbol="600519",
+            trade_date=date(2026, 1, 5),
+            side="buy",
+            quantity=100,
+            price=10,
+            market="cn",
+            currency="CNY",
+        )
+        self._save_close("600519", date(2026, 1, 20), 10.0)
+        for as_of in (date(2026, 1, 4), date(2026, 1, 10), date(2026, 1, 20)):
+            self.service.get_portfolio_snapshot(account_id=aid, as_of=as_of, cost_method="fifo")
+        # The 1/20 read resumes from the 1/9 checkpoint with no newer events, so it
+        # has nothing new to persist.
+        self.assertEqual(
+            self._replay_checkpoint_dates(aid),
+            [date(2026, 1, 3), date(2026, 1, 9)],
+        )
+
+        self.service.record_corporate_action(
+            account_id=aid,
+            symbol="600519",
+            effective_date=date(2026, 1, 9),
+            action_type="split_adjustment",
+            market="cn",
+            currency="CNY",
+            split_ratio=2.0,
+        )
+        self.assertEqual(self._replay_checkpoint_dates(aid), [date(2026, 1, 3)])
+
+        snapshot = self.service.get_portfolio_snapshot(account_id=aid, as_of=date(2026, 1, 20), cost_method="fifo")
+        self.assertAlmostEqual(snapshot["accounts"][0]["positions"][0]["quantity"], 200.0, places=6)
+
+        self.assertTrue(self.service.delete_trade_event(trade["id"]))
+        self.assertEqual(self._replay_checkpoint_dates(aid), [date(2026, 1, 3)])
+        snapshot = self.service.get_portfolio_snapshot(account_id=aid, as_of=date(2026, 1, 20), cost_method="fifo")
+        self.assertEqual(snapshot["accounts"][0]["positions"], [])
+        self.assertAlmostEqual(snapshot["accounts"][0]["total_cash"], 10000.0, places=6)
+
     def test_concurrent_sell_race_allows_only_one_write(self) -> None:
         account = self.service.create_account(name="Main", broker="Demo", market="cn", base_currency="CNY")
         aid = account["id"]
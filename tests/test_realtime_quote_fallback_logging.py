@@ -226,7 +226,7 @@ def test_event_monitor_keeps_manager_failure_summary_for_direct_quote_call(mock_
     async def _run_inline(func, *args, **kwargs):
         return func(*args, **kwargs)
 
-    with patch("data_provider.DataFetcherManager", return_value=manager), patch(
+    with patch("data_provider.base.DataFetcherManager", return_value=manager), patch(
         "src.agent.events.asyncio.to_thread", new=_run_inline
     ), caplog.at_level(logging.INFO):
         result = asyncio.run(monitor._check_price(rule))
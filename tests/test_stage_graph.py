@@ -0,0 +1,97 @@
+# -*- coding: utf-8 -*-
+"""Tests for the concurrent analysis stage graph."""
+
+import os
+import sys
+import threading
+import time
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.core.stage_graph import StageGraph
+from src.services.run_diagnostics import (
+    activate_run_diagnostic_context,
+    current_diagnostic_snapshot,
+    reset_run_diagnostic_context,
+)
+
+
+class StageGraphTestCase(unittest.TestCase):
+    def test_independent_stages_overlap(self) -> None:
+        barrier = threading.Barrier(2, timeout=2)
+        graph = StageGraph()
+        try:
+            graph.add("a", lambda: barrier.wait() is not None)
+            graph.add("b", lambda: barrier.wait() is not None)
+            self.assertTrue(graph.result("a", timeout=3))
+            self.assertTrue(graph.result("b", timeout=3))
+        finally:
+            graph.close()
+
+    def test_dependent_stage_reads_upstream_results(self) -> None:
+        graph = StageGraph()
+        try:
+            graph.add("quote", lambda: (time.sleep(0.05), 10)[1])
+            graph.add("bars", lambda: [1, 2, 3])
+            graph.add(
+                "trend",
+                lambda: graph.result("quote") + sum(graph.result("bars")),
+                after=("quote", "bars"),
+            )
+            self.assertEqual(graph.result("trend", timeout=3), 16)
+        finally:
+            graph.close()
+
+    def test_failed_stage_reraises_and_dependents_still_run(self) -> None:
+        def boom() -> None:
+            raise RuntimeError("provider down")
+
+        def degrade() -> str:
+            try:
+                graph.result("quote")
+            except RuntimeError:
+                return "fallback"
+            return "live"
+
+        graph = StageGraph()
+        try:
+            graph.add("quote", boom)
+            graph.add("trend", degrade, after=("quote",))
+            with self.assertRaises(RuntimeError):
+                graph.result("quote", timeout=3)
+            self.assertEqual(graph.result("trend", timeout=3), "fallback")
+        finally:
+            graph.close()
+
+    def test_unknown_dependency_is_rejected(self) -> None:
+        graph = StageGraph()
+        try:
+            with self.assertRaises(ValueError):
+                graph.add("trend", lambda: None, after=("quote",))
+        finally:
+            graph.close()
+
+    def test_stage_timings_recorded_in_active_diagnostics(self) -> None:
+        token = activate_run_diagnostic_context(trace_id="trace-stage")
+        try:
+            graph = StageGraph()
+            try:
+                graph.add("quote", lambda: 1)
+                graph.add("trend", lambda: graph.result("quote") + 1, after=("quote",))
+                self.assertEqual(graph.result("trend", timeout=3), 2)
+            finally:
+                graph.close()
+            snapshot = current_diagnostic_snapshot()
+        finally:
+            reset_run_diagnostic_context(token)
+
+        stage_runs = {run["stage"]: run for run in snapshot["stage_runs"]}
+        self.assertEqual(set(stage_runs), {"quote", "trend"})
+        self.assertTrue(stage_runs["quote"]["success"])
+        self.assertEqual(stage_runs["trend"]["depends_on"], ["quote"])
+        self.assertGreaterEqual(stage_runs["trend"]["offset_ms"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1160,5 +1160,55 @@ class TestStorage(unittest.TestCase):
             temp_dir.cleanup()
             DatabaseManager.reset_instance()
 
+    def test_save_daily_data_bulk_upserts_many_symbols_and_counts_inserts(self):
+        DatabaseManager.reset_instance()
+        temp_dir = tempfile.TemporaryDirectory()
+        db = DatabaseManager(db_url=f"sqlite:///{os.path.join(temp_dir.name, 'bulk_daily.db')}")
+
+        try:
+            db.save_daily_data(
+                pd.DataFrame([{'date': date(2026, 4, 1), 'close': 1.0}]),
+                code='600519',
+                data_source='legacy',
+            )
+            frames = {
+                '600519': pd.DataFrame(
+                    [
+                        {'date': '2026-04-01', 'open': 10, 'close': 10.5, 'volume': 100},
+                        {'date': '2026-04-02', 'open': 10.5, 'close': None, 'volume': 120},
+                        {'date': '2026-04-02', 'open': 10.6, 'close': 10.8, 'volume': 130},
+                    ]
+                ),
+                '000001': pd.DataFrame(
+                    [{'date': pd.Timestamp('2026-04-01'), 'open': 5, 'close': 5.1, 'pct_chg': float('nan')}]
+                ),
+                '000002': pd.DataFrame(),
+            }
+
+            summary = db.save_daily_data_bulk(
+                frames,
+                {'600519': 'BulkFetcher', '000001': 'OtherFetcher'},
+                batch_rows=2,
+            )
+
+            self.assertEqual(summary, {'symbols': 2, 'rows': 3, 'inserted': 2, 'updated': 1})
+            with db.get_session() as session:
+                rows = {
+                    (row.code, row.date): row
+                    for row in session.execute(select(StockDaily)).scalars().all()
+                }
+            self.assertEqual(len(rows), 3)
+            updated = rows[('600519', date(2026, 4, 1))]
+            self.assertEqual((updated.close, updated.data_source), (10.5, 'BulkFetcher'))
+            self.assertEqual(rows[('600519', date(2026, 4, 2))].close, 10.8)
+            self.assertIsNone(rows[('000001', date(2026, 4, 1))].pct_chg)
+            self.assertEqual(rows[('000001', date(2026, 4, 1))].data_source, 'OtherFetcher')
+
+            again = db.save_daily_data_bulk(frames, 'BulkFetcher')
+            self.assertEqual((again['inserted'], again['updated']), (0, 3))
+        finally:
+            DatabaseManager.reset_instance()
+            temp_dir.cleanup()
+
 if __name__ == '__main__':
     unittest.main()
@@ -2,8 +2,10 @@ from __future__ import annotations
 
 import os
 import tempfile
+import threading
 import unittest
 from datetime import date, timedelta
+from types import SimpleNamespace
 from unittest.mock import patch
 
 from api.v1.schemas.simulation import StrategyPublishRequest
@@ -895,3 +897,80 @@ class StrategyDefinitionServiceTest(unittest.TestCase):
         recovered = self.service.get_automatic_run_batch(batch["id"])
         self.assertEqual(recovered["status"], "failed")
         self.assertIn("服务重启", recovered["errorMessage"])
+
+
+class StrategyGraphRuntimeSchedulingTest(unittest.TestCase):
+    @staticmethod
+    def _agent(agent_id: int, kind: str) -> SimpleNamespace:
+        return SimpleNamespace(id=agent_id, lineage_id=f"lineage-{agent_id}", name=f"agent-{agent_id}", agent_type=kind,
+                               role="role", system_prompt="prompt", prompt_template="", timeout_seconds=30)
+
+    @staticmethod
+    def _edge(source: int, target: int, kind: str = "DATA_FLOW") -> SimpleNamespace:
+        return SimpleNamespace(source_agent_id=source, target_agent_id=target, connection_type=kind, field_mapping_json="{}")
+
+    def _execute(self, agents, connections, adapter, max_parallel_agents=4):
+        runtime = StrategyGraphRuntimeService(object(), adapter_factory=lambda: adapter, max_parallel_agents=max_parallel_agents)
+        ordered = runtime._ordered_agents(agents, connections)
+        snapshot = {"input": {"stock_code": "600519"}, "agents": ordered, "connections": connections,
+                    "agentRuns": [runtime._agent_event(item, "queued", None, 0.0) for item in ordered],
+                    "strategyId": 1, "strategyVersionId": 1}
+        finished = {}
+        with patch.object(runtime, "_start", return_value=snapshot), patch.object(runtime, "_checkpoint"), \
+                patch.object(runtime, "_is_cancelled", return_value=False), \
+                patch.object(runtime, "_finish", side_effect=lambda run_id, status, result, error: finished.update(status=status, result=result, error=error) or {"id": run_id, "status": status}):
+            runtime.execute(1)
+        return finished
+
+    def test_independent_branches_run_concurrently_and_reflection_runs_last(self):
+        agents = [self._agent(1, "INPUT"), self._agent(2, "ANALYSIS"), self._agent(3, "ANALYSIS"),
+                  self._agent(4, "DECISION"), self._agent(5, "REFLECTION")]
+        connections = [self._edge(1, 2), self._edge(1, 3), self._edge(2, 4), self._edge(3, 4), self._edge(4, 5, "POST_RUN_CONTEXT")]
+        both_branches_started = threading.Barrier(2, timeout=5)
+        calls: list[str] = []
+
+        class BranchAdapter:
+            def call_text(self, messages, **_kwargs):
+                name = messages[0]["content"]
+                calls.append(messages[1]["content"])
+                if "agent-2" in name or "agent-3" in name:
+                    both_branches_started.wait()
+                return SimpleNamespace(provider="test-provider", model="test-model", content=f"done {len(calls)}", usage=None)
+
+        with patch.object(StrategyGraphRuntimeService, "_system_message", staticmethod(lambda item: item.name)):
+            finished = self._execute(agents, connections, BranchAdapter())
+
+        self.assertEqual(finished["status"], "completed")
+        statuses = {item["agentName"]: item["status"] for item in finished["result"]["agentRuns"]}
+        self.assertEqual(set(statuses.values()), {"completed"})
+        self.assertEqual([item["agentType"] for item in finished["result"]["agentRuns"]][-1], "REFLECTION")
+        self.assertEqual(len(calls), 4)
+        self.assertEqual(calls[2].count("DATA_FLOW"), 2)
+        self.assertIn("POST_RUN_CONTEXT", calls[3])
+
+    def test_failed_branch_fails_run_and_limit_one_runs_sequentially(self):
+        agents = [self._agent(1, "ANALYSIS"), self._agent(2, "ANALYSIS"), self._agent(3, "DECISION")]
+        connections = [self._edge(1, 3), self._edge(2, 3)]
+        active = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        class CountingAdapter:
+            def call_text(self, messages, **_kwargs):
+                with lock:
+                    active["now"] += 1; active["max"] = max(active["max"], active["now"])
+                try:
+                    if "agent-2" in messages[0]["content"]:
+                        raise RuntimeError("branch exploded")
+                    return SimpleNamespace(provider="test-provider", model="test-model", content="ok", usage=None)
+                finally:
+                    with lock:
+                        active["now"] -= 1
+
+        with patch.object(StrategyGraphRuntimeService, "_system_message", staticmethod(lambda item: item.name)):
+            finished = self._execute(agents, connections, CountingAdapter(), max_parallel_agents=1)
+
+        self.assertEqual(finished["status"], "failed")
+        self.assertEqual(finished["error"], "branch exploded")
+        self.assertEqual(active["max"], 1)
+        statuses = [item["status"] for item in finished["result"]["agentRuns"]]
+        self.assertEqual(statuses, ["completed", "failed", "queued"])
@@ -1,11 +1,17 @@
 from __future__ import annotations
 
+import hashlib
 import io
 import json
 import os
+import shutil
+import stat
 import tempfile
+import threading
+import time
 import unittest
 import zipfile
+from pathlib import Path
 from unittest.mock import patch
 
 import yaml
@@ -13,6 +19,8 @@ import yaml
 from src.services.strategy_definition_service import StrategyDefinitionError, StrategyDefinitionService
 from src.services.strategy_package_service import StrategyPackageService
 from src.services.strategy_kernel_executor_service import StrategyKernelExecutorService
+from src.services.strategy_kernel_worker_pool import StrategyKernelWorkerError, StrategyKernelWorkerPool
+from src.services.strategy_package_cache import StrategyPackageCache
 from src.strategy_kernels import research_decision
 from src.storage import DatabaseManager
 
@@ -57,6 +65,15 @@ def package_bytes(name: str = "均值回归策略", source: str | None = None) -
     return buffer.getvalue()
 
 
+def kernel_source(body: str) -> str:
+    return (
+        "CALLS = []\n"
+        "def run(context):\n"
+        f"{body}"
+        "    return {'status': 'success', 'contract': 'DecisionProposal', 'dataCoverage': {}, 'warnings': ['call %d' % len(CALLS)]}\n"
+    )
+
+
 class StrategyPackageServiceTest(unittest.TestCase):
     def setUp(self):
         self.database_path = tempfile.mktemp(suffix=".sqlite")
@@ -72,9 +89,7 @@ class StrategyPackageServiceTest(unittest.TestCase):
         DatabaseManager.reset_instance()
         if os.path.exists(self.database_path):
             os.unlink(self.database_path)
-        for filename in os.listdir(self.package_dir):
-            os.unlink(os.path.join(self.package_dir, filename))
-        os.rmdir(self.package_dir)
+        shutil.rmtree(self.package_dir)
 
     def test_intake_creates_a_reusable_kernel_then_an_independent_configuration_draft(self):
         result = self.service.intake("mean-reversion.zip", package_bytes())
@@ -127,6 +142,18 @@ class StrategyPackageServiceTest(unittest.TestCase):
         self.assertEqual(executed["status"], "success")
         self.assertEqual(executed["contract"], "DecisionProposal")
 
+    def test_uploaded_kernel_stays_loaded_in_a_warm_worker_between_calls(self):
+        source = kernel_source("    CALLS.append(1)\n    print('ignored by the reply protocol')\n")
+        result = self.service.intake("warm.zip", package_bytes(source=source))
+        executor = StrategyKernelExecutorService(self.service.definition)
+        payload = {"inputs": {}, "data": {"primary_ohlcv": [{"date": "2026-01-01", "close": 10.0}]}}
+
+        first = executor.execute(result["draft"]["id"], payload)
+        second = executor.execute(result["draft"]["id"], payload)
+
+        self.assertEqual(first["warnings"], ["call 1"])
+        self.assertEqual(second["warnings"], ["call 2"])
+
     def test_intake_rejects_path_traversal(self):
         buffer = io.BytesIO()
         with zipfile.ZipFile(buffer, "w") as archive:
@@ -176,5 +203,191 @@ class StrategyPackageServiceTest(unittest.TestCase):
         self.assertNotIn("agentRuns", json.dumps(result, ensure_ascii=False))
 
 
+class StrategyKernelWorkerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.pool = StrategyKernelWorkerPool(
+            timeout_seconds=2,
+            output_limit_bytes=4096,
+            preexec=lambda: StrategyKernelExecutorService._limits(2 * StrategyKernelWorkerPool.MAX_CALLS_PER_WORKER),
+        )
+
+    def tearDown(self):
+        self.pool.shutdown()
+        for directory, _dirs, _files in os.walk(self.directory):
+            os.chmod(directory, stat.S_IRWXU)
+        shutil.rmtree(self.directory)
+
+    def _run(self, name: str, body: str) -> dict:
+        target = Path(self.directory) / name
+        if not target.exists():
+            target.mkdir()
+            with zipfile.ZipFile(io.BytesIO(package_bytes(source=kernel_source(body)))) as archive:
+                StrategyKernelExecutorService._extract_package(archive, target)
+        return self.pool.run(name, lambda: target, {"inputs": {}})
+
+    def test_workers_are_recycled_after_max_calls(self):
+        self.pool.MAX_CALLS_PER_WORKER = 2
+        warnings = [self._run("recycled", "    CALLS.append(1)\n")["warnings"] for _ in range(3)]
+        self.assertEqual(warnings, [["call 1"], ["call 2"], ["call 1"]])
+        self.assertEqual(self.pool.stats()["idleWorkers"], 1)
+
+    def test_idle_workers_and_packages_are_evicted(self):
+        self._run("idle", "")
+        self.assertEqual(self.pool.stats(), {"packages": 1, "idleWorkers": 1, "busyWorkers": 0})
+        self.pool.IDLE_SECONDS = 0
+        self._run("other", "")
+        self.assertEqual(self.pool.stats(), {"packages": 1, "idleWorkers": 1, "busyWorkers": 0})
+
+    def test_reaper_evicts_idle_workers_without_new_requests(self):
+        self.pool.IDLE_SECONDS = 0
+        self.pool.REAP_INTERVAL_SECONDS = 0.05
+        self._run("reaped", "")
+        deadline = time.monotonic() + 5
+        while self.pool.stats()["packages"] and time.monotonic() < deadline:
+            time.sleep(0.05)
+        self.assertEqual(self.pool.stats(), {"packages": 0, "idleWorkers": 0, "busyWorkers": 0})
+
+    def test_cold_package_resolve_does_not_block_other_packages(self):
+        self._run("warm", "    CALLS.append(1)\n")
+        resolving, release, resolved = threading.Event(), threading.Event(), threading.Event()
+        cold = Path(self.directory) / "cold"
+        cold.mkdir()
+        with zipfile.ZipFile(io.BytesIO(package_bytes(source=kernel_source("")))) as archive:
+            StrategyKernelExecutorService._extract_package(archive, cold)
+
+        def slow_resolve() -> Path:
+            resolving.set()
+            release.wait(timeout=5)
+            resolved.set()
+            return cold
+
+        results = []
+        thread = threading.Thread(target=lambda: results.append(self.pool.run("cold", slow_resolve, {"inputs": {}})))
+        thread.start()
+        try:
+            self.assertTrue(resolving.wait(timeout=5))
+            self.assertEqual(self._run("warm", "    CALLS.append(1)\n")["warnings"], ["call 2"])
+            self.assertFalse(resolved.is_set())
+        finally:
+            release.set()
+            thread.join(timeout=10)
+        self.assertEqual(results[0]["warnings"], ["call 0"])
+
+    def test_every_spawn_reverifies_the_package_directory(self):
+        self.pool.MAX_CALLS_PER_WORKER = 1
+        content = package_bytes(source=kernel_source(
+            "    import os\n"
+            "    CALLS.append(os.path.exists('state.txt'))\n"
+            "    try:\n"
+            "        with open('state.txt', 'w') as handle:\n"
+            "            handle.write('persisted')\n"
+            "    except OSError:\n"
+            "        pass\n"
+            "    if CALLS[0]:\n"
+            "        raise ValueError('state leaked between workers')\n"
+        ))
+        digest = hashlib.sha256(content).hexdigest()
+        archive_path = Path(self.directory) / f"{digest}.zip"
+        archive_path.write_bytes(content)
+        cache = StrategyPackageCache(Path(self.directory) / "extracted")
+        resolves = []
+
+        def resolve() -> Path:
+            resolves.append(digest)
+            return cache.materialize(digest, archive_path, StrategyKernelExecutorService._extract_package)
+
+        for _ in range(2):
+            self.assertEqual(self.pool.run(digest, resolve, {"inputs": {}})["warnings"], ["call 1"])
+        self.assertEqual(len(resolves), 2)
+
+    def test_timeout_and_output_limit_kill_the_worker(self):
+        with self.assertRaises(StrategyKernelWorkerError) as timed_out:
+            self._run("slow", "    while True:\n        pass\n")
+        self.assertEqual(timed_out.exception.code, "STRATEGY_KERNEL_TIMEOUT")
+        with self.assertRaises(StrategyKernelWorkerError) as too_large:
+            self._run("large", "    CALLS.append('x' * 8192)\n    return {'payload': CALLS}\n")
+        self.assertEqual(too_large.exception.code, "STRATEGY_KERNEL_OUTPUT_TOO_LARGE")
+        self.assertEqual(self.pool.stats()["idleWorkers"], 0)
+
+    def test_kernel_exceptions_keep_the_worker_warm(self):
+        with self.assertRaises(StrategyKernelWorkerError) as failed:
+            self._run("raises", "    CALLS.append(1)\n    if len(CALLS) == 1:\n        raise ValueError('bad input')\n")
+        self.assertEqual(failed.exception.code, "STRATEGY_KERNEL_EXECUTION_FAILED")
+        self.assertEqual(failed.exception.message, "ValueError: bad input")
+        self.assertEqual(self._run("raises", "")["warnings"], ["call 2"])
+
+
+
+class StrategyPackageCacheTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = Path(tempfile.mkdtemp())
+        self.extractions = 0
+
+    def tearDown(self):
+        for directory, _dirs, _files in os.walk(self.directory):
+            os.chmod(directory, stat.S_IRWXU)
+        shutil.rmtree(self.directory)
+
+    def _archive(self, name: str) -> tuple[str, Path]:
+        content = package_bytes(name=name)
+        digest = hashlib.sha256(content).hexdigest()
+        path = self.directory / f"{digest}.zip"
+        path.write_bytes(content)
+        return digest, path
+
+    def _extract(self, archive: zipfile.ZipFile, target: Path) -> Path:
+        self.extractions += 1
+        return StrategyKernelExecutorService._extract_package(archive, target)
+
+    def test_archive_is_extracted_once_and_reverified_on_every_use(self):
+        cache = StrategyPackageCache(self.directory / "extracted")
+        digest, archive_path = self._archive("缓存策略")
+
+        first = cache.materialize(digest, archive_path, self._extract)
+        second = cache.materialize(digest, archive_path, self._extract)
+        self.assertEqual(first, second)
+        self.assertEqual(self.extractions, 1)
+        self.assertTrue((first / "strategy.py").exists())
+        self.assertFalse((first / "strategy.py").stat().st_mode & stat.S_IWUSR)
+        self.assertFalse(first.stat().st_mode & stat.S_IWUSR)
+        self.assertFalse((first / "schemas").stat().st_mode & stat.S_IWUSR)
+
+        first.chmod(0o755)
+        (first / "strategy.py").chmod(0o644)
+        (first / "strategy.py").write_text("def run(context):\n    return {}\n", encoding="utf-8")
+        repaired = cache.materialize(digest, archive_path, self._extract)
+        self.assertEqual(self.extractions, 2)
+        self.assertIn("DecisionProposal", (repaired / "strategy.py").read_text(encoding="utf-8"))
+
+        repaired.chmod(0o755)
+        (repaired / "state.pkl").write_bytes(b"persisted")
+        cleaned = cache.materialize(digest, archive_path, self._extract)
+        self.assertEqual(self.extractions, 3)
+        self.assertFalse((cleaned / "state.pkl").exists())
+
+    def test_rejects_archive_that_does_not_match_its_digest(self):
+        cache = StrategyPackageCache(self.directory / "extracted")
+        _digest, archive_path = self._archive("篡改策略")
+        with self.assertRaises(StrategyDefinitionError) as rejected:
+            cache.materialize("0" * 64, archive_path, self._extract)
+        self.assertEqual(rejected.exception.code, "STRATEGY_KERNEL_ARCHIVE_INVALID")
+
+    def test_least_recently_used_entries_are_evicted_over_the_size_cap(self):
+        archives = [self._archive(f"策略{index}") for index in range(3)]
+        probe = StrategyPackageCache(self.directory / "probe")
+        probe.materialize(*archives[0], self._extract)
+        entry_bytes = probe.entries()[0]["bytes"]
+        cache = StrategyPackageCache(self.directory / "extracted", max_bytes=entry_bytes * 2)
+
+        cache.materialize(*archives[0], self._extract)
+        cache.materialize(*archives[1], self._extract)
+        os.utime(cache.root / archives[1][0] / ".manifest.json", ns=(1, 1))
+        cache.materialize(*archives[0], self._extract)
+        cache.materialize(*archives[2], self._extract)
+
+        self.assertEqual({item["digest"] for item in cache.entries()}, {archives[0][0], archives[2][0]})
+
+
 if __name__ == "__main__":
     unittest.main()
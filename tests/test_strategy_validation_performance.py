@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+===================================
+Strategy Validation Replay Performance Tests
+===================================
+
+Pins the per-day price lookup of the validation replay on a synthetic
+500-symbol x 1000-day panel.  The checks are deterministic: the dense lookup
+must match the former linear scan, and a full replay must never walk the panel
+bar by bar.
+"""
+
+from datetime import date, timedelta
+from unittest import mock
+
+import numpy as np
+
+from src.services.strategy_validation_bars import PRICE_FIELDS, ValidationBarPanel
+from src.services.strategy_validation_service import StrategyValidationService
+
+
+def _synthetic_panel(symbols: int = 500, days: int = 1000, missing: float = 0.05) -> ValidationBarPanel:
+    rng = np.random.default_rng(42)
+    shape = (days, symbols)
+    dates = np.arange(np.datetime64("2020-01-01"), np.datetime64("2020-01-01") + days, dtype="datetime64[D]")
+    present = rng.random(shape) >= missing
+    close = 10 * np.exp(np.cumsum(rng.normal(0, 0.02, shape), axis=0))
+    values = {field: np.where(present, close, np.nan) for field in PRICE_FIELDS}
+    values["open"] = np.where(present, close * (1 + rng.normal(0, 0.005, shape)), np.nan)
+    values["high"] = np.fmax(values["open"], values["close"]) * 1.01
+    values["low"] = np.fmin(values["open"], values["close"]) * 0.99
+    return ValidationBarPanel(
+        codes=tuple(f"{600000 + index:06d}" for index in range(symbols)),
+        dates=dates,
+        values=values,
+        present=present,
+        provenance_ids=np.where(present, 0, -1).astype(np.int32),
+        provenance=(("BenchmarkFetcher", "forward_adjusted"),),
+        created_at=np.full(shape, np.datetime64("NaT"), dtype="datetime64[us]"),
+        updated_at=np.full(shape, np.datetime64("NaT"), dtype="datetime64[us]"),
+    )
+
+
+def _scan_prices_on(by_code: dict, target: date, field: str) -> dict:
+    """Former per-code linear scan over lists of bar dicts."""
+    result = {}
+    for code, bars in by_code.items():
+        match = next((item for item in bars if item["date"] == target and item.get(field) is not None), None)
+        if match:
+            result[code] = float(match[field])
+    return result
+
+
+class TestStrategyValidationReplayPerformance:
+    """Pin the replay's mark-to-market and next-open price lookups."""
+
+    def test_dense_price_lookup_matches_linear_scan(self):
+        panel = _synthetic_panel()
+        by_code = {}
+        for record in panel.iter_records():
+            by_code.setdefault(record["code"], []).append(record)
+        close_prices = np.where(panel.tradable, panel.values["close"], np.nan)
+        open_prices = np.where(panel.tradable, panel.values["open"], np.nan)
+        rows_by_date = {day: row for row, day in enumerate(panel.dates.tolist())}
+        targets = [date(2020, 1, 1) + timedelta(days=offset) for offset in range(0, 1000, 50)]
+
+        scanned = [(_scan_prices_on(by_code, day, "close"), _scan_prices_on(by_code, day, "open")) for day in targets]
+        dense = [
+            (
+                StrategyValidationService._prices_on(close_prices, panel.codes, rows_by_date[day]),
+                StrategyValidationService._prices_on(open_prices, panel.codes, rows_by_date[day]),
+            )
+            for day in targets
+        ]
+
+        assert dense == scanned
+
+    def test_replay_never_iterates_bars_one_by_one(self):
+        panel = _synthetic_panel(symbols=100, days=300, missing=0.0)
+        config = StrategyValidationService._normalize_config({
+            "startDate": "2020-02-03",
+            "endDate": "2020-10-23",
+            "initialCapital": 1_000_000,
+            "market": "cn",
+            "maxPositions": 5,
+            "rebalanceFrequency": "weekly",
+        })
+        config["symbols"] = list(panel.codes)
+        version = {"screeningPolicy": {"strategy": "balanced_alpha"}}
+
+        with mock.patch.object(ValidationBarPanel, "iter_records", side_effect=AssertionError("per-bar replay loop")):
+            result = StrategyValidationService._run(config, version, panel, "synthetic-snapshot")
+
+        assert result["metrics"]["tradeCount"] > 0
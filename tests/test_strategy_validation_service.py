@@ -1,16 +1,22 @@
 from __future__ import annotations
 
+import math
 import os
+import random
+import statistics
 import tempfile
 import unittest
 from datetime import date, timedelta
+from unittest import mock
 
+import numpy as np
 import pandas as pd
 from fastapi import FastAPI
 from fastapi.testclient import TestClient
 
 from api.v1.endpoints.simulation import router as simulation_router
 from src.services.strategy_definition_service import StrategyDefinitionService
+from src.services.strategy_validation_bars import ValidationBarPanel, ValidationFeatures
 from src.services.strategy_validation_service import StrategyValidationError, StrategyValidationService
 from src.storage import (
     DatabaseManager,
@@ -20,6 +26,125 @@ from src.storage import (
 )
 
 
+SCREENING_POLICIES = (
+    "volume_breakout",
+    "shrink_pullback",
+    "oversold_reversal",
+    "capital_heat",
+    "low_volatility_quality",
+    "balanced_alpha",
+)
+
+
+def _reference_score(policy: str, history: list[dict]) -> float | None:
+    """Per-symbol ``statistics`` implementation the vectorized scores must match exactly."""
+    if len(history) < 21:
+        return None
+    closes = [float(item["close"]) for item in history]
+    volumes = [float(item.get("volume") or 0) for item in history]
+    current, prior5, prior20 = closes[-1], closes[-6], closes[-21]
+    if prior5 <= 0 or prior20 <= 0:
+        return None
+    mom5 = current / prior5 - 1
+    mom20 = current / prior20 - 1
+    returns = [closes[index] / closes[index - 1] - 1 for index in range(len(closes) - 19, len(closes)) if closes[index - 1] > 0]
+    volatility = statistics.pstdev(returns) if len(returns) >= 2 else 0.0
+    avg_volume = statistics.fmean(volumes[-21:-1]) if any(volumes[-21:-1]) else 0.0
+    volume_ratio = volumes[-1] / avg_volume if avg_volume > 0 else 1.0
+    ma20 = statistics.fmean(closes[-20:])
+    liquidity = math.log10(max(float(history[-1].get("amount") or 1), 1)) / 10
+    if policy == "volume_breakout":
+        if current < max(closes[-21:-1]) or volume_ratio < 1.3 or current < ma20:
+            return None
+        return mom20 * 5 + volume_ratio * 0.2 + liquidity
+    if policy == "shrink_pullback":
+        if current < ma20 or not 0.98 <= current / ma20 <= 1.08 or volume_ratio > 1.5:
+            return None
+        return mom20 * 3 - abs(current / ma20 - 1) - volatility + liquidity
+    if policy == "oversold_reversal":
+        if mom5 > -0.01 or closes[-1] <= closes[-2]:
+            return None
+        return -mom5 - volatility + liquidity
+    if policy == "capital_heat":
+        if mom5 <= 0 or volume_ratio < 1.2:
+            return None
+        return mom5 * 5 + volume_ratio * 0.2 + liquidity
+    if policy == "low_volatility_quality":
+        return mom20 * 2 - volatility * 4 + liquidity
+    if mom20 <= -0.05:
+        return None
+    return mom20 * 3 + mom5 - volatility * 2 + liquidity
+
+
+class StrategyValidationScoringTest(unittest.TestCase):
+    def test_vectorized_policy_scores_match_per_symbol_reference(self) -> None:
+        rng = random.Random(11)
+        rows = []
+        for code in ("000001", "000002", "600003", "600004", "600005"):
+            price = rng.uniform(5, 40)
+            for offset in range(90):
+                current = date(2024, 1, 1) + timedelta(days=offset)
+                if rng.random() < 0.1:
+                    continue
+                price *= 1 + rng.gauss(0, 0.03)
+                volume = rng.choice([None, 0.0, rng.uniform(1e5, 1e7), rng.uniform(1e5, 1e7)])
+                amount = rng.choice([None, rng.uniform(1e6, 1e9)])
+                rows.append((code, current, price, price * 1.01, price * 0.99, price, volume, amount, "src", None, None, "mode"))
+        panel = ValidationBarPanel.from_rows(rows)
+        features = ValidationFeatures.from_panel(panel)
+        histories = {code: [
+            {"date": item["date"], "close": item["close"], "volume": item["volume"], "amount": item["amount"]}
+            for item in panel.iter_records() if item["code"] == code
+        ] for code in panel.codes}
+        for policy in SCREENING_POLICIES:
+            for target in (date(2024, 1, 20), date(2024, 2, 10), date(2024, 3, 30)):
+                scores = StrategyValidationService._policy_scores(policy, features.at(target))
+                for column, code in enumerate(panel.codes):
+                    expected = _reference_score(policy, [item for item in histories[code] if item["date"] <= target])
+                    if expected is None:
+                        self.assertTrue(np.isnan(scores[column]), (policy, target, code))
+                    else:
+                        self.assertEqual(float(scores[column]), expected, (policy, target, code))
+
+    def test_flat_and_suspended_series_pick_what_the_per_symbol_replay_picked(self) -> None:
+        # Flat closes such as 10.1 sum to a window mean one ulp off when added
+        # naively, which flips ``close >= ma20``.  Bars without an open never
+        # entered the former replay's history, and suspensions leave holes.
+        rows = []
+        for column, (code, level) in enumerate((("000001", 10.1), ("000002", 3.3), ("600003", 7.7), ("600004", 0.7))):
+            for offset in range(70):
+                current = date(2024, 1, 1) + timedelta(days=offset)
+                if column % 2 and 30 <= offset < 36:
+                    continue
+                price = level if offset % 17 else level * 1.001
+                volume = 0.0 if 40 <= offset < 45 else 1e6 + (offset % 3) * 0.1
+                opening = None if column == 3 and offset % 5 == 0 else price
+                rows.append((code, current, opening, price, price, price, volume, 1e8, "src", None, None, "mode"))
+        panel = ValidationBarPanel.from_rows(rows)
+        features = ValidationFeatures.from_panel(panel)
+        histories = {code: [
+            {"date": item["date"], "close": item["close"], "volume": item["volume"], "amount": item["amount"]}
+            for item in panel.iter_records() if item["code"] == code and item["open"] is not None
+        ] for code in panel.codes}
+        code_order = np.argsort(np.argsort(np.array(panel.codes, dtype=object)))
+        for policy in SCREENING_POLICIES:
+            for offset in range(21, 70):
+                target = date(2024, 1, 1) + timedelta(days=offset)
+                ranked = []
+                for code in panel.codes:
+                    score = _reference_score(policy, [item for item in histories[code] if item["date"] <= target])
+                    if score is not None:
+                        ranked.append((score, code))
+                scores = StrategyValidationService._policy_scores(policy, features.at(target))
+                candidates = np.flatnonzero(~np.isnan(scores))
+                picks = candidates[np.lexsort((code_order[candidates], scores[candidates]))[::-1]]
+                self.assertEqual(
+                    [(float(scores[column]), panel.codes[column]) for column in picks.tolist()],
+                    sorted(ranked, reverse=True),
+                    (policy, target),
+                )
+
+
 class StrategyValidationServiceTest(unittest.TestCase):
     def setUp(self) -> None:
         self.path = tempfile.mktemp(suffix=".sqlite")
@@ -157,6 +282,124 @@ class StrategyValidationServiceTest(unittest.TestCase):
         self.assertEqual(completed["result"]["strategyCoverage"]["level"], "partial")
         self.assertEqual(self.validation.version_status(self.version_id)["status"], "completed")
 
+    def test_bar_panel_hash_matches_per_bar_snapshot_payload(self) -> None:
+        created = self.validation.create_experiment(self._payload(key="panel-hash-key"))
+        with self.db.get_session() as session:
+            panel = self.validation._frozen_bars(session, created["id"])
+        records = list(panel.iter_records())
+        self.assertEqual(len(records), created["barCount"])
+        self.assertEqual([(item["code"], item["date"]) for item in records], sorted((item["code"], item["date"]) for item in records))
+        legacy_payload = [{
+            key: value.isoformat() if hasattr(value, "isoformat") else value
+            for key, value in item.items()
+        } for item in records]
+        self.assertEqual(StrategyValidationService._bars_hash(panel), StrategyValidationService._hash(legacy_payload))
+        self.assertEqual(StrategyValidationService._bars_hash(panel), created["inputSnapshotHash"])
+
+        holed = ValidationBarPanel.from_rows([
+            ("600001", date(2024, 1, 2), 10.0, 10.5, 9.5, 10.2, None, 1.0, "src", None, None, "mode"),
+            ("600001", date(2024, 1, 4), None, 10.5, 9.5, 10.2, 5.0, None, "src", None, None, "mode"),
+            ("600002", date(2024, 1, 3), 20.0, 20.5, 19.5, 20.2, 7.0, 2.0, "other", None, None, "mode"),
+        ])
+        self.assertEqual(holed.present.shape, (3, 2))
+        self.assertEqual(len(holed), 3)
+        self.assertIsNone(list(holed.iter_records())[0]["volume"])
+        self.assertEqual(holed.tradable.sum(axis=0).tolist(), [1, 1])
+        self.assertEqual(holed.take(["600002"]).dates.tolist(), [date(2024, 1, 3)])
+
+    def test_parameter_sweep_loads_bars_once_and_persists_comparable_cells(self) -> None:
+        target_version_id = self._second_version()
+        payload = {
+            "strategyVersionIds": [self.version_id, target_version_id],
+            "idempotencyKey": "sweep-key-001",
+            "config": self._payload()["config"],
+            "grid": {"maxPositions": [1, 2], "rebalanceFrequency": ["weekly", "daily"]},
+        }
+        swept = self.validation.run_sweep(payload, max_workers=2)
+        self.assertEqual(swept["cellCount"], 8)
+        self.assertEqual(swept["executedCount"], 8)
+        self.assertEqual(swept["snapshotCount"], 1)
+        self.assertEqual({cell["status"] for cell in swept["cells"]}, {"completed"})
+
+        cell = next(
+            item for item in swept["cells"]
+            if item["strategyVersionId"] == self.version_id
+            and item["overrides"] == {"maxPositions": 2, "rebalanceFrequency": "weekly"}
+        )
+        sequential = self._completed_for_version(self.version_id, key="sweep-reference-key")
+        detail = self.validation.get_experiment(cell["experimentId"])
+        self.assertEqual(detail["integrityStatus"], "verified")
+        self.assertEqual(detail["result"]["trades"], sequential["result"]["trades"])
+        self.assertEqual(detail["result"]["metrics"], sequential["result"]["metrics"])
+        self.assertEqual(detail["inputSnapshotHash"], sequential["inputSnapshotHash"])
+
+        target_cell = next(
+            item for item in swept["cells"]
+            if item["strategyVersionId"] == target_version_id and item["overrides"] == cell["overrides"]
+        )
+        comparison = self.validation.compare_experiments({
+            "baselineExperimentId": cell["experimentId"],
+            "targetExperimentId": target_cell["experimentId"],
+        })
+        self.assertEqual(comparison["comparisonBasis"]["snapshotMode"], "exact_snapshot")
+
+        again = self.validation.run_sweep(payload)
+        self.assertEqual(again["executedCount"], 0)
+        self.assertEqual([item["experimentId"] for item in again["cells"]], [item["experimentId"] for item in swept["cells"]])
+
+        oversized = dict(payload, idempotencyKey="sweep-key-002", grid={"slippageRate": [0.001 * step for step in range(1, 40)]})
+        with self.assertRaises(StrategyValidationError) as too_large:
+            self.validation.run_sweep(oversized)
+        self.assertEqual(too_large.exception.code, "VALIDATION_SWEEP_TOO_LARGE")
+
+    def test_parameter_sweep_retries_failed_cells_on_their_frozen_snapshot(self) -> None:
+        payload = {
+            "strategyVersionIds": [self.version_id],
+            "idempotencyKey": "sweep-retry-key",
+            "config": self._payload()["config"],
+            "grid": {"maxPositions": [1]},
+        }
+        first = self.validation.run_sweep(payload)["cells"][0]
+        self.validation._fail(first["experimentId"], "interrupted")
+        with self.db.session_scope() as session:
+            session.query(StockDaily).update({StockDaily.volume: StockDaily.volume * 2})
+
+        # The new cell loads fresh bars for the same market before the failed
+        # cell with the same panel key is retried.
+        retried = self.validation.run_sweep(dict(payload, grid={"maxPositions": [2, 1]}))
+        self.assertEqual(retried["executedCount"], 2)
+        self.assertEqual(retried["snapshotCount"], 2)
+        fresh, replayed = retried["cells"]
+        self.assertEqual(replayed["experimentId"], first["experimentId"])
+        self.assertEqual(replayed["inputSnapshotHash"], first["inputSnapshotHash"])
+        self.assertNotEqual(fresh["inputSnapshotHash"], first["inputSnapshotHash"])
+        detail = self.validation.get_experiment(replayed["experimentId"])
+        self.assertEqual(detail["status"], "completed")
+        self.assertEqual(detail["result"]["marketSnapshot"]["sha256"], first["inputSnapshotHash"])
+
+    def test_parameter_sweep_marks_cells_failed_when_execution_breaks(self) -> None:
+        payload = {
+            "strategyVersionIds": [self.version_id],
+            "idempotencyKey": "sweep-broken-key",
+            "config": self._payload()["config"],
+            "grid": {"maxPositions": [1, 2]},
+        }
+        with mock.patch.object(
+            StrategyValidationService, "_execute_sweep_cells", side_effect=RuntimeError("pool broke"),
+        ):
+            with self.assertRaises(StrategyValidationError) as raised:
+                self.validation.run_sweep(payload)
+        self.assertEqual(raised.exception.code, "VALIDATION_SWEEP_EXECUTION_FAILED")
+        self.assertEqual(raised.exception.status_code, 503)
+        experiments = self.validation.list_experiments(self.version_id)
+        self.assertEqual(len(experiments), 2)
+        self.assertEqual({item["status"] for item in experiments}, {"failed"})
+        self.assertEqual({item["errorMessage"] for item in experiments}, {"pool broke"})
+
+        retried = self.validation.run_sweep(payload)
+        self.assertEqual(retried["executedCount"], 2)
+        self.assertEqual({cell["status"] for cell in retried["cells"]}, {"completed"})
+
     def test_validation_uses_the_kline_provider_frozen_in_strategy_version(self) -> None:
         with self.db.session_scope() as session:
             version = session.get(SimulationStrategyVersionRecord, self.version_id)
@@ -314,6 +557,26 @@ class StrategyValidationServiceTest(unittest.TestCase):
         self.assertEqual(comparison_response.json()["strategyId"], baseline["strategyId"])
         self.assertEqual(comparison_response.json()["target"]["strategyVersionId"], target_version_id)
 
+    def test_http_contract_runs_validation_sweep(self) -> None:
+        app = FastAPI()
+        app.include_router(simulation_router, prefix="/api/v1/simulation")
+        client = TestClient(app)
+
+        sweep_response = client.post(
+            "/api/v1/simulation/definition/validation-sweeps",
+            json={
+                "strategyVersionIds": [self.version_id],
+                "idempotencyKey": "api-sweep-key",
+                "config": self._payload()["config"],
+                "grid": {"slippageRate": [0.0005, 0.001]},
+            },
+        )
+        self.assertEqual(sweep_response.status_code, 200, sweep_response.text)
+        body = sweep_response.json()
+        self.assertEqual(body["cellCount"], 2)
+        self.assertEqual([cell["overrides"] for cell in body["cells"]], [{"slippageRate": 0.0005}, {"slippageRate": 0.001}])
+        self.assertEqual({cell["status"] for cell in body["cells"]}, {"completed"})
+
     def test_strategy_universe_is_default_and_requires_point_in_time_membership(self) -> None:
         with self.db.session_scope() as session:
             version = session.get(SimulationStrategyVersionRecord, self.version_id)